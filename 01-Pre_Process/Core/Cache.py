@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: Utf-8 -*-
+
+import os
+import json
+import pickle
+import hashlib
+from types import SimpleNamespace
+from Core.Definitions import Entities, Options
+from Core.Storage import TagStorage, NodeStorage, NodeView, ElementView, AttributeView
+
+#The cache manifest: the stages and partition files of the previous run
+Manifest = dict()
+
+#The digests of the Entities/Options computed in this run
+Digests = dict()
+
+#Number of CreateRunAnalysisFiles() calls in this run
+Session = {'call': 0}
+
+#Inputs and outputs (Entities or Options keys) of each pipeline stage
+Stages = {
+    'Constraints': (['Nodes', 'RigidLinks', 'Diaphragms', 'RigidBodies', 'Constraints', 'dimension'],
+                    ['Constraints', 'Nodes']),
+    'DRM'        : (['Loads', 'Functions', 'Materials', 'Nodes', 'dimension', 'path'],
+                    ['Loads', 'Functions']),
+    'Partition'  : (['Nodes', 'Elements', 'Constraints', 'Materials', 'Sections', 'nparts', 'partitioner', 'costs', 'migration', 'metispath', 'partition', 'clustermap'],
+                    ['partition', 'clustermap']),
+    'Numbering'  : (['Nodes', 'Elements', 'Constraints', 'Masses', 'numbering', 'ownership', 'allocation', 'nparts', 'partition', 'storage', 'dimension', 'metispath', 'fillin'],
+                    ['Nodes', 'nfree', 'ntotal', 'nconstraint', 'ownrange', 'd_nz', 'o_nz', 'd_nnz', 'o_nnz', 'nlumped', 'nconsistent', 'nfillin'])
+}
+
+class DigestPickler(pickle.Pickler):
+    """
+    This class serializes an object into a hash. The memo is disabled so the
+    result only depends on the content (not on which objects are shared), and
+    the Node/Element views and storages are serialized by their values.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    def __init__(self, h):
+        pickle.Pickler.__init__(self, SimpleNamespace(write=h.update), protocol=4)
+        self.fast = True
+
+    def reducer_override(self, obj):
+        if isinstance(obj, (NodeView, ElementView, AttributeView)):
+            return (dict, (dict(obj),))
+        elif isinstance(obj, TagStorage):
+            return (tuple, (StorageArrays(obj),))
+        return NotImplemented
+
+def StorageArrays(store, tags=None):
+    """
+    Returns the arrays (and tables) that define the given tags of an array-backed
+    storage, all the stored entities if tags is None.
+    """
+    tags = store.getTags() if tags is None else tags
+    if isinstance(store, NodeStorage):
+        return (tags,) + tuple(store.getArrays(tags))
+    namecode, nconn, conn, attrid = store.getArrays(tags)
+    return (tags, namecode, nconn, conn, attrid, store.names, store.records)
+
+def Digest(*objects):
+    """
+    This function computes a content hash of the given objects. The array-backed
+    storages and the dictionaries of Node/Element views (as the ones written in
+    the partition files) are hashed in bulk, other objects are pickled.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    objects : list
+        The Python objects to be hashed (in order)
+
+    Returns
+    -------
+    str
+        The hexadecimal digest
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for obj in objects:
+        views = list(obj.values()) if isinstance(obj, dict) else []
+        if views and isinstance(views[0], (NodeView, ElementView)) and all(type(view) is type(views[0]) and view.store is views[0].store for view in views):
+            obj = (list(obj.keys()), StorageArrays(views[0].store, [view.tag for view in views]))
+        DigestPickler(h).dump(obj)
+    return h.hexdigest()
+
+def GetDigest(key):
+    """
+    Returns the (memoized) digest of an Entities or Options field
+    """
+    if key not in Digests:
+        Digests[key] = Digest(Entities[key] if key in Entities else Options[key])
+    return Digests[key]
+
+def CacheEnabled():
+    """
+    Returns if the cache of the pipeline stages is enabled (see Options['cache'])
+    """
+    return Options['cache'].upper() == 'YES'
+
+def ManifestFile():
+    """
+    Returns the full path of the cache manifest
+    """
+    return Options['path'] + '/' + Options['file'] + '.Cache.json'
+
+def LoadManifest():
+    """
+    This function loads the cache manifest written by the previous run (if any)
+    located in Options['path']. It is called once per CreateRunAnalysisFiles(),
+    and the stages of each call are stored separately.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    None
+    """
+    Digests.clear()
+    Session['call'] += 1
+    if Session['call'] > 1:
+        return
+
+    Manifest.clear()
+    if os.path.isfile(ManifestFile()):
+        with open(ManifestFile(), "r") as infile:
+            try:
+                Manifest.update(json.load(infile))
+            except ValueError:
+                print('\x1B[33m ALERT \x1B[0m: The cache manifest \'%s\' is corrupted and it will be rebuilt.' % ManifestFile())
+    Manifest.setdefault('Stages', {})
+    Manifest.setdefault('Files', {})
+
+def SaveManifest():
+    """
+    This function writes the cache manifest in Options['path'].\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    None
+    """
+    with open(ManifestFile(), "w") as outfile:
+        json.dump(Manifest, outfile, indent=4)
+
+def FileDigest(path):
+    """
+    Returns the content digest of a file, None if it does not exist
+    """
+    if not os.path.isfile(path):
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as infile:
+        for block in iter(lambda: infile.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def RunStage(name, function, *args, files=(), paths=()):
+    """
+    This function runs a pipeline stage (see Stages) unless the digest of its
+    inputs is the one recorded in the manifest, in which case its outputs are
+    restored from the previous run. If Options['cache'] is not 'YES' the stage
+    is always executed.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    name : str
+        The stage name in Stages
+    function : function
+        The function that computes the stage
+    args : list
+        The arguments to be passed to the function
+    files : list
+        The (external) files read by the stage, their content is also hashed
+    paths : list
+        The files/folders generated by the stage that must exist to reuse it
+
+    Returns
+    -------
+    bool
+        True if the outputs were reused from the previous run
+    """
+    if not CacheEnabled():
+        function(*args)
+        return False
+
+    inputs, outputs = Stages[name]
+    stage = name + '.' + str(Session['call'])
+    key = Digest(name, [GetDigest(field) for field in inputs], args, [FileDigest(path) for path in files])
+    filename = Options['path'] + '/' + 'Cache' + '/' + Options['file'] + '.' + stage + '.pkl'
+
+    #Restores the outputs of the previous run
+    entry = Manifest['Stages'].get(stage)
+    if entry and entry['key'] == key and os.path.isfile(filename) and all(os.path.exists(path) for path in entry['paths']):
+        with open(filename, "rb") as infile:
+            values = pickle.load(infile)
+        for field in outputs:
+            if field in Entities:
+                Entities[field] = values[field]
+            else:
+                Options[field] = values[field]
+        Digests.update(entry['outputs'])
+        print(' ◇ Cache: the %s stage is unchanged and it was reused' % name)
+        return True
+
+    #Computes the stage and stores its outputs
+    function(*args)
+
+    dirName = Options['path'] + '/' + 'Cache'
+    if not os.path.exists(dirName):
+        os.mkdir(dirName)
+
+    values = {field: (Entities[field] if field in Entities else Options[field]) for field in outputs}
+    with open(filename, "wb") as outfile:
+        pickle.dump(values, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+
+    for field in outputs:
+        Digests.pop(field, None)
+    Manifest['Stages'][stage] = {'key': key, 'outputs': {field: GetDigest(field) for field in outputs}, 'paths': [path for path in paths if os.path.exists(path)]}
+    SaveManifest()
+    return False
+
+def UnchangedFile(filename, digest):
+    """
+    Returns if the file was written by a previous run with the same content digest
+    """
+    entry = Manifest.get('Files', {}).get(os.path.basename(filename))
+    return bool(entry) and entry['digest'] == digest and os.path.isfile(filename) and os.path.getsize(filename) == entry['size']
+
+def RecordFiles(files):
+    """
+    This function records the content digest of the written partition files in
+    the manifest.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    files : list
+        The (filename, digest) of the partition files
+
+    Returns
+    -------
+    None
+    """
+    for filename, digest in files:
+        Manifest['Files'][os.path.basename(filename)] = {'digest': digest, 'size': os.path.getsize(filename)}
+    SaveManifest()
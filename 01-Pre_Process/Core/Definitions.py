@@ -40,10 +40,19 @@ Options = {
     'runanalysis' : '',
     'allocation'  : 'NO',
     'numbering'   : 'Plain',
+    'ownership'   : 'Plain',       #Plain, Partition
+    'partitioner' : 'Metis',       #Metis, Graph, RCB, Hilbert
+    'costs'       : {},            #Element class/Material: cost
+    'migration'   : 0.0,           #Fraction of partitioned elements allowed to migrate
     'metispath'   : '',
     'update'      : 'Restartable', #Restartable, Progressive, Transmissive
     'massform'    : 'Consistent',
+    'storage'     : 'Dict',        #Dict, Array
+    'jsonformat'  : 'Indented',    #Indented, Compact, Binary
+    'cache'       : 'NO',          #YES: reuse the unchanged stages and partition files
+    'fillin'      : 'NO',          #YES: estimate the fill-in of the factorization (see FillInEstimate)
     'nparts'      :  1,
+    'nworkers'    :  0,            #Processes writing the partitions/DRM files (0: all cores)
     'dimension'   :  0,
     'nfree'       :  0,
     'ntotal'      :  0,
@@ -55,6 +64,10 @@ Options = {
     'nwarnings'   :  0,
     'd_nz'        : [],
     'o_nz'        : [],
+    'd_nnz'       : [],
+    'o_nnz'       : [],
+    'nfillin'     : [],            #Estimated non-zero of the factor and flops (see FillInEstimate)
+    'ownrange'    : [],
     'partition'   : [],
     'clustermap'  : {}
 }
@@ -1,19 +1,92 @@
 #!/usr/bin/python3
 # -*- coding: Utf-8 -*-
 
-import random
+import os
+import subprocess
 import numpy as np
 import scipy.sparse as sps
-import matplotlib.pylab as plt
-from scipy.sparse import find
 from scipy.sparse import linalg as sla
+import matplotlib.pylab as plt
 from Core.Definitions import Entities, Options
+from Core.Storage import GetNodeStorage, GetElementStorage, CommitNodeStorage
+
+#Maximum number of entries assembled at once in FormSparseMatrix
+FormChunk = 4194304
+
+#Number of Nodes below which the nested dissection stops bisecting
+DissectionLeaf = 64
+
+#Drop tolerance of the incomplete factorization (only the ordering is used)
+DropTolerance = 1.0E+100
+
+def RunLengthEncoding(values):
+    """
+    This function compresses an integer array as a sequence of (value, count)
+    pairs, i.e., [v0, n0, v1, n1, ...] where value vk is repeated nk times.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    values : array
+        The integer array to be compressed
+
+    Output
+    -------
+    list
+        The flattened (value, count) pairs
+    """
+    values = np.asarray(values, dtype=int)
+    if len(values) == 0:
+        return []
+
+    start = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+    count = np.diff(np.append(start, len(values)))
+
+    return np.column_stack((values[start], count)).ravel().tolist()
+
+def PetscNonZeros():
+    """
+    This function computes the exact number of non-zero of each row in the
+    diagonal and off-diagonal blocks of the (free) stiffness matrix, where 
+    the rows of each partition are given by Options['ownrange'].\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    None
+
+    Output
+    -------
+    d_nnz : array
+        The number of non-zero of each row in the diagonal block
+    o_nnz : array
+        The number of non-zero of each row in the off-diagonal block
+    """
+    ownrange = np.asarray(Options['ownrange'], dtype=int)
+
+    #Assembles the matrix pattern.
+    A = FormSparseMatrix('csr')
+
+    #Partition that owns each row and column of the non-zero entries
+    row = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+    part = np.searchsorted(ownrange, row, side='right') - 1
+    diag = (A.indices >= ownrange[part]) & (A.indices < ownrange[part + 1])
+
+    #Exact number of non-zero per row in the diagonal/off-diagonal blocks
+    d_nnz = np.bincount(row[diag], minlength=A.shape[0])
+    o_nnz = np.bincount(row[~diag], minlength=A.shape[0])
+
+    return d_nnz, o_nnz
 
 def PetscAllocation():
     """
-    This function computes (bruta fuerza) the number of non-zero for each 
-    diagonal and off-diagonal blocks required for allocation in PETSc. In
-    simple words, it estimates the memory allocation for PETSc.\n
+    This function computes the exact number of non-zero of each row in the
+    diagonal and off-diagonal blocks required for allocation in PETSc. The
+    rows of each partition are given by Options['ownrange']. In simple words,
+    it computes the memory allocation for PETSc, and reports the memory
+    allocated per row with respect to the (uniform) d_nz and o_nz values.\n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2020
 
@@ -26,37 +99,37 @@ def PetscAllocation():
     None
     """
     N = Options['nparts']
-    M = Options['nfree']
+    ownrange = np.asarray(Options['ownrange'], dtype=int)
+
+    #Exact number of non-zero per row in the diagonal/off-diagonal blocks
+    d_nnz, o_nnz = PetscNonZeros()
 
-    nr = int(M/N)
     n_nz = np.zeros(N, dtype=int)
     o_nz = np.zeros(N, dtype=int)
-
-    #Assembles the matrix.
-    A = FormSparseMatrix()
-
-    #Re-define matrix.
-    (I,J,V) = find(A)
-    V = 0.0*V + 1.0
-    A = sps.coo_matrix((V,(I, J)), shape=(M,M))
-    A = A.tocsr()
+    Options['d_nnz'] = []
+    Options['o_nnz'] = []
 
     #Loop over the partitions.
+    print(' ◇ PETSc memory allocation:')
     for k in range(0,N):
-        #Matrix partition.
-        inf = k*nr
-        sup = (k + 1)*nr
+        #Matrix partition (rows owned by this partition).
+        inf = ownrange[k]
+        sup = ownrange[k+1]
 
-        #Sub-Matrix stripe. 
-        S = A[inf:sup,:]
+        #Check the partition is not empty
+        if sup > inf:
+            n_nz[k] = np.max(d_nnz[inf:sup])
+            o_nz[k] = np.max(o_nnz[inf:sup])
 
-        #Sub-Matrix block-diagonal.
-        D = S[:,inf:sup]
+        #Per-row non-zero (run-length encoded) for this partition
+        Options['d_nnz'].append(RunLengthEncoding(d_nnz[inf:sup]))
+        Options['o_nnz'].append(RunLengthEncoding(o_nnz[inf:sup]))
 
-        #Check the partition is not empty
-        if D.size != 0:
-            n_nz[k] = np.max(D.sum(axis=1))
-            o_nz[k] = np.max(S.sum(axis=1) - D.sum(axis=1))
+        #Memory (AIJ format with 8 bytes value and 4 bytes column index)
+        used = int(np.sum(d_nnz[inf:sup]) + np.sum(o_nnz[inf:sup]))
+        uniform = int((sup - inf)*(np.floor(n_nz[k]/5 + 1)*5 + np.floor(o_nz[k]/5 + 1)*5))
+        print(' |   Partition[%d]: %d rows, %d non-zero (%.2f MB), uniform d_nz/o_nz allocation %d non-zero (%.2f MB)' 
+            % (k, sup - inf, used, 12.0*used/1048576.0, uniform, 12.0*uniform/1048576.0))
 
     #Sets the closest multipple of five.
     n_nz = np.floor( np.divide(n_nz,5) + 1) * 5
@@ -88,10 +161,100 @@ def plotSparsePattern(A):
 
     plt.close()
 
+def AssemblePattern(ptr, index, N, code):
+    """
+    This function emulates the assembly of the (boolean) pattern of a N x N
+    sparse matrix, where each Element k couples all the entries stored in
+    index[ptr[k]:ptr[k+1]]. The Elements are grouped by type and size, then
+    each group is expanded using a padded array.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    ptr : array
+        The CSR-style pointer of each Element
+    index : array
+        The concatenated indices (degree of freedom or Node rows) of the Elements
+    N : int
+        The size of the sparse matrix
+    code : array
+        The Element class name code
+
+    Output
+    -------
+    A : scipy.sparse
+        The (N x N) boolean sparse matrix pattern in csr format
+    """
+    #Groups of Element (type, size)
+    size = np.diff(ptr)
+    group = code.astype(np.int64)*(int(size.max(initial=0)) + 1) + size
+    order = np.argsort(group, kind='stable')
+    bound = np.flatnonzero(np.diff(group[order])) + 1
+
+    I = []
+    J = []
+    for sel in np.split(order, bound):
+        n = int(size[sel[0]]) if len(sel) else 0
+        if n == 0:
+            continue
+        #Assembles (at most) FormChunk entries at once
+        step = max(1, FormChunk//(n*n))
+        for k in range(0, len(sel), step):
+            #Padded (nElem x n) element index array
+            dofs = index[ptr[sel[k:k+step], None] + np.arange(n)]
+            B = sps.coo_matrix((np.ones(dofs.size*n, dtype=bool),
+                (np.repeat(dofs, n, axis=1).ravel(), np.tile(dofs, (1,n)).ravel())), shape=(N,N)).tocsr().tocoo()
+            I.append(B.row)
+            J.append(B.col)
+
+    I = np.concatenate(I) if I else np.zeros(0, dtype=int)
+    J = np.concatenate(J) if J else np.zeros(0, dtype=int)
+    A = sps.coo_matrix((np.ones(len(I), dtype=bool),(I, J)), shape=(N,N)).tocsr()
+
+    return A
+
+def ConstraintArrays(cTags):
+    """
+    This function gathers the slave and master Nodes and degree of freedom of
+    the given constraints into arrays, i.e., the master Nodes and degree of 
+    freedom of all the constraints are concatenated.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    cTags : array
+        The constraint identifiers (see Entities['Constraints'])
+
+    Output
+    -------
+    stag : array
+        The slave Node of each constraint
+    sdof : array
+        The slave degree of freedom (local to the slave Node)
+    nmaster : array
+        The number of master Nodes of each constraint
+    mtag : array
+        The (concatenated) master Nodes
+    mdof : array
+        The (concatenated) master degree of freedom (local to each master Node)
+    """
+    constraints = [Entities['Constraints'][cTag] for cTag in np.asarray(cTags).tolist()]
+
+    stag = np.array([con['stag'] for con in constraints], dtype=np.int64)
+    sdof = np.array([con['sdof'] for con in constraints], dtype=np.int64)
+    nmaster = np.array([len(con['mtag']) for con in constraints], dtype=np.int64)
+    mtag = np.array([tag for con in constraints for tag in con['mtag']], dtype=np.int64)
+    mdof = np.array([dof for con in constraints for dof in con['mdof']], dtype=np.int64)
+
+    return stag, sdof, nmaster, mtag, mdof
+
 def FormSparseMatrix(format='coo'):
     """
     This function compute/emulates the Sparse Matrix Pattern to be employed 
-    in the user's defined ordering scheme.\n
+    in the user's defined ordering scheme. The pattern is boolean, i.e., only
+    the non-zero structure of the assembled (and constrained) matrix is kept.\n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2020
 
@@ -102,86 +265,506 @@ def FormSparseMatrix(format='coo'):
 
     Output
     -------
-    None
+    A : scipy.sparse
+        The (nfree x nfree) boolean sparse matrix pattern
     """
-    #Emulates the Element Assembly Pattern 
+    #Array-backed Nodes and Elements
+    nodes = GetNodeStorage()
+    elems = GetElementStorage()
+    ptr, conn = elems.getConnectivity()
+    dptr, ndof, free, total = nodes.getDofs()
+    code, _ = elems.getNames()
+
+    #Element's degree-of-freedom list (CSR-style)
+    rows = nodes.getRows(conn)
+    edofs = total[nodes.getDofIndex(rows)]
+    nedof = np.add.reduceat(ndof[rows], ptr[:-1]) if len(rows) else np.zeros(len(ptr) - 1, dtype=int)
+    eptr = np.zeros(len(ptr), dtype=int)
+    np.cumsum(nedof, out=eptr[1:])
+
+    #Emulates the Element Assembly Pattern per group of Element (type, size)
     N = Options['ntotal']
-    M = Options['nconsistent']
+    A = AssemblePattern(eptr, edofs, N, code)
 
-    I = np.zeros(M, dtype=int)
-    J = np.zeros(M, dtype=int)
-    V = np.zeros(M, dtype=float)
+    #Emulates the Transformation matrix 
+    M = Options['nfree']
 
-    m = 0
-    for eTag in Entities['Elements']:
-        #Element's node connectivity array
-        connection = Entities['Elements'][eTag]['conn']
+    #The Free Degree-Of-Freedom is unconstrained
+    mask = free > -1
+    I = [total[mask]]
+    J = [free[mask]]
 
-        #Element's degree-of-freedom list
-        total = []
-        for nTag in connection:
-            total = np.concatenate((total, Entities['Nodes'][nTag]['totaldof']))
+    #The Free Degree-Of-Freedom is constrained
+    stag, sdof, nmaster, mtag, mdof = ConstraintArrays(free[free < -1])
+    I.append(np.repeat(total[dptr[nodes.getRows(stag)] + sdof], nmaster))
+    J.append(free[dptr[nodes.getRows(mtag)] + mdof])
 
-        for idof in total:
-            for jdof in total:
-                I[m] = idof
-                J[m] = jdof
-                V[m] = random.random()
-                m += 1
+    I = np.concatenate(I).astype(int)
+    J = np.concatenate(J).astype(int)
 
-    A = sps.coo_matrix((V,(I, J)), shape=(N,N))
+    #The Final Element Assembly pattern on the (boolean) degree-of-freedom graph
+    T = sps.coo_matrix((np.ones(len(I), dtype=bool),(I, J)), shape=(N,M)).tocsr()
+    A = (T.transpose().tocsr()*A*T).tocsr()
+    A.sort_indices()
 
-    #Emulates the Transformation matrix 
-    M = Options['nfree']
-    N = Options['ntotal']
-    S = Options['nfree'] + Options['nconstraint']
-
-    I = np.zeros(S, dtype=int)
-    J = np.zeros(S, dtype=int)
-    V = np.zeros(S, dtype=float)
-
-    m = 0
-    for nTag in Entities['Nodes']:
-        ndof  = Entities['Nodes'][nTag]['ndof' ]
-        free  = Entities['Nodes'][nTag]['freedof' ]
-        total = Entities['Nodes'][nTag]['totaldof']
-
-        for k in range(ndof):
-            #The Free Degree-Of-Freedom is unconstrained
-            if free[k] > -1:
-                I[m] = total[k]
-                J[m] = free[k]
-                V[m] = 1.00
-                m += 1
-
-            #The Free Degree-Of-Freedom is constrained
-            if free[k] < -1:
-                SlaveNode = Entities['Constraints'][free[k]]['stag']
-                SlaveDOF  = Entities['Constraints'][free[k]]['sdof' ]
-                Slave     = Entities['Nodes'][SlaveNode]['totaldof'][SlaveDOF]
-
-                MasterNode = Entities['Constraints'][free[k]]['mtag']
-                MasterDOF  = Entities['Constraints'][free[k]]['mdof']
-
-                for i in range(len(MasterNode)):
-                    Master = Entities['Nodes'][MasterNode[i]]['freedof'][MasterDOF[i]]
-                    I[m] = Slave
-                    J[m] = Master
-                    V[m] = 1.00 
-                    m += 1
-
-    T = sps.coo_matrix((V,(I, J)), shape=(N,M))
-
-    #The Final Element Assembly pattern 
-    A = T.transpose()*A*T
-
-    if format == 'csr':
-        A = A.tocsr()
+    if format == 'coo':
+        A = A.tocoo()
     elif format == 'csc':
         A = A.tocsc()
 
     return A
 
+def NodeFreeNumbering(nodes):
+    """
+    This function computes for each Node the number of free degree of freedom
+    and the lowest free degree of freedom number, which gives the position of
+    the Node in the current numbering.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    nodes : NodeStorage
+        The array-backed Nodes
+
+    Output
+    -------
+    count : array
+        The number of free degree of freedom of each Node row
+    first : array
+        The lowest free degree of freedom number of each Node row (the 
+        largest integer if the Node does not have free degree of freedom)
+    """
+    _, ndof, free, _ = nodes.getDofs()
+
+    node = np.repeat(np.arange(len(ndof)), ndof)
+    mask = free > -1
+    count = np.bincount(node[mask], minlength=len(ndof))
+    first = np.full(len(ndof), np.iinfo(np.int64).max)
+    np.minimum.at(first, node[mask], free[mask])
+
+    return count, first
+
+def NodeTransformation(nodes):
+    """
+    This function emulates the (boolean) transformation matrix of the Nodes,
+    i.e., each Node is coupled to itself and the Node with a constrained 
+    degree-of-freedom is also coupled to the master Nodes.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    nodes : NodeStorage
+        The array-backed Nodes
+
+    Output
+    -------
+    T : scipy.sparse
+        The (N x N) boolean transformation matrix on the Node rows in csr format
+    """
+    _, ndof, free, _ = nodes.getDofs()
+
+    #The Node is coupled to itself
+    N = len(ndof)
+    I = [np.arange(N)]
+    J = [np.arange(N)]
+
+    #The Node with a constrained degree-of-freedom is coupled to the master Nodes
+    stag, _, nmaster, mtag, _ = ConstraintArrays(np.unique(free[free < -1]))
+    I.append(np.repeat(nodes.getRows(stag), nmaster))
+    J.append(nodes.getRows(mtag))
+
+    I = np.concatenate(I).astype(int)
+    J = np.concatenate(J).astype(int)
+
+    return sps.coo_matrix((np.ones(len(I), dtype=bool),(I, J)), shape=(N,N)).tocsr()
+
+def FormNodeGraph(format='csr'):
+    """
+    This function compute/emulates the Node adjacency graph (the Sparse Matrix
+    Pattern at Node level) to be employed in the user's defined ordering scheme.
+    The graph is ndof x ndof smaller than the one given by FormSparseMatrix. 
+    A constrained (slave) Node is coupled to the master Nodes as in T^T A T,
+    and only the Nodes with free degree of freedom are kept in the graph.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    format : str
+        The sparse matrix format: coo, csr, csc
+
+    Output
+    -------
+    G : scipy.sparse
+        The (n x n) boolean adjacency graph of the Nodes with free degree of
+        freedom
+    rows : array
+        The n Node rows (see getDofs) associated to the vertices of G
+    """
+    #Array-backed Nodes and Elements
+    nodes = GetNodeStorage()
+    elems = GetElementStorage()
+    ptr, conn = elems.getConnectivity()
+    _, ndof, free, _ = nodes.getDofs()
+    code, _ = elems.getNames()
+
+    #Emulates the Element Assembly Pattern on the Node rows
+    N = len(ndof)
+    G = AssemblePattern(ptr, nodes.getRows(conn), N, code)
+
+    #The Final Node adjacency graph
+    T = NodeTransformation(nodes)
+    G = (T.transpose().tocsr()*G*T).tocsr()
+
+    #Removes the Nodes without free degree-of-freedom
+    nfree, _ = NodeFreeNumbering(nodes)
+    rows = np.flatnonzero(nfree)
+    G = G[rows,:][:,rows]
+    G.sort_indices()
+
+    if format == 'coo':
+        G = G.tocoo()
+    elif format == 'csc':
+        G = G.tocsc()
+
+    return G, rows
+
+def FormNodeIncidence(format='csr'):
+    """
+    This function compute/emulates the Element-Node incidence, i.e., the 
+    Element k couples the Nodes of the row k, where a constrained (slave) Node
+    is replaced by the master Nodes as in B T. The Node adjacency graph given
+    by FormNodeGraph is M^T M, and only the Nodes with free degree of freedom
+    and the Elements coupling them are kept.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    format : str
+        The sparse matrix format: coo, csr, csc
+
+    Output
+    -------
+    M : scipy.sparse
+        The (m x n) boolean incidence of the Elements and the Nodes with free
+        degree of freedom
+    rows : array
+        The n Node rows (see getDofs) associated to the columns of M
+    """
+    #Array-backed Nodes and Elements
+    nodes = GetNodeStorage()
+    elems = GetElementStorage()
+    ptr, conn = elems.getConnectivity()
+    N = len(nodes.getDofs()[1])
+
+    #The Element-Node incidence on the Node rows
+    B = sps.csr_matrix((np.ones(len(conn), dtype=bool), nodes.getRows(conn), ptr), shape=(len(ptr) - 1, N))
+    M = (B*NodeTransformation(nodes)).tocsr()
+
+    #Removes the Nodes without free degree-of-freedom and the empty Elements
+    nfree, _ = NodeFreeNumbering(nodes)
+    rows = np.flatnonzero(nfree)
+    M = M[:,rows]
+    M = M[np.diff(M.indptr) > 0,:]
+    M.sort_indices()
+
+    if format == 'coo':
+        M = M.tocoo()
+    elif format == 'csc':
+        M = M.tocsc()
+
+    return M, rows
+
+def NodeOrderingScheme(perm):
+    """
+    This function re-labels the free degree of freedom following the given
+    Node ordering, i.e., the free degree of freedom of the Node perm[0] are 
+    numbered first, then the ones of perm[1], and so on. The degree of 
+    freedom of each Node are kept contiguous (interleaved per Node).\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    perm : array
+        The Node rows (see getDofs) in the new order
+
+    Output
+    -------
+    None
+    """
+    #Array-backed Nodes
+    nodes = GetNodeStorage()
+    _, _, free, _ = nodes.getDofs()
+
+    #Degree of freedom positions in the new Node order
+    index = nodes.getDofIndex(perm)
+
+    #New-Free degree-of-freedom numbering.
+    dofs = free[index]
+    mask = dofs > -1
+    dofs[mask] = np.arange(np.count_nonzero(mask))
+    free[index] = dofs
+
+    #Assign the Free degree-of-freedom numbering.
+    CommitNodeStorage(nodes)
+
+def NestedDissection(G, idx=None):
+    """
+    This function computes the (native) Nested-Dissection ordering of a graph.
+    The graph is recursively bisected using the level structure rooted at a
+    pseudo-peripheral vertex, where the median level is the separator that is
+    numbered after the two halves. Small sub-graphs are ordered using the 
+    reverse CutHill-McKee ordering.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    G : scipy.sparse
+        The (n x n) symmetric adjacency graph in csr format
+    idx : array
+        The original vertex of each vertex in G (None for all)
+
+    Output
+    -------
+    perm : array
+        The vertex permutation, i.e., perm[k] is the k-th vertex to be numbered
+    """
+    if idx is None:
+        idx = np.arange(G.shape[0])
+
+    #Small graphs are not bisected
+    if len(idx) <= DissectionLeaf:
+        return idx[sps.csgraph.reverse_cuthill_mckee(G, True)]
+
+    #Level structure rooted at a pseudo-peripheral vertex
+    root = int(np.argmin(np.diff(G.indptr)))
+    for k in range(2):
+        level = sps.csgraph.shortest_path(G, directed=False, unweighted=True, indices=root)
+        reached = np.isfinite(level)
+        root = int(np.argmax(np.where(reached, level, -1)))
+
+    #The separator is the smallest level that splits the reached vertices in
+    #two (balanced) parts, i.e., each part has at least a third of the vertices
+    depth = level[reached].astype(int)
+    if depth.max() < 2:
+        return idx[sps.csgraph.reverse_cuthill_mckee(G, True)]
+    size = np.bincount(depth)
+    below = np.cumsum(size) - size
+    above = len(idx) - below - size
+    balanced = np.flatnonzero((np.minimum(below, above) >= len(idx)/3)[1:-1]) + 1
+    if len(balanced):
+        split = int(balanced[np.argmin(size[balanced])])
+    else:
+        split = min(max(int(np.searchsorted(below + size, len(depth)/2)), 1), depth.max() - 1)
+
+    S = reached & (level == split)
+    A = reached & (level < split)
+    B = ~(A | S)
+
+    #Numbers both halves first and the separator last
+    A = np.flatnonzero(A)
+    B = np.flatnonzero(B)
+    pA = NestedDissection(G[A,:][:,A].tocsr(), idx[A])
+    pB = NestedDissection(G[B,:][:,B].tocsr(), idx[B])
+
+    return np.concatenate((pA, pB, idx[S]))
+
+def MinimumDegree(G):
+    """
+    This function computes the Minimum-Degree ordering of a graph using the
+    multiple minimum degree (MMD) ordering of SuperLU on the structure of 
+    G + G^T. The incomplete factorization drops every off-diagonal entry, so
+    only the column ordering is computed.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    G : scipy.sparse
+        The (n x n) symmetric adjacency graph in csr format
+
+    Output
+    -------
+    perm : array
+        The vertex permutation, i.e., perm[k] is the k-th vertex to be numbered
+    """
+    n = G.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=int)
+
+    #Diagonally dominant matrix with the structure of G
+    A = G.astype(float)
+    A.setdiag(0.0)
+    A = (A + sps.diags(np.asarray(A.sum(axis=1)).ravel() + 1.0)).tocsc()
+
+    #Column ordering computed by SuperLU
+    LU = sla.spilu(A, drop_tol=DropTolerance, fill_factor=1, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0, options=dict(SymmetricMode=True))
+
+    return np.argsort(LU.perm_c, kind='stable')
+
+def ApproximateMinimumDegree(M):
+    """
+    This function computes the Approximate Minimum-Degree ordering of a graph 
+    G = M^T*M using the column approximate minimum degree (COLAMD) ordering 
+    of SuperLU on the Element-Node incidence M, i.e., the Elements are the 
+    cliques of G and the graph itself is never formed. The incidence is made
+    square with a maximum matching of its rows and columns, where unmatched
+    columns get a row of their own and unmatched rows get a column that is 
+    dropped from the ordering.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    M : scipy.sparse
+        The (m x n) boolean Element-Node incidence in csr format
+
+    Output
+    -------
+    perm : array
+        The vertex permutation, i.e., perm[k] is the k-th vertex to be numbered
+    """
+    m, n = M.shape
+    if n == 0:
+        return np.zeros(0, dtype=int)
+
+    #Matched column of each row (-1 if unmatched)
+    match = sps.csgraph.maximum_bipartite_matching(M, perm_type='column')
+    used = np.zeros(n, dtype=bool)
+    used[match[match > -1]] = True
+    urows = np.flatnonzero(match < 0)
+    ucols = np.flatnonzero(~used)
+
+    #Square incidence: each row is placed at its matched column
+    N = n + len(urows)
+    place = match.copy()
+    place[urows] = n + np.arange(len(urows))
+    place = np.concatenate((place, ucols))
+
+    M = M.tocoo()
+    I = place[np.concatenate((M.row, m + np.arange(len(ucols)), urows))]
+    J = np.concatenate((M.col, ucols, n + np.arange(len(urows))))
+
+    #The matched entries are in the diagonal and dominate each column
+    A = sps.csc_matrix((np.where(I == J, 2.0*m, 1.0), (I, J)), shape=(N,N))
+
+    #Column ordering computed by SuperLU
+    LU = sla.spilu(A, drop_tol=DropTolerance, fill_factor=1, permc_spec='COLAMD', diag_pivot_thresh=0.0)
+    perm = np.argsort(LU.perm_c, kind='stable')
+
+    return perm[perm < n]
+
+def MetisNestedDissection(G):
+    """
+    This function computes the Nested-Dissection ordering of a graph using the
+    ndmetis program of METIS - Serial Graph Partitioning by George Karypis,
+    which must be placed next to mpmetis (see Options['metispath']).\n
+    @visit  http://glaros.dtc.umn.edu/gkhome/metis/metis/download\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    G : scipy.sparse
+        The (n x n) symmetric adjacency graph in csr format
+
+    Output
+    -------
+    perm : array
+        The vertex permutation, None if ndmetis is not available
+    """
+    #Path to the METIS nested dissection program
+    ndmetis = os.path.join(os.path.dirname(str(Options['metispath'])), 'ndmetis')
+    if not (os.path.isfile(ndmetis) and os.access(ndmetis, os.X_OK)):
+        return None
+
+    #Creates the Partition folder if it has not
+    dirName = Options['path'] + '/' + 'Partition'
+    if not os.path.exists(dirName):
+        os.mkdir(dirName)
+
+    #The METIS graph (without self-loops) in 1-based numbering
+    G = G.tocsr(copy=True)
+    G.setdiag(False)
+    G.eliminate_zeros()
+    adj = (G.indices + 1).astype(str)
+
+    #Writes the graph for METIS.
+    filePath = dirName + '/' + 'Numbering.out'
+    lines = [str(G.shape[0]) + ' ' + str(G.nnz//2) + '\n']
+    for k in range(G.shape[0]):
+        lines.append(' '.join(adj[G.indptr[k]:G.indptr[k+1]]) + '\n')
+
+    with open(filePath, "w+") as MetisFile:
+        MetisFile.writelines(lines)
+
+    #Executes METIS - Nested Dissection ordering.
+    try:
+        subprocess.check_output([ndmetis, filePath], stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    #The (inverse) permutation of each vertex
+    iperm = np.atleast_1d(np.loadtxt(filePath + '.iperm', dtype=int))
+    return np.argsort(iperm, kind='stable')
+
+def FillInEstimate():
+    """
+    This function estimates the fill-in of the factorization for the current
+    free degree of freedom numbering, i.e., the number of non-zero entries in
+    the Cholesky factor L (lower triangle, diagonal included) and the number 
+    of floating point operations to compute it. The symbolic factorization is
+    performed on the Node adjacency graph, and then expanded to the degree
+    of freedom of each Node.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    None
+
+    Output
+    -------
+    nnz : int
+        The number of non-zero entries in L
+    flops : int
+        The (estimated) number of operations of the factorization
+    """
+    #Gets the Node adjacency graph
+    G, rows = FormNodeGraph('csr')
+
+    #Node ordering given by the current free degree-of-freedom numbering
+    weight, first = NodeFreeNumbering(GetNodeStorage())
+    perm = np.argsort(first[rows], kind='stable')
+    weight = weight[rows[perm]]
+
+    #Permuted graph (upper triangle)
+    G = sps.triu(G[perm,:][:,perm], k=1).tocsr()
+
+    #Symbolic factorization: the structure of column j of L is the union of
+    #its adjacency and the structure of its children in the elimination tree
+    nnz = 0
+    flops = 0
+    pending = {}
+    for j in range(G.shape[0]):
+        struct = [G.indices[G.indptr[j]:G.indptr[j+1]]] + pending.pop(j, [])
+        struct = np.unique(np.concatenate(struct)) if len(struct) > 1 else struct[0]
+        struct = struct[struct > j]
+        if len(struct):
+            pending.setdefault(int(struct[0]), []).append(struct)
+
+        #Dense diagonal block and off-diagonal blocks of the Node
+        w = int(weight[j])
+        c = int(weight[struct].sum())
+        nnz += w*(w + 1)//2 + w*c
+        flops += sum((c + w - i)**2 for i in range(1, w + 1))
+
+    return nnz, flops
+
 def PlainScheme():
     """
     This function assign a Plain Scheme to the degree of freedom of each Node, 
@@ -198,34 +781,32 @@ def PlainScheme():
     -------
     None
     """
-    #Counter Variables
-    count0 = 0
-    count1 = 0
+    #Array-backed Nodes
+    nodes = GetNodeStorage()
+    _, ndof, free, total = nodes.getDofs()
+
+    #Degree of freedom positions from the lowest to the highest Node identifier
+    order = np.argsort(nodes.getTags(), kind='stable')
+    index = nodes.getDofIndex(order)
+
+    #Total degree-of-freedom numbering.
+    total[index] = np.arange(len(index))
+    count0 = len(index)
+
+    #Free degree-of-freedom numbering.
+    dofs = free[index]
+    mask = dofs > -1
+    count1 = int(np.count_nonzero(mask))
+    dofs[mask] = np.arange(count1)
+    free[index] = dofs
+
+    #Number of master degree-of-freedom in constraints
     nConstraintDofs = 0
+    for cTag in dofs[dofs < -1].tolist():
+        nConstraintDofs += len(Entities['Constraints'][cTag]['mtag'])
 
-    #Assign consecutively degree of freedom numbering
-    for nTag in sorted(list(Entities['Nodes'].keys())):
-        ndof = Entities['Nodes'][nTag]['ndof' ]
-        free = Entities['Nodes'][nTag]['freedof' ]
-        total = Entities['Nodes'][nTag]['totaldof']
-
-        #Total degree-of-freedom numbering.
-        for k in range(ndof):
-            total[k] = count0
-            count0 += 1
-
-        #Free degree-of-freedom numbering.
-        for k in range(ndof):
-            if free[k] > -1:
-                free[k] = count1
-                count1 += 1
-            elif free[k] < -1:
-                MasterNodes = Entities['Constraints'][free[k]]['mtag'] 
-                nConstraintDofs += len(MasterNodes)
-
-        #Assign ne Free/Total degree-of-freedom numbering.
-        Entities['Nodes'][nTag]['freedof' ] = free
-        Entities['Nodes'][nTag]['totaldof'] = total
+    #Assign the Free/Total degree-of-freedom numbering.
+    CommitNodeStorage(nodes)
 
     #Write number of Free/Total/Constrained degree-of-freedom.
     Options['nfree'] = count1
@@ -235,9 +816,9 @@ def PlainScheme():
 def MinimumDegreeScheme():
     """
     This function performs the Minimum-Degree ordering Scheme to the free
-    degree of freedom. First compute the Sparse Matrix Pattern, and then
-    computes the permutation vector. Such vector is finally employed to
-    re-label the free-degree-of-freedom.\n
+    degree of freedom. First compute the Node adjacency graph, and then
+    computes the Node permutation vector. Such vector is finally expanded
+    to re-label the free-degree-of-freedom of each Node.\n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2020
 
@@ -249,41 +830,21 @@ def MinimumDegreeScheme():
     -------
     None
     """
-    #Gets the Sparse Matrix to Perform Permutation
-    A = FormSparseMatrix('csc')
+    #Gets the Node adjacency graph to Perform Permutation
+    A, rows = FormNodeGraph('csr')
 
-    #Computes the Permutation Vector for the Matrix
-    lu = sla.splu(A, permc_spec='MMD_ATA')
-    perm = lu.perm_c
+    #Computes the Permutation Vector for the Node graph
+    perm = MinimumDegree(A)
 
-    #The New Free-Degree-Of-Freedom Numbering
-    N = len(perm)
-    I = np.zeros(N, dtype=int)
-    I[perm] = np.arange(0, N, 1)
-
-    #Transform the degree of freedom numbering form Plain to CutHill-McKee
-    for nTag in Entities['Nodes']:
-        ndof = Entities['Nodes'][nTag]['ndof']
-        free = Entities['Nodes'][nTag]['freedof']
-        aux  = np.zeros(ndof, dtype=int)  
-
-        #New-Free degree-of-freedom numbering.
-        for k in range(ndof):
-            if free[k] > -1:
-                aux[k] = I[free[k]]
-            else:
-                aux[k] = free[k]
-
-        #Assign the Free degree-of-freedom numbering.
-        Entities['Nodes'][nTag]['freedof'] = aux
-    print('\x1B[33m ALERT \x1B[0m: The Minimum Degree scheme has not been validated.')
+    #Transform the degree of freedom numbering form Plain to Minimum-Degree
+    NodeOrderingScheme(rows[perm])
 
 def CutHillMcKeeScheme():
     """
     This function performs the CutHill-McKee ordering Scheme to the free
-    degree of freedom. First compute the Sparse Matrix Pattern, and then
-    computes the permutation vector. Such vector is finally employed to
-    re-label the free-degree-of-freedom.\n
+    degree of freedom. First compute the Node adjacency graph, and then
+    computes the Node permutation vector. Such vector is finally expanded
+    to re-label the free-degree-of-freedom of each Node.\n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2020
 
@@ -295,32 +856,120 @@ def CutHillMcKeeScheme():
     -------
     None
     """
-    #Gets the Sparse Matrix to Perform Permutation
-    A = FormSparseMatrix('csr')
+    #Gets the Node adjacency graph to Perform Permutation
+    A, rows = FormNodeGraph('csr')
 
-    #Computes the Permutation Vector for the Matrix
+    #Computes the Permutation Vector for the Node graph
     perm = sps.csgraph.reverse_cuthill_mckee(A, True)
 
-    #The New Free-Degree-Of-Freedom Numbering
-    N = len(perm)
-    I = np.zeros(N, dtype=int)
-    I[perm] = np.arange(0, N, 1)
-
     #Transform the degree of freedom numbering form Plain to CutHill-McKee
-    for nTag in Entities['Nodes']:
-        ndof = Entities['Nodes'][nTag]['ndof']
-        free = Entities['Nodes'][nTag]['freedof']
-        aux  = np.zeros(ndof, dtype=int)  
+    NodeOrderingScheme(rows[perm])
+
+def NestedDissectionScheme():
+    """
+    This function performs the Nested-Dissection ordering Scheme to the free
+    degree of freedom. First compute the Node adjacency graph, and then
+    computes the Node permutation vector using METIS (ndmetis) when it is
+    available or the native recursive bisection otherwise. Such vector is 
+    finally expanded to re-label the free-degree-of-freedom of each Node.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    None
 
-        #New-Free degree-of-freedom numbering.
-        for k in range(ndof):
-            if free[k] > -1:
-                aux[k] = I[free[k]]
-            else:
-                aux[k] = free[k]
+    Output
+    -------
+    None
+    """
+    #Gets the Node adjacency graph to Perform Permutation
+    A, rows = FormNodeGraph('csr')
 
-        #Assign the Free degree-of-freedom numbering.
-        Entities['Nodes'][nTag]['freedof'] = aux
+    #Computes the Permutation Vector for the Node graph
+    perm = MetisNestedDissection(A)
+    if perm is None:
+        perm = NestedDissection(A)
+
+    #Transform the degree of freedom numbering form Plain to Nested-Dissection
+    NodeOrderingScheme(rows[perm])
+
+def ApproximateMinimumDegreeScheme():
+    """
+    This function performs the Approximate Minimum-Degree ordering Scheme to
+    the free degree of freedom. First compute the Element-Node incidence, 
+    and then computes the Node permutation vector. Such vector is finally 
+    expanded to re-label the free-degree-of-freedom of each Node.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    None
+
+    Output
+    -------
+    None
+    """
+    #Gets the Element-Node incidence to Perform Permutation
+    M, rows = FormNodeIncidence('csr')
+
+    #Computes the Permutation Vector for the Node graph M^T*M
+    perm = ApproximateMinimumDegree(M)
+
+    #Transform the degree of freedom numbering form Plain to Approximate Minimum-Degree
+    NodeOrderingScheme(rows[perm])
+
+def PartitionScheme():
+    """
+    This function re-labels the free degree of freedom partition by partition,
+    i.e., the Nodes owned by the first partition are numbered first, then the
+    ones owned by the second partition, and so on. Within each partition the
+    interior Nodes are numbered before the interface Nodes, keeping the order
+    given by the user's numbering scheme. The ownership range of each 
+    partition is stored in Options['ownrange'].\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    None
+
+    Output
+    -------
+    None
+    """
+    #Array-backed Nodes and Elements
+    nodes = GetNodeStorage()
+    elems = GetElementStorage()
+    ptr, conn = elems.getConnectivity()
+    rows = nodes.getRows(conn)
+    nparts = Options['nparts']
+
+    #The Node is owned by the lowest partition of its Elements
+    part = np.repeat(np.asarray(Options['partition'], dtype=int), np.diff(ptr))
+    owner = np.full(len(nodes), nparts, dtype=int)
+    last = np.full(len(nodes), -1, dtype=int)
+    np.minimum.at(owner, rows, part)
+    np.maximum.at(last, rows, part)
+
+    #Interface Nodes belong to Elements of several partitions
+    interface = last > owner
+
+    #Nodes that do not belong to Element (constraint's master) are owned by the first one
+    owner[owner == nparts] = 0
+
+    #Ordering by (owner, interface, current numbering)
+    count, first = NodeFreeNumbering(nodes)
+    active = np.flatnonzero(count)
+    order = np.lexsort((first[active], interface[active], owner[active]))
+
+    #Transform the degree of freedom numbering form Plain to Partition
+    NodeOrderingScheme(active[order])
+
+    #The ownership range of the free degree of freedom of each partition
+    size = np.bincount(owner[active], weights=count[active], minlength=nparts).astype(int)
+    Options['ownrange'] = np.concatenate(([0], np.cumsum(size))).tolist()
 
 #Finds nodes that do not belong elements
 def FindDefectiveNodes():
@@ -339,35 +988,35 @@ def FindDefectiveNodes():
     -------
     None
     """
-    #Memory Storage Variables
-    nLumpedStorage = 0
-    nConsistentStorage = 0
+    #Array-backed Nodes and Elements
+    nodes = GetNodeStorage()
+    elems = GetElementStorage()
+    ptr, conn = elems.getConnectivity()
+    dofptr, ndof, free, _ = nodes.getDofs()
 
     #Identifies Nodes which don't belong to Element.
-    Condition = dict.fromkeys(Entities['Nodes'].keys(), True)
-    for eTag in Entities['Elements']:
-        nDOFelem   = 0
-        connection = Entities['Elements'][eTag]['conn']
-        for conn in connection:
-            Condition[conn] = False
-            nDOFelem += Entities['Nodes'][conn]['ndof']
+    rows = nodes.getRows(conn)
+    Condition = np.ones(len(ndof), dtype=bool)
+    Condition[rows] = False
 
-        nLumpedStorage     += nDOFelem
-        nConsistentStorage += nDOFelem*nDOFelem
+    #Memory Storage Variables
+    nDOFelem = np.add.reduceat(ndof[rows], ptr[:-1]) if len(rows) else np.zeros(0, dtype=int)
+    nLumpedStorage = int(np.sum(nDOFelem))
+    nConsistentStorage = int(np.sum(nDOFelem*nDOFelem))
 
     #Diaphragm, Equal, and General Constraints Nodes are considered non-defective.
-    for cTag in  Entities['Constraints']:
-        mNodes = Entities['Constraints'][cTag]['mtag']
-        for mTag in mNodes:
-            Condition[mTag] = False
+    mTags = [mTag for cTag in Entities['Constraints'] for mTag in Entities['Constraints'][cTag]['mtag']]
+    mRows = nodes.getRows(mTags)
+    Condition[mRows[mRows > -1]] = False
 
     #Fix all Detected Defective Nodes
-    for nTag in Condition:
-        if Condition[nTag]:
-            ndof = Entities['Nodes'][nTag]['ndof']
-            if np.sum(Entities['Nodes'][nTag]['freedof']) != -ndof:
-                Entities['Nodes'][nTag]['freedof'] = np.full(ndof, -1, dtype=int)
-                print('\x1B[33m ALERT \x1B[0m: The Node[' + str(nTag) + '] does not belong to an element. Node will be fixed.')
+    tags = nodes.getTags()
+    for k in np.flatnonzero(Condition):
+        dofs = free[dofptr[k]:dofptr[k+1]]
+        if np.sum(dofs) != -ndof[k]:
+            dofs[:] = -1
+            print('\x1B[33m ALERT \x1B[0m: The Node[' + str(tags[k]) + '] does not belong to an element. Node will be fixed.')
+    CommitNodeStorage(nodes)
 
     #Saves in Options the Matrix Memory Storage 
     Options['nlumped'] = nLumpedStorage
@@ -384,6 +1033,12 @@ def setDegreeOfFreedom(plot=False):
     -------
     None
     """
+    #The numbering is performed over the array-backed Nodes and Elements
+    Nodes = Entities['Nodes']
+    Elements = Entities['Elements']
+    Entities['Nodes'] = GetNodeStorage()
+    Entities['Elements'] = GetElementStorage()
+
     #Detects Point that does not belong to Element
     FindDefectiveNodes()
 
@@ -397,6 +1052,25 @@ def setDegreeOfFreedom(plot=False):
         CutHillMcKeeScheme()
     elif Options['numbering'].upper() == 'MINIMUM DEGREE':
         MinimumDegreeScheme()
+    elif Options['numbering'].upper() == 'NESTED DISSECTION':
+        NestedDissectionScheme()
+    elif Options['numbering'].upper() == 'AMD':
+        ApproximateMinimumDegreeScheme()
+
+    #Numbers the degree of freedom partition by partition
+    if Options['ownership'].upper() == 'PARTITION':
+        PartitionScheme()
+    else:
+        #Contiguous blocks as decided by PETSc
+        N = Options['nparts']
+        M = Options['nfree']
+        size = M//N + (np.arange(N) < M % N)
+        Options['ownrange'] = np.concatenate(([0], np.cumsum(size))).tolist()
+
+    #Estimates the fill-in of the factorization for the final numbering
+    Options['nfillin'] = []
+    if Options['fillin'].upper() == 'YES' and Options['nfree'] > 0:
+        Options['nfillin'] = list(FillInEstimate())
 
     #Gets the Sparse Matrix to Perform Permutation
     if plot:
@@ -406,3 +1080,30 @@ def setDegreeOfFreedom(plot=False):
     #Compute memory storage for Petsc matrix.
     if Options['allocation'] == 'YES':
         PetscAllocation()
+
+    #Restores the dictionaries with the new numbering
+    if Options['storage'].upper() != 'ARRAY':
+        nodes = Entities['Nodes']
+        Entities['Nodes'] = Nodes
+        Entities['Elements'] = Elements
+        CommitNodeStorage(nodes)
+
+def NumberingReport():
+    """
+    This function reports the degree of freedom numbering scheme and the
+    fill-in of the factorization estimated for it (see FillInEstimate), so
+    the numbering can be chosen by comparing the reported values. Nothing is
+    reported unless Options['fillin'] = 'YES'.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Returns
+    -------
+    None
+    """
+    if not Options['nfillin']:
+        return
+
+    nnz, flops = Options['nfillin']
+    print(' ◇ Degree of freedom numbering: %s (%s ownership)' % (Options['numbering'].upper(), Options['ownership'].upper()))
+    print(' |   Estimated factor non-zero: %d (%.2f MB), factorization: %1.3E flops' % (nnz, 12.0*nnz/1048576.0, flops))
@@ -3,15 +3,22 @@
 
 import sys
 import json
+import itertools
 import numpy as np
 from json import JSONEncoder
+from collections.abc import Mapping
+from Core.Storage import NodeView, ElementView
 from Core.Definitions import Entities, Options
 
+#Number of entities serialized at once when streaming a section
+ChunkSize = 4096
+
 class NumpyArrayEncoder(JSONEncoder):
     """
     This simple class allow to serialize numpy multi-dimensional
     arrays when using JSON python module. Essentially it transform
-    a numpy array into a json list.\n
+    a numpy array into a json list. The Node/Element views of the
+    array-backed storage are transformed into dictionaries.\n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2020
     """
@@ -22,14 +29,88 @@ class NumpyArrayEncoder(JSONEncoder):
             return float(obj)
         elif isinstance(obj, np.ndarray):
             return obj.tolist()
+        elif isinstance(obj, Mapping):
+            return dict(obj)
         else:
             return super(JSONEncoder, self).default(obj)
         return JSONEncoder.default(self, obj)
 
-def dict2json(d, fn):
+def ExportChunk(chunk):
+    """
+    This function replaces the Node/Element views of the array-backed storage
+    in a chunk of entities by plain dictionaries gathered in bulk, so that the
+    serialization does not convert each small numpy array separately.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    chunk : dict
+        Group of entities (tag: entity) of a section
+
+    Returns
+    -------
+    dict
+        The same group of entities, with views exported as dictionaries
+    """
+    views = list(chunk.values())
+    if not isinstance(views[0], (NodeView, ElementView)):
+        return chunk
+
+    store = views[0].store
+    if not all(type(view) is type(views[0]) and view.store is store for view in views):
+        return chunk
+    return dict(zip(chunk.keys(), store.getDictionaries([view.tag for view in views])))
+
+def WriteSection(outfile, section, encoder, newline):
     """
-    This function writes a dictionary using JSON format. The serialization
-    used was taken from: https://pynative.com/python-serialize-numpy-ndarray-into-json/\n
+    This function streams a section (dictionary of entities) into the file.
+    The entities are serialized in chunks of ChunkSize, hence the section is
+    never transformed into a single string.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    outfile : file
+        The opened file where the section is written
+    section : dict
+        Dictionary of entities to be transformed into json format
+    encoder : JSONEncoder
+        The encoder that serializes the entities
+    newline : str
+        Line break and indentation of the section key, empty if compact
+
+    Returns
+    -------
+    None
+    """
+    items = iter(section.items())
+    chunk = dict(itertools.islice(items, ChunkSize))
+    if not chunk:
+        outfile.write('{}')
+        return
+
+    outfile.write('{')
+    while chunk:
+        #Serialize the chunk and removes its braces
+        JSONdata = encoder.encode(ExportChunk(chunk))[1:-1]
+        if newline:
+            JSONdata = JSONdata.rstrip('\n').replace('\n', newline)
+        outfile.write(JSONdata)
+
+        chunk = dict(itertools.islice(items, ChunkSize))
+        if chunk:
+            outfile.write(',')
+    outfile.write(newline + '}')
+
+def dict2json(d, fn, compact=None):
+    """
+    This function writes a dictionary using JSON format. Each entry of the
+    dictionary is streamed into the file, and the numpy arrays of the Nodes
+    and Elements are gathered in bulk. The compact format has no indentation
+    and is selected by Options['jsonformat']. The serialization used was taken
+    from: https://pynative.com/python-serialize-numpy-ndarray-into-json/\n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2020
 
@@ -39,14 +120,194 @@ def dict2json(d, fn):
         Dictionary to be transformed into json format
     fn : str
         The full path where the file will be written
+    compact : bool
+        Writes the file without indentation, Options['jsonformat'] if None
 
     Returns
     -------
     None
     """
-    #Serializing json
-    JSONdata = json.dumps(d, cls=NumpyArrayEncoder, indent=4)
+    if compact is None:
+        compact = Options['jsonformat'].upper() == 'COMPACT'
+
+    #Compact files are serialized with the (faster) C encoder
+    if compact:
+        newline, separator = '', ':'
+        encoder = NumpyArrayEncoder(separators=(',', ':'))
+    else:
+        newline, separator = '\n    ', ': '
+        encoder = NumpyArrayEncoder(indent=4)
 
     #Writes the file in json format
-    with open(fn, "w") as outfile: 
-        outfile.write(JSONdata)
\ No newline at end of file
+    with open(fn, "w") as outfile:
+        if not d:
+            outfile.write('{}')
+            return
+
+        outfile.write('{')
+        for k, key in enumerate(d):
+            if k > 0:
+                outfile.write(',')
+            outfile.write(newline + json.dumps(str(key)) + separator)
+            if isinstance(d[key], Mapping):
+                WriteSection(outfile, d[key], encoder, newline)
+            else:
+                outfile.write(encoder.encode(d[key]).replace('\n', newline))
+        outfile.write(newline[:1] + '}')
+
+def Int32Array(values, name):
+    """
+    This function converts an integer array of a partition to the 32-bit 
+    integers of the binary format. An OverflowError is raised if a value is
+    outside the int32 range, so it reaches the caller from a worker too.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    values : array
+        The integer array to be converted
+    name : str
+        The name of the array (used in the error message)
+
+    Returns
+    -------
+    array
+        The values as little-endian 32-bit integers
+    """
+    bounds = np.iinfo(np.int32)
+    if len(values) and (values.max() > bounds.max or values.min() < bounds.min):
+        raise OverflowError('The %s array of the binary partition file has values outside the 32-bit integer range [%d, %d], use Options[\'jsonformat\'] = \'Compact\' or \'Indented\' instead.' % (name, bounds.min, bounds.max))
+    return values.astype('<i4')
+
+def NodeArrays(nodes, ndim):
+    """
+    This function gathers the Nodes of a partition in contiguous arrays. The
+    free and total degree of freedom are concatenated, and the coordinates
+    are stored as a (N,ndim) array.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    nodes : dict
+        The Nodes (tag: node) of the partition
+    ndim : int
+        Number of coordinates of each Node
+
+    Returns
+    -------
+    dict
+        The number of Nodes and the tag, ndof, freedof, totaldof, coords arrays
+    """
+    views = list(nodes.values())
+    tags = np.fromiter(map(int, nodes.keys()), dtype=np.int64, count=len(nodes))
+
+    if views and all(type(view) is NodeView and view.store is views[0].store for view in views):
+        ndof, freedof, totaldof, coords, _ = views[0].store.getArrays([view.tag for view in views], ndim)
+    else:
+        ndof = np.array([node['ndof'] for node in views], dtype=np.int64)
+        freedof = np.concatenate([np.asarray(node['freedof'], dtype=np.int64) for node in views] + [np.empty(0, dtype=np.int64)])
+        totaldof = np.concatenate([np.asarray(node['totaldof'], dtype=np.int64) for node in views] + [np.empty(0, dtype=np.int64)])
+        coords = np.zeros((len(views), ndim))
+        for k, node in enumerate(views):
+            coords[k,:len(node['coords'])] = node['coords']
+
+    return {'count': len(views), 'ndim': ndim, 'tag': Int32Array(tags, 'Node tag'), 'ndof': Int32Array(ndof, 'Node ndof'), 
+        'freedof': Int32Array(freedof, 'Node freedof'), 'totaldof': Int32Array(totaldof, 'Node totaldof'), 'coords': np.ascontiguousarray(coords, dtype='<f8')}
+
+def ElementArrays(elements):
+    """
+    This function gathers the Elements of a partition in contiguous arrays. The
+    connectivity is concatenated, while the class names and (distinct) sets of 
+    attributes are stored in tables referred by an index.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    elements : dict
+        The Elements (tag: element) of the partition
+
+    Returns
+    -------
+    dict
+        The number of Elements, the names and records tables, and the tag, class,
+        nconn, conn, attributes arrays
+    """
+    views = list(elements.values())
+    tags = np.fromiter(map(int, elements.keys()), dtype=np.int64, count=len(elements))
+
+    if views and all(type(view) is ElementView and view.store is views[0].store for view in views):
+        store = views[0].store
+        namecode, nconn, conn, attrid = store.getArrays([view.tag for view in views])
+        names, namecode = np.unique(namecode, return_inverse=True)
+        records, attrid = np.unique(attrid, return_inverse=True)
+        names = [store.names[k] for k in names.tolist()]
+        records = [store.records[k] for k in records.tolist()]
+    else:
+        names, records = dict(), dict()
+        encoder = NumpyArrayEncoder(separators=(',', ':'))
+        namecode = np.array([names.setdefault(elem['name'], len(names)) for elem in views], dtype=np.int64)
+        attrid = np.array([records.setdefault(encoder.encode(elem['attributes']), len(records)) for elem in views], dtype=np.int64)
+        nconn = np.array([len(elem['conn']) for elem in views], dtype=np.int64)
+        conn = np.concatenate([np.asarray(elem['conn'], dtype=np.int64) for elem in views] + [np.empty(0, dtype=np.int64)])
+        names = list(names.keys())
+        records = [json.loads(record) for record in records.keys()]
+
+    return {'count': len(views), 'names': names, 'records': records, 'tag': Int32Array(tags, 'Element tag'), 'class': Int32Array(namecode, 'Element class'),
+        'nconn': Int32Array(nconn, 'Element nconn'), 'conn': Int32Array(conn, 'Element conn'), 'attributes': Int32Array(attrid, 'Element attributes')}
+
+def dict2bin(d, fn):
+    """
+    This function writes a dictionary using a binary format. The Nodes and
+    Elements are written as contiguous little-endian arrays, while the rest
+    of the Entities are written in a (compact) JSON header. The file starts
+    with 'SVLBIN01', the header length (uint64) and the header, the arrays
+    start at the next multiple of 8 bytes and their offsets relative to this
+    position are stored in the header['Binary'] entry.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    d : dict
+        Dictionary to be transformed into binary format
+    fn : str
+        The full path where the file will be written
+
+    Returns
+    -------
+    None
+    """
+    header = {key: d[key] for key in d if key not in ('Nodes', 'Elements')}
+
+    #Gathers the Nodes and Elements arrays
+    blocks = dict()
+    if 'Nodes' in d:
+        blocks['Nodes'] = NodeArrays(d['Nodes'], max(Options['dimension'], 1))
+    if 'Elements' in d:
+        blocks['Elements'] = ElementArrays(d['Elements'])
+
+    #Replaces the arrays by their offset
+    arrays = list()
+    offset = 0
+    for block in blocks.values():
+        for key, array in block.items():
+            if isinstance(array, np.ndarray):
+                block[key] = offset
+                arrays.append(array)
+                offset += 8*((array.nbytes + 7)//8)
+    if blocks:
+        header['Binary'] = blocks
+
+    #Writes the file in binary format
+    JSONdata = json.dumps(header, cls=NumpyArrayEncoder, separators=(',', ':')).encode()
+    with open(fn, "wb") as outfile:
+        outfile.write(b'SVLBIN01')
+        outfile.write(np.array([len(JSONdata)], dtype='<u8').tobytes())
+        outfile.write(JSONdata)
+        outfile.write(bytes(-(16 + len(JSONdata)) % 8))
+        for array in arrays:
+            array.tofile(outfile)
+            outfile.write(bytes(-array.nbytes % 8))
@@ -3,199 +3,947 @@
 
 import os
 import sys
+import heapq
 import subprocess
 import numpy as np
+import scipy.sparse as sps
 from Core.Definitions import Entities, Options
+from Core.Storage import GetNodeStorage, GetElementStorage
+from Core.Outputs import dict2json
+from Core.Spatial import SegmentSum
+from Core.Numberer import FormNodeGraph, NodeFreeNumbering
 
-def most_frequent(List):
-    return max(set(List), key = List.count)
+#Relative computational cost of nonlinear materials and PML elements
+NonlinearCost = 4.0
+PMLCost = 2.0
 
-def CheckPartition(Partition):
+#Accepted load imbalance (max/mean cost) and diffusion refinement sweeps
+BalanceTolerance = 1.05
+DiffusionSweeps = 10
+
+#Maximum number of boundary refinement passes of each graph bisection
+RefinementPasses = 8
+
+#Largest (integer) element weight given to METIS
+MetisWeight = 1000
+
+#Materials whose state is updated (return mapping) at each integration point
+NonlinearMaterials = ('PLASTIC1DJ2', 'PLASTICPLANESTRAINJ2', 'PLASTICPLANESTRAINBA', 'PLASTIC3DJ2', 'PLASTIC3DBA', 'STEEL1DFIBER', 'CONCRETE1DFIBER', 'PLASTIC1DGAP', 'HERTZIAN1DLINEAR')
+
+def Incidence(ptr, rows, nNodes):
+    """
+    This function computes the Element-Node incidence matrix, i.e., the entry
+    (e,n) is one if the Node n belongs to the Element e.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    ptr : array
+        The CSR-style pointer of the Element connectivity
+    rows : array
+        The Element connectivity given as Node rows
+    nNodes : int
+        The number of Nodes
+
+    Returns
+    -------
+    B : scipy.sparse
+        The (nElems x nNodes) incidence matrix in csr format
+    """
+    B = sps.csr_matrix((np.ones(len(rows), dtype=np.int32), rows, ptr), shape=(len(ptr) - 1, nNodes))
+    B.sum_duplicates()
+    B.data[:] = 1
+    return B
+
+def TiedRows(nodes):
+    """
+    This function maps each Node row onto the row of the Node it is tied to
+    by EQUAL constraints (the slave Node goes to its master Node), so the 
+    Nodes coupled through constraints (e.g., PML attached with mergeDomain or
+    setPMLDomain) are treated as a single Node by the domain partition.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    nodes : NodeStorage
+        The array-backed Nodes
+
+    Returns
+    -------
+    tie : array
+        The (tied) row of each Node row
+    """
+    tie = np.arange(len(nodes), dtype=int)
+    slave  = list()
+    master = list()
+    for ctag in Entities['Constraints']:
+        if Entities['Constraints'][ctag]['name'] == 'EQUAL':
+            slave.append(Entities['Constraints'][ctag]['stag'])
+            master.append(Entities['Constraints'][ctag]['mtag'][0])
+    if slave:
+        tie[nodes.getRows(slave)] = nodes.getRows(master)
+
+        #Follows the masters that are tied to other Nodes (pointer jumping)
+        for _ in range(len(tie).bit_length()):
+            root = tie[tie]
+            if np.array_equal(root, tie):
+                break
+            tie = root
+    return tie
+
+def PartitionAdjacency(B, parts, nparts, mask=None):
+    """
+    This function computes the number of Nodes of each Element that are 
+    shared with each partition, i.e., that belong to an Element (in mask) of
+    that partition.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    B : scipy.sparse
+        The (nElems x nNodes) Element-Node incidence matrix
+    parts : array
+        The partition of each Element
+    nparts : int
+        The number of partitions
+    mask : array
+        The Elements that define the partitions (all if None)
+
+    Returns
+    -------
+    A : scipy.sparse
+        The (nElems x nparts) number of shared Nodes in csc format
+    touch : scipy.sparse
+        The (nNodes x nparts) Node-partition incidence in csr format
+    """
+    elems = np.arange(len(parts)) if mask is None else np.flatnonzero(mask)
+    P = sps.csr_matrix((np.ones(len(elems), dtype=np.int32), (elems, parts[elems])), shape=(len(parts), nparts))
+    touch = (B.transpose()*P).tocsr()
+    touch.data[:] = 1
+    A = (B*touch).tocsc()
+    return A, touch
+
+def DiffusionRefinement(B, parts, weights, added, nparts):
+    """
+    This function restores the computational load balance of the partitions
+    using a first-order diffusion scheme, i.e., the load flow between 
+    adjacent partitions solves L*x = load - mean(load), where L is the 
+    Laplacian of the partition graph. Then, the Elements of a partition that
+    are adjacent to the receiving partition migrate, starting with the added
+    Elements. Previously partitioned Elements migrate only up to the fraction
+    Options['migration'] of them.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    B : scipy.sparse
+        The (nElems x nNodes) Element-Node incidence matrix
+    parts : array
+        The partition of each Element
+    weights : array
+        The computational cost of each Element
+    added : array
+        The Elements that have been added (not partitioned before)
+    nparts : int
+        The number of partitions
+
+    Returns
+    -------
+    parts : array
+        The refined partition of each Element
+    """
+    budget = int(Options['migration']*np.count_nonzero(~added))
+
+    for sweep in range(DiffusionSweeps):
+        load = np.bincount(parts, weights=weights, minlength=nparts)
+        if load.max() <= BalanceTolerance*load.mean():
+            break
+
+        #Partition graph and its diffusion flow
+        A, touch = PartitionAdjacency(B, parts, nparts)
+        C = (touch.transpose()*touch).toarray() > 0
+        np.fill_diagonal(C, False)
+        L = np.diag(C.sum(axis=1)) - C
+        x = np.linalg.lstsq(L, load - load.mean(), rcond=None)[0]
+
+        #Migrates boundary Elements along the flow
+        moved = 0
+        count = np.bincount(parts, minlength=nparts)
+        for p, q in zip(*np.nonzero(C)):
+            flow = x[p] - x[q]
+            if flow <= 0.0:
+                continue
+
+            elems = A.indices[A.indptr[q]:A.indptr[q+1]]
+            shared = A.data[A.indptr[q]:A.indptr[q+1]]
+            cand = (parts[elems] == p) & (added[elems] | (budget > 0))
+            elems, shared = elems[cand], shared[cand]
+
+            #Added elements first, then the most connected to q
+            order = np.lexsort((-shared, ~added[elems]))
+            elems = elems[order]
+            w = weights[elems]
+            elems = elems[np.cumsum(w) - 0.5*w < flow]
+
+            #Limits the migration of partitioned elements
+            old = ~added[elems]
+            elems = elems[~old | (np.cumsum(old) <= budget)]
+            elems = elems[:count[p] - 1]
+
+            parts[elems] = q
+            count[p] -= len(elems)
+            count[q] += len(elems)
+            budget -= int(np.count_nonzero(~added[elems]))
+            moved += len(elems)
+
+        if moved == 0:
+            break
+
+    return parts
+
+def CheckPartition(Partition, nodes, elems, weights):
     """
     This function makes the new partition to be consistent to previous
-    one. The idea is too keep the previously clustered elements in the 
-    same partition and new elements are re-distributed among partitions. 
-    Unfortunately, this naive process may generate discontinuity between
-    elements that are clustered.\n
+    one. The previously clustered elements are kept in the same partition,
+    while each new element is moved to the (previous) partition with which
+    it shares most Nodes, including the Nodes tied by EQUAL constraints. 
+    Then, the load balance is restored by diffusion (see 
+    DiffusionRefinement).\n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2021
 
     Parameters
     ----------
     Partition : array 
-        The list/array containing the information
+        The partition of the added Elements
+    nodes : NodeStorage
+        The array-backed Nodes
+    elems : ElementStorage
+        The array-backed Elements
+    weights : array
+        The computational cost of each Element
 
     Returns
     -------
     None
-        Updates the 'partition' fields in Options
+        Updates the 'partition' and 'clustermap' fields in Options
     """
     nparts = Options['nparts']
-    nElems = len(Entities['Elements'])
-
-    if len(Partition) > 0:
-        #if elements are added, distribute them in partitions 
-        kTag = 0
-        elems = dict()
-        nodes = {x: set() for x in range(nparts)}
-        parts = np.zeros(nElems)
-
-        for m, eTag in enumerate(Entities['Elements']):
-            if Options['clustermap'][eTag] != -1:
-                parts[m] = Options['clustermap'][eTag]
-                nodes[parts[m]].update(Entities['Elements'][eTag]['conn'])
-            else:
-                elems[eTag] = m
-                parts[m] = Partition[kTag]
-                Options['clustermap'][eTag] = Partition[kTag]
-                kTag += 1 
-
-        #TODO: This loop is very naive and can be improved. Essentially checks
-        #the nodes of the element added, and see in which partition fits better
-        #Corrects elements in a partition that may have nodes in another
-        for eTag in elems:
-            count =  0
-            pTags = -1
-            nTags = Entities['Elements'][eTag]['conn']
-            for p in nodes:
-                n = len(set(nTags).intersection(nodes[p]))
-                if n > 0 and count < n:
-                    pTags = p
-                    count = n
-            if pTags != -1:
-                 pid = elems[eTag]
-                 parts[pid] = pTags
-                 Options['clustermap'][eTag] = pTags
-
-        Options['partition'] = parts
-    else:
-        #If elements were removed, update partition and clustermap
-        ne = len(Options['partition'])
-        if ne != nElems:
-            kTag = 0
-            cluster = dict()
-            elparts  = np.zeros(nElems)
-            for m, eTag in enumerate(Options['clustermap']):
-                if eTag in Entities['Elements']:
-                    elparts[kTag] = Options['partition'][m]
-                    cluster[eTag] = Options['clustermap'][eTag]
-                    kTag += 1 
-
-            Options['partition' ] = elparts
-            Options['clustermap'] = cluster
-
-def SetMetisInputFile():
-    """
-    This function creates the input file for METIS - Serial Graph Partitioning
-    by George Karypis.\n
+    eTags = elems.getTags().tolist()
+
+    #Previous partition of the Elements (removed Elements are discarded)
+    parts = np.fromiter((Options['clustermap'].get(eTag, -1) for eTag in eTags), dtype=int, count=len(eTags))
+    added = parts == -1
+    parts[added] = Partition
+
+    if nparts > 1 and len(parts) > 0:
+        #Incidence on the tied Nodes (see TiedRows), so the partitions joined
+        #by EQUAL constraints are adjacent
+        ptr, conn = elems.getConnectivity()
+        B = Incidence(ptr, TiedRows(nodes)[nodes.getRows(conn)], len(nodes))
+
+        #Added Elements go to the previous partition that shares most Nodes
+        if np.any(added) and not np.all(added):
+            A, _ = PartitionAdjacency(B, parts, nparts, ~added)
+            A = A[added,:].tocsr()
+            best = np.asarray(A.argmax(axis=1)).ravel()
+            found = np.diff(A.indptr) > 0
+            parts[np.flatnonzero(added)[found]] = best[found]
+
+        #Restores the computational load balance
+        parts = DiffusionRefinement(B, parts, weights, added, nparts)
+
+    Options['partition' ] = parts
+    Options['clustermap'] = dict(zip(eTags, parts.tolist()))
+
+def ElementCost(nodes, elems):
+    """
+    This function estimates the computational cost of each Element, i.e., 
+    the cost of forming its matrices (ndofs^2 x number of integration 
+    points), scaled by NonlinearCost if its material is in NonlinearMaterials 
+    and by PMLCost if it is a PML element. The estimate can be calibrated 
+    with measured timings using Options['costs'] = {name: value}, where name
+    is an Element class (the value replaces the matrix cost) or a Material 
+    name (the value replaces NonlinearCost), or per Element using the 'cost'
+    attribute (the value replaces the estimate).\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    nodes : NodeStorage
+        The array-backed Nodes
+    elems : ElementStorage
+        The array-backed Elements
+
+    Returns
+    -------
+    cost : array
+        The computational cost of each Element in insertion order
+    """
+    costs = {name.upper(): value for name, value in Options['costs'].items()}
+
+    #Matrix forming cost of each Element
+    ptr, conn = elems.getConnectivity()
+    _, ndof, _, _ = nodes.getDofs()
+    ndofs = SegmentSum(ndof[nodes.getRows(conn)], ptr)
+    cost = ndofs.astype(float)**2
+
+    #Integration points and scale factors shared by Elements with the same
+    #class and attributes
+    code, names = elems.getNames()
+    ids, records = elems.getAttributeIds()
+    pairs, inverse = np.unique(np.c_[code, ids], axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+
+    npoints = np.zeros(len(pairs))
+    factor = np.ones(len(pairs))
+    fixed = np.full(len(pairs), np.nan)
+    for k, (c, a) in enumerate(pairs.tolist()):
+        name = names[c].upper()
+        attributes = records[a]
+
+        #Matrix forming cost
+        if name in costs:
+            fixed[k] = costs[name]
+        elif 'np' in attributes:
+            npoints[k] = attributes['np']
+
+        #Material nonlinearity
+        if 'material' in attributes and attributes['material'] in Entities['Materials']:
+            material = Entities['Materials'][attributes['material']]['name'].upper()
+            if material in costs:
+                factor[k] *= costs[material]
+            elif material in NonlinearMaterials:
+                factor[k] *= NonlinearCost
+
+        #Perfectly Matched Layer
+        if name.startswith('PML') and name not in costs:
+            factor[k] *= PMLCost
+
+        #User defined cost
+        if 'cost' in attributes:
+            fixed[k] = attributes['cost']/factor[k]
+
+    #Elements without integration points use their number of Nodes
+    npoints = npoints[inverse]
+    npoints[npoints == 0] = np.diff(ptr)[npoints == 0]
+    cost = np.where(np.isnan(fixed[inverse]), cost*npoints, fixed[inverse])*factor[inverse]
+
+    return cost
+
+def MetisPartition(ptr, conn, centroids, weights, nparts):
+    """
+    This function partitions the Elements using METIS - Serial Graph 
+    Partitioning by George Karypis. The element connectivity (and weights)
+    is written in the Partition/Graph.out file, mpmetis (see 
+    Options['metispath']) is executed, and the element partition is read.\n
     @visit  http://glaros.dtc.umn.edu/gkhome/metis/metis/download\n
     @author George Karypis
 
     Parameters
     ----------
-    Entities : dict 
-        The dictionary containing model's information
+    ptr : array
+        The CSR-style pointer of the Element connectivity
+    conn : array
+        The Element connectivity given as (zero-based) Node rows
+    centroids : array
+        The (nElems, ndim) Element centroid coordinates (not employed)
+    weights : array
+        The computational cost of each Element
+    nparts : int
+        The number of partitions
 
     Returns
     -------
-    file : Graph.out 
-        Element connectivity's of the Serial Graph.
+    Partition : array
+        The partition of each Element
     """
-
-    #Total number of (added) elements
-    nElems = 0
-    for eTag in Entities['Elements']:
-        if eTag not in Options['clustermap']:
-            nElems += 1   
-    
     #Creates the Partition folder if it has not
     dirName  = Options['path'] + '/' + 'Partition'
     if not os.path.exists(dirName):
         os.mkdir(dirName)
 
-    #Creates a Map between Node Tags
-    MetisMap = dict()
-    for k, nTag in enumerate(Entities['Nodes']):
-        MetisMap[nTag] = k+1
-
-    #Assign same Point Tag To Equal Constraints
-    #OBJECTIVE: Make a uniform partition (in paricular if PML are used)
-    #TODO: Be extremely carefull with these lines: 44-48, it gives problem for large models.
-    auxMap = MetisMap.copy()
-    for ctag in Entities['Constraints']:
-        if Entities['Constraints'][ctag]['name'] == 'EQUAL':
-            slave  = Entities['Constraints'][ctag]['stag' ]
-            master = Entities['Constraints'][ctag]['mtag']
-            MetisMap[slave] = auxMap[master[0]]
+    #Integer element weights (only if they are not uniform)
+    nconn = np.diff(ptr)
+    ncon = 0 if np.all(weights == weights[0]) else 1
+    wgts = np.maximum(np.rint(MetisWeight*weights/weights.max()), 1).astype(int)
 
-    #Creates the Partition File
+    #Writes the connectivities of the elements for Metis (one-based).
     MetisPath = dirName + '/' + 'Graph.out'
-    if nElems > 0:
-        MetisFile = open(MetisPath, "w+")
-        MetisFile.write(str(nElems) + '\n')
-
-        #Writes the connectivities of the (added) elements for Metis.
-        for eTag in Entities['Elements']:
-            if eTag not in Options['clustermap']:
-                Options['clustermap'][eTag] = -1
-                connection = Entities['Elements'][eTag]['conn']
-                for conn in connection:
-                    MetisFile.write("%d " % MetisMap[conn])
-                MetisFile.write("\n")
-        MetisFile.close()
-    else:
-        #No elements to be partitioned (empty file is created)
-        open(MetisPath, 'a+').close()
+    graph = conn + 1
+    if ncon:
+        graph = np.insert(graph, ptr[:-1], wgts)
+        nconn = nconn + 1
+        ptr = ptr + np.arange(len(ptr))
+    with open(MetisPath, "w+") as MetisFile:
+        MetisFile.write(str(len(nconn)) + (' 1' if ncon else '') + '\n')
+        if np.all(nconn == nconn[0]):
+            np.savetxt(MetisFile, graph.reshape(len(nconn), -1), fmt='%d', delimiter=' ')
+        else:
+            graph = graph.astype(str)
+            MetisFile.writelines(' '.join(graph[ptr[k]:ptr[k+1]]) + '\n' for k in range(len(nconn)))
+
+    #Executes METIS - Serial Graph Partitioning.
+    try:
+        subprocess.check_output([Options['metispath'], MetisPath, str(nparts)], stderr=subprocess.STDOUT)
+    except subprocess.CalledProcessError as error:
+        message = error.output.decode(errors='replace').strip()
+        print('\x1B[31m ERROR \x1B[0m: The mpmetis program in Options[\'metispath\']=\'%s\' failed (exit status %d) to partition the mesh in %d parts:\n%s' % (Options['metispath'], error.returncode, nparts, message))
+        sys.exit(-1)
+    except OSError as error:
+        print('\x1B[31m ERROR \x1B[0m: The mpmetis program in Options[\'metispath\']=\'%s\' could not be executed: %s' % (Options['metispath'], error))
+        sys.exit(-1)
+
+    #Obtains the partition information
+    Partition = np.fromfile(MetisPath + '.epart.' + str(nparts), dtype=int, sep=' ')
+
+    #Cleans generated auxiliary files
+    for fileName in (MetisPath, MetisPath + '.epart.' + str(nparts), MetisPath + '.npart.' + str(nparts)):
+        if os.path.exists(fileName):
+            os.remove(fileName)
+
+    return Partition
+
+def Bisection(order, weights, nparts, offset):
+    """
+    This function splits the given Elements in two halves, where the first
+    half has the fraction (nparts//2)/nparts of the total cost, and assigns
+    the partitions [offset, offset + nparts) to the halves.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    order : array
+        The Elements in the (bisection) order
+    weights : array
+        The computational cost of each Element in order
+    nparts : int
+        The number of partitions to be assigned
+    offset : int
+        The first partition identifier
 
-def GetMetisOutputFile():
+    Returns
+    -------
+    list
+        The (Elements, number of partitions, offset) of each half
+    """
+    n1 = nparts//2
+    csum = np.cumsum(weights)
+    k = int(np.argmin(np.abs(csum - csum[-1]*n1/nparts))) + 1
+    return [(order[:k], n1, offset), (order[k:], nparts - n1, offset + n1)]
+
+def RCBPartition(ptr, conn, centroids, weights, nparts):
     """
-    This function runs the METIS - Serial Graph Partitioning by George Karypis,
-    and gets the element indexes for each partition.\n
+    This function partitions the Elements using the Recursive Coordinate 
+    Bisection (RCB), i.e., the Elements are recursively split at the (cost)
+    weighted median of their centroid coordinate along the largest dimension.\n
     @visit  https://github.com/SeismoVLAB/SVL\n
-    @author Danilo S. Kusanovic 2020
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    ptr : array
+        The CSR-style pointer of the Element connectivity (not employed)
+    conn : array
+        The Element connectivity given as Node rows (not employed)
+    centroids : array
+        The (nElems, ndim) Element centroid coordinates
+    weights : array
+        The computational cost of each Element
+    nparts : int
+        The number of partitions
 
     Returns
     -------
-    Partition : list 
-        Indexes of the element that belongs to each partition.
+    Partition : array
+        The partition of each Element
     """
-    #Gets information of the mesh
-    filePath = Options['path'] + '/' + 'Partition' + '/' + 'Graph.out'
+    Partition = np.zeros(len(centroids), dtype=int)
+
+    stack = [(np.arange(len(centroids)), nparts, 0)]
+    while stack:
+        idx, n, offset = stack.pop()
+        if n == 1 or len(idx) == 0:
+            Partition[idx] = offset
+            continue
+
+        #Splits along the largest dimension
+        xyz = centroids[idx]
+        axis = int(np.argmax(np.ptp(xyz, axis=0)))
+        order = idx[np.argsort(xyz[:,axis], kind='stable')]
+        stack.extend(Bisection(order, weights[order], n, offset))
+
+    return Partition
+
+def HilbertIndex(centroids, nbits=None):
+    """
+    This function computes the position of each point along the Hilbert 
+    space-filling curve, see J. Skilling, Programming the Hilbert curve, 
+    AIP Conference Proceedings 707 (2004).\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    centroids : array
+        The (n, ndim) point coordinates
+    nbits : int
+        The number of bits of each coordinate (as many as possible if None)
+
+    Returns
+    -------
+    key : array
+        The (integer) Hilbert index of each point
+    """
+    ndim = centroids.shape[1]
+    nbits = nbits if nbits else 62//max(ndim, 1)
+
+    #Quantize the coordinates
+    x0 = centroids.min(axis=0)
+    dx = np.ptp(centroids, axis=0)
+    dx[dx == 0.0] = 1.0
+    scale = float((1 << nbits) - 1)
+    X = [np.floor((centroids[:,i] - x0[i])/dx[i]*scale).astype(np.uint64) for i in range(ndim)]
+
+    #Inverse undo
+    Q = np.uint64(1 << (nbits - 1))
+    while Q > 1:
+        P = Q - np.uint64(1)
+        for i in range(ndim):
+            cond = (X[i] & Q) != 0
+            t = np.where(cond, np.uint64(0), (X[0] ^ X[i]) & P)
+            X[0] = np.where(cond, X[0] ^ P, X[0] ^ t)
+            if i != 0:
+                X[i] = X[i] ^ t
+        Q = Q >> np.uint64(1)
+
+    #Gray encode
+    for i in range(1, ndim):
+        X[i] = X[i] ^ X[i-1]
+    t = np.zeros(len(centroids), dtype=np.uint64)
+    Q = np.uint64(1 << (nbits - 1))
+    while Q > 1:
+        t = np.where((X[ndim-1] & Q) != 0, t ^ (Q - np.uint64(1)), t)
+        Q = Q >> np.uint64(1)
+    for i in range(ndim):
+        X[i] = X[i] ^ t
+
+    #Interleaves the bits of the transposed index
+    key = np.zeros(len(centroids), dtype=np.uint64)
+    for j in range(nbits - 1, -1, -1):
+        for i in range(ndim):
+            key = (key << np.uint64(1)) | ((X[i] >> np.uint64(j)) & np.uint64(1))
+
+    return key
+
+def HilbertPartition(ptr, conn, centroids, weights, nparts):
+    """
+    This function partitions the Elements using the Hilbert space-filling 
+    curve, i.e., the Elements are sorted along the curve passing through 
+    their centroids, and the curve is split in nparts pieces of the same cost.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    ptr : array
+        The CSR-style pointer of the Element connectivity (not employed)
+    conn : array
+        The Element connectivity given as Node rows (not employed)
+    centroids : array
+        The (nElems, ndim) Element centroid coordinates
+    weights : array
+        The computational cost of each Element
+    nparts : int
+        The number of partitions
+
+    Returns
+    -------
+    Partition : array
+        The partition of each Element
+    """
+    order = np.argsort(HilbertIndex(centroids), kind='stable')
+
+    #Splits the curve in pieces with the same cost
+    csum = np.cumsum(weights[order])
+    Partition = np.zeros(len(centroids), dtype=int)
+    Partition[order] = np.minimum(((csum - 0.5*weights[order])*nparts/csum[-1]).astype(int), nparts - 1)
+
+    return Partition
+
+def DualGraph(ptr, conn, ncommon=1):
+    """
+    This function computes the dual graph of the mesh, i.e., two Elements are
+    adjacent if they share at least ncommon Nodes.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    ptr : array
+        The CSR-style pointer of the Element connectivity
+    conn : array
+        The Element connectivity given as Node rows
+    ncommon : int
+        The number of common Nodes to consider two Elements adjacent
+
+    Returns
+    -------
+    G : scipy.sparse
+        The (nElems x nElems) adjacency graph in csr format
+    """
+    B = Incidence(ptr, conn, int(conn.max(initial=-1)) + 1)
+    G = (B*B.transpose()).tocsr()
+
+    #Removes self-loops and Elements that share less than ncommon Nodes
+    G.setdiag(0)
+    G.data[G.data < ncommon] = 0
+    G.eliminate_zeros()
+
+    return G
+
+def BisectionRefinement(S, side, weights, target):
+    """
+    This function reduces the edge cut of a graph bisection using passes of
+    the Fiduccia-Mattheyses heuristic, i.e., the unlocked Element with the
+    highest gain (cut edges removed minus cut edges created) is moved to the
+    other half and locked, even if the gain is negative, as long as the cost
+    of the second half stays within BalanceTolerance of the target. A pass 
+    stops after as many moves without improvement as boundary Elements, and
+    the moves after the smallest edge cut are undone.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    S : scipy.sparse
+        The (n x n) adjacency graph of the bisected Elements in csr format
+    side : array
+        True if the Element belongs to the second half
+    weights : array
+        The computational cost of each Element
+    target : float
+        The cost of the second half
+
+    Returns
+    -------
+    side : array
+        The refined bisection
+    """
+    S = S.copy()
+    S.data[:] = 1
+    indptr, indices = S.indptr, S.indices
+    degree = np.diff(indptr)
+    total = weights.sum()
+    allowed = 0.5*(BalanceTolerance - 1.0)*min(target, total - target)
+    cost = weights.tolist()
+
+    for npass in range(RefinementPasses):
+        #Gain of moving each Element to the other half
+        external = S.dot(side.astype(int))
+        external = np.where(side, degree - external, external)
+        gain = (2*external - degree).tolist()
+
+        #Boundary Elements ordered by gain
+        heap = [(-gain[e], e) for e in np.flatnonzero(external > 0).tolist()]
+        heapq.heapify(heap)
+        limit = len(heap)
+
+        load = float(weights[side].sum())
+        deviation = max(abs(load - target), allowed)
+        half = side.tolist()
+        locked = set()
+        moves = []
+        cut, best, nbest = 0, 0, 0
+        while heap and len(moves) - nbest < limit:
+            g, e = heapq.heappop(heap)
+            if e in locked or -g != gain[e]:
+                continue
+            change = -cost[e] if half[e] else cost[e]
+            if abs(load + change - target) > deviation:
+                continue
+
+            #Moves the Element and updates the gain of its neighbours
+            half[e] = not half[e]
+            load += change
+            cut -= gain[e]
+            locked.add(e)
+            moves.append(e)
+            for u in indices[indptr[e]:indptr[e+1]].tolist():
+                gain[u] += -2 if half[u] == half[e] else 2
+                if u not in locked:
+                    heapq.heappush(heap, (-gain[u], u))
+
+            if cut < best:
+                best, nbest = cut, len(moves)
+
+        #Undoes the moves after the smallest edge cut
+        for e in moves[nbest:]:
+            half[e] = not half[e]
+        side = np.array(half, dtype=bool)
+
+        if nbest == 0:
+            break
+
+    return side
+
+def GraphPartition(ptr, conn, centroids, weights, nparts):
+    """
+    This function partitions the dual graph of the mesh (in memory) using a
+    recursive graph bisection, where each half is grown in breadth-first 
+    order from a pseudo-peripheral Element, and the boundary between halves
+    is then refined (see BisectionRefinement). Since there is no multilevel
+    coarsening, the edge cut is usually larger than the one given by METIS,
+    so it is meant as a fallback when mpmetis is not available.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    ptr : array
+        The CSR-style pointer of the Element connectivity
+    conn : array
+        The Element connectivity given as Node rows
+    centroids : array
+        The (nElems, ndim) Element centroid coordinates (not employed)
+    weights : array
+        The computational cost of each Element
+    nparts : int
+        The number of partitions
+
+    Returns
+    -------
+    Partition : array
+        The partition of each Element
+    """
+    G = DualGraph(ptr, conn)
+    Partition = np.zeros(G.shape[0], dtype=int)
+
+    stack = [(np.arange(G.shape[0]), nparts, 0)]
+    while stack:
+        idx, n, offset = stack.pop()
+        if n == 1 or len(idx) == 0:
+            Partition[idx] = offset
+            continue
+
+        #Breadth-first distance from a pseudo-peripheral Element
+        S = G[idx,:][:,idx]
+        root = int(np.argmin(np.diff(S.indptr)))
+        for k in range(2):
+            level = sps.csgraph.shortest_path(S, directed=False, unweighted=True, indices=root)
+            root = int(np.argmax(np.where(np.isfinite(level), level, -1)))
+
+        #Splits the breadth-first order and refines the boundary between halves
+        order = np.argsort(level, kind='stable')
+        w = weights[idx]
+        (first, n1, offset1), (second, n2, offset2) = Bisection(order, w[order], n, offset)
+        side = np.zeros(len(idx), dtype=bool)
+        side[second] = True
+        side = BisectionRefinement(S, side, w, w.sum()*n2/n)
+
+        stack.extend([(idx[~side], n1, offset1), (idx[side], n2, offset2)])
+
+    return Partition
+
+#Registered domain partition methods, Options['partitioner'] selects one of them
+Partitioners = {
+    'METIS'  : MetisPartition,
+    'GRAPH'  : GraphPartition,
+    'RCB'    : RCBPartition,
+    'HILBERT': HilbertPartition
+}
+
+def GetPartitioner():
+    """
+    This function returns the domain partition method given in 
+    Options['partitioner'] (see Partitioners). If it is METIS and the mpmetis
+    program in Options['metispath'] is not available, the GRAPH partitioner
+    is returned instead.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    str
+        The (upper case) name of the partitioner to be used
+    """
+    name = Options['partitioner'].upper()
+    if name not in Partitioners:
+        print('\x1B[31m ERROR \x1B[0m: The partitioner \'%s\' is not defined in Partitioners (%s).' % (Options['partitioner'], ', '.join(Partitioners)))
+        sys.exit(-1)
+
+    metis = str(Options['metispath'])
+    if name == 'METIS' and not (os.path.isfile(metis) and os.access(metis, os.X_OK)):
+        name = 'GRAPH'
+    return name
+
+def SetDomainPartition():
+    """
+    This function computes the domain decomposition of the Elements that have
+    not been partitioned yet using the method given in Options['partitioner']
+    (see Partitioners), METIS falls back to GRAPH if mpmetis is not available
+    (see GetPartitioner). A method receives the Element connectivity, their
+    centroids, and their computational cost (see ElementCost) as arrays, and
+    returns the partition of each Element.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    None
+        Updates the 'partition' and 'clustermap' fields in Options
+    """
+    #Array-backed Nodes and Elements
+    nodes = GetNodeStorage()
+    elems = GetElementStorage()
+    ptr, conn = elems.getConnectivity()
+    rows = nodes.getRows(conn)
+
+    #Total number of (added) elements
+    eTags = elems.getTags().tolist()
+    added = np.fromiter((eTag not in Options['clustermap'] for eTag in eTags), dtype=bool, count=len(eTags))
+    nElems = int(np.count_nonzero(added))
 
     #Generates the division according to the number of parts
     nparts = Options['nparts']
 
     if nparts > 1:
-        #Command line to be excecuted
-        cmdline = Options['metispath'] + ' \'' + filePath + '\' ' + str(nparts)
-
-        if os.stat(filePath).st_size != 0:
-            #Executes METIS - Serial Graph Partitioning.
-            subprocess.check_output(cmdline, shell=True, stderr=subprocess.DEVNULL)
+        #Domain partition method (METIS requires the mpmetis program)
+        name = GetPartitioner()
+        if name != Options['partitioner'].upper():
+            print('\x1B[33m ALERT \x1B[0m: The mpmetis program was not found in Options[\'metispath\']=\'%s\', the %s partitioner is used instead.' % (Options['metispath'], name))
 
-            #Obtains the partition information
-            Partition = np.loadtxt(filePath + '.epart.' + str(nparts), dtype='int', skiprows=0)
-        else:
-            open(filePath + '.epart.' + str(nparts), 'a+').close()
-            open(filePath + '.npart.' + str(nparts), 'a+').close()
+        #Element computational cost
+        weights = ElementCost(nodes, elems)
 
-            #Obtains the partition information
-            Partition = []   
-    elif nparts == 1:
-        #Generates a unique partition.
-        nElems = len(Entities['Elements'])
+        if nElems > 0:
+            #Connectivity of the (added) elements
+            nconn = np.diff(ptr)
+            sub = np.zeros(nElems + 1, dtype=int)
+            np.cumsum(nconn[added], out=sub[1:])
+            rows = rows[np.repeat(added, nconn)]
 
-        #Element Partition (Useless)
-        open(filePath + '.epart.' + str(nparts), 'a+').close()
+            #Element centroid coordinates
+            coords = nodes.getCoordinates()
+            centroids = np.add.reduceat(coords[rows], sub[:-1], axis=0)/np.diff(sub)[:,None]
 
-        #Node Partition (Useless)
-        open(filePath + '.npart.' + str(nparts), 'a+').close()
+            #Assign same Point Tag To Equal Constraints
+            #OBJECTIVE: Make a uniform partition (in paricular if PML are used)
+            tie = TiedRows(nodes)
 
-        #The partition information
+            #Executes the domain partition method
+            Partition = np.asarray(Partitioners[name](sub, tie[rows], centroids, weights[added], nparts), dtype=int)
+        else:
+            #No elements to be partitioned
+            Partition = np.zeros(0, dtype=int)
+    elif nparts == 1:
+        #Generates a unique partition.
+        weights = np.ones(len(eTags))
         Partition = np.full(nElems, 0, dtype='int')
     else:
         print('\x1B[31m ERROR \x1B[0m: The requested number of partition is not possible.')
         sys.exit(-1)
 
     #Check partition consistency with previous partition
-    CheckPartition(Partition)
+    CheckPartition(Partition, nodes, elems, weights)
+
+    #Computational load balance among partitions
+    if nparts > 1 and len(eTags) > 0:
+        load = np.bincount(Options['partition'], weights=weights, minlength=nparts)
+        print(' ◇ Domain partition (%s) load imbalance (max/mean cost): %1.3f' % (name, load.max()/load.mean()))
+
+def PartitionReport():
+    """
+    This function reports the quality of the domain partition, i.e., the 
+    number of Elements, Nodes, interface Nodes (shared with other partitions
+    or tied by EQUAL constraints to Nodes of other partitions),
+    free degree of freedom, owned rows, matrix non-zero and memory, and the
+    computational cost (see ElementCost) of each partition, the load 
+    imbalance, and the edge cut of the dual graph. The non-zero are the ones
+    computed for the PETSc allocation if Options['allocation'] is 'YES', and
+    they are counted on the Node adjacency graph otherwise (an upper bound
+    when constraints couple some degree of freedom only). The report is 
+    printed and saved in the Partition/<file>.Report.json file, and it is 
+    skipped if there is a single partition.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    None
+    """
+    nparts = Options['nparts']
+    if nparts < 2:
+        return
+    parts = np.asarray(Options['partition'], dtype=int)
+
+    #Array-backed Nodes and Elements
+    nodes = GetNodeStorage()
+    elems = GetElementStorage()
+    ptr, conn = elems.getConnectivity()
+    dofptr, ndof, free, _ = nodes.getDofs()
+    conn = nodes.getRows(conn)
+    tie = TiedRows(nodes)
+    B = Incidence(ptr, conn, len(nodes))
+
+    #Nodes of each partition and nodes shared among partitions, i.e., their
+    #tied Node (see TiedRows) belongs to Elements of several partitions
+    _, touch = PartitionAdjacency(B, parts, nparts)
+    _, tied = PartitionAdjacency(Incidence(ptr, tie[conn], len(nodes)), parts, nparts)
+    shared = (np.diff(tied.indptr)[tie] > 1) & (np.diff(touch.indptr) > 0)
+    touch = touch.tocsc()
+    nfree = SegmentSum(free >= 0, dofptr)
+
+    #Edge cut of the dual graph (Elements coupled by constraints are adjacent)
+    G = sps.triu(DualGraph(ptr, tie[conn]), k=1).tocoo()
+    cut = int(np.count_nonzero(parts[G.row] != parts[G.col]))
+
+    #Matrix non-zero of the rows owned by each partition (AIJ format)
+    ownrange = np.asarray(Options['ownrange'], dtype=int)
+    if len(Options['d_nnz']) == nparts:
+        nnz = np.array([np.sum(np.array(d[0::2])*np.array(d[1::2])) + np.sum(np.array(o[0::2])*np.array(o[1::2])) for d, o in zip(Options['d_nnz'], Options['o_nnz'])], dtype=int)
+    elif len(ownrange) == nparts + 1 and Options['nfree'] > 0:
+        #Non-zero of each free degree of freedom row from its Node row
+        G, grows = FormNodeGraph('csr')
+        count, _ = NodeFreeNumbering(nodes)
+        rownnz = np.zeros(len(ndof), dtype=int)
+        rownnz[grows] = G.astype(int).dot(count[grows])
+        mask = free > -1
+        row = np.repeat(np.arange(len(ndof)), ndof)[mask]
+        owner = np.searchsorted(ownrange, free[mask], side='right') - 1
+        nnz = np.bincount(owner, weights=rownnz[row], minlength=nparts).astype(int)
+    else:
+        nnz = np.zeros(nparts, dtype=int)
+    rows = np.diff(ownrange) if len(ownrange) == nparts + 1 else np.zeros(nparts, dtype=int)
+
+    #Computational load balance among partitions
+    load = np.bincount(parts, weights=ElementCost(nodes, elems), minlength=nparts)
+
+    report = {'partitioner': GetPartitioner(), 'nparts': nparts, 'edgecut': cut, 'interface': int(np.count_nonzero(shared)), 'imbalance': float(load.max()/load.mean()), 'partitions': []}
+
+    print(' ◇ Domain partition quality:')
+    for k in range(nparts):
+        nTags = touch.indices[touch.indptr[k]:touch.indptr[k+1]]
+        partition = {
+            'elements' : int(np.count_nonzero(parts == k)),
+            'nodes'    : int(len(nTags)),
+            'interface': int(np.count_nonzero(shared[nTags])),
+            'dofs'     : int(np.sum(nfree[nTags])),
+            'rows'     : int(rows[k]),
+            'nonzero'  : int(nnz[k]),
+            'memory'   : 12.0*nnz[k]/1048576.0,
+            'cost'     : float(load[k])
+        }
+        report['partitions'].append(partition)
+        print(' |   Partition[%d]: %d elements, %d nodes (%d interface), %d free dofs (%d owned rows), %d non-zero (%.2f MB), cost %1.3E' 
+            % (k, partition['elements'], partition['nodes'], partition['interface'], partition['dofs'], partition['rows'], partition['nonzero'], partition['memory'], partition['cost']))
+    print(' |   Edge cut: %d, interface nodes: %d, load imbalance (max/mean cost): %1.3f' % (report['edgecut'], report['interface'], report['imbalance']))
+
+    #Writes the report next to the partition files
+    dict2json(report, Options['path'] + '/' + 'Partition' + '/' + Options['file'] + '.Report.json')
@@ -5,7 +5,7 @@ import os
 import time
 import numpy as np
 from scipy import signal
-import concurrent.futures
+import multiprocessing
 
 from scipy import interpolate
 
@@ -16,6 +16,9 @@ from scipy import integrate
 from Core.Utilities import *
 from Core.Definitions import *
 
+#The DRM field computed by the workers (inherited when forked)
+DRMTask = dict()
+
 def GetDerivative(f, dx):
     """
     This function computes the numerical derivative of a time series\n
@@ -317,6 +320,81 @@ def WriteDRMFile(filepath, filename, fTag, Disp, Vels, Accel, nt, nc, n, option)
             DRMfile.write("%E %E %E %E %E %E %E %E %E\n" % (Disp[k,0], Disp[k,1], Disp[k,2], Vels[k,0], Vels[k,1], Vels[k,2], Accel[k,0], Accel[k,1], Accel[k,2]))
     DRMfile.close()
 
+def WriteDRMBatch(batch):
+    """
+    This function computes the background field of a batch of DRM Nodes using
+    the arguments in DRMTask, and writes their *.drm files. It is executed by
+    the workers (see Options['nworkers']) that inherit DRMTask when forked, 
+    hence the interface solutions are not transferred for each Node.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    batch : range
+        The positions of the Nodes in DRMTask['nodes']
+
+    Returns
+    -------
+    int
+        The number of DRM files written
+    """
+    field = DRMTask['field']
+    for k in batch:
+        n = DRMTask['nodes'][k]
+        U, V, A = field(DRMTask['coords'][k])
+        WriteDRMFile(DRMTask['path'], DRMTask['name'], DRMTask['fTag'], U, V, A, DRMTask['nt'], DRMTask['nc'], n, DRMTask['conditions'][k])
+    return len(batch)
+
+def RunDRMTask(field, nodes, conditions, filepath, filename, fTag, nt, nc):
+    """
+    This function computes and writes the DRM files of all Nodes. The Nodes are
+    split in batches that are processed by Options['nworkers'] forked workers,
+    each one computing the background field of its Nodes.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    field : function
+        Returns the displacement, velocity, and acceleration time series for
+        the given Node coordinates
+    nodes : array
+        The DRM nodes list provided by the user
+    conditions : array
+        The DRM node condition (0: interior, 1: exterior)
+    filepath  : str
+        The path where the DRM files will be written
+    filename  : str
+        The DRM file name
+    fTag  : int
+        The function tag in Entities
+    nt  : int
+        The number of time steps in the time series
+    nc  : int
+        The number of DRM columns to be written (2D: 6, 3D: 9)
+
+    Returns
+    -------
+    None
+    """
+    coords = [Entities['Nodes'][n]['coords'] for n in nodes]
+    DRMTask.update({'field': field, 'nodes': nodes, 'coords': coords, 'conditions': conditions, 
+        'path': filepath, 'name': filename, 'fTag': fTag, 'nt': nt, 'nc': nc})
+
+    #Batches of Nodes (several per worker to balance the load)
+    nworkers = getNumberOfWorkers(len(nodes))
+    size = max(-(-len(nodes)//(4*nworkers)), 1)
+    batches = [range(k, min(k + size, len(nodes))) for k in range(0, len(nodes), size)]
+
+    if nworkers > 1:
+        with multiprocessing.get_context('fork').Pool(nworkers) as pool:
+            pool.map(WriteDRMBatch, batches)
+    else:
+        for batch in batches:
+            WriteDRMBatch(batch)
+    DRMTask.clear()
+
 def GetKofLayer(k,p,s,h,mu,aSP):
     """
     This function calculates the K00 and K01 components of the stiffness matrix
@@ -1439,13 +1517,12 @@ def GenerateDRMFiles():
                         aInterface = SoilInterfaceResponse(afull, wVec, p, s, h, mu, aSP, phaseVelIn, sinTheta, N)
 
                         x0 = xmin[0]
-                        with concurrent.futures.ProcessPoolExecutor() as executor:
-                            for k, n in enumerate(nodes):
-                                x = Entities['Nodes'][n]['coords']
-                                U = PSVbackground2Dfield(uInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, sinTheta, N, Nt, x0, x[0], x[1])
-                                V = PSVbackground2Dfield(vInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, sinTheta, N, Nt, x0, x[0], x[1])
-                                A = PSVbackground2Dfield(aInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, sinTheta, N, Nt, x0, x[0], x[1])
-                                executor.submit(WriteDRMFile, dirName, funName, fTag, U, V, A, nt, 6, n, conditions[k])
+                        def field(x):
+                            U = PSVbackground2Dfield(uInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, sinTheta, N, Nt, x0, x[0], x[1])
+                            V = PSVbackground2Dfield(vInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, sinTheta, N, Nt, x0, x[0], x[1])
+                            A = PSVbackground2Dfield(aInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, sinTheta, N, Nt, x0, x[0], x[1])
+                            return U, V, A
+                        RunDRMTask(field, nodes, conditions, dirName, funName, fTag, nt, 6)
                     elif waveType == 'RH':
                         #Unpack Layer information
                         fun    = Entities['Functions'][fTag]['attributes']
@@ -1481,13 +1558,12 @@ def GenerateDRMFiles():
                         interpuMmodeShape = interpolate.RectBivariateSpline(yGridModeShape,2.0*np.pi*fDispersion, uModeShape)
                         interpvMmodeShape = interpolate.RectBivariateSpline(yGridModeShape,2.0*np.pi*fDispersion, vModeShape)
 
-                        with concurrent.futures.ProcessPoolExecutor() as executor:
-                            for k, n in enumerate(nodes):
-                                x = Entities['Nodes'][n]['coords']  
-                                U = RHbackground2Dfield(FFTdisp, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, x[0], x[1], Nt, xmin[0], x0[1])
-                                V = RHbackground2Dfield(FFTvels, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, x[0], x[1], Nt, xmin[0], x0[1])
-                                A = RHbackground2Dfield(FFTaccel, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, x[0], x[1], Nt, xmin[0], x0[1])
-                                executor.submit(WriteDRMFile, dirName, funName, fTag, U, V, A, Nt, 6, n, conditions[k])
+                        def field(x):
+                            U = RHbackground2Dfield(FFTdisp, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, x[0], x[1], Nt, xmin[0], x0[1])
+                            V = RHbackground2Dfield(FFTvels, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, x[0], x[1], Nt, xmin[0], x0[1])
+                            A = RHbackground2Dfield(FFTaccel, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, x[0], x[1], Nt, xmin[0], x0[1])
+                            return U, V, A
+                        RunDRMTask(field, nodes, conditions, dirName, funName, fTag, Nt, 6)
                     else:
                         print('\x1B[31m ERROR \x1B[0m: The specified PLANEWAVE (2D) option (=%s) is not recognized' % funOption)
                 elif Options['dimension'] == 3:
@@ -1522,22 +1598,20 @@ def GenerateDRMFiles():
                         aInterface = SoilInterfaceResponse(afull, wVec, p, s, h, mu, aSP, phaseVelIn, sinTheta, N)
 
                         x0 = xmin[0]*di[0] + xmin[0]*di[1]
-                        with concurrent.futures.ProcessPoolExecutor() as executor:
-                            for k, n in enumerate(nodes):
-                                x = Entities['Nodes'][n]['coords']  
-                                U = PSVbackground3Dfield(uInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, di, sinTheta, N, Nt, x0, x[0], x[1], x[2])
-                                V = PSVbackground3Dfield(vInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, di, sinTheta, N, Nt, x0, x[0], x[1], x[2])
-                                A = PSVbackground3Dfield(aInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, di, sinTheta, N, Nt, x0, x[0], x[1], x[2])
-                                executor.submit(WriteDRMFile, dirName, funName, fTag, U, V, A, nt, 9, n, conditions[k])
+                        def field(x):
+                            U = PSVbackground3Dfield(uInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, di, sinTheta, N, Nt, x0, x[0], x[1], x[2])
+                            V = PSVbackground3Dfield(vInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, di, sinTheta, N, Nt, x0, x[0], x[1], x[2])
+                            A = PSVbackground3Dfield(aInterface, layers, wVec, p, s, h, mu, aSP, phaseVelIn, di, sinTheta, N, Nt, x0, x[0], x[1], x[2])
+                            return U, V, A
+                        RunDRMTask(field, nodes, conditions, dirName, funName, fTag, nt, 9)
                     elif waveType == 'SH':
                         #TODO: Complete SH case in 3D
-                        with concurrent.futures.ProcessPoolExecutor() as executor: 
-                            for k, n in enumerate(nodes):
-                                x = Entities['Nodes'][n]['coords']
-                                U = SHbackground3Dfield(Disp, t, x, x0, xmin, di, nt, fTag)
-                                V = SHbackground3Dfield(Vels, t, x, x0, xmin, di, nt, fTag)
-                                A = SHbackground3Dfield(Accel, t, x, x0, xmin, di, nt, fTag)
-                                executor.submit(WriteDRMFile, dirName, funName, fTag, U, V, A, nt, 9, n, conditions[k])
+                        def field(x):
+                            U = SHbackground3Dfield(Disp, t, x, x0, xmin, di, nt, fTag)
+                            V = SHbackground3Dfield(Vels, t, x, x0, xmin, di, nt, fTag)
+                            A = SHbackground3Dfield(Accel, t, x, x0, xmin, di, nt, fTag)
+                            return U, V, A
+                        RunDRMTask(field, nodes, conditions, dirName, funName, fTag, nt, 9)
                     elif waveType == 'RH':
                         #Unpack Layer information
                         fun    = Entities['Functions'][fTag]['attributes']
@@ -1573,13 +1647,12 @@ def GenerateDRMFiles():
                         interpuMmodeShape = interpolate.RectBivariateSpline(yGridModeShape,2.0*np.pi*fDispersion, uModeShape)
                         interpvMmodeShape = interpolate.RectBivariateSpline(yGridModeShape,2.0*np.pi*fDispersion, vModeShape)
 
-                        with concurrent.futures.ProcessPoolExecutor() as executor:
-                            for k, n in enumerate(nodes):
-                                x = Entities['Nodes'][n]['coords']
-                                U = RHbackground3Dfield(FFTdisp, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, di, x[0], x[1], x[2], Nt, xmin[0], xmin[1], x0[2])
-                                V = RHbackground3Dfield(FFTvels, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, di, x[0], x[1], x[2], Nt, xmin[0], xmin[1], x0[2])
-                                A = RHbackground3Dfield(FFTaccel, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, di, x[0], x[1], x[2], Nt, xmin[0], xmin[1], x0[2])
-                                executor.submit(WriteDRMFile, dirName, funName, fTag, U, V, A, nt, 9, n, conditions[k])
+                        def field(x):
+                            U = RHbackground3Dfield(FFTdisp, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, di, x[0], x[1], x[2], Nt, xmin[0], xmin[1], x0[2])
+                            V = RHbackground3Dfield(FFTvels, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, di, x[0], x[1], x[2], Nt, xmin[0], xmin[1], x0[2])
+                            A = RHbackground3Dfield(FFTaccel, wVec, interpDispersion, interpuMmodeShape, interpvMmodeShape, di, x[0], x[1], x[2], Nt, xmin[0], xmin[1], x0[2])
+                            return U, V, A
+                        RunDRMTask(field, nodes, conditions, dirName, funName, fTag, nt, 9)
                     else:
                         print('\x1B[31m ERROR \x1B[0m: The specified PLANEWAVE (3D) option (=%s) is not recognized' % funOption)
                 else:
@@ -5,6 +5,8 @@ import os
 import sys
 import math
 import copy
+import time
+import multiprocessing
 import numpy as np
 from Method.Attach import *
 from Method.Remove import *
@@ -13,6 +15,10 @@ from Method.Builder import *
 from Method.Compute import *
 from Parser.Formats import *
 from Core.Outputs import *
+from Core.Cache import *
+from Core.Storage import *
+from Core.Structured import *
+from Core.Spatial import *
 from Core.Utilities import *
 from Core.Numberer import *
 from Core.Partition import *
@@ -46,7 +52,56 @@ def createFolders():
             if not os.path.exists(dirName):
                 os.mkdir(dirName)
 
-def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain, conSubdomain, elemSubdomain, surfSubdomain, k, combo):
+def GroupByPartition(tags, rows, ptr, parts, nparts, first=False):
+    """
+    This function distributes a list of tags among the partitions, where the
+    partitions of the tag in row r are parts[ptr[r]:ptr[r+1]].\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    tags : list
+        The tags to be distributed
+    rows : array
+        The row of each tag (-1 if it does not exist)
+    ptr : array
+        The CSR-style pointer of the partitions of each row
+    parts : array
+        The partitions of each row in ascending order
+    nparts : int
+        The number of partitions
+    first : bool
+        If the tag is assigned only to its first partition
+
+    Returns
+    -------
+    list
+        The (sorted) tags that belong to each partition
+    """
+    tags = np.asarray(tags, dtype=np.int64)
+    rows = np.asarray(rows, dtype=np.int64)
+    tags, rows = tags[rows >= 0], rows[rows >= 0]
+
+    #Expands each tag to its partitions
+    n = ptr[rows + 1] - ptr[rows]
+    if first:
+        n = np.minimum(n, 1)
+    gather = np.repeat(ptr[rows] - np.cumsum(n) + n, n) + np.arange(np.sum(n))
+    part = parts[gather]
+    tags = np.repeat(tags, n)
+
+    #Sorts by partition and tag, and removes repeated tags
+    order = np.lexsort((tags, part))
+    part, tags = part[order], tags[order]
+    unique = np.ones(len(tags), dtype=bool)
+    unique[1:] = (part[1:] != part[:-1]) | (tags[1:] != tags[:-1])
+    part, tags = part[unique], tags[unique]
+
+    bounds = np.searchsorted(part, np.arange(nparts + 1))
+    return [tags[bounds[k]:bounds[k+1]].tolist() for k in range(nparts)]
+
+def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain, suppSubdomain, conSubdomain, elemSubdomain, surfSubdomain, dampSubdomain, loadSubdomain, recSubdomain, k, combo):
     """
     This function creates a dictionary that holds all information required to
     be written in the k-th processor  
@@ -61,12 +116,22 @@ def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain,
         The section indexes that belongs to the k-th partition
     nodeSubdomain : list
         The node indexes that belongs to the k-th partition
+    massSubdomain : list
+        The point mass indexes that belongs to the k-th partition
+    suppSubdomain : list
+        The support motion indexes that belongs to the k-th partition
     conSubdomain  : list
         The constraint indexes that belongs to the k-th partition
     elemSubdomain : list
         The material indexes that belongs to the k-th partition
     surfSubdomain : list
         The surface indexes that belongs to the k-th partition
+    dampSubdomain : dict
+        The element indexes of each damping in the k-th partition
+    loadSubdomain : dict
+        The node/element/surface indexes of each load in the k-th partition
+    recSubdomain  : dict
+        The node/element indexes of each recorder in the k-th partition
     k : int
         The processor (partition) number
 
@@ -116,15 +181,11 @@ def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain,
         ToProcessor['Nodes'][str(tag)] = Entities['Nodes'][tag]
 
     #Gets the point masses for this partition
-    nTags = sorted(massSubdomain.intersection(nodeSubdomain))
-    for tag in nTags:
+    for tag in massSubdomain:
         ToProcessor['Masses'][str(tag)] = copy.deepcopy(Entities['Masses'][tag])
-        massSubdomain.remove(tag)
 
     #Gets the support motions for this partition
-    sTags = set(Entities['Supports'].keys())
-    nTags = sorted(sTags.intersection(nodeSubdomain))
-    for tag in nTags:
+    for tag in suppSubdomain:
         ToProcessor['Supports'][str(tag)] = Entities['Supports'][tag]
 
     #Gets the constraints for this partition
@@ -142,7 +203,6 @@ def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain,
     for tag in elemSubdomain:
         ToProcessor['Elements'][str(tag)] = Entities['Elements'][tag]
         Options['nparaview'] += (len(Entities['Elements'][tag]['conn']) + 1)
-    Options['nfeatures'] += Options['nparaview']
 
     #Gets the surfaces for this partition
     for sTag in surfSubdomain:
@@ -151,18 +211,15 @@ def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain,
         ToProcessor['Surfaces'][str(sTag)] = {'element': eTag, 'face': face}
 
     #Gets the dampings for this partition
-    for dTag in Entities['Dampings']:
-        eTag = list(set(elemSubdomain).intersection(Entities['Dampings'][dTag]['attributes']['list']))
-        if eTag:
-             ToProcessor['Dampings'][str(dTag)] = copy.deepcopy(Entities['Dampings'][dTag])
-             ToProcessor['Dampings'][str(dTag)]['attributes']['list'] = eTag
+    for dTag, eTag in dampSubdomain.items():
+        attributes = dict(Entities['Dampings'][dTag]['attributes'], list=eTag)
+        ToProcessor['Dampings'][str(dTag)] = dict(Entities['Dampings'][dTag], attributes=attributes)
 
     #Gets the loads for this partition
-    loadSubdomain = list()
-    for lTag in Entities['Loads']:
+    for lTag in loadSubdomain:
         name = Entities['Loads'][lTag]['name']
         if name == 'POINTLOAD':
-            nTags = sorted(nodeSubdomain.intersection(Entities['Loads'][lTag]['attributes']['list']))
+            nTags = loadSubdomain[lTag]
             if nTags:
                 fTag  = Entities['Loads'][lTag]['attributes']['fun']
                 ltype = Entities['Loads'][lTag]['attributes']['type']
@@ -176,15 +233,9 @@ def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain,
                     filepath = Entities['Functions'][fTag]['attributes']['file']
                     attributes = {'name': fname, 'type': ltype, 'file': filepath, 'dir': fdir, 'list': nTags}
                     ToProcessor['Loads'][str(lTag)] = {'name': name, 'attributes': attributes}
-                loadSubdomain.append(lTag)
-                Entities['Loads'][lTag]['attributes']['list'] = list(set(Entities['Loads'][lTag]['attributes']['list']).difference(nTags))
         elif name == 'ELEMENTLOAD':
-            #Check the indexes correspond to element or surface
-            if Entities['Loads'][lTag]['attributes']['type'] == 'SURFACE':
-                eTags = sorted(list(set(surfSubdomain).intersection(Entities['Loads'][lTag]['attributes']['list'])))
-            else:
-                eTags = sorted(list(set(elemSubdomain).intersection(Entities['Loads'][lTag]['attributes']['list'])))
-
+            #The indexes correspond to element or surface
+            eTags = loadSubdomain[lTag]
             if eTags:
                 fTag  = Entities['Loads'][lTag]['attributes']['fun']
                 fname = Entities['Functions'][fTag]['name']
@@ -207,13 +258,11 @@ def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain,
                         fdir  = Entities['Functions'][fTag]['attributes']['dir']
                         attributes = {'name': fname, 'type': lname, 'file': filepath, 'dir': fdir, 'list': eTags}
                         ToProcessor['Loads'][str(lTag)] = {'name': name, 'attributes': attributes}
-                loadSubdomain.append(lTag)
         elif name == 'SUPPORTMOTION':
-            nTags = sorted(nodeSubdomain.intersection(Entities['Loads'][lTag]['attributes']['list']))
+            nTags = loadSubdomain[lTag]
             if nTags:
                 attributes = {'list': nTags}
                 ToProcessor['Loads'][str(lTag)] = {'name': name, 'attributes': attributes}
-                loadSubdomain.append(lTag)
 
     #Gets the load combinations for this partition
     for cTag in Entities['Combinations']:
@@ -241,23 +290,17 @@ def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain,
         OUTFILE = OUTFILE.replace(".", '.' + str(k) + '.')
         
         if Entities['Recorders'][rTag]['name'] == 'NODE':
-            nTags = sorted(nodeSubdomain.intersection(Entities['Recorders'][rTag]['list']))
+            nTags = recSubdomain.get(rTag, [])
             if nTags:
-                ToProcessor['Recorders'][str(rTag)] = copy.deepcopy(Entities['Recorders'][rTag])
-                ToProcessor['Recorders'][str(rTag)]['file'] = OUTFILE
-                ToProcessor['Recorders'][str(rTag)]['list'] = nTags.copy()
+                ToProcessor['Recorders'][str(rTag)] = dict(Entities['Recorders'][rTag], file=OUTFILE, list=nTags)
         elif Entities['Recorders'][rTag]['name'] == 'ELEMENT':
-            eTags = sorted(list(set(elemSubdomain).intersection(Entities['Recorders'][rTag]['list'])))
+            eTags = recSubdomain.get(rTag, [])
             if eTags:
-                ToProcessor['Recorders'][str(rTag)] = copy.deepcopy(Entities['Recorders'][rTag])
-                ToProcessor['Recorders'][str(rTag)]['file'] = OUTFILE
-                ToProcessor['Recorders'][str(rTag)]['list'] = eTags.copy()
+                ToProcessor['Recorders'][str(rTag)] = dict(Entities['Recorders'][rTag], file=OUTFILE, list=eTags)
         elif Entities['Recorders'][rTag]['name'] == 'SECTION':
-            eTags = sorted(list(set(elemSubdomain).intersection(Entities['Recorders'][rTag]['list'])))
+            eTags = recSubdomain.get(rTag, [])
             if eTags:
-                ToProcessor['Recorders'][str(rTag)] = copy.deepcopy(Entities['Recorders'][rTag])
-                ToProcessor['Recorders'][str(rTag)]['file'] = OUTFILE
-                ToProcessor['Recorders'][str(rTag)]['list'] = eTags.copy()
+                ToProcessor['Recorders'][str(rTag)] = dict(Entities['Recorders'][rTag], file=OUTFILE, list=eTags)
         elif Entities['Recorders'][rTag]['name'] == 'PARAVIEW':
             OUTFILE = Entities['Recorders'][rTag]['file']
             OUTFILE = OUTFILE.split('.')
@@ -286,6 +329,9 @@ def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain,
             if solver['name'] == 'PETSC':
                 solver['d_nz'] = int(Options['d_nz'][k])
                 solver['o_nz'] = int(Options['o_nz'][k])
+                solver['ownership'] = [int(Options['ownrange'][k]), int(Options['ownrange'][k+1])]
+                solver['d_nnz'] = Options['d_nnz'][k]
+                solver['o_nnz'] = Options['o_nnz'][k]
 
             attributes = {'analysis': analysis, 'algorithm': algorithm, 'integrator': integrator, 'solver': solver}
             ToProcessor['Simulations'] = {'combo': ctag, 'attributes': attributes} 
@@ -297,20 +343,86 @@ def Entities2Processor(matSubdomain, secSubdomain, nodeSubdomain, massSubdomain,
             del ToProcessor[key]
     return ToProcessor
 
-def createPartitions(combo, filename):
+#Arguments of Entities2Processor for each partition file (shared with the workers)
+PartitionTasks = list()
+
+#Entities written in the (shared) mesh file when several combinations are generated
+MeshEntities = ('Global', 'Materials', 'Sections', 'Nodes', 'Masses', 'Supports', 'Constraints', 'Surfaces', 'Elements', 'Dampings')
+
+def WritePartition(n):
+    """
+    This function creates and writes the n-th Run-Analysis file using the
+    arguments in PartitionTasks. If a mesh file is given, the MeshEntities are
+    written in it (if required) and the file only stores the combination 
+    Entities and the name of the mesh file. It is executed by the workers 
+    (see Options['nworkers']) that inherit the model when forked.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    n : int
+        The task number in PartitionTasks
+
+    Returns
+    -------
+    tuple
+        The (task, process id, elapsed seconds, paraview features, written 
+        files), the written files are (filename, digest) if Options['cache']
+        is 'YES'
+    """
+    start = time.time()
+    filename, meshfile, writemesh, args = PartitionTasks[n]
+    k = args[-2]
+
+    #Sets the Entities that belong to this partition
+    ToProcessor = Entities2Processor(*args)
+
+    #Binary partition files are selected by their extension
+    writer = dict2bin if filename.endswith('.bin') else dict2json
+
+    #The files whose content has changed are written
+    files = list()
+    def WriteFile(d, fn):
+        if CacheEnabled():
+            digest = Digest(Options['jsonformat'].upper(), list(d.keys()), *d.values())
+            if UnchangedFile(fn, digest):
+                return
+            files.append((fn, digest))
+        writer(d, fn)
+
+    #Splits the mesh and combination Entities
+    if meshfile:
+        Mesh = {key: ToProcessor.pop(key) for key in MeshEntities if key in ToProcessor}
+        if writemesh:
+            WriteFile(Mesh, str.replace(meshfile, "$", str(k)))
+        ToProcessor = dict({'Mesh': os.path.basename(meshfile)}, **ToProcessor)
+
+    #Writes the partition in separated files
+    WriteFile(ToProcessor, str.replace(filename, "$", str(k)))
+
+    return n, os.getpid(), time.time() - start, Options['nparaview'], files
+
+def createPartitions(combo, filename, meshfile=None):
     """
     This function creates the partitions according with the pattern generated
     during the domain decomposition. Basically, goes over the Entities and 
-    extract the information\n
+    extract the information. If a mesh file is provided, the mesh Entities 
+    are written once in it, and the file of each combination only stores the
+    loads, combination, recorders, and simulation.\n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2020
 
     Parameters
     ----------
-    combo : int
-        The combination identifier for which the simulation is generated
+    combo : int or list
+        The combination identifier(s) for which the simulation is generated
     filename : str
-        The full path to the json file ro be written
+        The full path to the json file ro be written ('#' is replaced by the
+        combination, and '$' by the partition)
+    meshfile : str
+        The full path to the shared mesh json file ('$' is replaced by the
+        partition)
     
     Returns
     -------
@@ -319,30 +431,46 @@ def createPartitions(combo, filename):
     #Creates the required folder
     createFolders()
 
-    #Creates the domain decomposition input files
-    SetMetisInputFile()
-
-    #Reads the generated domain decomposition results
-    GetMetisOutputFile()
-
-    #Creates a load copy
-    dictLoads = copy.deepcopy(Entities['Loads'])
-
-    #Keeps loads in this combination only
-    lTags = Entities['Combinations'][combo]['attributes']['load']
-    LoadCombo = {k: Entities['Loads'][k] for k in lTags}
-    Entities['Loads'] = LoadCombo
-
-    eTags = np.zeros(len(Entities['Elements']), dtype=np.uint32)
-    for k, tag in enumerate(Entities['Elements']):
-        eTags[k] = tag
-
-    massSubdomain = set(Entities['Masses'].keys())
-
-    #Writes the mesh file 
-    for k in range(Options['nparts']):
+    #Loads in the combinations only
+    combos = list(combo) if isinstance(combo, (list, tuple, np.ndarray)) else [combo]
+    lTags = list()
+    for cTag in combos:
+        lTags.extend(lTag for lTag in Entities['Combinations'][cTag]['attributes']['load'] if lTag not in lTags)
+
+    #Array-backed Nodes and Elements
+    nodes = GetNodeStorage()
+    elems = GetElementStorage()
+    ptr, conn = elems.getConnectivity()
+    _, _, free, _ = nodes.getDofs()
+    attrid, records = elems.getAttributeIds()
+    eTags = elems.getTags()
+    nTags = nodes.getTags()
+    rows = nodes.getRows(conn)
+    nconn = np.diff(ptr)
+
+    nparts = Options['nparts']
+    partition = np.asarray(Options['partition'], dtype=int)
+
+    #Elements of each partition (in insertion order)
+    elemOrder = np.argsort(partition, kind='stable')
+    elemBounds = np.searchsorted(partition[elemOrder], np.arange(nparts + 1))
+
+    #Node rows of each partition (sorted)
+    pairs = np.unique(np.repeat(partition, nconn)*len(nTags) + rows)
+    nodePart, nodeRow = np.divmod(pairs, len(nTags))
+    nodeBounds = np.searchsorted(nodePart, np.arange(nparts + 1))
+
+    #Surfaces (sorted by tag) and the partition of their element
+    sTags = np.array(sorted(Entities['Surfaces'].keys()), dtype=np.int64)
+    surfRows = elems.getRows([Entities['Surfaces'][sTag]['etag'] for sTag in sTags.tolist()], strict=False)
+    surfPart = np.where(surfRows >= 0, partition[surfRows], -1)
+
+    #Sets the Entities that belong to each partition
+    Subdomains = list()
+    for k in range(nparts):
         #Element that belong to this partition
-        elemSubdomain = eTags[Options['partition'] == k]
+        elemRows = elemOrder[elemBounds[k]:elemBounds[k+1]]
+        elemSubdomain = eTags[elemRows]
 
         #Check if the partition has Element
         if len(elemSubdomain) == 0:
@@ -351,23 +479,18 @@ def createPartitions(combo, filename):
             sys.exit(-1)
 
         #Nodes that belong to this partition
-        nodeSubdomain = set() 
-        for eTag in elemSubdomain:
-            connection = Entities['Elements'][eTag]['conn']
-            for nTag in connection:
-                nodeSubdomain.add(nTag)
+        nodeRows = nodeRow[nodeBounds[k]:nodeBounds[k+1]]
+        nodeSubdomain = set(nTags[nodeRows].tolist())
 
-        #Materials that belong to this partition
+        #Materials and Sections that belong to this partition
         matSubdomain = set()
-        for eTag in elemSubdomain:
-            if 'material' in Entities['Elements'][eTag]['attributes']:
-                matSubdomain.add(Entities['Elements'][eTag]['attributes']['material']) 
-
-        #Sections that belong to this partition
         secSubdomain = set() 
-        for eTag in elemSubdomain:
-            if 'section' in Entities['Elements'][eTag]['attributes']:
-                sTag = Entities['Elements'][eTag]['attributes']['section']
+        for m in np.unique(attrid[elemRows]):
+            attribute = records[m]
+            if 'material' in attribute:
+                matSubdomain.add(attribute['material']) 
+            if 'section' in attribute:
+                sTag = attribute['section']
                 if Entities['Sections'][sTag]['model'] == 'PLAIN':
                     mTag = Entities['Sections'][sTag]['attributes']['material']
                     matSubdomain.add(mTag)
@@ -377,12 +500,8 @@ def createPartitions(combo, filename):
                 secSubdomain.add(sTag)
 
         #Constraints (Equal, General, Diaphragm) that belong to this partition
-        conSubdomain = set() 
-        for nTag in nodeSubdomain:
-            FreeDofs = Entities['Nodes'][nTag]['freedof']
-            for dof in FreeDofs:
-                if dof < -1:
-                    conSubdomain.add(dof)
+        FreeDofs = free[nodes.getDofIndex(nodeRows)]
+        conSubdomain = set(FreeDofs[FreeDofs < -1].tolist())
 
         #Constraints information must be contained in this partition
         for cTag in conSubdomain:
@@ -391,33 +510,117 @@ def createPartitions(combo, filename):
                 nodeSubdomain.add(mNode)
 
         #Surfaces that belong to this partition
-        surfSubdomain = set() 
-        for sTag in Entities['Surfaces']:
-            eTag = Entities['Surfaces'][sTag]['etag']
-            if eTag in elemSubdomain:
-                surfSubdomain.add(sTag)
-
-        #Sets the Entities that belong to this partition
-        ToProcessor = Entities2Processor(matSubdomain,secSubdomain,nodeSubdomain,massSubdomain,conSubdomain,elemSubdomain,surfSubdomain,k,combo)
-
-        #The file name for this processor/partition
-        filepath = str.replace(filename, "$", str(k))
+        surfSubdomain = set(sTags[surfPart == k].tolist())
+
+        Subdomains.append((matSubdomain, secSubdomain, nodeSubdomain, conSubdomain, elemSubdomain, surfSubdomain))
+
+    #Partitions of each Node (CSR-style, in ascending order)
+    nodePart = np.concatenate([np.full(len(S[2]), k, dtype=int) for k, S in enumerate(Subdomains)])
+    nodeRow = nodes.getRows(np.concatenate([np.fromiter(S[2], dtype=np.int64, count=len(S[2])) for S in Subdomains]))
+    order = np.lexsort((nodePart, nodeRow))
+    nodeParts = nodePart[order]
+    nodePtr = np.zeros(len(nTags) + 1, dtype=int)
+    np.cumsum(np.bincount(nodeRow, minlength=len(nTags)), out=nodePtr[1:])
+
+    #Partition of each Element and Surface (CSR-style)
+    elemPtr = np.arange(len(eTags) + 1)
+    surfPtr = np.zeros(len(sTags) + 1, dtype=int)
+    np.cumsum(surfPart >= 0, out=surfPtr[1:])
+    surfParts = surfPart[surfPart >= 0]
+
+    #Point masses and support motions of each partition
+    massSubdomain = GroupByPartition(list(Entities['Masses'].keys()), nodes.getRows(list(Entities['Masses'].keys()), strict=False), nodePtr, nodeParts, nparts, first=True)
+    suppSubdomain = GroupByPartition(list(Entities['Supports'].keys()), nodes.getRows(list(Entities['Supports'].keys()), strict=False), nodePtr, nodeParts, nparts)
+
+    #Dampings, Loads, and Recorders of each partition
+    dampSubdomain = [dict() for k in range(nparts)]
+    for dTag in Entities['Dampings']:
+        eList = Entities['Dampings'][dTag]['attributes']['list']
+        for k, group in enumerate(GroupByPartition(eList, elems.getRows(eList, strict=False), elemPtr, partition, nparts)):
+            if group:
+                dampSubdomain[k][dTag] = group
 
-        #Writes the partition in separated files
-        dict2json(ToProcessor, filepath)
+    loadGroups = dict()
+    for lTag in lTags:
+        name = Entities['Loads'][lTag]['name']
+        lList = Entities['Loads'][lTag]['attributes']['list']
+        if name == 'POINTLOAD':
+            groups = GroupByPartition(lList, nodes.getRows(lList, strict=False), nodePtr, nodeParts, nparts, first=True)
+        elif name == 'SUPPORTMOTION':
+            groups = GroupByPartition(lList, nodes.getRows(lList, strict=False), nodePtr, nodeParts, nparts)
+        elif name == 'ELEMENTLOAD' and Entities['Loads'][lTag]['attributes']['type'] == 'SURFACE':
+            pos = np.minimum(np.searchsorted(sTags, lList), max(len(sTags) - 1, 0))
+            rows = np.where(sTags[pos] == lList, pos, -1) if len(sTags) else np.full(len(lList), -1)
+            groups = GroupByPartition(lList, rows, surfPtr, surfParts, nparts)
+        elif name == 'ELEMENTLOAD':
+            groups = GroupByPartition(lList, elems.getRows(lList, strict=False), elemPtr, partition, nparts)
+        else:
+            continue
+        loadGroups[lTag] = groups
 
-    #Cleans generated auxiliary files
-    execpath = Options['path'] + '/Partition'
-    os.remove(execpath + '/Graph.out')
-    os.remove(execpath + '/Graph.out.epart.' + str(Options['nparts']))
-    os.remove(execpath + '/Graph.out.npart.' + str(Options['nparts']))
+    recSubdomain = [dict() for k in range(nparts)]
+    for rTag in Entities['Recorders']:
+        name = Entities['Recorders'][rTag]['name']
+        if name == 'NODE':
+            rList = Entities['Recorders'][rTag]['list']
+            groups = GroupByPartition(rList, nodes.getRows(rList, strict=False), nodePtr, nodeParts, nparts)
+        elif name == 'ELEMENT' or name == 'SECTION':
+            rList = Entities['Recorders'][rTag]['list']
+            groups = GroupByPartition(rList, elems.getRows(rList, strict=False), elemPtr, partition, nparts)
+        else:
+            continue
+        for k, group in enumerate(groups):
+            if group:
+                recSubdomain[k][rTag] = group
+
+    #Arguments of the partitions for the workers
+    PartitionTasks.clear()
+    for n, cTag in enumerate(combos):
+        comboFile = str.replace(filename, "#", str(cTag))
+        for k in range(nparts):
+            matSubdomain, secSubdomain, nodeSubdomain, conSubdomain, elemSubdomain, surfSubdomain = Subdomains[k]
+            loadSubdomain = {lTag: loadGroups[lTag][k] for lTag in Entities['Combinations'][cTag]['attributes']['load'] if lTag in loadGroups and loadGroups[lTag][k]}
+            PartitionTasks.append((comboFile, meshfile, n == 0, (matSubdomain,secSubdomain,nodeSubdomain,massSubdomain[k],suppSubdomain[k],conSubdomain,elemSubdomain,surfSubdomain,dampSubdomain[k],loadSubdomain,recSubdomain[k],k,cTag)))
+
+    #Number of workers (processes) that write the partitions
+    nworkers = getNumberOfWorkers(len(PartitionTasks))
 
-    #Restores default loads
-    Entities['Loads'] = dictLoads
+    #Writes the mesh file 
+    start = time.time()
+    try:
+        if nworkers > 1:
+            with multiprocessing.get_context('fork').Pool(nworkers) as pool:
+                timings = list(pool.imap_unordered(WritePartition, range(len(PartitionTasks))))
+        else:
+            timings = [WritePartition(n) for n in range(len(PartitionTasks))]
+    except OverflowError as error:
+        print('\x1B[31m ERROR \x1B[0m: %s' % error)
+        sys.exit(-1)
+    elapsed = time.time() - start
+
+    #Paraview features of the written partitions
+    timings.sort(key=lambda timing: timing[0])
+    Options['nparaview'] = timings[-1][3]
+    Options['nfeatures'] += sum(timing[3] for timing in timings[-nparts:])
+    PartitionTasks.clear()
+
+    #Reports the time spent by each worker
+    print(' ◇ Partition files written by %d worker(s) in %.2f s:' % (nworkers, elapsed))
+    for n, pid in enumerate(sorted(set(timing[1] for timing in timings))):
+        work = [timing for timing in timings if timing[1] == pid]
+        print(' |   Worker[%d]: %d file(s) in %.2f s' % (n, len(work), sum(timing[2] for timing in work)))
+
+    #Records the content of the written files in the cache manifest
+    if CacheEnabled():
+        files = [record for timing in timings for record in timing[4]]
+        RecordFiles(files)
+        nfiles = len(timings) + (nparts if meshfile else 0)
+        print(' ◇ Cache: %d of %d partition file(s) were unchanged and not rewritten' % (nfiles - len(files), nfiles))
 
     #The generated partition file name path
-    execfile =  Options['file'] + '.' + str(combo) + '.$.json'
-    Options['execfiles'].append(execfile)
+    for cTag in combos:
+        execfile = str.replace(os.path.basename(filename), "#", str(cTag))
+        Options['execfiles'].append(execfile)
 
 def checkWarnings():
     """
@@ -449,20 +652,33 @@ def checkWarnings():
         sys.exit(-1)
 
     nrestrain = 0
-    for nTag in Entities['Nodes']:
-        if math.isnan(nTag):
-            print(" |   *** Node[%s] is invalid and should be removed" % nTag)
-            chk += 1
-        if Entities['Nodes'][nTag]['ndof'] == 0:
+    if isinstance(Entities['Nodes'], NodeStorage):
+        #The array-backed Nodes are checked in bulk (tags are integers)
+        tags = Entities['Nodes'].getTags()
+        ndof, free, _, _, ncoord = Entities['Nodes'].getArrays(tags)
+        for nTag in tags[ndof == 0].tolist():
             print(" |   *** Node[%s] has ndof=0, fix this or delete it" % nTag)
             chk += 1
-        ndim = len(Entities['Nodes'][nTag]['coords'])
-        if Options['dimension'] != ndim:
+        wrong = ncoord != Options['dimension']
+        for nTag, ndim in zip(tags[wrong].tolist(), ncoord[wrong].tolist()):
             print(" |   *** Node[%s] coordinate's dimension (=%d) disagrees with Options[\'dimension\'] (=%d)" % (nTag,ndim,Options['dimension']))
             chk += 1
-        for free in Entities['Nodes'][nTag]['freedof']:
-            if free == -1:
-                nrestrain += 1
+        nrestrain = int(np.count_nonzero(free == -1))
+    else:
+        for nTag in Entities['Nodes']:
+            if math.isnan(nTag):
+                print(" |   *** Node[%s] is invalid and should be removed" % nTag)
+                chk += 1
+            if Entities['Nodes'][nTag]['ndof'] == 0:
+                print(" |   *** Node[%s] has ndof=0, fix this or delete it" % nTag)
+                chk += 1
+            ndim = len(Entities['Nodes'][nTag]['coords'])
+            if Options['dimension'] != ndim:
+                print(" |   *** Node[%s] coordinate's dimension (=%d) disagrees with Options[\'dimension\'] (=%d)" % (nTag,ndim,Options['dimension']))
+                chk += 1
+            for free in Entities['Nodes'][nTag]['freedof']:
+                if free == -1:
+                    nrestrain += 1
 
     #if nrestrain == 0:
     #    print(" |   *** There is no restrains applied to Nodes")
@@ -507,32 +723,66 @@ def checkWarnings():
         print("\x1B[31m   *************** THE PROCESS WILL BE ABORTED ***************\x1B[0m\n")
         sys.exit(-1)
 
-    naux = set(nTags)
-    for eTag in Entities['Elements']:
-        name = Entities['Elements'][eTag]['name']
-        if math.isnan(eTag):
-            print(" |   *** Element[%s] is invalid and should be removed" % nTag)
-            chk += 1
-        if name not in SVLclasses['Elements']:
-            print(" |   *** Elements[%s] does not have an appropriate class name (%s)" % (eTag,Entities['Elements'][eTag]['name']))
-            chk += 1
-        elif Options['dimension'] not in SVLclasses['Elements'][name]['dim']:
-            print(" |   *** Element[%s] cannot be used in a %sD space" % (eTag, Options['dimension']))
-            chk += 1
-        if 'material' in Entities['Elements'][eTag]['attributes']:
-            mtag = Entities['Elements'][eTag]['attributes']['material']
-            if mtag not in mTags:
-                print(" |   *** Material[%s] has not been defined in Elements[%s] (%s)" % (mtag, eTag,Entities['Elements'][eTag]['name']))
+    if isinstance(Entities['Elements'], ElementStorage):
+        #The array-backed Elements are checked by class name and attributes
+        elems = Entities['Elements']
+        tags = elems.getTags()
+        code, names = elems.getNames()
+        attrid, records = elems.getAttributeIds()
+        ptr, conn = elems.getConnectivity()
+        badname = np.array([name not in SVLclasses['Elements'] for name in names], dtype=bool)
+        baddim  = np.array([name in SVLclasses['Elements'] and Options['dimension'] not in SVLclasses['Elements'][name]['dim'] for name in names], dtype=bool)
+        badmat  = np.array([('material' in record) and (record['material'] not in mTags) for record in records], dtype=bool)
+        badsec  = np.array([('section' in record) and (record['section'] not in sTags) for record in records], dtype=bool)
+        missing = ~FindTags(Entities['Nodes'], conn)
+        nmissing = np.bincount(np.repeat(np.arange(len(tags)), np.diff(ptr))[missing], minlength=len(tags))
+
+        flagged = badname[code] | baddim[code] | badmat[attrid] | badsec[attrid] | (nmissing > 0)
+        for k in np.flatnonzero(flagged).tolist():
+            eTag, name, attributes = int(tags[k]), names[code[k]], records[attrid[k]]
+            if badname[code[k]]:
+                print(" |   *** Elements[%s] does not have an appropriate class name (%s)" % (eTag,name))
                 chk += 1
-        if 'section' in Entities['Elements'][eTag]['attributes']:
-            stag = Entities['Elements'][eTag]['attributes']['section']
-            if stag not in sTags:
-                print(" |   *** Section[%s] has not been defined in Elements[%s] (%s)" % (stag, eTag,Entities['Elements'][eTag]['name']))
+            elif baddim[code[k]]:
+                print(" |   *** Element[%s] cannot be used in a %sD space" % (eTag, Options['dimension']))
+                chk += 1
+            if badmat[attrid[k]]:
+                print(" |   *** Material[%s] has not been defined in Elements[%s] (%s)" % (attributes['material'], eTag,name))
+                chk += 1
+            if badsec[attrid[k]]:
+                print(" |   *** Section[%s] has not been defined in Elements[%s] (%s)" % (attributes['section'], eTag,name))
+                chk += 1
+            if nmissing[k]:
+                defective = set(conn[ptr[k]:ptr[k+1]][missing[ptr[k]:ptr[k+1]]].tolist())
+                print(' |   *** Node[%s] have not been defined in Element[%s]' % (', '.join(str(s) for s in defective), eTag))
+                chk += 1
+    else:
+        naux = set(nTags)
+        for eTag in Entities['Elements']:
+            name = Entities['Elements'][eTag]['name']
+            if math.isnan(eTag):
+                print(" |   *** Element[%s] is invalid and should be removed" % nTag)
+                chk += 1
+            if name not in SVLclasses['Elements']:
+                print(" |   *** Elements[%s] does not have an appropriate class name (%s)" % (eTag,Entities['Elements'][eTag]['name']))
+                chk += 1
+            elif Options['dimension'] not in SVLclasses['Elements'][name]['dim']:
+                print(" |   *** Element[%s] cannot be used in a %sD space" % (eTag, Options['dimension']))
+                chk += 1
+            if 'material' in Entities['Elements'][eTag]['attributes']:
+                mtag = Entities['Elements'][eTag]['attributes']['material']
+                if mtag not in mTags:
+                    print(" |   *** Material[%s] has not been defined in Elements[%s] (%s)" % (mtag, eTag,Entities['Elements'][eTag]['name']))
+                    chk += 1
+            if 'section' in Entities['Elements'][eTag]['attributes']:
+                stag = Entities['Elements'][eTag]['attributes']['section']
+                if stag not in sTags:
+                    print(" |   *** Section[%s] has not been defined in Elements[%s] (%s)" % (stag, eTag,Entities['Elements'][eTag]['name']))
+                    chk += 1
+            defective = set(Entities['Elements'][eTag]['conn']).difference(naux)
+            if defective:
+                print(' |   *** Node[%s] have not been defined in Element[%s]' % (', '.join(str(s) for s in defective), eTag))
                 chk += 1
-        defective = set(Entities['Elements'][eTag]['conn']).difference(naux)
-        if defective:
-            print(' |   *** Node[%s] have not been defined in Element[%s]' % (', '.join(str(s) for s in defective), eTag))
-            chk += 1
 
     #[5] Check all attributes in SURFACES are defined in ENTITIES
     for sTag in Entities['Surfaces']:
@@ -808,8 +1058,15 @@ def CreateRunAnalysisFiles(combo=np.nan, plot=False):
 
     Parameters
     ----------
-    combo : int
-        The combination identifier for which the simulation is generated
+    combo : int, list or str
+        The combination identifier for which the simulation is generated. If
+        a list of combinations (or 'ALL') is given, the model is processed
+        once, the mesh is written in the <file>.Mesh.$.json files, and each 
+        combination file only stores its loads, recorders, and simulation.
+        If Options['cache'] is 'YES' the stages (constraints, DRM, partition,
+        numbering) whose inputs are unchanged since the previous run are
+        restored from <path>/Cache, and only the changed partition files are
+        rewritten (see <file>.Cache.json)
     plot : bool
         If the stiffness matrix structure needs to be ploted
 
@@ -818,7 +1075,11 @@ def CreateRunAnalysisFiles(combo=np.nan, plot=False):
     None
     """
     #Check there are multiple combinations defined
-    if np.isnan(combo):
+    if isinstance(combo, str) and combo.upper() == 'ALL':
+        combo = list(Entities['Combinations'].keys())
+    elif isinstance(combo, (list, tuple, np.ndarray)):
+        combo = list(combo)
+    elif np.isnan(combo):
         if len(Entities['Combinations']) == 1:
             keys  = list(Entities['Combinations'].keys())
             combo = int(keys[0])
@@ -827,26 +1088,46 @@ def CreateRunAnalysisFiles(combo=np.nan, plot=False):
             print('\x1B[33m ALERT \x1B[0m: In file=\'%s\' at line=%d CreateRunAnalysisFiles(combo=?) must be specified.' %(info.filename,info.lineno))
             exit(-1)
 
-    #The JSON output file name
-    filename = Options['path'] + '/' + 'Partition' + '/' + Options['file'] + '.' + str(combo) + '.$.json'
+    #The JSON output (and shared mesh) file name
+    extension = '.bin' if Options['jsonformat'].upper() == 'BINARY' else '.json'
+    filename = Options['path'] + '/' + 'Partition' + '/' + Options['file'] + '.#.$' + extension
+    meshfile = Options['path'] + '/' + 'Partition' + '/' + Options['file'] + '.Mesh.$' + extension if isinstance(combo, list) else None
+
+    #Loads the stages and files of the previous run
+    if CacheEnabled():
+        LoadManifest()
 
     #Comute combinational factors for constraints
-    ApplyConstraints()
+    RunStage('Constraints', ApplyConstraints)
 
     #Check if the model is properly done
     if checkWarnings():
         info = debugInfo(2) 
         print("\x1B[32m   *************** FIX WARNINGS BEFORE CONTINUING FROM LINE %d ***************\x1B[0m\n" % info.lineno)
         exit(-1)
+    Digests.clear()
+
+    #The Elements are not modified from here, their storage is built once
+    KeepElementStorage(True)
+    try:
+        #Generate DRM input files
+        drmfiles = [Entities['Functions'][fTag]['attributes']['file'] for fTag in Entities['Functions'] if 'file' in Entities['Functions'][fTag]['attributes']]
+        RunStage('DRM', GenerateDRMFiles, files=drmfiles, paths=[Options['path'] + '/' + 'DRM'])
+
+        #Computes the domain decomposition
+        RunStage('Partition', SetDomainPartition)
 
-    #Generate DRM input files
-    GenerateDRMFiles()
+        #Set degree of freedom
+        RunStage('Numbering', setDegreeOfFreedom, plot)
+        NumberingReport()
 
-    #Set degree of freedom
-    setDegreeOfFreedom(plot)
+        #Generate the Entities group
+        createPartitions(combo, filename, meshfile)
 
-    #Generate the Entities group
-    createPartitions(combo, filename)
+        #Reports the domain partition quality
+        PartitionReport()
+    finally:
+        KeepElementStorage(False)
 
 #Functions to be run when SeismoVLAB is imported
 printHeader()
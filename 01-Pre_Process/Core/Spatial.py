@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: Utf-8 -*-
+
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from Core.Storage import NodeStorage, ElementStorage
+from Core.Structured import StructuredDomain
+
+#Spatial indexes of the most recently queried Nodes containers
+SpatialTable = dict()
+
+class SpatialIndex():
+    """
+    This class stores the node coordinates of a mesh in a k-d tree for
+    tolerance-based point location, nearest node matching, coincident node
+    detection and box queries. The tags and coordinates are kept in the
+    iteration order of the Nodes, and the row of a node is its position in
+    this order.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    def __init__(self, tags, coords):
+        self.tags = np.asarray(tags, dtype=np.int64)
+        self.coords = np.asarray(coords, dtype=float).reshape(len(self.tags), -1) if len(self.tags) else np.zeros((0,3))
+        self.tree = cKDTree(self.coords) if len(self.tags) else None
+        self.nodes = None
+        self.state = None
+        self.sorted = None
+
+    def __len__(self):
+        return len(self.tags)
+
+    def getRows(self, tags):
+        """
+        Returns the rows of the given node tags, -1 if the tag does not exist
+        """
+        tags = np.asarray(tags, dtype=np.int64)
+        if self.sorted is None:
+            order = np.argsort(self.tags, kind='stable')
+            self.sorted = (self.tags[order], order)
+        stags, order = self.sorted
+        if len(stags) == 0:
+            return np.full(tags.shape, -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(stags, tags), len(stags) - 1)
+        return np.where(stags[pos] == tags, order[pos], -1)
+
+    def getCoordinates(self, tags):
+        """
+        Returns the (n,ndim) coordinates of the given node tags
+        """
+        return self.coords[self.getRows(tags)]
+
+    def findPoints(self, xp, tol):
+        """
+        Finds the nodes closer than tol to each point in xp, i.e., the pairs
+        such that norm(xp[k] - coords[row]) < tol.
+
+        Parameters
+        ----------
+        xp : array
+            The (m,ndim) coordinates of the points to be located
+        tol : float
+            Tolerance for which the node is accepted
+
+        Returns
+        -------
+        rows : array
+            The rows of the nodes that were found, sorted by row and point
+        k : array
+            The point in xp that each row matches
+        """
+        xp = np.asarray(xp, dtype=float).reshape(-1, self.coords.shape[1])
+        if self.tree is None or len(xp) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        found = self.tree.query_ball_point(xp, r=tol*(1.0 + 1E-12))
+        count = np.fromiter((len(rows) for rows in found), dtype=np.int64, count=len(xp))
+        rows = np.fromiter((row for rows in found for row in rows), dtype=np.int64, count=int(count.sum()))
+        k = np.repeat(np.arange(len(xp)), count)
+
+        #The tree distance is only used to pre-select the candidates
+        keep = np.linalg.norm(xp[k] - self.coords[rows], axis=1) < tol
+        rows, k = rows[keep], k[keep]
+        order = np.lexsort((k, rows))
+        return rows[order], k[order]
+
+    def findNearest(self, xp):
+        """
+        Returns the row and distance of the closest node to each point in xp
+        """
+        xp = np.asarray(xp, dtype=float).reshape(-1, self.coords.shape[1])
+        dist, rows = self.tree.query(xp)
+        return rows, dist
+
+    def findCoincident(self, tol):
+        """
+        Groups the nodes that are closer than tol (transitively), and returns
+        for each row the first row (in mesh order) of its group.
+        """
+        n = len(self.tags)
+        if self.tree is None:
+            return np.arange(n)
+
+        pairs = self.tree.query_pairs(r=tol*(1.0 + 1E-12), output_type='ndarray')
+        keep = np.linalg.norm(self.coords[pairs[:,0]] - self.coords[pairs[:,1]], axis=1) < tol
+        pairs = pairs[keep]
+
+        graph = coo_matrix((np.ones(len(pairs), dtype=np.int8), (pairs[:,0], pairs[:,1])), shape=(n,n))
+        ngroups, group = connected_components(graph, directed=False)
+        first = np.full(ngroups, n, dtype=np.int64)
+        np.minimum.at(first, group, np.arange(n))
+        return first[group]
+
+    def findBox(self, x0, xl):
+        """
+        Returns the (sorted) rows of the nodes inside the box |x - x0| <= xl
+        """
+        x0 = np.asarray(x0, dtype=float)
+        xl = np.broadcast_to(np.asarray(xl, dtype=float), x0.shape)
+        if self.tree is None:
+            return np.empty(0, dtype=np.int64)
+
+        #Candidates from the enclosing cube, i.e., Chebyshev distance
+        rows = np.array(sorted(self.tree.query_ball_point(x0, r=xl.max()*(1.0 + 1E-12), p=np.inf)), dtype=np.int64)
+        if len(rows) == 0:
+            return rows
+        inside = np.all(np.abs(self.coords[rows] - x0) <= xl, axis=1)
+        return rows[inside]
+
+def NodeCoordinates(nodes, tags):
+    """
+    Gathers the coordinates of the given node tags in an (n,ndim) array, the
+    coordinates with less components are padded with zeros.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    coords = [nodes[tag]['coords'] for tag in tags]
+    if not coords:
+        return np.zeros((0,3), dtype=float)
+    try:
+        return np.array(coords, dtype=float).reshape(len(coords), -1)
+    except ValueError:
+        ndim = max(len(x) for x in coords)
+        xyz = np.zeros((len(coords), ndim), dtype=float)
+        for k, x in enumerate(coords):
+            xyz[k,:len(x)] = x
+        return xyz
+
+def GetSpatialIndex(mesh):
+    """
+    Returns the spatial index of the Nodes in mesh. The index is built once
+    and reused while the Nodes are not modified. The array-backed storage is
+    checked with its version counter, while the tags and coordinates of the
+    dictionary Nodes are gathered and compared with the indexed ones (nodes
+    added, deleted or moved in place are detected), hence only the k-d tree
+    construction is saved in such case.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    mesh : dict
+        'Nodes'  : (dict) The Node information using SVL format
+
+    Returns
+    -------
+    index : SpatialIndex
+        The k-d tree of the node coordinates
+    """
+    if isinstance(mesh, StructuredDomain) and mesh.isLazy():
+        nodes = mesh
+        state = (mesh.nNodes, mesh.version)
+    else:
+        nodes = mesh['Nodes']
+        state = (len(nodes), getattr(nodes, 'version', None))
+
+    index = SpatialTable.get(id(nodes))
+    if nodes is mesh or isinstance(nodes, NodeStorage):
+        if index is not None and index.nodes is nodes and index.state == state:
+            return index
+        if nodes is mesh:
+            index = SpatialIndex(np.arange(1, mesh.nNodes + 1), mesh.getCoordinates())
+        else:
+            index = SpatialIndex(nodes.getTags(), nodes.getCoordinates())
+    else:
+        tags = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+        coords = NodeCoordinates(nodes, tags.tolist())
+        if index is not None and index.nodes is nodes and np.array_equal(index.tags, tags) and np.array_equal(index.coords, coords):
+            return index
+        index = SpatialIndex(tags, coords)
+    index.nodes = nodes
+    index.state = state
+
+    #Only the most recent indexes are kept alive
+    SpatialTable.pop(id(nodes), None)
+    SpatialTable[id(nodes)] = index
+    while len(SpatialTable) > 8:
+        del SpatialTable[next(iter(SpatialTable))]
+
+    return index
+
+def SegmentSum(values, ptr):
+    """
+    Returns the sum of values in each segment [ptr[k], ptr[k+1]) of a
+    CSR-style array.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    csum = np.concatenate(([0], np.cumsum(values)))
+    return csum[ptr[1:]] - csum[ptr[:-1]]
+
+def MeshConnectivity(mesh):
+    """
+    Returns the element connectivity of mesh as CSR-style arrays.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    mesh : dict
+        'Elements'  : (dict) The Element information using SVL format
+
+    Returns
+    -------
+    eTags : array
+        The element tags in mesh order
+    ptr : array
+        The connectivity of element k is conn[ptr[k]:ptr[k+1]]
+    conn : array
+        The concatenated node tags of the elements
+    """
+    Elements = mesh['Elements']
+    if isinstance(Elements, ElementStorage):
+        ptr, conn = Elements.getConnectivity()
+        return Elements.getTags(), ptr, conn
+
+    n = len(Elements)
+    eTags = np.fromiter(Elements.keys(), dtype=np.int64, count=n)
+    nconn = np.fromiter((len(element['conn']) for element in Elements.values()), dtype=np.int64, count=n)
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(nconn, out=ptr[1:])
+    conn = np.fromiter((nTag for element in Elements.values() for nTag in element['conn']), dtype=np.int64, count=int(ptr[-1]))
+    return eTags, ptr, conn
+
+def ClassifyBox(mesh, x0, xl):
+    """
+    Classifies the nodes of mesh against the box |x - x0| <= xl in a single
+    array operation, and finds the elements with at least one node inside the
+    box by gathering the node classification through the connectivity. An
+    element is inside the box if all its nodes are inside, otherwise it is
+    cut by the box. A StructuredDomain that has not been materialized only
+    visits the cells that intersect the box.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    mesh : dict
+        The mesh that contains 'Nodes' and 'Elements' dictionaries
+    x0: array
+        The coordinate of center of the box
+    xl: array
+        The side half-length in each direction
+
+    Returns
+    -------
+    eTags : array
+        The elements (in mesh order) with at least one node inside the box
+    ptr : array
+        The connectivity of element k is conn[ptr[k]:ptr[k+1]]
+    conn : array
+        The concatenated node tags of these elements
+    inside : array
+        Boolean array that marks the nodes in conn inside the box
+    """
+    if isinstance(mesh, StructuredDomain) and mesh.isLazy():
+        eTags, conn, inside = mesh.getBoxElements(x0, xl)
+        ptr = np.arange(0, conn.size + 1, conn.shape[1])
+        return eTags, ptr, conn.ravel(), inside.ravel()
+
+    #Classification of all nodes
+    index = GetSpatialIndex(mesh)
+    nodeIn = np.all(np.abs(index.coords - np.asarray(x0, dtype=float)) <= xl, axis=1)
+
+    #Classification of the element nodes
+    eTags, ptr, conn = MeshConnectivity(mesh)
+    rows = index.getRows(conn)
+    inside = nodeIn[rows] & (rows >= 0)
+
+    nconn = np.diff(ptr)
+    keep = SegmentSum(inside, ptr) > 0
+    ptr = np.zeros(np.count_nonzero(keep) + 1, dtype=np.int64)
+    np.cumsum(nconn[keep], out=ptr[1:])
+    flat = np.repeat(keep, nconn)
+    return eTags[keep], ptr, conn[flat], inside[flat]
+
+def GetDRMSets(mesh, x0, xl):
+    """
+    Finds the DRM elements, i.e., the elements cut by the box |x - x0| <= xl,
+    and their interior (inside the box) and exterior nodes. The lists have
+    the same order as if the sets were filled traversing the mesh.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    mesh : dict
+        The mesh that contains 'Nodes' and 'Elements' dictionaries
+    x0: array
+        The coordinate of center of the box
+    xl: array
+        The side half-length in each direction
+
+    Returns
+    -------
+    Interior  : list
+        List with the DRM internal node Tags 
+    Exterior  : list
+        List with the DRM external node Tags 
+    Elements  : list
+        List with the DRM element Tags 
+    """
+    eTags, ptr, conn, inside = ClassifyBox(mesh, x0, xl)
+    nconn = np.diff(ptr)
+    cut = SegmentSum(inside, ptr) < nconn
+    elemDRM = set(eTags[cut].tolist())
+
+    #Interior/Exterior DRM node lists
+    intDRM = set()
+    extDRM = set()
+    flat = np.repeat(cut, nconn)
+    nodes, flags = conn[flat].tolist(), inside[flat].tolist()
+    offset = np.cumsum(nconn[cut]) - nconn[cut]
+    start = dict(zip(eTags[cut].tolist(), zip(offset.tolist(), nconn[cut].tolist())))
+    for eTag in elemDRM:
+        k, n = start[eTag]
+        for nTag, isIn in zip(nodes[k:k+n], flags[k:k+n]):
+            if isIn:
+                intDRM.add(nTag)
+            else:
+                extDRM.add(nTag)
+
+    return list(intDRM), list(extDRM), list(elemDRM)
@@ -0,0 +1,953 @@
+#!/usr/bin/env python3
+# -*- coding: Utf-8 -*-
+
+import copy
+import numpy as np
+from collections.abc import Mapping, MutableMapping
+from Core.Definitions import Entities, Options
+
+AttributeTable = dict()
+
+#Temporary ElementStorage built from the Entities['Elements'] dictionary, it
+#is reused while KeepElementStorage() is enabled
+TemporaryStorage = dict()
+
+class Attributes(dict):
+    """
+    This class is an interned (shared) read-only dictionary of element
+    attributes. Elements in an ElementStorage with the same attributes refer 
+    to the same object (see AttributeView for copy-on-write), while Elements
+    stored in dictionaries receive a plain copy (see CopyAttributes). A copy
+    (copy.copy/copy.deepcopy) is a regular dictionary that can be modified.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    __slots__ = ()
+
+    def readonly(self, *args, **kwargs):
+        raise TypeError('Shared element attributes are read-only, assign a modified copy to the element instead')
+
+    __setitem__ = __delitem__ = __ior__ = readonly
+    update = pop = popitem = setdefault = clear = readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (InternAttributes, (dict(self),))
+
+def AttributeKey(value):
+    """
+    Returns a hashable key that identifies the (nested) attribute values
+    """
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, AttributeKey(value[key])) for key in value))
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        return (type(value).__name__,) + tuple(AttributeKey(x) for x in value)
+    elif isinstance(value, np.generic):
+        return value.item()
+    try:
+        hash(value)
+        return (type(value).__name__, value)
+    except TypeError:
+        return repr(value)
+
+def InternAttributes(attributes):
+    """
+    Returns the interned (shared) Attributes object with the same values as
+    the given attributes. A single object is kept for each distinct set.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    attributes : dict
+        Specific properties of an element
+
+    Returns
+    -------
+    Attributes
+        The shared read-only attributes
+    """
+    if isinstance(attributes, Attributes):
+        return attributes
+    key = AttributeKey(attributes)
+    if key not in AttributeTable:
+        AttributeTable[key] = Attributes(copy.deepcopy(dict(attributes)))
+    return AttributeTable[key]
+
+def CopyAttributes(attributes):
+    """
+    Returns a plain (modifiable) dictionary with the values of the given
+    attributes. The Elements stored in dictionaries (Options['storage'] is
+    'Dict') own a copy, since they are modified in place by the users, e.g., 
+    Mesh['Elements'][tag]['attributes']['material'] = 1.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    attributes : dict
+        Specific properties of an element
+
+    Returns
+    -------
+    dict
+        The copy of the attributes
+    """
+    if all(isinstance(value, (int, float, str, bool, np.generic)) for value in attributes.values()):
+        return dict(attributes)
+    return copy.deepcopy(dict(attributes))
+
+class AttributeView(MutableMapping):
+    """
+    This class emulates the attribute dictionary of a single Element stored in
+    an ElementStorage. Reading is done over the shared Attributes, while
+    writing assigns a new interned Attributes to this element only.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    __slots__ = ('store', 'tag')
+
+    def __init__(self, store, tag):
+        self.store = store
+        self.tag = tag
+
+    def record(self):
+        store = self.store
+        return store.records[store.attrid[store.index[self.tag]]]
+
+    def modify(self, key, value=None, remove=False):
+        attributes = dict(self.record())
+        if remove:
+            del attributes[key]
+        else:
+            attributes[key] = value
+        store = self.store
+        store.attrid[store.index[self.tag]] = store.getRecordId(attributes)
+
+    def __getitem__(self, key):
+        return self.record()[key]
+
+    def __setitem__(self, key, value):
+        self.modify(key, value)
+
+    def __delitem__(self, key):
+        self.modify(key, remove=True)
+
+    def __iter__(self):
+        return iter(self.record())
+
+    def __len__(self):
+        return len(self.record())
+
+    def __contains__(self, key):
+        return key in self.record()
+
+    def __copy__(self):
+        return dict(self.record())
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self.record()), memo)
+
+    def __repr__(self):
+        return repr(dict(self.record()))
+
+class NodeView(MutableMapping):
+    """
+    This class emulates the dictionary of a single Node stored in a NodeStorage.
+    The 'freedof' and 'totaldof' fields are numpy views of the storage arrays,
+    hence in-place modifications are kept in the storage. The 'coords' field is
+    a read-only view, the coordinates are modified by assigning them, e.g.,
+    Nodes[tag]['coords'] = [x, y], so the spatial index is rebuilt.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    __slots__ = ('store', 'tag')
+    fields = ('ndof', 'freedof', 'totaldof', 'coords')
+
+    def __init__(self, store, tag):
+        self.store = store
+        self.tag = tag
+
+    def __getitem__(self, key):
+        store = self.store
+        row = store.index[self.tag]
+        if key == 'ndof':
+            return int(store.ndof[row])
+        elif key == 'freedof':
+            start = store.dofstart[row]
+            return store.freedof[start:start + store.ndof[row]]
+        elif key == 'totaldof':
+            start = store.dofstart[row]
+            return store.totaldof[start:start + store.ndof[row]]
+        elif key == 'coords':
+            coords = store.coords[row,:store.ncoord[row]]
+            coords.flags.writeable = False
+            return coords
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        store = self.store
+        row = store.index[self.tag]
+        if key == 'ndof':
+            store.resizeDofs(row, int(value))
+        elif key == 'freedof' or key == 'totaldof':
+            value = np.asarray(value, dtype=np.int64)
+            if len(value) != store.ndof[row]:
+                store.resizeDofs(row, len(value))
+            start = store.dofstart[row]
+            if key == 'freedof':
+                store.freedof[start:start + len(value)] = value
+            else:
+                store.totaldof[start:start + len(value)] = value
+        elif key == 'coords':
+            value = np.asarray(value, dtype=float)
+            store.ncoord[row] = len(value)
+            store.coords[row,:] = 0.0
+            store.coords[row,:len(value)] = value
+            store.version += 1
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key):
+        raise KeyError('Node fields cannot be deleted')
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __copy__(self):
+        return {key: (np.copy(self[key]) if key != 'ndof' else self[key]) for key in self.fields}
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+
+    def __repr__(self):
+        return repr(self.__copy__())
+
+class ElementView(MutableMapping):
+    """
+    This class emulates the dictionary of a single Element stored in an
+    ElementStorage. The 'conn' field is a numpy view of the connectivity array,
+    while 'attributes' gives a copy-on-write view of the interned attributes.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    __slots__ = ('store', 'tag')
+    fields = ('name', 'conn', 'attributes')
+
+    def __init__(self, store, tag):
+        self.store = store
+        self.tag = tag
+
+    def __getitem__(self, key):
+        store = self.store
+        row = store.index[self.tag]
+        if key == 'name':
+            return store.names[store.namecode[row]]
+        elif key == 'conn':
+            start = store.connstart[row]
+            return store.conn[start:start + store.nconn[row]]
+        elif key == 'attributes':
+            return AttributeView(store, self.tag)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        store = self.store
+        row = store.index[self.tag]
+        if key == 'name':
+            store.namecode[row] = store.getNameCode(value)
+        elif key == 'conn':
+            value = np.asarray(value, dtype=np.int64)
+            if len(value) != store.nconn[row]:
+                store.resizeConnectivity(row, len(value))
+            start = store.connstart[row]
+            store.conn[start:start + len(value)] = value
+        elif key == 'attributes':
+            store.attrid[row] = store.getRecordId(value)
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key):
+        raise KeyError('Element fields cannot be deleted')
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __copy__(self):
+        store = self.store
+        return {'name': self['name'], 'conn': np.copy(self['conn']), 'attributes': dict(store.records[store.attrid[store.index[self.tag]]])}
+
+    def __deepcopy__(self, memo):
+        return {'name': self['name'], 'conn': np.copy(self['conn']), 'attributes': copy.deepcopy(self['attributes'], memo)}
+
+    def __repr__(self):
+        return repr(self.__copy__())
+
+class TagStorage(MutableMapping):
+    """
+    Base class for the array-backed storages. Rows are appended at the end of
+    the arrays, a deleted row is only marked as dead and removed when compact()
+    is called. The 'index' dictionary maps an entity tag to its row, and the
+    'version' counter is increased when entities are added, deleted or moved.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    def __init__(self):
+        self.size = 0
+        self.ndead = 0
+        self.version = 0
+        self.index = dict()
+        self.tags = np.empty(0, dtype=np.int64)
+        self.alive = np.empty(0, dtype=bool)
+        self.sorted = None
+
+    def __contains__(self, tag):
+        try:
+            return tag in self.index
+        except TypeError:
+            return False
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.getTags().tolist())
+
+    def __getitem__(self, tag):
+        if tag not in self.index:
+            raise KeyError(tag)
+        return self.view(self, tag)
+
+    def __delitem__(self, tag):
+        row = self.index.pop(tag)
+        self.alive[row] = False
+        self.ndead += 1
+        self.version += 1
+        self.sorted = None
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __repr__(self):
+        return '%s(%d)' % (self.__class__.__name__, len(self))
+
+    def grow(self, arrays, n):
+        """
+        Returns the arrays with enough capacity to hold n entries (geometric growth)
+        """
+        resized = list()
+        for array in arrays:
+            if len(array) < n:
+                capacity = max(n, 2*len(array), 16)
+                shape = (capacity,) + array.shape[1:]
+                aux = np.zeros(shape, dtype=array.dtype)
+                aux[:len(array)] = array
+                array = aux
+            resized.append(array)
+        return resized
+
+    def renumber(self):
+        """
+        Re-numbers the stored entities as 1,2,... in insertion order (the rows
+        are compacted), and returns their previous tags
+        """
+        self.compact()
+        tags = self.tags[:self.size].copy()
+        self.tags[:self.size] = np.arange(1, self.size + 1)
+        self.index = dict(zip(range(1, self.size + 1), range(self.size)))
+        self.sorted = None
+        self.version += 1
+        return tags
+
+    def getTags(self):
+        """
+        Returns the tags of the stored entities in insertion order
+        """
+        tags = self.tags[:self.size]
+        if self.ndead:
+            tags = tags[self.alive[:self.size]]
+        return tags
+
+    def getRows(self, tags, strict=True):
+        """
+        Returns the (vectorized) rows associated to the given tags. If strict, a
+        KeyError is raised if a tag does not exist in the storage, otherwise its
+        row is -1 (and it must be masked by the caller).
+        """
+        tags = np.asarray(tags, dtype=np.int64)
+        if self.sorted is None:
+            rows = np.flatnonzero(self.alive[:self.size])
+            order = np.argsort(self.tags[rows], kind='stable')
+            self.sorted = (self.tags[rows[order]], rows[order])
+        stags, srows = self.sorted
+        if len(stags) == 0:
+            rows = np.full(tags.shape, -1, dtype=np.int64)
+        else:
+            pos = np.minimum(np.searchsorted(stags, tags), len(stags) - 1)
+            rows = np.where(stags[pos] == tags, srows[pos], -1)
+        if strict and np.any(rows < 0):
+            raise KeyError(int(tags[rows < 0].flat[0]))
+        return rows
+
+class NodeStorage(TagStorage):
+    """
+    This class stores the Nodes as a structure of arrays: the coordinates as an
+    (N,3) array, and the number of degree of freedom, free and total degree of
+    freedom numbering as CSR-style arrays. The class behaves as the dictionary
+    Entities['Nodes'], i.e., Entities['Nodes'][tag]['freedof'] is still valid.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    view = NodeView
+
+    def __init__(self, nodes=None):
+        TagStorage.__init__(self)
+        self.ndof = np.empty(0, dtype=np.int64)
+        self.ncoord = np.empty(0, dtype=np.int8)
+        self.coords = np.empty((0,3), dtype=float)
+        self.dofstart = np.empty(0, dtype=np.int64)
+        self.ndofs = 0
+        self.freedof = np.empty(0, dtype=np.int64)
+        self.totaldof = np.empty(0, dtype=np.int64)
+
+        if nodes:
+            tags = list(nodes.keys())
+            ndof = np.fromiter((nodes[tag]['ndof'] for tag in tags), dtype=np.int64, count=len(tags))
+            coords = [nodes[tag]['coords'] for tag in tags]
+            free  = [np.asarray(nodes[tag]['freedof' ], dtype=np.int64) for tag in tags]
+            total = [np.asarray(nodes[tag]['totaldof'], dtype=np.int64) for tag in tags]
+            free  = np.concatenate(free ) if free  else np.empty(0, dtype=np.int64)
+            total = np.concatenate(total) if total else np.empty(0, dtype=np.int64)
+            self.extend(tags, ndof, coords, free, total)
+
+    def __setitem__(self, tag, node):
+        if tag in self.index:
+            view = self[tag]
+            for key in NodeView.fields:
+                view[key] = node[key]
+        else:
+            free  = np.asarray(node['freedof' ], dtype=np.int64)
+            total = np.asarray(node['totaldof'], dtype=np.int64)
+            self.extend([tag], [node['ndof']], [node['coords']], free, total)
+
+    def extend(self, tags, ndof, coords, freedof=None, totaldof=None):
+        """
+        Appends a group of Nodes to the storage.
+
+        Parameters
+        ----------
+        tags : array
+            The identifiers of the nodes
+        ndof : array
+            The number of degree of freedom of each node
+        coords : array or list
+            The (n,ndim) coordinates or list of coordinates of the nodes
+        freedof : array
+            The concatenated free degree of freedom numbering (zeros if None)
+        totaldof : array
+            The concatenated total degree of freedom numbering (zeros if None)
+        """
+        tags = np.asarray(tags, dtype=np.int64)
+        ndof = np.broadcast_to(np.asarray(ndof, dtype=np.int64), tags.shape)
+        n = len(tags)
+        m = int(ndof.sum())
+
+        #Coordinates may be provided with different dimensions
+        if isinstance(coords, np.ndarray) and coords.ndim == 2:
+            ncoord = np.full(n, coords.shape[1], dtype=np.int8)
+            xyz = np.zeros((n,3), dtype=float)
+            xyz[:,:coords.shape[1]] = coords
+        else:
+            ncoord = np.fromiter((len(x) for x in coords), dtype=np.int8, count=n)
+            xyz = np.zeros((n,3), dtype=float)
+            for k, x in enumerate(coords):
+                xyz[k,:ncoord[k]] = x
+
+        size = self.size
+        self.tags, self.alive, self.ndof, self.ncoord, self.coords, self.dofstart = self.grow([self.tags, self.alive, self.ndof, self.ncoord, self.coords, self.dofstart], size + n)
+        self.freedof, self.totaldof = self.grow([self.freedof, self.totaldof], self.ndofs + m)
+
+        self.tags[size:size+n] = tags
+        self.alive[size:size+n] = True
+        self.ndof[size:size+n] = ndof
+        self.ncoord[size:size+n] = ncoord
+        self.coords[size:size+n] = xyz
+        self.dofstart[size:size+n] = self.ndofs + np.cumsum(ndof) - ndof
+        self.freedof[self.ndofs:self.ndofs+m] = 0 if freedof is None else freedof
+        self.totaldof[self.ndofs:self.ndofs+m] = 0 if totaldof is None else totaldof
+
+        for row, tag in enumerate(tags.tolist(), start=size):
+            if tag in self.index:
+                del self[tag]
+            self.index[tag] = row
+
+        self.size += n
+        self.ndofs += m
+        self.version += 1
+        self.sorted = None
+
+    def resizeDofs(self, row, ndof):
+        """
+        Changes the number of degree of freedom of the node in the given row
+        """
+        if ndof > self.ndof[row]:
+            self.freedof, self.totaldof = self.grow([self.freedof, self.totaldof], self.ndofs + ndof)
+            start = self.dofstart[row]
+            old = self.ndof[row]
+            self.freedof[self.ndofs:self.ndofs+ndof] = 0
+            self.totaldof[self.ndofs:self.ndofs+ndof] = 0
+            self.freedof[self.ndofs:self.ndofs+old] = self.freedof[start:start+old]
+            self.totaldof[self.ndofs:self.ndofs+old] = self.totaldof[start:start+old]
+            self.dofstart[row] = self.ndofs
+            self.ndofs += ndof
+        self.ndof[row] = ndof
+
+    def compact(self):
+        """
+        Removes the deleted rows and makes the degree of freedom arrays contiguous
+        """
+        n = self.size
+        rows = np.flatnonzero(self.alive[:n])
+        ndof = self.ndof[rows]
+        ptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(ndof, out=ptr[1:])
+        if self.ndead == 0 and np.array_equal(self.dofstart[:n], ptr[:-1]):
+            return
+        gather = np.repeat(self.dofstart[rows] - ptr[:-1], ndof) + np.arange(ptr[-1])
+
+        self.tags = self.tags[rows]
+        self.alive = np.ones(len(rows), dtype=bool)
+        self.ndof = ndof
+        self.ncoord = self.ncoord[rows]
+        self.coords = self.coords[rows]
+        self.dofstart = ptr[:-1].copy()
+        self.freedof = self.freedof[gather]
+        self.totaldof = self.totaldof[gather]
+        self.size = len(rows)
+        self.ndofs = int(ptr[-1])
+        self.ndead = 0
+        self.index = dict(zip(self.tags.tolist(), range(self.size)))
+        self.sorted = None
+
+    def copy(self):
+        """
+        Returns an independent (compacted) copy of this storage
+        """
+        self.compact()
+        new = NodeStorage()
+        free, total = self.freedof[:self.ndofs], self.totaldof[:self.ndofs]
+        new.extend(self.getTags(), self.ndof[:self.size], self.coords[:self.size], free, total)
+        new.ncoord[:new.size] = self.ncoord[:self.size]
+        return new
+
+    def getCoordinates(self, ndim=None):
+        """
+        Returns the (N,ndim) coordinate array of the nodes in insertion order
+        """
+        self.compact()
+        ndim = ndim if ndim else max(int(self.ncoord[:self.size].max(initial=1)), 1)
+        return self.coords[:self.size,:ndim]
+
+    def getDofs(self):
+        """
+        Returns the CSR-style (ptr, ndof, freedof, totaldof) arrays of the nodes
+        in insertion order. The freedof/totaldof arrays are views of the storage.
+        """
+        self.compact()
+        ndof = self.ndof[:self.size]
+        ptr = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(ndof, out=ptr[1:])
+        return ptr, ndof, self.freedof[:self.ndofs], self.totaldof[:self.ndofs]
+
+    def getDofIndex(self, rows):
+        """
+        Returns the positions in the freedof/totaldof arrays (see getDofs) of
+        the degree of freedom of the given rows, concatenated in the given order.
+        """
+        ptr, ndof, _, _ = self.getDofs()
+        rows = np.asarray(rows, dtype=np.int64)
+        n = ndof[rows]
+        offset = np.cumsum(n) - n
+        return np.repeat(ptr[rows] - offset, n) + np.arange(n.sum())
+
+    def getArrays(self, tags, ndim=3):
+        """
+        Returns the (ndof, freedof, totaldof, coords, ncoord) arrays of the given
+        tags, the free/total degree of freedom are concatenated in tag order.
+        """
+        rows = self.getRows(tags)
+        ndof = self.ndof[rows]
+        offset = np.cumsum(ndof) - ndof
+        index = np.repeat(self.dofstart[rows] - offset, ndof) + np.arange(ndof.sum())
+        return ndof, self.freedof[index], self.totaldof[index], self.coords[rows,:ndim], self.ncoord[rows]
+
+    def getDictionaries(self, tags):
+        """
+        Returns the Nodes of the given tags as plain dictionaries of python
+        lists, gathered from the storage arrays in bulk.
+        """
+        ndof, free, total, coords, ncoord = self.getArrays(tags)
+        free, total, coords = free.tolist(), total.tolist(), coords.tolist()
+        offset = (np.cumsum(ndof) - ndof).tolist()
+
+        nodes = list()
+        for n, start, x, m in zip(ndof.tolist(), offset, coords, ncoord.tolist()):
+            nodes.append({'ndof': n, 'freedof': free[start:start + n], 'totaldof': total[start:start + n], 'coords': x[:m]})
+        return nodes
+
+class ElementStorage(TagStorage):
+    """
+    This class stores the Elements as a structure of arrays: the class name as
+    an integer code, and the connectivity as CSR-style (offsets, indices) arrays.
+    The class behaves as the dictionary Entities['Elements'], i.e., the field
+    Entities['Elements'][tag]['conn'] is still valid.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    view = ElementView
+
+    def __init__(self, elements=None):
+        TagStorage.__init__(self)
+        self.names = list()
+        self.namemap = dict()
+        self.namecode = np.empty(0, dtype=np.int16)
+        self.connstart = np.empty(0, dtype=np.int64)
+        self.nconn = np.empty(0, dtype=np.int64)
+        self.nconns = 0
+        self.conn = np.empty(0, dtype=np.int64)
+        self.attrid = np.empty(0, dtype=np.int32)
+        self.records = list()
+        self.recordmap = dict()
+
+        if elements:
+            tags = list(elements.keys())
+            names = [elements[tag]['name'] for tag in tags]
+            conn = [elements[tag]['conn'] for tag in tags]
+            attributes = [elements[tag]['attributes'] for tag in tags]
+            self.extend(tags, names, conn, attributes)
+
+    def __setitem__(self, tag, element):
+        if tag in self.index:
+            view = self[tag]
+            for key in ElementView.fields:
+                view[key] = element[key]
+        else:
+            self.extend([tag], [element['name']], [element['conn']], [element['attributes']])
+
+    def getNameCode(self, name):
+        """
+        Returns the integer code associated to an element class name
+        """
+        if name not in self.namemap:
+            self.namemap[name] = len(self.names)
+            self.names.append(name)
+        return self.namemap[name]
+
+    def getRecordId(self, attributes):
+        """
+        Returns the integer identifier of the interned attributes
+        """
+        record = InternAttributes(attributes)
+        if id(record) not in self.recordmap:
+            self.recordmap[id(record)] = len(self.records)
+            self.records.append(record)
+        return self.recordmap[id(record)]
+
+    def extend(self, tags, names, conn, attributes):
+        """
+        Appends a group of Elements to the storage.
+
+        Parameters
+        ----------
+        tags : array
+            The identifiers of the elements
+        names : str or list
+            The element class name(s)
+        conn : array or list
+            The (n,nconn) connectivity array or list of connectivity arrays
+        attributes : dict or list
+            The attributes shared by all elements, or one per element
+        """
+        tags = np.asarray(tags, dtype=np.int64)
+        n = len(tags)
+
+        if isinstance(names, str):
+            codes = np.full(n, self.getNameCode(names), dtype=np.int16)
+        else:
+            codes = np.fromiter((self.getNameCode(name) for name in names), dtype=np.int16, count=n)
+
+        if isinstance(conn, np.ndarray) and conn.ndim == 2:
+            nconn = np.full(n, conn.shape[1], dtype=np.int64)
+            flat = conn.ravel()
+        else:
+            nconn = np.fromiter((len(c) for c in conn), dtype=np.int64, count=n)
+            flat = np.fromiter((x for c in conn for x in c), dtype=np.int64, count=int(nconn.sum()))
+        m = len(flat)
+
+        #Attributes are interned, the same object is interned once
+        if isinstance(attributes, Mapping):
+            ids = np.full(n, self.getRecordId(attributes), dtype=np.int32)
+        else:
+            cache = dict()
+            for attribute in attributes:
+                if id(attribute) not in cache:
+                    cache[id(attribute)] = self.getRecordId(attribute)
+            ids = np.fromiter((cache[id(attribute)] for attribute in attributes), dtype=np.int32, count=n)
+
+        size = self.size
+        self.tags, self.alive, self.namecode, self.connstart, self.nconn, self.attrid = self.grow([self.tags, self.alive, self.namecode, self.connstart, self.nconn, self.attrid], size + n)
+        self.conn, = self.grow([self.conn], self.nconns + m)
+
+        self.tags[size:size+n] = tags
+        self.alive[size:size+n] = True
+        self.namecode[size:size+n] = codes
+        self.nconn[size:size+n] = nconn
+        self.connstart[size:size+n] = self.nconns + np.cumsum(nconn) - nconn
+        self.conn[self.nconns:self.nconns+m] = flat
+        self.attrid[size:size+n] = ids
+
+        for row, tag in enumerate(tags.tolist(), start=size):
+            if tag in self.index:
+                del self[tag]
+            self.index[tag] = row
+
+        self.size += n
+        self.nconns += m
+        self.version += 1
+        self.sorted = None
+
+    def resizeConnectivity(self, row, nconn):
+        """
+        Changes the number of nodes of the element in the given row
+        """
+        if nconn > self.nconn[row]:
+            self.conn, = self.grow([self.conn], self.nconns + nconn)
+            self.connstart[row] = self.nconns
+            self.nconns += nconn
+        self.nconn[row] = nconn
+
+    def compact(self):
+        """
+        Removes the deleted rows and makes the connectivity array contiguous
+        """
+        n = self.size
+        rows = np.flatnonzero(self.alive[:n])
+        nconn = self.nconn[rows]
+        ptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(nconn, out=ptr[1:])
+        if self.ndead == 0 and np.array_equal(self.connstart[:n], ptr[:-1]):
+            return
+        gather = np.repeat(self.connstart[rows] - ptr[:-1], nconn) + np.arange(ptr[-1])
+
+        self.tags = self.tags[rows]
+        self.alive = np.ones(len(rows), dtype=bool)
+        self.namecode = self.namecode[rows]
+        self.nconn = nconn
+        self.connstart = ptr[:-1].copy()
+        self.conn = self.conn[gather]
+        self.attrid = self.attrid[rows]
+        self.size = len(rows)
+        self.nconns = int(ptr[-1])
+        self.ndead = 0
+        self.index = dict(zip(self.tags.tolist(), range(self.size)))
+        self.sorted = None
+
+    def copy(self):
+        """
+        Returns an independent (compacted) copy of this storage
+        """
+        self.compact()
+        new = ElementStorage()
+        names = [self.names[k] for k in self.namecode[:self.size].tolist()]
+        conn = np.split(self.conn[:self.nconns], self.connstart[1:self.size])
+        new.extend(self.getTags(), names, conn, [self.records[k] for k in self.attrid[:self.size].tolist()])
+        return new
+
+    def getConnectivity(self):
+        """
+        Returns the CSR-style (ptr, conn) arrays of the elements in insertion
+        order. The conn array stores Node tags and it is a view of the storage.
+        """
+        self.compact()
+        ptr = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(self.nconn[:self.size], out=ptr[1:])
+        return ptr, self.conn[:self.nconns]
+
+    def getNames(self):
+        """
+        Returns the element class name codes and the list of class names
+        """
+        self.compact()
+        return self.namecode[:self.size], self.names
+
+    def getAttributes(self):
+        """
+        Returns the list of (shared) element attributes in insertion order
+        """
+        self.compact()
+        return [self.records[k] for k in self.attrid[:self.size].tolist()]
+
+    def getAttributeIds(self):
+        """
+        Returns the attribute identifier of each element in insertion order and
+        the list of distinct (interned) attributes
+        """
+        self.compact()
+        return self.attrid[:self.size], self.records
+
+    def getArrays(self, tags):
+        """
+        Returns the (namecode, nconn, conn, attrid) arrays of the given tags, the
+        connectivity is concatenated in tag order.
+        """
+        rows = self.getRows(tags)
+        nconn = self.nconn[rows]
+        offset = np.cumsum(nconn) - nconn
+        index = np.repeat(self.connstart[rows] - offset, nconn) + np.arange(nconn.sum())
+        return self.namecode[rows], nconn, self.conn[index], self.attrid[rows]
+
+    def getDictionaries(self, tags):
+        """
+        Returns the Elements of the given tags as plain dictionaries of python
+        lists, gathered from the storage arrays in bulk.
+        """
+        namecode, nconn, conn, attrid = self.getArrays(tags)
+        conn = conn.tolist()
+        offset = (np.cumsum(nconn) - nconn).tolist()
+
+        elements = list()
+        names, records = self.names, self.records
+        for code, n, start, k in zip(namecode.tolist(), nconn.tolist(), offset, attrid.tolist()):
+            elements.append({'name': names[code], 'conn': conn[start:start + n], 'attributes': records[k]})
+        return elements
+
+def FindTags(entities, tags):
+    """
+    Returns whether the given tags exist in the Entities (dictionary or storage)
+    using a single vectorized search.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    entities : dict or TagStorage
+        The Entities['Nodes'] or Entities['Elements'] to look into
+    tags : array
+        The identifiers to be found
+
+    Returns
+    -------
+    array
+        Boolean mask with True if the tag exists
+    """
+    tags = np.asarray(tags, dtype=np.int64)
+    if isinstance(entities, TagStorage):
+        return entities.getRows(tags, strict=False) > -1
+    if len(entities) == 0:
+        return np.zeros(tags.shape, dtype=bool)
+    keys = np.fromiter(entities.keys(), dtype=np.int64, count=len(entities))
+    return np.isin(tags, keys)
+
+def GetNodeStorage():
+    """
+    Returns Entities['Nodes'] as a NodeStorage. If Options['storage'] is 'ARRAY'
+    the dictionary in Entities is replaced by the storage, otherwise a temporary
+    storage is created that must be committed with CommitNodeStorage().\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    NodeStorage
+        The array-backed Nodes
+    """
+    if isinstance(Entities['Nodes'], NodeStorage):
+        return Entities['Nodes']
+    nodes = NodeStorage(Entities['Nodes'])
+    if Options['storage'].upper() == 'ARRAY':
+        Entities['Nodes'] = nodes
+    return nodes
+
+def KeepElementStorage(keep):
+    """
+    This function enables (or disables) the reuse of the temporary storage
+    created by GetElementStorage() from the Entities['Elements'] dictionary,
+    so it is built once while the Elements are not modified, e.g., during
+    CreateRunAnalysisFiles(). The kept storage is discarded in both cases.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    keep : bool
+        True if the temporary storage is to be reused
+
+    Returns
+    -------
+    None
+    """
+    TemporaryStorage.clear()
+    TemporaryStorage['keep'] = keep
+
+def GetElementStorage():
+    """
+    Returns Entities['Elements'] as an ElementStorage. If Options['storage'] is
+    'ARRAY' the dictionary in Entities is replaced by the storage, otherwise a
+    temporary (read-only) storage is created, which is reused for the same 
+    dictionary if KeepElementStorage() is enabled.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    ElementStorage
+        The array-backed Elements
+    """
+    if isinstance(Entities['Elements'], ElementStorage):
+        return Entities['Elements']
+    kept = TemporaryStorage.get('Elements')
+    if kept and kept[0] is Entities['Elements']:
+        return kept[1]
+    elems = ElementStorage(Entities['Elements'])
+    if Options['storage'].upper() == 'ARRAY':
+        Entities['Elements'] = elems
+    elif TemporaryStorage.get('keep'):
+        TemporaryStorage['Elements'] = (Entities['Elements'], elems)
+    return elems
+
+def CommitNodeStorage(nodes):
+    """
+    Writes back the degree of freedom numbering of a temporary NodeStorage into
+    the Entities['Nodes'] dictionary.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    nodes : NodeStorage
+        The storage returned by GetNodeStorage()
+
+    Returns
+    -------
+    None
+    """
+    if Entities['Nodes'] is nodes:
+        return
+    ptr, ndof, free, total = nodes.getDofs()
+    for k, nTag in enumerate(nodes.getTags().tolist()):
+        Entities['Nodes'][nTag]['ndof'] = int(ndof[k])
+        Entities['Nodes'][nTag]['freedof'] = free[ptr[k]:ptr[k+1]].copy()
+        Entities['Nodes'][nTag]['totaldof'] = total[ptr[k]:ptr[k+1]].copy()
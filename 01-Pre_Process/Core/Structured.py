@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+# -*- coding: Utf-8 -*-
+
+import numpy as np
+from collections.abc import MutableMapping
+from Core.Storage import NodeStorage, ElementStorage, CopyAttributes
+from Core.Definitions import Options
+
+#Element nodes (local cell corner numbering) of each element in a structured cell
+StructuredCells = {
+    'LINE2' : [[0,1]],
+    'TRIA3' : [[0,1,3], [1,2,3]],
+    'QUAD4' : [[0,1,2,3]],
+    'TETRA4': [[0,1,2,5], [4,5,7,0], [5,6,7,2], [0,2,7,5], [0,2,7,3]],
+    'HEXA8' : [[0,1,2,3,4,5,6,7]]
+}
+
+#Grid index offsets of the corners of a structured cell
+CellCorners = {
+    1: [[0], [1]],
+    2: [[0,0], [1,0], [1,1], [0,1]],
+    3: [[0,0,0], [1,0,0], [1,1,0], [0,1,0], [0,0,1], [1,0,1], [1,1,1], [0,1,1]]
+}
+
+def NewEntities():
+    """
+    Returns empty Nodes and Elements containers, i.e., NodeStorage and
+    ElementStorage if Options['storage'] is 'ARRAY', dictionaries otherwise.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    if Options['storage'].upper() == 'ARRAY':
+        return NodeStorage(), ElementStorage()
+    return dict(), dict()
+
+def AppendNodes(Nodes, tags, ndof, coords):
+    """
+    Appends a group of Nodes with the same number of degree of freedom.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    Nodes : dict
+        The Nodes container (dict or NodeStorage)
+    tags : array
+        The node identifiers
+    ndof : int
+        Number of degree of freedom per node
+    coords : array
+        The (n,ndim) coordinates of the nodes
+    """
+    if isinstance(Nodes, NodeStorage):
+        Nodes.extend(tags, ndof, coords)
+    else:
+        for tag, xyz in zip(np.asarray(tags).tolist(), coords):
+            Nodes[tag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': xyz}
+
+def AppendElements(Elements, tags, name, conn, attributes):
+    """
+    Appends a group of Elements with the same class name and attributes.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    Elements : dict
+        The Elements container (dict or ElementStorage)
+    tags : array
+        The element identifiers
+    name : str
+        SeismoVLAB element class name
+    conn : array
+        The (m,nconn) element connectivity array
+    attributes : Attributes
+        The (interned) attributes shared by all elements, each element in
+        a dictionary receives its own (modifiable) copy
+    """
+    if isinstance(Elements, ElementStorage):
+        Elements.extend(tags, name.upper(), conn, attributes)
+    else:
+        for tag, nodes in zip(np.asarray(tags).tolist(), conn.tolist()):
+            Elements[tag] = {'name': name.upper(), 'conn': nodes, 'attributes': CopyAttributes(attributes)}
+
+def RemoveIds(index, n, removed):
+    """
+    Removes the given (grid) tags from the n grid entities, and re-numbers the
+    remaining ones as 1,2,... in grid order.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    index : array
+        The current tag of each grid entity, 0 if it was removed (None for all)
+    n : int
+        The number of grid entities
+    removed : array
+        The grid tags to be removed
+
+    Returns
+    -------
+    ids : array
+        The grid tag of each remaining entity
+    index : array
+        The new tag of each grid entity, 0 if it was removed
+    """
+    keep = np.ones(n, dtype=bool) if index is None else index > 0
+    keep[removed - 1] = False
+    index = np.cumsum(keep)
+    index[~keep] = 0
+    return np.flatnonzero(keep) + 1, index
+
+class StructuredDomain(MutableMapping):
+    """
+    Implicit mesh of a structured grid made of linear elements. The node
+    coordinates and element connectivities are functions of the grid origin
+    P0, the grid increments D, and the number of cells ne, hence coordinate,
+    connectivity, boundary and box queries are answered from the grid without
+    creating the Nodes and Elements. The Nodes and Elements removed from the
+    grid (see remove) are kept as masks of the grid, and the operations on the
+    Elements (e.g., the PML attributes) are deferred (see defer). The mesh
+    behaves as the Mesh dictionary returned by the builders: accessing 'Nodes'
+    or 'Elements' materializes them (chunk-by-chunk) in a dict or the array
+    storage, i.e., when they are assigned to the model.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    #Number of entities generated at once during materialization
+    chunk = 262144
+
+    def __init__(self, ndof, name, attributes, P0, D, ne, elems):
+        self.ndof = ndof
+        self.name = name.upper()
+        self.attributes = attributes
+        self.P0 = np.asarray(P0, dtype=float)
+        self.D = [np.asarray(d, dtype=float) for d in D]
+        self.ne = [int(n) for n in ne]
+        self.npts = [n + 1 for n in self.ne]
+        self.cells = np.array(StructuredCells[elems.upper()])
+        self.corners = np.array(CellCorners[len(self.ne)])
+        self.stride = np.cumprod([1] + self.npts[:-1])
+        self.nNodes = int(np.prod(self.npts))
+        self.nElems = int(np.prod(self.ne))*len(self.cells)
+        self.data = dict()
+        self.lazy = True
+
+        #Grid tag of each mesh tag and mesh tag of each grid tag (None if no
+        #entity has been removed, 0 for a removed grid entity)
+        self.nodeIds = None
+        self.nodeMap = None
+        self.elemIds = None
+        self.elemMap = None
+        self.version = 0
+        self.deferred = list()
+
+        #Coordinate axis of each grid direction (None if not axis-aligned)
+        self.axes = list()
+        for d in self.D:
+            axis = np.flatnonzero(d)
+            if len(axis) != 1 or axis[0] in self.axes:
+                self.axes = None
+                break
+            self.axes.append(int(axis[0]))
+
+    def __getitem__(self, key):
+        if self.lazy and key in ('Nodes', 'Elements'):
+            self.materialize()
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        if self.lazy and key in ('Nodes', 'Elements'):
+            self.materialize()
+        self.data[key] = value
+
+    def __delitem__(self, key):
+        if self.lazy and key in ('Nodes', 'Elements'):
+            self.materialize()
+        del self.data[key]
+
+    def __contains__(self, key):
+        return (self.lazy and key in ('Nodes', 'Elements')) or key in self.data
+
+    def __iter__(self):
+        if self.lazy:
+            yield 'Nodes'
+            yield 'Elements'
+        yield from self.data
+
+    def __len__(self):
+        return len(self.data) + 2*self.lazy
+
+    def __repr__(self):
+        return '%s(%s, ne=%s, lazy=%s)' % (self.__class__.__name__, self.name, self.ne, self.lazy)
+
+    def isLazy(self):
+        """
+        Returns True while the Nodes and Elements have not been created
+        """
+        return self.lazy
+
+    def materialize(self):
+        """
+        Creates the Nodes and Elements of the grid in chunks, so that the
+        temporary arrays do not scale with the size of the mesh, then the 
+        deferred operations are applied on the created mesh.
+        """
+        Nodes, Elements = NewEntities()
+        for start in range(0, self.nNodes, self.chunk):
+            nTags = np.arange(start + 1, min(start + self.chunk, self.nNodes) + 1)
+            AppendNodes(Nodes, nTags, self.ndof, self.getCoordinates(nTags))
+        for start in range(0, self.nElems, self.chunk):
+            eTags = np.arange(start + 1, min(start + self.chunk, self.nElems) + 1)
+            AppendElements(Elements, eTags, self.name, self.getConnectivity(eTags), self.attributes)
+
+        self.data = {'Nodes': Nodes, 'Elements': Elements, **self.data}
+        self.lazy = False
+
+        deferred, self.deferred = self.deferred, list()
+        for operation in deferred:
+            operation(self)
+
+    def defer(self, operation):
+        """
+        Defers operation(mesh) until the Nodes and Elements are created, where
+        the operations are applied in the given order
+        """
+        self.deferred.append(operation)
+
+    def remove(self, eTags, nTags, tags=()):
+        """
+        Removes the given elements and nodes from the grid, and re-numbers the
+        remaining ones as 1,2,... in grid order (same as reLabel). The nodes in
+        Boundary are re-numbered as well.
+
+        Returns
+        -------
+        list
+            The new tags of the (remaining) nodes given in tags
+        """
+        eTags = np.fromiter(eTags, dtype=np.int64)
+        nTags = np.fromiter(nTags, dtype=np.int64)
+        tags = np.fromiter(tags, dtype=np.int64)
+
+        #Grid tags of the removed and given entities
+        eGrid = self.getGridElements(eTags)
+        nGrid = self.getGridNodes(nTags)
+        grid = self.getGridNodes(tags)
+        bcs = {name: self.getGridNodes(np.fromiter(bc, dtype=np.int64)) for name, bc in self.data.get('Boundary', {}).items()}
+
+        #Masks of the remaining grid entities
+        self.nodeIds, self.nodeMap = RemoveIds(self.nodeMap, int(np.prod(self.npts)), nGrid)
+        self.elemIds, self.elemMap = RemoveIds(self.elemMap, int(np.prod(self.ne))*len(self.cells), eGrid)
+        self.nNodes = len(self.nodeIds)
+        self.nElems = len(self.elemIds)
+        self.version += 1
+
+        #Re-Numbers Boundary
+        for name, bc in bcs.items():
+            bc = self.getMeshNodes(bc)
+            self.data['Boundary'][name] = bc[bc > 0].tolist()
+
+        return self.getMeshNodes(grid).tolist()
+
+    def getGridNodes(self, nTags):
+        """
+        Returns the grid tags of the given node tags
+        """
+        nTags = np.asarray(nTags, dtype=np.int64)
+        return nTags if self.nodeIds is None else self.nodeIds[nTags - 1]
+
+    def getMeshNodes(self, gTags):
+        """
+        Returns the node tags of the given grid tags (0 if it was removed)
+        """
+        gTags = np.asarray(gTags, dtype=np.int64)
+        return gTags if self.nodeMap is None else self.nodeMap[gTags - 1]
+
+    def getGridElements(self, eTags):
+        """
+        Returns the grid tags of the given element tags
+        """
+        eTags = np.asarray(eTags, dtype=np.int64)
+        return eTags if self.elemIds is None else self.elemIds[eTags - 1]
+
+    def getMeshElements(self, gTags):
+        """
+        Returns the element tags of the given grid tags (0 if it was removed)
+        """
+        gTags = np.asarray(gTags, dtype=np.int64)
+        return gTags if self.elemMap is None else self.elemMap[gTags - 1]
+
+    def getIndices(self, nTags):
+        """
+        Returns the grid indices in each direction of the given node tags
+        """
+        index = np.unravel_index(np.asarray(nTags, dtype=np.int64) - 1, self.npts[::-1])
+        return list(index[::-1])
+
+    def getGridTags(self, index):
+        """
+        Returns the (sorted) node tags of the tensor product of the grid indices
+        given in each direction
+        """
+        grids = np.meshgrid(*index[::-1], indexing='ij')[::-1]
+        tags = np.ones(grids[0].size, dtype=np.int64)
+        for grid, stride in zip(grids, self.stride):
+            tags += stride*grid.ravel()
+        return tags
+
+    def getCoordinates(self, nTags=None):
+        """
+        Returns the (n,ndim) coordinates of the given node tags (all if None)
+        """
+        if nTags is None:
+            nTags = np.arange(1, self.nNodes + 1)
+        index = self.getIndices(self.getGridNodes(nTags))
+        coords = np.tile(self.P0, (len(index[0]), 1))
+        for m in range(len(self.D)):
+            coords = coords + index[m].reshape(-1,1)*self.D[m]
+        return coords
+
+    def getConnectivity(self, eTags=None):
+        """
+        Returns the (m,nconn) connectivity array of the given element tags (all if None)
+        """
+        if eTags is None:
+            eTags = np.arange(1, self.nElems + 1)
+        cell, sub = np.divmod(self.getGridElements(eTags) - 1, len(self.cells))
+        index = np.unravel_index(cell, self.ne[::-1])[::-1]
+        base = np.ones(len(cell), dtype=np.int64)
+        for m in range(len(self.ne)):
+            base += self.stride[m]*index[m]
+        corners = base.reshape(-1,1) + self.corners.dot(self.stride)
+        return self.getMeshNodes(np.take_along_axis(corners, self.cells[sub], axis=1))
+
+    def getLine(self, m):
+        """
+        Returns the coordinate of the grid points along direction m (axis-aligned grids)
+        """
+        a = self.axes[m]
+        return self.P0[a] + np.arange(self.npts[m])*self.D[m][a]
+
+    def getBoundary(self, planes):
+        """
+        Finds the nodes beyond the planes that bound the grid in each coordinate
+        axis, i.e., planes[a] = ((upperName, upper), (lowerName, lower)). A node
+        is on the upper boundary if x[a] - upper > 0.0, otherwise on the lower
+        boundary if lower - x[a] > 0.0 (same as Find3DBoundaries).
+
+        Returns
+        -------
+        Boundary : dict
+            The list of nodes on each named boundary
+        """
+        Boundary = dict()
+        if self.axes is not None:
+            for a, ((upName, upper), (loName, lower)) in enumerate(planes):
+                if a in self.axes:
+                    m = self.axes.index(a)
+                    x = self.getLine(m)
+                else:
+                    m = None
+                    x = np.full(1, self.P0[a])
+                up = x - upper > 0.0
+                lo = ~up & (lower - x > 0.0)
+                for name, mask in ((upName, up), (loName, lo)):
+                    if m is None:
+                        tags = np.arange(1, self.nNodes + 1) if mask[0] else np.empty(0, dtype=np.int64)
+                    else:
+                        index = [np.arange(n) for n in self.npts]
+                        index[m] = np.flatnonzero(mask)
+                        tags = self.getMeshNodes(self.getGridTags(index))
+                        tags = tags[tags > 0]
+                    Boundary[name] = tags
+        else:
+            found = {name: list() for plane in planes for name, _ in plane}
+            for start in range(0, self.nNodes, self.chunk):
+                nTags = np.arange(start + 1, min(start + self.chunk, self.nNodes) + 1)
+                xn = self.getCoordinates(nTags)
+                for a, ((upName, upper), (loName, lower)) in enumerate(planes):
+                    up = xn[:,a] - upper > 0.0
+                    lo = ~up & (lower - xn[:,a] > 0.0)
+                    found[upName].append(nTags[up])
+                    found[loName].append(nTags[lo])
+            Boundary = {name: np.concatenate(found[name]) for name in found}
+
+        #Sets are filled in ascending tag order as the Nodes are traversed
+        return {name: list(set(Boundary[name].tolist())) for name in Boundary}
+
+    def getBoxElements(self, x0, xl):
+        """
+        Finds the elements with at least one node inside the box |x - x0| <= xl.
+        Only the cells that intersect the box are visited when the grid is
+        axis-aligned.
+
+        Returns
+        -------
+        eTags : array
+            The element tags (sorted) with at least one node inside the box
+        conn : array
+            The connectivity of these elements
+        inside : array
+            Boolean array that marks the element nodes inside the box
+        """
+        x0 = np.asarray(x0, dtype=float)
+        xl = np.asarray(xl, dtype=float)
+
+        if self.axes is not None:
+            #Cells that have a corner inside the box in every direction
+            index = list()
+            for m in range(len(self.ne)):
+                a = self.axes[m]
+                mask = np.abs(self.getLine(m) - x0[a]) <= xl[a]
+                index.append(np.flatnonzero(mask[:-1] | mask[1:]))
+            for a in range(len(self.P0)):
+                if a not in self.axes and not np.abs(self.P0[a] - x0[a]) <= xl[a]:
+                    index[0] = index[0][:0]
+            grids = np.meshgrid(*index[::-1], indexing='ij')[::-1]
+            cell = np.zeros(grids[0].size, dtype=np.int64)
+            for m, grid in enumerate(grids):
+                cell += int(np.prod(self.ne[:m]))*grid.ravel()
+            eTags = self.getMeshElements((len(self.cells)*cell.reshape(-1,1) + np.arange(1, len(self.cells) + 1)).ravel())
+            chunks = [eTags[eTags > 0]]
+        else:
+            chunks = [np.arange(start + 1, min(start + self.chunk, self.nElems) + 1) for start in range(0, self.nElems, self.chunk)]
+
+        found = list()
+        for eTags in chunks:
+            conn = self.getConnectivity(eTags)
+            xn = self.getCoordinates(conn.ravel())
+            inside = np.all(np.abs(xn - x0) <= xl, axis=1).reshape(conn.shape)
+            cond = inside.any(axis=1)
+            found.append((eTags[cond], conn[cond], inside[cond]))
+
+        if not found:
+            nconn = self.cells.shape[1]
+            return np.zeros(0, dtype=np.int64), np.zeros((0, nconn), dtype=np.int64), np.zeros((0, nconn), dtype=bool)
+
+        eTags, conn, inside = zip(*found)
+        return np.concatenate(eTags), np.concatenate(conn), np.concatenate(inside)
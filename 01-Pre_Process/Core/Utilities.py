@@ -6,8 +6,11 @@ import sys
 import copy
 import atexit
 import inspect
+import multiprocessing
 import numpy as np
 from datetime import date
+from Core.Storage import AttributeTable
+from Core.Spatial import SpatialTable
 from Core.Definitions import Entities, Options, ConvergeTest, SolverOption
 
 @atexit.register
@@ -42,6 +45,8 @@ def cleanAll():
     #Sets the Entities to empty dictionaries
     for key in Entities:
         Entities[key] = {}
+    AttributeTable.clear()
+    SpatialTable.clear()
 
     #Sets the Options to pre-defined values
     metis = Options['metispath']
@@ -60,9 +65,17 @@ def cleanAll():
     Options['description'] = '\n'
     Options['allocation' ] = 'NO'
     Options['numbering'  ] = 'Plain'
+    Options['ownership'  ] = 'Plain'
+    Options['partitioner'] = 'Metis'
+    Options['costs'      ] = {}
+    Options['migration'  ] = 0.0
     Options['massform'   ] = 'Consistent'
+    Options['storage'    ] = 'Dict'
+    Options['jsonformat' ] = 'Indented'
+    Options['cache'      ] = 'NO'
     Options['updatemode' ] = 'Restartable'
     Options['nparts'     ] =  1
+    Options['nworkers'   ] =  0
     Options['execfiles'  ] = []
     Options['dimension'  ] =  0
     Options['nfree'      ] =  0
@@ -75,8 +88,12 @@ def cleanAll():
     Options['nwarnings'  ] =  0
     Options['d_nz'       ] = []
     Options['o_nz'       ] = []
+    Options['d_nnz'      ] = []
+    Options['o_nnz'      ] = []
+    Options['nfillin'    ] = []
+    Options['ownrange'   ] = []
     Options['partition'  ] = []
-    Options['clustermap' ] = []
+    Options['clustermap' ] = {}
     Options['preanalysis'] = preanalysis
     Options['runanalysis'] = runanalysis
     setFilePath()
@@ -165,6 +182,37 @@ def debugInfo(level):
 
     return info
 
+def printSummary(info, title, problems, nmax=10):
+    """
+    Prints in a single ALERT all problems found during a bulk operation, i.e.,
+    a group of identifiers for each kind of problem.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    info : struc
+        Structure containing information of the function called (debugInfo)
+    title : str
+        The name of the bulk operation
+    problems : dict
+        Description of each problem (key) with the list of identifiers (value)
+    nmax : int
+        Maximum number of identifiers printed for each problem
+
+    Returns
+    -------
+    None
+    """
+    nProblems = sum(len(tags) for tags in problems.values())
+    print('\x1B[33m ALERT \x1B[0m: In file=\'%s\' at line=%d %s has %d problem(s):' %(info.filename,info.lineno,title,nProblems))
+    for message in problems:
+        tags = list(problems[message])
+        shown = ', '.join(str(tag) for tag in tags[:nmax])
+        if len(tags) > nmax:
+            shown += ', ...'
+        print('    %d %s: [%s]' % (len(tags), message, shown))
+
 def printFormatted(d, indent=0):
     """
     Format and print the given dictionary\n
@@ -270,6 +318,32 @@ def setFileExtension(filename='', extension=''):
                 filename += extension
     return filename
 
+def getNumberOfWorkers(ntasks):
+    """
+    This function returns the number of worker processes to be forked for the
+    given number of tasks according to Options['nworkers'], which by default
+    is 0 (all cores). If process fork is not available in this platform, the
+    tasks are executed serially.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    ntasks : int
+        The number of tasks to be executed
+
+    Returns
+    -------
+    int
+        The number of worker processes (1: serial execution)
+    """
+    nworkers = Options['nworkers'] if Options['nworkers'] > 0 else os.cpu_count()
+    nworkers = max(min(nworkers, ntasks), 1)
+    if nworkers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+        print('\x1B[33m ALERT \x1B[0m: The tasks are executed serially, process fork is not available in this platform.')
+        nworkers = 1
+    return nworkers
+
 def ExecuteRunAnalysis():
     """
     This function generates a string containing the command line to be run in terminal\n
@@ -333,7 +407,9 @@ def saveAs(filename='output'):
     pyFile.write("#User's (pre-defined) options\n")
     pyFile.write("SVL.Options[\'file\'     ] = \'%s\'\n" % Options['file'])
     pyFile.write("SVL.Options[\'numbering\'] = \'%s\'\n" % Options['numbering'].upper())
+    pyFile.write("SVL.Options[\'ownership\'] = \'%s\'\n" % Options['ownership'].upper())
     pyFile.write("SVL.Options[\'massform\' ] = \'%s\'\n" % Options['massform'].upper())
+    pyFile.write("SVL.Options[\'partitioner\'] = \'%s\'\n" % Options['partitioner'].upper())
     pyFile.write("SVL.Options[\'metispath\'] = \'%s\'\n" % Options['metispath'])
     pyFile.write("SVL.Options[\'nparts\'   ] = %d\n" % Options['nparts'])
     pyFile.write("SVL.Options[\'dimension\'] = %d\n" % Options['dimension'])
@@ -2,7 +2,8 @@
 # -*- coding: Utf-8 -*-
 
 import numpy as np
-from Core.Utilities import debugInfo
+from Core.Utilities import debugInfo, printSummary
+from Core.Storage import GetNodeStorage, GetElementStorage, FindTags, InternAttributes, CopyAttributes
 from Method.Remove import delConstraint
 from Method.Compute import GenerateFiberSection
 from Core.Definitions import Entities, Options, ConvergeTest, SolverOption
@@ -31,6 +32,10 @@ def addNode(tag=np.nan, ndof=0, coords=[], freedof=[], totaldof=[]):
     bool
         Whether the addition was successful (True) of failed (False)
     """
+    #Nodes are appended to the array-backed storage
+    if Options['storage'].upper() == 'ARRAY':
+        GetNodeStorage()
+
     #Check whether the Node exists
     if tag not in Entities['Nodes']:
         #Create the total/free list
@@ -44,6 +49,74 @@ def addNode(tag=np.nan, ndof=0, coords=[], freedof=[], totaldof=[]):
         print('\x1B[33m ALERT \x1B[0m: In file=\'%s\' at line=%d Node[%d] has been already defined.' %(info.filename,info.lineno,tag))
         return False
 
+def addNodes(tag=[], ndof=0, coords=[], freedof=[], totaldof=[]):
+    """
+    Appends a group of new Nodes to the model. The group is validated at once
+    and all problems found are reported in a single summary.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    tag : array
+        The identifiers of the nodes, i.e., tag > -1
+    ndof : int or array
+        Number of degree of freedom of all nodes or of each node, i.e., ndof > 0
+    coords : array
+        The (n,ndim) coordinates of the nodes
+    freedof : array
+        The (n,ndof) free degree of freedom numbering of the nodes (same ndof)
+    totaldof : array
+        The (n,ndof) total degree of freedom numbering of the nodes (same ndof)
+
+    Returns
+    -------
+    bool
+        Whether the additions were successful (True) of some failed (False)
+    """
+    tags   = np.asarray(tag, dtype=int).ravel()
+    coords = np.asarray(coords, dtype=float).reshape(len(tags), -1)
+    ndof   = np.broadcast_to(np.asarray(ndof, dtype=int), tags.shape)
+
+    #Create the total/free arrays (only for same ndof)
+    free  = np.asarray(freedof , dtype=int).reshape(len(tags), -1) if len(freedof ) else np.zeros((len(tags), ndof.max(initial=0)), dtype=int)
+    total = np.asarray(totaldof, dtype=int).reshape(len(tags), -1) if len(totaldof) else np.zeros((len(tags), ndof.max(initial=0)), dtype=int)
+
+    #Validates the group of Nodes
+    problems = dict()
+    first = np.zeros(len(tags), dtype=bool)
+    first[np.unique(tags, return_index=True)[1]] = True
+    problems['Node tags are repeated'] = tags[~first]
+
+    exists = FindTags(Entities['Nodes'], tags)
+    problems['Node have been already defined'] = tags[exists]
+
+    wrong = ndof < 1
+    problems['Node have ndof < 1'] = tags[wrong]
+
+    if len(freedof) or len(totaldof):
+        wrong |= ndof != free.shape[1]
+        wrong |= ndof != total.shape[1]
+        problems['Node have ndof different to freedof/totaldof'] = tags[(ndof != free.shape[1]) | (ndof != total.shape[1])]
+
+    #Appends the valid Nodes
+    valid = first & ~exists & ~wrong
+    if Options['storage'].upper() == 'ARRAY':
+        free  = free[valid].ravel()  if len(freedof ) else None
+        total = total[valid].ravel() if len(totaldof) else None
+        GetNodeStorage().extend(tags[valid], ndof[valid], coords[valid], free, total)
+    else:
+        for k in np.flatnonzero(valid):
+            n = ndof[k]
+            Entities['Nodes'][int(tags[k])] = {'ndof': int(n), 'freedof': free[k,:n].copy(), 'totaldof': total[k,:n].copy(), 'coords': coords[k].copy()}
+
+    #Reports all problems found
+    problems = {message: problems[message] for message in problems if len(problems[message]) > 0}
+    if problems:
+        printSummary(debugInfo(2), 'addNodes', problems)
+        return False
+    return True
+
 def addMass(tag=np.nan, dof=[], vals=[]):
     """
     Add mass to a Node in specific degree-of-freedom\n
@@ -136,6 +209,66 @@ def addRestrain(tag=np.nan, dof=[]):
         Entities['Nodes'][tag]['freedof'][n] = -1
     return True
 
+def addRestrains(tag=[], dof=[]):
+    """
+    Specifies a restrain applied to a group of Nodes. The group is validated at
+    once and all problems found are reported in a single summary.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    tag : array
+        The identifiers of the nodes, i.e., tag > -1
+    dof : int or list
+        Number or list of degree of freedom to be restrained in all nodes.
+
+    Returns
+    -------
+    bool
+        Whether the Restrains were successful (True) of some failed (False)
+    """
+    #Transform to zero base index
+    tags = np.asarray(tag, dtype=int).ravel()
+    dofs = np.atleast_1d(np.asarray(dof, dtype=int)) - 1
+
+    #Validates the group of Nodes
+    problems = dict()
+    exists = FindTags(Entities['Nodes'], tags)
+    problems['Node have not been defined'] = tags[~exists]
+
+    ndof = np.array([Entities['Nodes'][nTag]['ndof'] for nTag in tags[exists].tolist()], dtype=int)
+    bound = np.all((dofs[None,:] < ndof[:,None]) & (dofs[None,:] > -1), axis=1)
+    problems['Node have dof out-of-bound'] = tags[exists][~bound]
+    valid = tags[exists][bound].tolist()
+
+    #Gathers the (free) degree of freedom to be restrained
+    if Options['storage'].upper() == 'ARRAY':
+        nodes = GetNodeStorage()
+        index = nodes.dofstart[nodes.getRows(valid)][:,None] + dofs[None,:]
+        FreeDofs = nodes.freedof[index]
+    else:
+        FreeDofs = np.array([Entities['Nodes'][nTag]['freedof'][dofs] for nTag in valid], dtype=int).reshape(len(valid), len(dofs))
+
+    #The constraint is not applied if degree-of-freedom was restrained
+    failed = len(problems['Node have not been defined']) + len(problems['Node have dof out-of-bound']) > 0
+    cTags = np.unique(FreeDofs[FreeDofs < -1])
+    problems['Constraint removed, the restrain will be enforced'] = cTags
+    for cTag in cTags.tolist():
+        delConstraint(tag=cTag)
+
+    if Options['storage'].upper() == 'ARRAY':
+        nodes.freedof[index] = -1
+    else:
+        for nTag in valid:
+            Entities['Nodes'][nTag]['freedof'][dofs] = -1
+
+    #Reports all problems found
+    problems = {message: problems[message] for message in problems if len(problems[message]) > 0}
+    if problems:
+        printSummary(debugInfo(2), 'addRestrains', problems)
+    return not failed
+
 def addConstraint(tag=np.nan, name='Unknown', attributes={}):
     """
     Specifies a constraint applied to a degree of freedom\n
@@ -498,6 +631,10 @@ def addElement(tag=np.nan, name='Unknown', conn=[], attributes={}):
     if 'rule' in attributes:
         attributes['rule'] = attributes['rule'].upper()
         
+    #Elements are appended to the array-backed storage
+    if Options['storage'].upper() == 'ARRAY':
+        GetElementStorage()
+
     #Check whether the Element exists
     if tag not in Entities['Elements']:
         Entities['Elements'][tag] = {'name': name.upper(), 'conn': conn, 'attributes': attributes}
@@ -507,6 +644,93 @@ def addElement(tag=np.nan, name='Unknown', conn=[], attributes={}):
         print('\x1B[33m ALERT \x1B[0m: In file=\'%s\' at line=%d Element[%s] has been already defined.' %(info.filename,info.lineno,tag))
         return False
 
+def addElements(tag=[], name='Unknown', conn=[], attributes={}):
+    """
+    Appends a group of new Elements to the model. The group is validated at
+    once and all problems found are reported in a single summary.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    tag : array
+        The identifiers of the elements, i.e., tag > -1
+    name : str or list
+        Seismo-VLAB element class name of all elements or of each element
+    conn : array or list
+        The (n,nconn) connectivity array or the list of connectivity arrays
+    attributes : dict or list
+        Specific properties shared by all elements or for each element. In
+        the array-backed storage the attributes are interned, i.e., shared by
+        elements with same values, otherwise each element owns a copy
+
+    Returns
+    -------
+    bool
+        Whether the additions were successful (True) of some failed (False)
+    """
+    tags = np.asarray(tag, dtype=int).ravel()
+    names = [name.upper()]*len(tags) if isinstance(name, str) else [n.upper() for n in name]
+    attributes = [attributes]*len(tags) if isinstance(attributes, dict) else list(attributes)
+
+    #Connectivity in CSR-style arrays
+    if isinstance(conn, np.ndarray) and conn.ndim == 2:
+        nconn = np.full(len(tags), conn.shape[1], dtype=int)
+        flat = conn.ravel().astype(int)
+    else:
+        nconn = np.array([len(c) for c in conn], dtype=int)
+        flat = np.fromiter((x for c in conn for x in c), dtype=int, count=nconn.sum())
+    ptr = np.zeros(len(tags) + 1, dtype=int)
+    np.cumsum(nconn, out=ptr[1:])
+
+    #Validates the group of Elements
+    problems = dict()
+    first = np.zeros(len(tags), dtype=bool)
+    first[np.unique(tags, return_index=True)[1]] = True
+    problems['Element tags are repeated'] = tags[~first]
+
+    exists = FindTags(Entities['Elements'], tags)
+    problems['Element have been already defined'] = tags[exists]
+
+    missing = ~FindTags(Entities['Nodes'], flat)
+    dangling = np.zeros(len(tags), dtype=bool)
+    dangling[np.repeat(np.arange(len(tags)), nconn)[missing]] = True
+    problems['Element have undefined Nodes'] = tags[dangling]
+
+    #Appends the valid Elements
+    valid = np.flatnonzero(first & ~exists & ~dangling)
+
+    #Normalizes a copy of each (distinct) attribute dictionary once, elements
+    #with the same attributes share a single (interned) object
+    interned = dict()
+    for attribute in {id(attributes[k]): attributes[k] for k in valid.tolist()}.values():
+        normalized = dict(attribute)
+        if 'model' in normalized:
+            normalized['model'] = normalized['model'].upper()
+        if 'dir' in normalized:
+            normalized['dir'] -= 1
+        if 'rule' in normalized:
+            normalized['rule'] = normalized['rule'].upper()
+        interned[id(attribute)] = InternAttributes(normalized)
+    attributes = [interned.get(id(attribute)) for attribute in attributes]
+
+    if Options['storage'].upper() == 'ARRAY':
+        #Connectivity positions of the valid elements
+        count = nconn[valid]
+        offset = np.cumsum(count) - count
+        index = np.repeat(ptr[valid] - offset, count) + np.arange(count.sum())
+        GetElementStorage().extend(tags[valid], [names[k] for k in valid], np.split(flat[index], np.cumsum(count)[:-1]), [attributes[k] for k in valid])
+    else:
+        for k in valid:
+            Entities['Elements'][int(tags[k])] = {'name': names[k], 'conn': flat[ptr[k]:ptr[k+1]].tolist(), 'attributes': CopyAttributes(attributes[k])}
+
+    #Reports all problems found
+    problems = {message: problems[message] for message in problems if len(problems[message]) > 0}
+    if problems:
+        printSummary(debugInfo(2), 'addElements', problems)
+        return False
+    return True
+
 def addSurface(tag=np.nan, etag=-1, conn=[]):
     """
     Appends a surface for an specific element\n
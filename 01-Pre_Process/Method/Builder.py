@@ -3,30 +3,53 @@
 
 import copy
 import numpy as np
-from Core.Utilities import debugInfo
+from Core.Utilities import debugInfo, printSummary
+from Core.Storage import NodeStorage, ElementStorage, AttributeView, InternAttributes, AttributeKey, CopyAttributes
+from Core.Structured import StructuredDomain, StructuredCells, NewEntities, AppendNodes, AppendElements
+from Core.Spatial import GetSpatialIndex, MeshConnectivity, SegmentSum, ClassifyBox, GetDRMSets
 from Core.Definitions import Options
 
 def reLabel(mesh):
     """
+    Re-numbers the Nodes and Elements of the mesh as 1,2,... in insertion order,
+    and updates the connectivity, boundaries and constraints accordingly. The
+    array-backed storages are re-numbered in place (in bulk).\n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2020
     """
     #Re-Numbers Nodes
-    tag = 0
-    nMap  = dict()
-    nodes = dict()
-    for nTag in mesh['Nodes']:
-        tag += 1
-        nMap[nTag] = tag
-        nodes[tag] = mesh['Nodes'][nTag]          
+    if isinstance(mesh['Nodes'], NodeStorage):
+        nodes = mesh['Nodes']
+        oTags = nodes.renumber()
+        nMap = dict(zip(oTags.tolist(), range(1, len(oTags) + 1)))
+    else:
+        tag = 0
+        nMap  = dict()
+        nodes = dict()
+        for nTag in mesh['Nodes']:
+            tag += 1
+            nMap[nTag] = tag
+            nodes[tag] = mesh['Nodes'][nTag]          
+        oTags = np.fromiter(nMap.keys(), dtype=np.int64, count=len(nMap))
 
     #Re-Numbers Elements
-    tag = 0
-    elems = dict()
-    for eTag in mesh['Elements']:
-        tag += 1
-        elems[tag] = mesh['Elements'][eTag]
-        elems[tag]['conn'] = [nMap[x] for x in elems[tag]['conn']]
+    if isinstance(mesh['Elements'], ElementStorage):
+        elems = mesh['Elements']
+        elems.renumber()
+        _, conn = elems.getConnectivity()
+        order = np.argsort(oTags, kind='stable')
+        pos = np.minimum(np.searchsorted(oTags[order], conn), max(len(oTags) - 1, 0))
+        missing = oTags[order][pos] != conn if len(oTags) else np.ones(len(conn), dtype=bool)
+        if np.any(missing):
+            raise KeyError(int(conn[missing][0]))
+        conn[:] = order[pos] + 1
+    else:
+        tag = 0
+        elems = dict()
+        for eTag in mesh['Elements']:
+            tag += 1
+            elems[tag] = mesh['Elements'][eTag]
+            elems[tag]['conn'] = [nMap[x] for x in elems[tag]['conn']]
 
     #Re-Numbers Interface
     if 'Boundary' in mesh:
@@ -34,7 +57,7 @@ def reLabel(mesh):
         for name in mesh['Boundary']:
             nTags = list()
             for nTag in mesh['Boundary'][name]:
-                if nTag in mesh['Nodes']:
+                if nTag in nMap:
                     nTags.append(nMap[nTag])
             bcs[name] = nTags
 
@@ -50,10 +73,85 @@ def reLabel(mesh):
     #New Labels
     mesh['Nodes'] = nodes
     mesh['Elements'] = elems
-    mesh['Boundary'] = bcs
+    if 'Boundary' in mesh:
+        mesh['Boundary'] = bcs
 
     return nMap
 
+def GridCoordinates(P0, D, a):
+    """
+    Computes the coordinates of a structured grid, i.e., P0 + a0*D0 + a1*D1 + ...
+    where the first direction is the fastest varying (inner loop).\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    P0 : array
+        The origin point of the grid
+    D : list
+        The grid increment vector in each direction
+    a : list
+        The (fractional) grid indices in each direction
+
+    Returns
+    -------
+    coords : array
+        The (n,ndim) coordinates of the grid points
+    """
+    grids = np.meshgrid(*a[::-1], indexing='ij')[::-1]
+    coords = np.tile(np.asarray(P0), (grids[0].size, 1))
+    for m in range(len(D)):
+        coords = coords + grids[m].reshape(-1,1)*D[m]
+    return coords
+
+def GridIndices(*n):
+    """
+    Returns the raveled (i, j, k, ...) indices of a structured grid with n[0]
+    points in the first (fastest varying) direction, n[1] in the second, etc.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    grids = np.meshgrid(*[np.arange(m) for m in n[::-1]], indexing='ij')[::-1]
+    return [grid.ravel() for grid in grids]
+
+def StructuredMesh(ndof, coords, name, conn, attributes, nTags=None):
+    """
+    Creates the Mesh dictionary from the arrays generated by the structured
+    grid generators. When Options['storage'] is 'ARRAY' the Nodes and
+    Elements are bulk-inserted in the array-backed storage.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    ndof : int
+        Number of degree of freedom per node
+    coords : array
+        The (n,ndim) coordinates of the nodes
+    name : str
+        SeismoVLAB element class name for the generated elements
+    conn : array
+        The (m,nconn) element connectivity array
+    attributes : Attributes
+        The (interned) attributes shared by all elements
+    nTags : array
+        The node identifiers in the same order as coords (1,2,... if None)
+
+    Returns
+    -------
+    Mesh : dict
+        A dictionary that contains nodes and element with the same structure as Entities
+    """
+    nTags = np.arange(1, len(coords) + 1) if nTags is None else np.asarray(nTags)
+    eTags = np.arange(1, len(conn) + 1)
+
+    Nodes, Elements = NewEntities()
+    AppendNodes(Nodes, nTags, ndof, coords)
+    AppendElements(Elements, eTags, name, conn, attributes)
+
+    return {'Nodes': Nodes, 'Elements': Elements}
+
 def makeDomainVolume(options={}):
     """
     Creates a volume domain (in 3D) with specified parameters is option.\n
@@ -81,7 +179,11 @@ def makeDomainVolume(options={}):
     Returns
     -------
     Mesh : dict
-        A dictionary that contains nodes and element with the same structure as Entities
+        A dictionary that contains nodes and element with the same structure as Entities,
+        i.e., NodeStorage and ElementStorage if Options['storage'] is 'ARRAY'
+        A StructuredDomain is returned for linear elements, i.e., the nodes and
+        elements are created when 'Nodes' or 'Elements' are first accessed
+        (e.g., when they are assigned to Entities)
     """
     #Defines an empty Mesh dictionary
     Mesh = {'Nodes': {}, 'Elements': {}}
@@ -92,6 +194,12 @@ def makeDomainVolume(options={}):
         print('\x1B[33m ALERT \x1B[0m: In file=\'%s\' at line=%d makeDomainVolume(attributes=?) must be specified.' %(info.filename,info.lineno))
         exit(-1)
 
+    #Check the element type can be meshed
+    if options['elems'].upper() not in ('TETRA4', 'TETRA10', 'HEXA8', 'HEXA20'):
+        info = debugInfo(2)
+        print('\x1B[33m ALERT \x1B[0m: In file=\'%s\' at line=%d makeDomainVolume() options[\'elems\']=\'%s\' is not supported, i.e., TETRA4, TETRA10, HEXA8, HEXA20.' %(info.filename,info.lineno,options['elems']))
+        exit(-1)
+
     if 'attributes' not in options:
         if options['elems'].upper() == 'TETRA4':
             options['class'] = 'LIN3DTETRA4'
@@ -111,6 +219,9 @@ def makeDomainVolume(options={}):
             options['attributes']['rule'] = options['attributes']['rule'].upper()
         attributes = options['attributes']
 
+    #Elements share a single (interned) attributes object
+    attributes = InternAttributes(attributes)
+
     #Unpack attribute provided by the user
     ndof = options['ndof']
     name = options['class']
@@ -131,106 +242,62 @@ def makeDomainVolume(options={}):
     DY = (P2 - P0)/ny
     DZ = (P3 - P0)/nz
 
-    #Defines the primary grid
-    tag = 0
-    for k in range(nz+1):
-        for j  in range(ny+1):
-            for i in range(nx+1):
-                tag += 1
-                coords = P0 + i*DX + j*DY + k*DZ
-                Mesh['Nodes'][tag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
-
-    if options['elems'].upper() == 'TETRA4':
-        #Defines the Elements in Mesh
-        tag = 0
-        for k  in range(nz):
-            for j  in range(ny):
-                for i in range(nx):
-                    n1 = (nx+1)*(ny+1)*k + j*(nx+1) + i + 1
-                    n2 = (nx+1)*(ny+1)*k + j*(nx+1) + i + 2
-                    n3 = (nx+1)*(ny+1)*k + (j+1)*(nx+1) + i + 2
-                    n4 = (nx+1)*(ny+1)*k + (j+1)*(nx+1) + i + 1
-                    n5 = (nx+1)*(ny+1)*(k+1) + j*(nx+1) + i + 1
-                    n6 = (nx+1)*(ny+1)*(k+1) + j*(nx+1) + i + 2
-                    n7 = (nx+1)*(ny+1)*(k+1) + (j+1)*(nx+1) + i + 2
-                    n8 = (nx+1)*(ny+1)*(k+1) + (j+1)*(nx+1) + i + 1
-
-                    tag += 1; Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n1,n2,n3,n6], 'attributes': copy.deepcopy(attributes)}
-                    tag += 1; Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n5,n6,n8,n1], 'attributes': copy.deepcopy(attributes)}
-                    tag += 1; Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n6,n7,n8,n3], 'attributes': copy.deepcopy(attributes)}
-                    tag += 1; Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n1,n3,n8,n6], 'attributes': copy.deepcopy(attributes)}
-                    tag += 1; Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n1,n3,n8,n4], 'attributes': copy.deepcopy(attributes)}
-    elif options['elems'].upper() == 'TETRA10':
-        #Creates the secondary 3D grid
-        #TODO: Implement this feature
-        pass
-    elif options['elems'].upper() == 'HEXA8':   
-        #Defines the Elements in Mesh
-        tag = 0
-        for k  in range(nz):
-            for j  in range(ny):
-                for i in range(nx):
-                    tag += 1
-                    n1 = (nx+1)*(ny+1)*k + j*(nx+1) + i + 1
-                    n2 = (nx+1)*(ny+1)*k + j*(nx+1) + i + 2
-                    n3 = (nx+1)*(ny+1)*k + (j+1)*(nx+1) + i + 2
-                    n4 = (nx+1)*(ny+1)*k + (j+1)*(nx+1) + i + 1
-                    n5 = (nx+1)*(ny+1)*(k+1) + j*(nx+1) + i + 1
-                    n6 = (nx+1)*(ny+1)*(k+1) + j*(nx+1) + i + 2
-                    n7 = (nx+1)*(ny+1)*(k+1) + (j+1)*(nx+1) + i + 2
-                    n8 = (nx+1)*(ny+1)*(k+1) + (j+1)*(nx+1) + i + 1
-                
-                    Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n1, n2, n3, n4, n5, n6, n7, n8], 'attributes': copy.deepcopy(attributes)}
-    elif options['elems'].upper() == 'HEXA20':
-        #Creates the secondary 3D grid
-        for k in range(nz+1):
-            for j in range(ny+1):
-                for i in range(nx):
-                    mtag = tag + (nx*(ny+1) + ny*(nx+1))*k + (2*nx + 1)*j + i + 1
-                    coords = P0 + 0.5*(2*i+1)*DX + j*DY + k*DZ
-                    Mesh['Nodes'][mtag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
-        for k in range(nz+1):
-            for j in range(ny):
-                for i in range(nx+1):
-                    mtag = tag + (nx*(ny+1) + ny*(nx+1))*k + nx + (2*nx + 1)*j + i + 1
-                    coords = P0 + i*DX + 0.5*(2*j+1)*DY + k*DZ
-                    Mesh['Nodes'][mtag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
-        mtag = tag + (nx*(ny+1) + ny*(nx+1))*(nz+1)
-        for k in range(nz):
-            for j  in range(ny+1):
-                for i in range(nx+1):
-                    mtag += 1
-                    coords = P0 + i*DX + j*DY + 0.5*(2*k+1)*DZ
-                    Mesh['Nodes'][mtag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
-
-        #Defines the Elements in Mesh
-        tag = 0
-        for k  in range(nz):
-            for j  in range(ny):
-                for i in range(nx):
-                    tag += 1
-                    n1 = (nx+1)*(ny+1)*k + j*(nx+1) + i + 1
-                    n2 = (nx+1)*(ny+1)*k + j*(nx+1) + i + 2
-                    n3 = (nx+1)*(ny+1)*k + (j+1)*(nx+1) + i + 2
-                    n4 = (nx+1)*(ny+1)*k + (j+1)*(nx+1) + i + 1
-                    n5 = (nx+1)*(ny+1)*(k+1) + j*(nx+1) + i + 1
-                    n6 = (nx+1)*(ny+1)*(k+1) + j*(nx+1) + i + 2
-                    n7 = (nx+1)*(ny+1)*(k+1) + (j+1)*(nx+1) + i + 2
-                    n8 = (nx+1)*(ny+1)*(k+1) + (j+1)*(nx+1) + i + 1
-                    n9 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*k + (2*nx + 1)*j + i + 1
-                    n10 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*k + nx + (2*nx + 1)*j + i + 2
-                    n11 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*k + (2*nx + 1)*(j+1) + i + 1
-                    n12 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*k + nx + (2*nx + 1)*j + i + 1
-                    n13 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*(k+1) + (2*nx + 1)*j + i + 1
-                    n14 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*(k+1) + nx + (2*nx + 1)*j + i + 2
-                    n15 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*(k+1) + (2*nx + 1)*(j+1) + i + 1
-                    n16 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*(k+1) + nx + (2*nx + 1)*j + i + 1
-                    n17 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*(nz+1) + (nx+1)*(ny+1)*k + j*(nx+1) + i + 1
-                    n18 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*(nz+1) + (nx+1)*(ny+1)*k + j*(nx+1) + i + 2
-                    n19 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*(nz+1) + (nx+1)*(ny+1)*k + (j+1)*(nx+1) + i + 2
-                    n20 = (nx+1)*(ny+1)*(nz+1) + (nx*(ny+1) + ny*(nx+1))*(nz+1) + (nx+1)*(ny+1)*k + (j+1)*(nx+1) + i + 1
-                
-                    Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n1, n2, n3, n4, n5, n6, n7, n8, n9, n10, n11, n12, n13, n14, n15, n16, n17, n18, n19, n20], 'attributes': copy.deepcopy(attributes)}
+    if options['elems'].upper() in StructuredCells:
+        #Linear elements are implicitly defined by the structured grid
+        Mesh = StructuredDomain(ndof, name, attributes, P0, [DX, DY, DZ], [nx, ny, nz], options['elems'])
+    else:
+        #Defines the primary grid and its linear elements
+        linear = 'TETRA4' if options['elems'].upper() == 'TETRA10' else 'HEXA8'
+        grid = StructuredDomain(ndof, name, attributes, P0, [DX, DY, DZ], [nx, ny, nz], linear)
+        nTags  = [np.arange(1, grid.nNodes + 1)]
+        coords = [grid.getCoordinates()]
+        conn   = grid.getConnectivity()
+        ntags  = grid.nNodes
+
+        if options['elems'].upper() == 'TETRA10':
+            #Creates the secondary 3D grid on the (unique) tetrahedron edges
+            pairs = np.array([[0,1], [1,2], [0,2], [0,3], [1,3], [2,3]])
+            edges = np.sort(conn[:,pairs], axis=2).reshape(-1,2)
+            edges, index = np.unique(edges, axis=0, return_inverse=True)
+
+            nTags.append(np.arange(ntags + 1, ntags + len(edges) + 1))
+            coords.append(0.5*(coords[0][edges[:,0]-1] + coords[0][edges[:,1]-1]))
+
+            #Defines the Elements in Mesh
+            conn = np.concatenate((conn, ntags + 1 + index.reshape(-1,6)), axis=1)
+        elif options['elems'].upper() == 'HEXA20':
+            #Creates the secondary 3D grid
+            layer = nx*(ny+1) + ny*(nx+1)
+
+            i, j, k = GridIndices(nx, ny+1, nz+1)
+            nTags.append(ntags + layer*k + (2*nx + 1)*j + i + 1)
+            coords.append(GridCoordinates(P0, [DX, DY, DZ], [0.5*(2*np.arange(nx)+1), np.arange(ny+1), np.arange(nz+1)]))
+
+            i, j, k = GridIndices(nx+1, ny, nz+1)
+            nTags.append(ntags + layer*k + nx + (2*nx + 1)*j + i + 1)
+            coords.append(GridCoordinates(P0, [DX, DY, DZ], [np.arange(nx+1), 0.5*(2*np.arange(ny)+1), np.arange(nz+1)]))
+
+            nTags.append(ntags + layer*(nz+1) + np.arange(1, (nx+1)*(ny+1)*nz + 1))
+            coords.append(GridCoordinates(P0, [DX, DY, DZ], [np.arange(nx+1), np.arange(ny+1), 0.5*(2*np.arange(nz)+1)]))
+
+            #Defines the Elements in Mesh
+            I, J, K = GridIndices(nx, ny, nz)
+            n9  = ntags + layer*K + (2*nx + 1)*J + I + 1
+            n10 = ntags + layer*K + nx + (2*nx + 1)*J + I + 2
+            n11 = ntags + layer*K + (2*nx + 1)*(J+1) + I + 1
+            n12 = ntags + layer*K + nx + (2*nx + 1)*J + I + 1
+            n13 = ntags + layer*(K+1) + (2*nx + 1)*J + I + 1
+            n14 = ntags + layer*(K+1) + nx + (2*nx + 1)*J + I + 2
+            n15 = ntags + layer*(K+1) + (2*nx + 1)*(J+1) + I + 1
+            n16 = ntags + layer*(K+1) + nx + (2*nx + 1)*J + I + 1
+            n17 = ntags + layer*(nz+1) + (nx+1)*(ny+1)*K + J*(nx+1) + I + 1
+            n18 = ntags + layer*(nz+1) + (nx+1)*(ny+1)*K + J*(nx+1) + I + 2
+            n19 = ntags + layer*(nz+1) + (nx+1)*(ny+1)*K + (J+1)*(nx+1) + I + 2
+            n20 = ntags + layer*(nz+1) + (nx+1)*(ny+1)*K + (J+1)*(nx+1) + I + 1
+
+            conn = np.concatenate((conn, np.stack([n9, n10, n11, n12, n13, n14, n15, n16, n17, n18, n19, n20], axis=1)), axis=1)
+
+        Mesh = StructuredMesh(ndof, np.concatenate(coords), name, conn, attributes, np.concatenate(nTags))
 
     #Finds the Boundary Nodes list
     if Options['dimension'] == 3:
@@ -267,7 +334,11 @@ def makeDomainArea(options={}):
     Returns
     -------
     Mesh : dict
-        A dictionary that contains nodes and element with the same structure as Entities
+        A dictionary that contains nodes and element with the same structure as Entities,
+        i.e., NodeStorage and ElementStorage if Options['storage'] is 'ARRAY'
+        A StructuredDomain is returned for linear elements, i.e., the nodes and
+        elements are created when 'Nodes' or 'Elements' are first accessed
+        (e.g., when they are assigned to Entities)
     """
     #Defines an empty Mesh dictionary
     Mesh = {'Nodes': {}, 'Elements': {}}
@@ -278,6 +349,12 @@ def makeDomainArea(options={}):
         print('\x1B[33m ALERT \x1B[0m: In file=\'%s\' at line=%d makeDomainArea(attributes=?) must be specified.' %(info.filename,info.lineno))
         exit(-1)
 
+    #Check the element type can be meshed
+    if options['elems'].upper() not in ('TRIA3', 'TRIA6', 'QUAD4', 'QUAD8'):
+        info = debugInfo(2)
+        print('\x1B[33m ALERT \x1B[0m: In file=\'%s\' at line=%d makeDomainArea() options[\'elems\']=\'%s\' is not supported, i.e., TRIA3, TRIA6, QUAD4, QUAD8.' %(info.filename,info.lineno,options['elems']))
+        exit(-1)
+
     if 'attributes' not in options:
         if options['elems'].upper() == 'TRIA3':
             options['class'] = 'LIN2DTRIA3'
@@ -295,6 +372,9 @@ def makeDomainArea(options={}):
     else:
         attributes = options['attributes']
 
+    #Elements share a single (interned) attributes object
+    attributes = InternAttributes(attributes)
+
     #Unpack attribute provided by the user
     ndof = options['ndof']
     name = options['class']
@@ -314,100 +394,51 @@ def makeDomainArea(options={}):
     DX = (P1 - P0)/nx
     DY = (P2 - P0)/ny
 
-    #Defines the primary grid
-    tag = 0
-    for j in range(ny+1):
-        for i in range(nx+1):
-            tag += 1
-            coords = P0 + DX*i + DY*j
-            Mesh['Nodes'][tag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
+    if options['elems'].upper() in StructuredCells:
+        #Linear elements are implicitly defined by the structured grid
+        Mesh = StructuredDomain(ndof, name, attributes, P0, [DX, DY], [nx, ny], options['elems'])
+    else:
+        #Defines the primary grid
+        nTags  = [np.arange(1, (nx+1)*(ny+1) + 1)]
+        coords = [GridCoordinates(P0, [DX, DY], [np.arange(nx+1), np.arange(ny+1)])]
+
+        #Corner Nodes of each quadrilateral
+        I, J = GridIndices(nx, ny)
+        n1 = (nx+1)*J + I + 1
+        n2 = (nx+1)*J + I + 2
+        n3 = (nx+1)*(J+1) + I + 2
+        n4 = (nx+1)*(J+1) + I + 1
 
-    if options['elems'].upper() == 'TRIA3':   
-        #Defines the Elements in Mesh
-        tag = 0
-        for j  in range(ny):
-            for i in range(nx):
-                n1 = (nx+1)*j+i+1
-                n2 = (nx+1)*j+i+2
-                n3 = (nx+1)*(j+1)+i+2
-                n4 = (nx+1)*(j+1)+i+1
-
-                tag += 1; Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n1, n2, n4], 'attributes': copy.deepcopy(attributes)}
-                tag += 1; Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n2, n3, n4], 'attributes': copy.deepcopy(attributes)}
-    elif options['elems'].upper() == 'TRIA6':
-        #Creates the secondary 2D grid
-        for j in range(ny+1):
-            for i in range(nx):
-                mtag = tag + (2*nx + 1)*j + i + 1
-                coords = P0 + 0.5*(2*i+1)*DX + DY*j
-                Mesh['Nodes'][mtag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
-        for j in range(ny):
-            for i in range(nx+1):
-                mtag = tag + nx + (2*nx + 1)*j + i + 1
-                coords = P0 + i*DX + 0.5*(2*j+1)*DY
-                Mesh['Nodes'][mtag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
-        for j in range(ny):
-            for i in range(nx):
-                mtag = tag + nx*(ny+1) + (nx+1)*ny + nx*j + i + 1
-                coords = P0 + 0.5*(2*i+1)*DX + 0.5*(2*j+1)*DY
-                Mesh['Nodes'][mtag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
-
-        #Defines the Elements in Mesh
-        ntags = tag
-        tag   = 0
-        for j  in range(ny):
-            for i in range(nx):
-                n1 = (nx+1)*j+i+1
-                n2 = (nx+1)*j+i+2
-                n3 = (nx+1)*(j+1)+i+2
-                n4 = (nx+1)*(j+1)+i+1
-                n5 = ntags + (2*nx + 1)*j + i + 1
-                n6 = ntags + nx + (2*nx + 1)*j + i + 2
-                n7 = ntags + (2*nx + 1)*(j+1) + i + 1
-                n8 = ntags + nx + (2*nx + 1)*j + i + 1
-                n9 = ntags + nx*(ny+1) + (nx+1)*ny + nx*j + i + 1
-
-                tag += 1; Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n1, n2, n4, n5, n9, n8], 'attributes': copy.deepcopy(attributes)}
-                tag += 1; Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n2, n3, n4, n6, n7, n9], 'attributes': copy.deepcopy(attributes)}
-    elif options['elems'].upper() == 'QUAD4':  
-        #Defines the Elements in Mesh
-        tag = 0
-        for j  in range(ny):
-            for i in range(nx):
-                tag += 1
-                conn = [(nx+1)*j+i+1, (nx+1)*j+i+2, (nx+1)*(j+1)+i+2, (nx+1)*(j+1)+i+1]
-                Mesh['Elements'][tag] = {'name': name.upper(), 'conn': conn, 'attributes': copy.deepcopy(attributes)}
-    elif options['elems'].upper() == 'QUAD8':
         #Creates the secondary 2D grid
-        for j in range(ny+1):
-            for i in range(nx):
-                mtag = tag + (2*nx + 1)*j + i + 1
-                coords = P0 + 0.5*(2*i+1)*DX + DY*j
-                Mesh['Nodes'][mtag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
-        for j in range(ny):
-            for i in range(nx+1):
-                mtag = tag + nx + (2*nx + 1)*j + i + 1
-                coords = P0 + i*DX + 0.5*(2*j+1)*DY
-                Mesh['Nodes'][mtag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
-
-        #Defines the Elements in Mesh
-        ntags = tag
-        tag   = 0
-        for j  in range(ny):
-            for i in range(nx):
-                n1 = (nx+1)*j+i+1
-                n2 = (nx+1)*j+i+2
-                n3 = (nx+1)*(j+1)+i+2
-                n4 = (nx+1)*(j+1)+i+1
-
-                n5 = ntags + (2*nx + 1)*j + i + 1
-                n6 = ntags + nx + (2*nx + 1)*j + i + 2
-                n7 = ntags + (2*nx + 1)*(j+1) + i + 1
-                n8 = ntags + nx + (2*nx + 1)*j + i + 1
-
-                tag += 1
-                Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [n1, n2, n3, n4, n5, n6, n7, n8], 'attributes': copy.deepcopy(attributes)}
-                
+        ntags = (nx+1)*(ny+1)
+
+        i, j = GridIndices(nx, ny+1)
+        nTags.append(ntags + (2*nx + 1)*j + i + 1)
+        coords.append(GridCoordinates(P0, [DX, DY], [0.5*(2*np.arange(nx)+1), np.arange(ny+1)]))
+
+        i, j = GridIndices(nx+1, ny)
+        nTags.append(ntags + nx + (2*nx + 1)*j + i + 1)
+        coords.append(GridCoordinates(P0, [DX, DY], [np.arange(nx+1), 0.5*(2*np.arange(ny)+1)]))
+
+        n5 = ntags + (2*nx + 1)*J + I + 1
+        n6 = ntags + nx + (2*nx + 1)*J + I + 2
+        n7 = ntags + (2*nx + 1)*(J+1) + I + 1
+        n8 = ntags + nx + (2*nx + 1)*J + I + 1
+
+        if options['elems'].upper() == 'TRIA6':
+            #Creates the center Nodes of the secondary 2D grid
+            nTags.append(ntags + nx*(ny+1) + (nx+1)*ny + np.arange(1, nx*ny + 1))
+            coords.append(GridCoordinates(P0, [DX, DY], [0.5*(2*np.arange(nx)+1), 0.5*(2*np.arange(ny)+1)]))
+            n9 = ntags + nx*(ny+1) + (nx+1)*ny + nx*J + I + 1
+
+            #Defines the Elements in Mesh
+            conn = np.stack([np.stack([n1, n2, n4, n5, n9, n8], axis=1), np.stack([n2, n3, n4, n6, n7, n9], axis=1)], axis=1).reshape(-1,6)
+        elif options['elems'].upper() == 'QUAD8':
+            #Defines the Elements in Mesh
+            conn = np.stack([n1, n2, n3, n4, n5, n6, n7, n8], axis=1)
+
+        Mesh = StructuredMesh(ndof, np.concatenate(coords), name, conn, attributes, np.concatenate(nTags))
+
     #Finds the Boundary Nodes list
     if Options['dimension'] == 2:
         TOLx = DX[0]/1000.0
@@ -441,7 +472,11 @@ def makeDomainLine(options={}):
     Returns
     -------
     Mesh : dict
-        A dictionary that contains nodes and element with the same structure as Entities
+        A dictionary that contains nodes and element with the same structure as Entities,
+        i.e., NodeStorage and ElementStorage if Options['storage'] is 'ARRAY'
+        A StructuredDomain is returned for linear elements, i.e., the nodes and
+        elements are created when 'Nodes' or 'Elements' are first accessed
+        (e.g., when they are assigned to Entities)
     """
     #Defines an empty Mesh dictionary
     Mesh = {'Nodes': {}, 'Elements': {}}
@@ -452,6 +487,12 @@ def makeDomainLine(options={}):
         print('\x1B[33m ALERT \x1B[0m: In file=\'%s\' at line=%d makeDomainLine(attributes=?) must be specified.' %(info.filename,info.lineno))
         return Mesh
 
+    #Check the element type can be meshed
+    if options['elems'].upper() not in ('LINE2', 'LINE3'):
+        info = debugInfo(2)
+        print('\x1B[33m ALERT \x1B[0m: In file=\'%s\' at line=%d makeDomainLine() options[\'elems\']=\'%s\' is not supported, i.e., LINE2, LINE3.' %(info.filename,info.lineno,options['elems']))
+        return Mesh
+
     if 'attributes' not in options:
         if options['elems'].upper() == 'LINE2':
             nQp = 3
@@ -461,6 +502,9 @@ def makeDomainLine(options={}):
     else:
         attributes = options['attributes']
 
+    #Elements share a single (interned) attributes object
+    attributes = InternAttributes(attributes)
+
     #Unpack attribute provided by the user
     ndof = options['ndof']
     name = options['class']
@@ -473,103 +517,136 @@ def makeDomainLine(options={}):
     #Creates the grid increment
     D = (P1 - P0)/nx
 
+    if options['elems'].upper() in StructuredCells:
+        #Linear elements are implicitly defined by the structured grid
+        return StructuredDomain(ndof, name, attributes, P0, [D], [nx], options['elems'])
+
     #Defines the primary grid
-    tag = 0
-    for i in range(nx+1):
-        tag += 1
-        coords = P0 + D*i
-        Mesh['Nodes'][tag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
-
-    if options['elems'].upper() == 'LINE2':   
-        #Defines the Elements in Mesh
-        tag = 0
-        for i in range(nx):
-            tag += 1 
-            Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [i+1, i+2], 'attributes': copy.deepcopy(attributes)}
-    elif options['elems'].upper() == 'LINE3':
-        #Creates the secondary grid
-        for i in range(nx):
-            tag += 1
-            coords = P0 + 0.5*(2*i + 1)*D
-            Mesh['Nodes'][tag] = {'ndof': ndof, 'freedof': np.zeros(ndof, dtype=int), 'totaldof': np.zeros(ndof, dtype=int), 'coords': coords}
+    coords = [GridCoordinates(P0, [D], [np.arange(nx+1)])]
+    I, = GridIndices(nx)
 
-        #Defines the Elements in Mesh
-        tag = 0
-        for i in range(nx):
-            tag += 1 
-            Mesh['Elements'][tag] = {'name': name.upper(), 'conn': [i+1, i+2, nx+2+i], 'attributes': copy.deepcopy(attributes)}
-    return Mesh
+    #Creates the secondary grid
+    coords.append(GridCoordinates(P0, [D], [0.5*(2*np.arange(nx) + 1)]))
 
-def removeDomain(mesh={}, attributes={}):
+    #Defines the Elements in Mesh
+    conn = np.stack([I+1, I+2, nx+2+I], axis=1)
+
+    return StructuredMesh(ndof, np.concatenate(coords), name, conn, attributes)
+
+def SplitDomain(mesh, x0, xl):
     """
-    This function removes a domain specifying the geometry\n
+    Finds the elements completely inside the box |x - x0| <= xl, the nodes
+    that are only connected to them, and the nodes of the elements cut by the
+    box that are inside it (see ClassifyBox).\n
     @visit  https://github.com/SeismoVLAB/SVL\n
-    @author Danilo S. Kusanovic 2020
+    @author Danilo S. Kusanovic 2021
 
     Parameters
     ----------
     mesh : dict
-        The mesh that contains 'Nodes' and 'Elements' dictionaries from which
-        the deletion will be performed. 
-    attributes : dict
-        The domain to be removed, for example
-            'sides' (list) The length of the sides in x,y, and z
-            'center' (list) The center of the rectangular domain
+        The mesh that contains 'Nodes' and 'Elements' dictionaries
+    x0: array
+        The coordinate of center of the box
+    xl: array
+        The side half-length in each direction
 
     Returns
     -------
-    None
+    rmElems : set
+        The elements to be removed
+    rmNodes : set
+        The nodes to be removed
+    keepNodes : set
+        The nodes inside the box shared with the elements cut by the box
     """
-    x0 = np.array(attributes['center'])
-    xl = 0.5*np.array(attributes['sides'])
+    eTags, ptr, conn, inside = ClassifyBox(mesh, x0, xl)
+    nconn = np.diff(ptr)
+    full = SegmentSum(inside, ptr) == nconn
 
-    #Identify the elements to be removed
-    rmElems = set()
-    cpElems = set()
-    for eTag in mesh['Elements']:
-        count = 0
-        nodes = mesh['Elements'][eTag]['conn']
-        nNodes = len(nodes)
-        for nTag in nodes:
-            xn = mesh['Nodes'][nTag]['coords']
-            cn = np.abs(xn - x0) <= xl
-            if cn.all():
-                count += 1
-        if 0 < count and count < nNodes:
-            cpElems.add(eTag)
-        elif count == nNodes:
-            rmElems.add(eTag)
-
-    #List of Nodes to be removed
-    removeNodes = set()
-    for eTag in rmElems:
-        nodes = mesh['Elements'][eTag]['conn']
-        for nTag in nodes:
-            removeNodes.add(nTag)
+    #Elements (and their nodes) to be removed
+    rmElems = set(eTags[full].tolist())
+    removeNodes = set(np.unique(conn[np.repeat(full, nconn)]).tolist())
 
     #Identify Nodes of the cut section 
+    cut = ~full
+    cpElems = set(eTags[cut].tolist())
+    flat = np.repeat(cut, nconn)
+    nodes, flags = conn[flat].tolist(), inside[flat].tolist()
+    offset = np.cumsum(nconn[cut]) - nconn[cut]
+    start = dict(zip(eTags[cut].tolist(), zip(offset.tolist(), nconn[cut].tolist())))
+
     keepNodes = set()
     for eTag in cpElems:
-        nodes = mesh['Elements'][eTag]['conn']
-        for nTag in nodes:
-            xn = mesh['Nodes'][nTag]['coords']
-            cn = np.abs(xn - x0) <= xl
-            if cn.all():
+        k, n = start[eTag]
+        for nTag, isIn in zip(nodes[k:k+n], flags[k:k+n]):
+            if isIn:
                 keepNodes.add(nTag)
 
-    rmNodes = removeNodes.difference(keepNodes)
+    return rmElems, removeNodes.difference(keepNodes), keepNodes
+
+def RemoveEntities(mesh, rmElems, rmNodes, keepNodes):
+    """
+    Removes the given elements and nodes from the mesh, and re-numbers the
+    remaining ones (see reLabel). A StructuredDomain that has not been 
+    materialized only masks the removed entities of the grid.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    mesh : dict
+        The mesh that contains 'Nodes' and 'Elements' dictionaries
+    rmElems : set
+        The elements to be removed
+    rmNodes : set
+        The nodes to be removed
+    keepNodes : set
+        The (remaining) nodes to be re-numbered
+
+    Returns
+    -------
+    list
+        The new tags of the nodes in keepNodes
+    """
+    if isinstance(mesh, StructuredDomain) and mesh.isLazy():
+        return mesh.remove(rmElems, rmNodes, keepNodes)
 
-    #Remove the elements and associated nodes
     for nTag in rmNodes:
         del mesh['Nodes'][nTag]
     for eTag in rmElems:
         del mesh['Elements'][eTag]
 
-    #Re-Numbers Nodes and Elements and Interface
     nMap = reLabel(mesh)
-    cpNodes = list()
-    for k in keepNodes:
-        cpNodes.append(nMap[k])
+    return [nMap[k] for k in keepNodes]
+
+def removeDomain(mesh={}, attributes={}):
+    """
+    This function removes a domain specifying the geometry\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2020
+
+    Parameters
+    ----------
+    mesh : dict
+        The mesh that contains 'Nodes' and 'Elements' dictionaries from which
+        the deletion will be performed. 
+    attributes : dict
+        The domain to be removed, for example
+            'sides' (list) The length of the sides in x,y, and z
+            'center' (list) The center of the rectangular domain
+
+    Returns
+    -------
+    None
+    """
+    x0 = np.array(attributes['center'])
+    xl = 0.5*np.array(attributes['sides'])
+
+    #Identify the elements and nodes to be removed
+    rmElems, rmNodes, keepNodes = SplitDomain(mesh, x0, xl)
+
+    #Remove the elements and associated nodes, and re-numbers the Interface
+    cpNodes = RemoveEntities(mesh, rmElems, rmNodes, keepNodes)
 
     mesh['Boundary']['Interface'] = cpNodes
 
@@ -578,7 +655,7 @@ def removeDomain(mesh={}, attributes={}):
 def swap(mesh1, mesh2):
     return mesh2, mesh1
 
-def mergeDomain(mesh1={}, mesh2={}, TOL=1E-6):
+def mergeDomain(mesh1={}, mesh2={}, TOL=1E-6, coincident='NONE'):
     """
     This function merge two domain into a third mesh\n
     @visit  https://github.com/SeismoVLAB/SVL\n
@@ -593,13 +670,19 @@ def mergeDomain(mesh1={}, mesh2={}, TOL=1E-6):
         The mesh from which data will be copied. 
     TOL   : double
         The tolerance for which 2 nodes will be consider as close.
+    coincident : str
+        How the coincident nodes of the merged mesh are handled (see mergeNodes)
+        'NONE'  : Only the 'Interface' boundary nodes are tied with EQUAL constraints
+        'MERGE' : The coincident nodes are merged into a single node
+        'EQUAL' : The coincident nodes are tied with EQUAL constraints
 
     Returns
     -------
     mesh1 : dict
         The mesh with the appended mesh domain
     """
-    if 'Interface' in mesh1['Boundary']:
+    coincident = coincident.upper()
+    if 'Interface' in mesh1.get('Boundary', {}):
         mesh1, mesh2 = mesh2, mesh1
 
     nNodes = len(mesh1['Nodes'])
@@ -619,28 +702,48 @@ def mergeDomain(mesh1={}, mesh2={}, TOL=1E-6):
         mesh1['Elements'][tag]['conn'] = [nMap[x] for x in mesh1['Elements'][tag]['conn']]
 
     #The mesh has a common interface to apply constraints 
-    if 'Interface' in mesh2['Boundary']:
-        #Gets the Node Tags from main Mesh
-        nTags = set()
-        for names in mesh1['Boundary']:
-            if names in ['bottom','left','right','back','front']:
-                nTags.update(mesh1['Boundary'][names])
-
-        iTags = mesh2['Boundary']['Interface']
-        iTags = np.array(list(iTags))
-        nTags = np.array(list(nTags))
-        coordM1 = np.zeros((len(nTags), Options['dimension']))
-        coordM2 = np.zeros((len(iTags), Options['dimension']))
-        for k, nTag in enumerate(nTags):
-            coordM1[k,:] = mesh1['Nodes'][nTag]['coords']
-        for k, iTag in enumerate(iTags):
-            coordM2[k,:] = mesh2['Nodes'][iTag]['coords']
-        
-        Interface = dict()
-        for k, iTag in enumerate(iTags):
-            delta = np.subtract(coordM1, coordM2[k,:])
-            cond = np.linalg.norm(delta, axis=1) < TOL
-            Interface[nTags[cond][0]] = nMap[iTag]
+    if 'Interface' in mesh2.get('Boundary', {}):
+        if coincident == 'NONE':
+            #Gets the Node Tags from main Mesh
+            nTags = set()
+            for names in mesh1['Boundary']:
+                if names in ['bottom','left','right','back','front']:
+                    nTags.update(mesh1['Boundary'][names])
+
+            iTags = mesh2['Boundary']['Interface']
+            iTags = np.array(list(iTags))
+            nTags = np.array(list(nTags))
+            coordM2 = np.zeros((len(iTags), Options['dimension']))
+            for k, iTag in enumerate(iTags):
+                coordM2[k,:] = mesh2['Nodes'][iTag]['coords']
+
+            #Closest boundary nodes of mesh1 (first in nTags order) to the interface
+            index = GetSpatialIndex(mesh1)
+            rows, ks = index.findPoints(coordM2, TOL)
+            position = dict(zip(nTags.tolist(), range(len(nTags))))
+            match = dict()
+            for nTag, k in zip(index.tags[rows].tolist(), ks.tolist()):
+                if nTag in position:
+                    match[k] = min(match.get(k, len(nTags)), position[nTag])
+
+            Interface = dict()
+            for k, iTag in enumerate(iTags):
+                Interface[nTags[match[k]]] = nMap[iTag]
+
+            #Create the constraints to tie both meshes together
+            if 'Constraints' not in mesh1:
+                mesh1['Constraints'] = dict()
+                tag = -1
+            else:
+                cTags = mesh1['Constraints'].keys()
+                tag = min(cTags)
+
+            for mtag in Interface:
+                stag = Interface[mtag]
+                for k in range(Options['dimension']):
+                    tag += -1
+                    mesh1['Constraints'][tag] = {'name': 'EQUAL', 'stag': stag, 'sdof': k, 'mtag': [mtag], 'mdof': [k], 'factor': [1.00]}
+                    mesh1['Nodes'][stag]['freedof'][k] = tag
 
         #Transfers boundaries from mesh2 to mesh 1
         for names in mesh2['Boundary']:
@@ -649,28 +752,107 @@ def mergeDomain(mesh1={}, mesh2={}, TOL=1E-6):
                 for nTag in mesh2['Boundary'][names]:
                     nodes.append(nMap[nTag])
                 mesh1['Boundary'][names] = nodes
-        
-        #Create the constraints to tie both meshes together
-        if 'Constraints' not in mesh1:
-            mesh1['Constraints'] = dict()
-            tag = -1
-        else:
-            cTags = mesh1['Constraints'].keys()
-            tag = min(cTags)
 
-        for mtag in Interface:
-            stag = Interface[mtag]
+    #Coincident nodes of both meshes (and within each mesh)
+    if coincident in ['MERGE', 'EQUAL']:
+        mergeNodes(mesh1, TOL=TOL, constraint=(coincident == 'EQUAL'))
+
+    return mesh1
+
+def mergeNodes(mesh, TOL=1E-6, constraint=False):
+    """
+    This function finds the nodes of the mesh that are closer than TOL, and
+    merges each group of coincident nodes into its first node (in mesh order),
+    or ties them to the first node with EQUAL constraints. The coincident nodes
+    are found with the spatial index of the mesh. Merged nodes are removed and
+    the mesh is re-numbered, the element connectivity, boundaries and
+    constraints are updated accordingly.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    mesh : dict
+        The mesh that contains 'Nodes' and 'Elements' dictionaries
+    TOL   : double
+        The tolerance for which 2 nodes will be consider as coincident.
+    constraint : bool
+        Ties the coincident nodes with EQUAL constraints instead of merging
+
+    Returns
+    -------
+    nMap : dict
+        The (removed or constrained) node tag mapped to the node it was merged to
+    """
+    index = GetSpatialIndex(mesh)
+    first = index.findCoincident(TOL)
+    rows = np.flatnonzero(first != np.arange(len(first)))
+    nMap = dict(zip(index.tags[rows].tolist(), index.tags[first[rows]].tolist()))
+    if not nMap:
+        return nMap
+
+    if constraint:
+        #Create the constraints to tie the coincident nodes together
+        if 'Constraints' not in mesh:
+            mesh['Constraints'] = dict()
+        tag = min(mesh['Constraints'].keys(), default=-1)
+
+        for stag in nMap:
+            mtag = nMap[stag]
             for k in range(Options['dimension']):
                 tag += -1
-                mesh1['Constraints'][tag] = {'name': 'EQUAL', 'stag': stag, 'sdof': k, 'mtag': [mtag], 'mdof': [k], 'factor': [1.00]}
-                mesh1['Nodes'][stag]['freedof'][k] = tag
-    return mesh1
+                mesh['Constraints'][tag] = {'name': 'EQUAL', 'stag': stag, 'sdof': k, 'mtag': [mtag], 'mdof': [k], 'factor': [1.00]}
+                mesh['Nodes'][stag]['freedof'][k] = tag
+        return nMap
+
+    #Nodes with different number of degree of freedom are not merged
+    Nodes = mesh['Nodes']
+    mismatch = [nTag for nTag in nMap if Nodes[nTag]['ndof'] != Nodes[nMap[nTag]]['ndof']]
+    if mismatch:
+        printSummary(debugInfo(2), 'mergeNodes', {'coincident nodes have different ndof and were not merged': mismatch})
+        for nTag in mismatch:
+            del nMap[nTag]
+
+    #Restraints and constraints of the merged nodes are kept
+    for sTag in nMap:
+        free = np.asarray(Nodes[nMap[sTag]]['freedof'])
+        Nodes[nMap[sTag]]['freedof'] = np.where(free == 0, Nodes[sTag]['freedof'], free)
+
+    #Remaps the connectivity in bulk
+    Elements = mesh['Elements']
+    if isinstance(Elements, ElementStorage):
+        _, conn = Elements.getConnectivity()
+        sTags = np.array(sorted(nMap), dtype=np.int64)
+        mTags = np.array([nMap[nTag] for nTag in sTags.tolist()], dtype=np.int64)
+        pos = np.minimum(np.searchsorted(sTags, conn), len(sTags) - 1)
+        hit = sTags[pos] == conn
+        conn[hit] = mTags[pos[hit]]
+    else:
+        for eTag in Elements:
+            nodes = Elements[eTag]['conn']
+            if any(nTag in nMap for nTag in nodes):
+                Elements[eTag]['conn'] = [nMap.get(nTag, nTag) for nTag in nodes]
+
+    #Remaps the constraints and boundaries
+    for cTag in mesh.get('Constraints', {}):
+        mesh['Constraints'][cTag]['stag'] = nMap.get(mesh['Constraints'][cTag]['stag'], mesh['Constraints'][cTag]['stag'])
+        mesh['Constraints'][cTag]['mtag'] = [nMap.get(nTag, nTag) for nTag in mesh['Constraints'][cTag]['mtag']]
+    for names in mesh.get('Boundary', {}):
+        mesh['Boundary'][names] = list(dict.fromkeys(nMap.get(nTag, nTag) for nTag in mesh['Boundary'][names]))
+
+    #Removes the merged nodes and re-numbers the mesh
+    for nTag in nMap:
+        del Nodes[nTag]
+    reLabel(mesh)
+
+    return nMap
 
 def Find2DBoundaries(mesh, top=float('inf'), bottom=float('inf'), left=float('inf'), right=float('inf')):
     """
-    This function is a brute force method to find the nodes that are on the boundary
-    assuming a rectangular domain. Note that the inputs top, bottom, left, right must
-    specify a value a little bit inside the domain. \n
+    This function finds the nodes that are on the boundary assuming a rectangular
+    domain using the coordinates stored in the spatial index of the mesh. Note that
+    the inputs top, bottom, left, right must specify a value a little bit inside
+    the domain. \n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2020
 
@@ -691,33 +873,33 @@ def Find2DBoundaries(mesh, top=float('inf'), bottom=float('inf'), left=float('in
         'Right' : set
             The list of Nodes on the right boundary, i.e., -X
     """
+    #The boundaries of a structured grid are found from the grid
+    if isinstance(mesh, StructuredDomain) and mesh.isLazy():
+        bc = mesh.getBoundary([(('right', right), ('left', left)), (('top', top), ('bottom', bottom))])
+        mesh['Boundary'] = {name: bc[name] for name in ['top', 'bottom', 'left', 'right']}
+        return
+
     #Nodes that belong to boundary 
-    Top, Bottom = set(), set()
-    Left, Right = set(), set()
-
-    for nTag in mesh['Nodes']:
-        xn = mesh['Nodes'][nTag]['coords']
-
-        #Left (+X)/Right (-X) boundaries
-        if xn[0] - right > 0.0:
-            Right.add(nTag)
-        elif left - xn[0] > 0.0:
-            Left.add(nTag)
-        
-        #Top (+Z)/Bottom (-Z) boundaries
-        if xn[1] - top > 0.0:
-            Top.add(nTag)
-        elif bottom - xn[1] > 0.0:
-            Bottom.add(nTag)
+    index = GetSpatialIndex(mesh)
+    nTags, xn = index.tags, index.coords
+
+    #Left (+X)/Right (-X) boundaries
+    Right = xn[:,0] - right > 0.0
+    Left = ~Right & (left - xn[:,0] > 0.0)
+
+    #Top (+Z)/Bottom (-Z) boundaries
+    Top = xn[:,1] - top > 0.0
+    Bottom = ~Top & (bottom - xn[:,1] > 0.0)
 
     #Appends the boundary Nodes information
-    mesh['Boundary'] = {'top': list(Top), 'bottom': list(Bottom), 'left': list(Left), 'right': list(Right)}
+    mesh['Boundary'] = {name: list(set(nTags[bc].tolist())) for name, bc in [('top', Top), ('bottom', Bottom), ('left', Left), ('right', Right)]}
 
 def Find3DBoundaries(mesh, top=float('inf'), bottom=float('inf'), left=float('inf'), right=float('inf'), front=float('inf'), back=float('inf')):
     """
-    This function is a brute force method to find the nodes that are on the boundary
-    assuming a rectangular prism domain. Note that the inputs top, bottom, left, right 
-    must specify a value a little bit inside the domain. \n
+    This function finds the nodes that are on the boundary assuming a rectangular
+    prism domain using the coordinates stored in the spatial index of the mesh. Note
+    that the inputs top, bottom, left, right must specify a value a little bit inside
+    the domain. \n
     @visit  https://github.com/SeismoVLAB/SVL\n
     @author Danilo S. Kusanovic 2020
 
@@ -742,34 +924,30 @@ def Find3DBoundaries(mesh, top=float('inf'), bottom=float('inf'), left=float('in
         'Back' : set
             The list of Nodes on the back boundary, i.e., -Y
     """
+    #The boundaries of a structured grid are found from the grid
+    if isinstance(mesh, StructuredDomain) and mesh.isLazy():
+        bc = mesh.getBoundary([(('right', right), ('left', left)), (('front', front), ('back', back)), (('top', top), ('bottom', bottom))])
+        mesh['Boundary'] = {name: bc[name] for name in ['top', 'bottom', 'left', 'right', 'front', 'back']}
+        return
+
     #Nodes that belong to boundary 
-    Top, Bottom = set(), set()
-    Left, Right = set(), set()
-    Back, Front = set(), set()
-
-    for nTag in mesh['Nodes']:
-        xn = mesh['Nodes'][nTag]['coords']
-
-        #Left (+X)/Right (-X) boundaries
-        if xn[0] - right > 0.0:
-            Right.add(nTag)
-        elif left - xn[0] > 0.0:
-            Left.add(nTag)
-        
-        #Top (+Z)/Bottom (-Z) boundaries
-        if xn[2] - top > 0.0:
-            Top.add(nTag)
-        elif bottom - xn[2] > 0.0:
-            Bottom.add(nTag)
-
-        #Front (+Y)/Back (-Y) boundaries 
-        if xn[1] - front > 0.0:
-            Front.add(nTag)
-        elif back - xn[1] > 0.0:
-            Back.add(nTag)
+    index = GetSpatialIndex(mesh)
+    nTags, xn = index.tags, index.coords
+
+    #Left (+X)/Right (-X) boundaries
+    Right = xn[:,0] - right > 0.0
+    Left = ~Right & (left - xn[:,0] > 0.0)
+
+    #Top (+Z)/Bottom (-Z) boundaries
+    Top = xn[:,2] - top > 0.0
+    Bottom = ~Top & (bottom - xn[:,2] > 0.0)
+
+    #Front (+Y)/Back (-Y) boundaries 
+    Front = xn[:,1] - front > 0.0
+    Back = ~Front & (back - xn[:,1] > 0.0)
 
     #Appends the boundary Nodes information
-    mesh['Boundary'] = {'top': list(Top), 'bottom': list(Bottom), 'left': list(Left), 'right': list(Right), 'front': list(Front), 'back': list(Back)}
+    mesh['Boundary'] = {name: list(set(nTags[bc].tolist())) for name, bc in [('top', Top), ('bottom', Bottom), ('left', Left), ('right', Right), ('front', Front), ('back', Back)]}
 
 def Coords2Tag(mesh, xp, tol=1E-6):
     """
@@ -794,111 +972,98 @@ def Coords2Tag(mesh, xp, tol=1E-6):
     cPoints  : list
         List with the node Tags 
     """
-    cPoints = []
-    for nTag in mesh['Nodes']:
-        for x in xp:
-            if np.linalg.norm(x - mesh['Nodes'][nTag]['coords']) < tol:
-                cPoints.append(nTag)
+    #Nodes are listed in mesh order, once per point they match
+    index = GetSpatialIndex(mesh)
+    rows, _ = index.findPoints(xp, tol)
+    cPoints = index.tags[rows].tolist()
     return cPoints
 
+def PMLRegion(code, x0, xl):
+    """
+    Returns the PML attributes 'x0' and 'npml' of a PML region. The region code
+    is -1, 0, +1 in each horizontal direction, and -1 (below) or 0 in the last
+    (vertical) direction with respect to the box |x - x0| <= xl.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    ndim = len(code)
+    nnz = np.count_nonzero(code)
+
+    X0 = list()
+    for k in range(ndim - 1):
+        if code[k] < 0:
+            X0.append(x0[k] - xl[k])
+        elif code[k] > 0:
+            X0.append(x0[k] + xl[k])
+        else:
+            X0.append(x0[k])
+    X0.append(x0[ndim-1] - xl[ndim-1] if code[-1] < 0 else x0[ndim-1] - xl[ndim-1]/2.0)
+
+    npml = [float(c) if c == 0 or nnz == 1 else c/np.sqrt(nnz) for c in code]
+    return X0, npml
+
 def setPMLattributes(mesh, x0, xl):
-    if Options['dimension'] == 2:
-        for eTag in mesh['Elements']:
-            coords = np.full(2,  0.0, dtype=float)
-            for nTag in mesh['Elements'][eTag]['conn']:
-                coords +=  mesh['Nodes'][nTag]['coords']
-            xavg = coords/len( mesh['Elements'][eTag]['conn'])
-
-            attributes = copy.deepcopy( mesh['Elements'][eTag]['attributes'])
-            if xavg[0] < (x0[0] - xl[0]):
-                if xavg[1] < (x0[1] - xl[1]):
-                    attributes['x0'] = [x0[0]-xl[0], x0[1]-xl[1]]
-                    attributes['npml'] = [-1.0/np.sqrt(2), -1.0/np.sqrt(2)]
-                else:
-                    attributes['x0'] = [x0[0]-xl[0], x0[1]-xl[1]/2.0]
-                    attributes['npml'] = [-1.0, 0.0]
-            elif xavg[0] > (x0[0] + xl[0]):
-                if xavg[1] < (x0[1] - xl[1]):
-                    attributes['x0'] = [x0[0]+xl[0], x0[1]-xl[1]]
-                    attributes['npml'] = [1.0/np.sqrt(2), -1.0/np.sqrt(2)]
-                else:
-                    attributes['x0'] = [x0[0]+xl[0], x0[1]-xl[1]/2.0]
-                    attributes['npml'] = [1.0, 0.0]
-            else:
-                attributes['x0'] = [x0[0], x0[1]-xl[1]]
-                attributes['npml'] = [0.0, -1.0]
-            mesh['Elements'][eTag]['attributes'] = attributes
-    elif Options['dimension'] == 3:
-        for eTag in mesh['Elements']:
-            coords = np.full(3,  0.0, dtype=float)
-            for nTag in mesh['Elements'][eTag]['conn']:
-                coords +=  mesh['Nodes'][nTag]['coords']
-            xavg = coords/len(mesh['Elements'][eTag]['conn'])
-
-            attributes = copy.deepcopy(mesh['Elements'][eTag]['attributes'])
-            if xavg[0] < (x0[0] - xl[0]):
-                if xavg[1] < (x0[1] - xl[1]):
-                    if xavg[2] < (x0[2] - xl[2]):
-                        attributes['x0'] = [x0[0]-xl[0], x0[1]-xl[1], x0[2]-xl[2]]
-                        attributes['npml'] = [-1.0/np.sqrt(3), -1.0/np.sqrt(3), -1.0/np.sqrt(3)]
-                    else:
-                        attributes['x0'] = [x0[0]-xl[0], x0[1]-xl[1], x0[2]-xl[2]/2.0]
-                        attributes['npml'] = [-1.0/np.sqrt(2), -1.0/np.sqrt(2), 0.0]
-                elif xavg[1] > (x0[1] + xl[1]):
-                    if xavg[2] < (x0[2] - xl[2]):
-                        attributes['x0'] = [x0[0]-xl[0], x0[1]+xl[1], x0[2]-xl[2]]
-                        attributes['npml'] = [-1.0/np.sqrt(3), 1.0/np.sqrt(3), -1.0/np.sqrt(3)]
-                    else:
-                        attributes['x0'] = [x0[0]-xl[0], x0[1]+xl[1], x0[2]-xl[2]/2.0]
-                        attributes['npml'] = [-1.0/np.sqrt(2), 1.0/np.sqrt(2), 0.0]
-                else:
-                    if xavg[2] < (x0[2] - xl[2]):
-                        attributes['x0'] = [x0[0]-xl[0], x0[1], x0[2]-xl[2]]
-                        attributes['npml'] = [-1.0/np.sqrt(2), 0.0, -1.0/np.sqrt(2)]
-                    else:
-                        attributes['x0'] = [x0[0]-xl[0], x0[1], x0[2]-xl[2]/2.0]
-                        attributes['npml'] = [-1.0, 0.0, 0.0]
-            elif xavg[0] > (x0[0] + xl[0]):
-                if xavg[1] < (x0[1] - xl[1]):
-                    if xavg[2] < (x0[2] - xl[2]):
-                        attributes['x0'] = [x0[0]+xl[0], x0[1]-xl[1], x0[2]-xl[2]]
-                        attributes['npml'] = [1.0/np.sqrt(3), -1.0/np.sqrt(3), -1.0/np.sqrt(3)]
-                    else:
-                        attributes['x0'] = [x0[0]+xl[0], x0[1]-xl[1], x0[2]-xl[2]/2.0]
-                        attributes['npml'] = [1.0/np.sqrt(2), -1.0/np.sqrt(2), 0.0]
-                elif xavg[1] > (x0[1] + xl[1]):
-                    if xavg[2] < (x0[2] - xl[2]):
-                        attributes['x0'] = [x0[0]+xl[0], x0[1]+xl[1], x0[2]-xl[2]]
-                        attributes['npml'] = [1.0/np.sqrt(3), 1.0/np.sqrt(3), -1.0/np.sqrt(3)]
-                    else:
-                        attributes['x0'] = [x0[0]+xl[0], x0[1]+xl[1], x0[2]-xl[2]/2.0]
-                        attributes['npml'] = [1.0/np.sqrt(2), 1.0/np.sqrt(2), 0.0]
-                else:
-                    if xavg[2] < (x0[2] - xl[2]):
-                        attributes['x0'] = [x0[0]+xl[0], x0[1], x0[2]-xl[2]]
-                        attributes['npml'] = [1.0/np.sqrt(2), 0.0, -1.0/np.sqrt(2)]
-                    else:
-                        attributes['x0'] = [x0[0]+xl[0], x0[1], x0[2]-xl[2]/2.0]
-                        attributes['npml'] = [1.0, 0.0, 0.0]
-            else:
-                if xavg[1] < (x0[1] - xl[1]):
-                    if xavg[2] < (x0[2] - xl[2]):
-                        attributes['x0'] = [x0[0], x0[1]-xl[1], x0[2]-xl[2]]
-                        attributes['npml'] = [0.0, -1.0/np.sqrt(2), -1.0/np.sqrt(2)]
-                    else:
-                        attributes['x0'] = [x0[0], x0[1]-xl[1], x0[2]-xl[2]/2.0]
-                        attributes['npml'] = [0.0, -1.0, 0.0]
-                elif xavg[1] > (x0[1] + xl[1]):
-                    if xavg[2] < (x0[2] - xl[2]):
-                        attributes['x0'] = [x0[0], x0[1]+xl[1], x0[2]-xl[2]]
-                        attributes['npml'] = [0.0, 1.0/np.sqrt(2), -1.0/np.sqrt(2)]
-                    else:
-                        attributes['x0'] = [x0[0], x0[1]+xl[1], x0[2]-xl[2]/2.0]
-                        attributes['npml'] = [0.0, 1.0, 0.0]
-                else:
-                    attributes['x0'] = [x0[0], x0[1], x0[2]-xl[2]]
-                    attributes['npml'] = [0.0, 0.0, -1.0]
-            mesh['Elements'][eTag]['attributes'] = attributes
+    """
+    Assigns the PML attributes 'x0' and 'npml' to the elements according to
+    the region (face, edge or corner of the PML) where the element centroid
+    is located. The regions are classified in a few array operations, and the
+    attributes are interned once per region. The attributes of a structured
+    grid are assigned when it is materialized.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+    """
+    #The attributes are assigned when the structured grid is materialized
+    if isinstance(mesh, StructuredDomain) and mesh.isLazy():
+        mesh.defer(lambda grid: setPMLattributes(grid, x0, xl))
+        return
+
+    ndim = Options['dimension']
+    x0, xl = np.asarray(x0), np.asarray(xl)
+
+    #Element centroids (node coordinates are added in connectivity order)
+    index = GetSpatialIndex(mesh)
+    eTags, ptr, conn = MeshConnectivity(mesh)
+    xn = index.coords[index.getRows(conn),:ndim]
+    nconn = np.diff(ptr)
+    xavg = np.zeros((len(eTags), ndim), dtype=float)
+    for n in np.unique(nconn):
+        elems = np.flatnonzero(nconn == n)
+        coords = np.full((len(elems), ndim), 0.0, dtype=float)
+        for k in range(n):
+            coords += xn[ptr[elems] + k]
+        xavg[elems] = coords/n
+
+    #Region codes: -1 (below), 0 (inside), +1 (above) the box in each direction
+    code = np.zeros((len(eTags), ndim), dtype=int)
+    code[xavg < (x0[:ndim] - xl[:ndim])] = -1
+    code[xavg > (x0[:ndim] + xl[:ndim])] =  1
+    code[:,-1] = np.minimum(code[:,-1], 0)
+    code[np.all(code[:,:-1] == 0, axis=1),-1] = -1
+    regions, region = np.unique(code, axis=0, return_inverse=True)
+    region = region.ravel()
+
+    def PMLattributes(base, k):
+        attributes = copy.deepcopy(base)
+        attributes['x0'], attributes['npml'] = PMLRegion(regions[k].tolist(), x0, xl)
+        return InternAttributes(attributes)
+
+    Elements = mesh['Elements']
+    if isinstance(Elements, ElementStorage):
+        #One record for each (attributes, region) pair
+        attrid, records = Elements.getAttributeIds()
+        pairs, group = np.unique(np.stack([attrid, region], axis=1), axis=0, return_inverse=True)
+        ids = np.array([Elements.getRecordId(PMLattributes(records[a], k)) for a, k in pairs.tolist()], dtype=attrid.dtype)
+        attrid[:] = ids[group.ravel()]
+    else:
+        #Elements in dictionaries own a copy of the attributes of their region
+        cache = dict()
+        for eTag, k in zip(eTags.tolist(), region.tolist()):
+            base = Elements[eTag]['attributes']
+            base = base.record() if isinstance(base, AttributeView) else base
+            key = (AttributeKey(base), k)
+            if key not in cache:
+                cache[key] = PMLattributes(base, k)
+            Elements[eTag]['attributes'] = CopyAttributes(cache[key])
 
 def setPMLDomain(attributes, x0, xl):
     """
@@ -942,53 +1107,11 @@ def setPMLDomain(attributes, x0, xl):
     elif Options['dimension'] == 3:
         mesh = makeDomainVolume(options=attributes)
 
-    #Identify the elements to be removed
-    rmElems = set()
-    cpElems = set()
-    for eTag in mesh['Elements']:
-        count = 0
-        nodes = mesh['Elements'][eTag]['conn']
-        nNodes = len(nodes)
-        for nTag in nodes:
-            xn = mesh['Nodes'][nTag]['coords']
-            cn = np.abs(xn - x0) <= xl
-            if cn.all():
-                count += 1
-        if 0 < count and count < nNodes:
-            cpElems.add(eTag)
-        elif count == nNodes:
-            rmElems.add(eTag)
-
-    #List of Nodes to be removed
-    removeNodes = set()
-    for eTag in rmElems:
-        nodes = mesh['Elements'][eTag]['conn']
-        for nTag in nodes:
-            removeNodes.add(nTag)
+    #Identify the elements and nodes to be removed
+    rmElems, rmNodes, keepNodes = SplitDomain(mesh, x0, xl)
 
-    #Identify Nodes of the cut section 
-    keepNodes = set()
-    for eTag in cpElems:
-        nodes = mesh['Elements'][eTag]['conn']
-        for nTag in nodes:
-            xn = mesh['Nodes'][nTag]['coords']
-            cn = np.abs(xn - x0) <= xl
-            if cn.all():
-                keepNodes.add(nTag)
-
-    rmNodes = removeNodes.difference(keepNodes)
-
-    #Remove the elements and associated nodes
-    for nTag in rmNodes:
-        del mesh['Nodes'][nTag]
-    for eTag in rmElems:
-        del mesh['Elements'][eTag]
-
-    #Re-Numbers Nodes and Elements and Interface
-    nMap = reLabel(mesh)
-    cpNodes = list()
-    for k in keepNodes:
-        cpNodes.append(nMap[k])
+    #Remove the elements and associated nodes, and re-numbers the Interface
+    cpNodes = RemoveEntities(mesh, rmElems, rmNodes, keepNodes)
 
     setPMLattributes(mesh, x0, xl)
 
@@ -1038,39 +1161,16 @@ def setDRMDomain(mesh, x0, xl):
         Exterior  : list
             List with the DRM external node Tags 
     """
-    #Identify the DRM elements
-    elemDRM = set()
-    for eTag in mesh['Elements']:
-        count = 0
-        nodes = mesh['Elements'][eTag]['conn']
-        for nTag in nodes:
-            xn = mesh['Nodes'][nTag]['coords']
-            cn = np.abs(xn - x0) <= xl
-            if cn.all():
-                count += 1
-        if 0 < count and count < len(nodes):
-            elemDRM.add(eTag)
-
-    #Interior/Exterior DRM node lists
-    intDRM = set()
-    extDRM = set()
-    for eTag in elemDRM:
-        nodes = mesh['Elements'][eTag]['conn']
-        for nTag in nodes:
-            xn = mesh['Nodes'][nTag]['coords']
-            cn = np.abs(xn - x0) <= xl
-            if cn.all():
-                intDRM.add(nTag)
-            else:
-                extDRM.add(nTag)
+    #Identify the DRM elements and Interior/Exterior DRM node lists
+    intDRM, extDRM, elemDRM = GetDRMSets(mesh, x0, xl)
 
     #Provides the DRM information in Mesh
     if 'DRM' not in mesh:
          mesh['DRM'] = dict()
 
-    mesh['DRM']['Interior'] = list(intDRM)
-    mesh['DRM']['Exterior'] = list(extDRM)
-    mesh['DRM']['Elements'] = list(elemDRM)
+    mesh['DRM']['Interior'] = intDRM
+    mesh['DRM']['Exterior'] = extDRM
+    mesh['DRM']['Elements'] = elemDRM
 
 def setRestrains(mesh, dof=[], bc=[]):
     """
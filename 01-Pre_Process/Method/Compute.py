@@ -4,6 +4,7 @@
 import numpy as np
 from Core.Definitions import Entities, Options
 from Core.Utilities import *
+from Core.Spatial import GetDRMSets
 
 def GetDRMInformation(x0, xl):
     """
@@ -30,35 +31,8 @@ def GetDRMInformation(x0, xl):
     Exterior  : list
         List with the DRM external node Tags 
     """
-    #Identify the DRM elements
-    elemDRM = set()
-    for eTag in Entities['Elements']:
-        count = 0
-        nodes = Entities['Elements'][eTag]['conn']
-        for nTag in nodes:
-            xn = Entities['Nodes'][nTag]['coords']
-            cn = np.abs(xn - x0) <= xl
-            if cn.all():
-                count += 1
-        if 0 < count and count < len(nodes):
-            elemDRM.add(eTag)
-
-    #Interior/Exterior DRM node lists
-    intDRM = set()
-    extDRM = set()
-    for eTag in elemDRM:
-        nodes = Entities['Elements'][eTag]['conn']
-        for nTag in nodes:
-            xn = Entities['Nodes'][nTag]['coords']
-            cn = np.abs(xn - x0) <= xl
-            if cn.all():
-                intDRM.add(nTag)
-            else:
-                extDRM.add(nTag)
-    #Provides the DRM information in Mesh
-    intDRM = list(intDRM)
-    extDRM = list(extDRM)
-    elemDRM = list(elemDRM)    
+    #Identify the DRM elements and Interior/Exterior DRM node lists
+    intDRM, extDRM, elemDRM = GetDRMSets(Entities, x0, xl)
 
     return intDRM, extDRM, elemDRM
 
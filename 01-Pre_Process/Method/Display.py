@@ -4,6 +4,7 @@
 import os
 import numpy as np
 from Core.Utilities import debugInfo, setFileExtension
+from Core.Storage import GetNodeStorage, GetElementStorage
 from Core.Definitions import Entities, Options, SVLclasses
 
 def GetNumberOfFeatures():
@@ -61,45 +62,41 @@ def renderData(filename=''):
         Paraviewfile.write("%s<Points>\n%s" % (head3, head4))
         Paraviewfile.write("<DataArray type=\"Float32\" NumberOfComponents=\"3\" Format=\"ascii\">\n")
 
-        count = 0
-        ParaviewMap = dict()
-        for nTag in Entities['Nodes']:
-            coords = Entities['Nodes'][nTag]['coords']
-            if Options['dimension'] == 2:
-                coords = [coords[0], coords[1], 0.0]
-            elif Options['dimension'] == 1:
-                coords = [coords[0], 0.0, 0.0]
-            Paraviewfile.write("%s  %E %E %E\n" % (head3, coords[0], coords[1], coords[2]))
-            ParaviewMap[nTag] = count 
-            count += 1
+        #Array-backed Nodes and Elements
+        nodes = GetNodeStorage()
+        elems = GetElementStorage()
+        ptr, conn = elems.getConnectivity()
+        _, ndof, free, _ = nodes.getDofs()
+        codes, names = elems.getNames()
+        attrid, records = elems.getAttributeIds()
+
+        xyz = np.array(nodes.getCoordinates(3))
+        if Options['dimension'] == 2:
+            xyz[:,2] = 0.0
+        elif Options['dimension'] == 1:
+            xyz[:,1:] = 0.0
+        np.savetxt(Paraviewfile, xyz, fmt=head3 + '  %E %E %E')
 
         Paraviewfile.write("%s</DataArray>\n%s" % (head4, head3))
         Paraviewfile.write("</Points>\n%s" % head3)
         Paraviewfile.write("<Cells>\n%s" % head4)
         Paraviewfile.write("<DataArray type=\"Int64\" Name=\"connectivity\" Format=\"ascii\">")
 
-        for eTag in Entities['Elements']:
-            connection = Entities['Elements'][eTag]['conn']
-            Paraviewfile.write("\n%s " % head3)
-            for conn in connection:
-                Paraviewfile.write(" %d" % ParaviewMap[conn])
+        ParaviewMap = nodes.getRows(conn).astype(str)
+        for k in range(nElems):
+            Paraviewfile.write("\n%s  %s" % (head3, ' '.join(ParaviewMap[ptr[k]:ptr[k+1]])))
 
         Paraviewfile.write("\n%s" % head4)
         Paraviewfile.write("</DataArray>\n%s" % head4)
         Paraviewfile.write("<DataArray type=\"Int64\" Name=\"offsets\" Format=\"ascii\">\n%s " % head3)
 
-        nOffsets = 0
-        for eTag in Entities['Elements']:
-            nOffsets += len(Entities['Elements'][eTag]['conn'])
-            Paraviewfile.write(" %d" % nOffsets)
+        Paraviewfile.write(''.join(' %d' % n for n in ptr[1:].tolist()))
         Paraviewfile.write("\n%s" % head4)
         Paraviewfile.write("</DataArray>\n%s" % head4)
         Paraviewfile.write("<DataArray type=\"Int32\" Name=\"types\" Format=\"ascii\">\n%s " % head3)
 
-        for eTag in Entities['Elements']:
-            name = Entities['Elements'][eTag]['name']
-            cell = SVLclasses['Elements'][name]['paraview']
-            Paraviewfile.write(" %d" % cell)
+        cells = np.array([SVLclasses['Elements'][name]['paraview'] for name in names], dtype=int)
+        Paraviewfile.write(''.join(' %d' % n for n in cells[codes].tolist()))
 
         Paraviewfile.write("\n%s" % head4)
         Paraviewfile.write("</DataArray>\n%s" % head3)
@@ -107,34 +104,28 @@ def renderData(filename=''):
         Paraviewfile.write("<PointData>\n%s" % head4)
         Paraviewfile.write("<DataArray type=\"Int64\" Name=\"GlobalNodeId\" format=\"ascii\">\n%s" % head4)
 
-        for nTag in Entities['Nodes']:
-            Paraviewfile.write("%d " % nTag)
+        Paraviewfile.write(''.join('%d ' % n for n in nodes.getTags().tolist()))
 
         Paraviewfile.write("\n%s" % head4)
         Paraviewfile.write("</DataArray>\n%s" % head4)
         Paraviewfile.write("<DataArray type=\"Int32\" Name=\"DegreeOfFreedom\" format=\"ascii\">\n%s" % head4)
 
-        for nTag in Entities['Nodes']:
-            Paraviewfile.write("%d " % Entities['Nodes'][nTag]['ndof'])
+        Paraviewfile.write(''.join('%d ' % n for n in ndof.tolist()))
 
         Paraviewfile.write("\n%s" % head4)
         Paraviewfile.write("</DataArray>\n%s" % head4)
 
+        #The first restrained (1) or constrained (-1) degree of freedom defines the condition
         bc = np.zeros(nNodes, dtype=int)
-        for nTag in Entities['Nodes']:
-            freedof = Entities['Nodes'][nTag]['freedof']
-            for dof in freedof:
-                if dof == -1:
-                    bc[ParaviewMap[nTag]] = 1
-                    break
-                elif dof < -1:
-                    bc[ParaviewMap[nTag]] = -1
-                    break
+        flag = np.where(free == -1, 1, np.where(free < -1, -1, 0))
+        index = np.flatnonzero(flag)
+        owner = np.repeat(np.arange(nNodes), ndof)[index]
+        owner, first = np.unique(owner, return_index=True)
+        bc[owner] = flag[index[first]]
 
         Paraviewfile.write("<DataArray type=\"Int32\" Name=\"NodeConditions\" format=\"ascii\">\n%s" % head4)
 
-        for n in bc:
-            Paraviewfile.write("%d " % n)
+        Paraviewfile.write(''.join('%d ' % n for n in bc.tolist()))
 
         Paraviewfile.write("\n%s" % head4)
         Paraviewfile.write("</DataArray>\n%s" % head3)
@@ -142,17 +133,15 @@ def renderData(filename=''):
         Paraviewfile.write("<CellData>\n%s" % head4)
         Paraviewfile.write("<DataArray type=\"Int64\" Name=\"GlobalElementId\" format=\"ascii\">\n%s" % head4)
 
-        for eTag in Entities['Elements']:
-            Paraviewfile.write("%d " % eTag)
+        Paraviewfile.write(''.join('%d ' % n for n in elems.getTags().tolist()))
 
         Paraviewfile.write("\n%s" % head4)
         Paraviewfile.write("</DataArray>\n%s" % head4)
 
         Paraviewfile.write("<DataArray type=\"Int32\" Name=\"ElementGroup\" format=\"ascii\">\n%s" % head4)
 
-        for eTag in Entities['Elements']:
-            name = Entities['Elements'][eTag]['name']
-            Paraviewfile.write("%d " % SVLclasses['Elements'][name]['group'])
+        groups = np.array([SVLclasses['Elements'][name]['group'] for name in names], dtype=int)
+        Paraviewfile.write(''.join('%d ' % n for n in groups[codes].tolist()))
 
         Paraviewfile.write("\n%s" % head4)
         Paraviewfile.write("</DataArray>\n%s" % head4)
@@ -160,11 +149,8 @@ def renderData(filename=''):
         #Materials
         Paraviewfile.write("<DataArray type=\"Int64\" Name=\"Materials\" format=\"ascii\">\n%s" % head4)
 
-        for eTag in Entities['Elements']:
-            if 'material' in Entities['Elements'][eTag]['attributes']:
-                Paraviewfile.write("%d " % Entities['Elements'][eTag]['attributes']['material'])
-            else:
-                Paraviewfile.write("-1 ")
+        values = np.array([record.get('material', -1) for record in records], dtype=int)
+        Paraviewfile.write(''.join('%d ' % n for n in values[attrid].tolist()))
 
         Paraviewfile.write("\n%s" % head4)
         Paraviewfile.write("</DataArray>\n%s" % head4)
@@ -172,11 +158,8 @@ def renderData(filename=''):
         #Sections
         Paraviewfile.write("<DataArray type=\"Int64\" Name=\"Sections\" format=\"ascii\">\n%s" % head4)
 
-        for eTag in Entities['Elements']:
-            if 'section' in Entities['Elements'][eTag]['attributes']:
-                Paraviewfile.write("%d " % Entities['Elements'][eTag]['attributes']['section'])
-            else:
-                Paraviewfile.write("-1 ")
+        values = np.array([record.get('section', -1) for record in records], dtype=int)
+        Paraviewfile.write(''.join('%d ' % n for n in values[attrid].tolist()))
 
         Paraviewfile.write("\n%s" % head4)
 
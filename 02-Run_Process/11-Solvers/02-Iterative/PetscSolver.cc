@@ -13,8 +13,8 @@
 KSPType KSPSolverName;
 
 //Overload constructor.
-PetscSolver::PetscSolver(unsigned int dnz, unsigned int onz, double tol, unsigned int kspnum) : 
-d_nz(dnz), o_nz(onz), Tolerance(tol) {
+PetscSolver::PetscSolver(unsigned int dnz, unsigned int onz, double tol, unsigned int kspnum, int nrows, std::vector<int> dnnz, std::vector<int> onnz) : 
+d_nz(dnz), o_nz(onz), nLocal(nrows), d_nnz(dnnz), o_nnz(onnz), Reported(false), Tolerance(tol) {
     //Assigns the iterative solver.    
     switch (kspnum){
         case 0: {    //The Preconditioned Conjugate Gradient (PCG) iterative method 
@@ -54,10 +54,13 @@ PetscSolver::SolveSystem(Eigen::SparseMatrix<double> &K, Eigen::VectorXd &b){
     //Starts profiling this function.
     PROFILE_FUNCTION();
 
+    //Number of rows owned by this processor.
+    PetscInt nRows = nLocal < 0 ? PETSC_DECIDE : nLocal;
+
     //Creates and Assembles the right-hand side vector.
     Vec B;
     VecCreate(PETSC_COMM_WORLD, &B);
-    VecSetSizes(B, PETSC_DECIDE, numberOfFreeDofs);
+    VecSetSizes(B, nRows, numberOfFreeDofs);
     VecSetFromOptions(B); 
     VecSet(B, 0.0); 
 
@@ -76,13 +79,23 @@ PetscSolver::SolveSystem(Eigen::SparseMatrix<double> &K, Eigen::VectorXd &b){
     //Creates and Assembles the left-hand side matrix.
     Mat A;
     MatCreate(PETSC_COMM_WORLD, &A); 
-    MatSetSizes(A, PETSC_DECIDE, PETSC_DECIDE, numberOfFreeDofs, numberOfFreeDofs);     
+    MatSetSizes(A, nRows, nRows, numberOfFreeDofs, numberOfFreeDofs);     
     MatSetFromOptions(A);
-    MatMPIAIJSetPreallocation(A, d_nz, PETSC_NULL, o_nz, PETSC_NULL);
+
+    //Exact number of nonzero per row if they match the owned rows
+    std::vector<PetscInt> dnnz, onnz;
+    if(nLocal >= 0 && d_nnz.size() == (unsigned int)nLocal && o_nnz.size() == (unsigned int)nLocal){
+        dnnz.assign(d_nnz.begin(), d_nnz.end());
+        onnz.assign(o_nnz.begin(), o_nnz.end());
+    }
+
+    const PetscInt *dRows = dnnz.empty() ? PETSC_NULL : dnnz.data();
+    const PetscInt *oRows = onnz.empty() ? PETSC_NULL : onnz.data();
+    MatMPIAIJSetPreallocation(A, d_nz, dRows, o_nz, oRows);
 
     //Sequential Matrix for single core execution
     if(size == 1)
-        MatSeqAIJSetPreallocation(A, d_nz, PETSC_NULL);
+        MatSeqAIJSetPreallocation(A, d_nz, dRows);
 
     for(unsigned int k = 0; k < K.outerSize(); ++k){
         for(Eigen::SparseMatrix<double>::InnerIterator it(K,k); it; ++it) {
@@ -96,10 +109,18 @@ PetscSolver::SolveSystem(Eigen::SparseMatrix<double> &K, Eigen::VectorXd &b){
     MatAssemblyBegin(A, MAT_FINAL_ASSEMBLY);
     MatAssemblyEnd(A, MAT_FINAL_ASSEMBLY);     
 
+    //Reports the allocated and used memory once.
+    if(!Reported){
+        MatInfo info;
+        MatGetInfo(A, MAT_GLOBAL_SUM, &info);
+        PetscPrintf(PETSC_COMM_WORLD, "PETSc matrix: %.0f nonzero allocated, %.0f used, %.0f mallocs, %.2f MB\n", info.nz_allocated, info.nz_used, info.mallocs, info.memory/1048576.0);
+        Reported = true;
+    }
+
     //Creates the Solution Vector.
     Vec X;
     VecCreate(PETSC_COMM_WORLD, &X);
-    VecSetSizes(X, PETSC_DECIDE, numberOfFreeDofs); 
+    VecSetSizes(X, nRows, numberOfFreeDofs); 
     VecSetFromOptions(X);
     VecSet(X, 0.0);
 
@@ -45,6 +45,7 @@
 #ifndef _PETSCSOLVER_HPP_
 #define _PETSCSOLVER_HPP_
 
+#include <vector>
 #include <Eigen/Dense>
 #include <Eigen/SparseCore>
 
@@ -65,9 +66,12 @@ class PetscSolver : public LinearSystem {
         ///@param onz Number of nonzero in off-diagonal per row.
         ///@param tol The tolerance at which convergence is reached.
         ///@param kspnum The iterative algorithm to be employed.
+        ///@param nrows Number of (free) rows owned by this processor, PETSc decides if negative.
+        ///@param dnnz Number of nonzero in diagonal for each owned row (empty to use dnz).
+        ///@param onnz Number of nonzero in off-diagonal for each owned row (empty to use onz).
         ///@note More details can be found at @ref linkPetscSolver.
         ///@see PetscSolver::n, PetscSolver::d_nz, PetscSolver::o_nz, PetscSolver::Tolerance.
-        PetscSolver(unsigned int dnz, unsigned int onz, double tol=1E-12, unsigned int kspnum=0);
+        PetscSolver(unsigned int dnz, unsigned int onz, double tol=1E-12, unsigned int kspnum=0, int nrows=-1, std::vector<int> dnnz=std::vector<int>(), std::vector<int> onnz=std::vector<int>());
 
         ///Destroys this PetscSolver object.
         ~PetscSolver();
@@ -92,6 +96,18 @@ class PetscSolver : public LinearSystem {
         ///Number of nonzero in off-diagonal per row. 
         unsigned int o_nz;
 
+        ///Number of local rows owned by this processor (negative if PETSc decides).
+        int nLocal;
+
+        ///Number of nonzero in diagonal for each local row.
+        std::vector<int> d_nnz;
+
+        ///Number of nonzero in off-diagonal for each local row.
+        std::vector<int> o_nnz;
+
+        ///Whether the memory allocation has been reported.
+        bool Reported;
+
         ///Residual tolerance error.
         double Tolerance;
 
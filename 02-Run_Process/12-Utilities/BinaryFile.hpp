@@ -0,0 +1,151 @@
+//==============================================================================
+//
+//                       Seismo Virtual Laboratory
+//             Module for Serial and Parallel Analysis of seismic
+//         wave propagation and soil-structure interaction simulation
+//         Copyright (C) 2018-2021, The California Institute of Technology
+//                         All Rights Reserved.
+//
+// Commercial use of this program without express permission of the California
+// Institute of Technology, is strictly  prohibited. See  file "COPYRIGHT"  in
+// main  directory  for  information on  usage  and  redistribution, and for a
+// DISCLAIMER OF ALL WARRANTIES.
+//
+//==============================================================================
+//
+// Written by:
+//   Danilo S. Kusanovic (dkusanov@caltech.edu)
+//   Elnaz E. Seylabi    (elnaze@unr.edu)
+//
+// Supervised by:
+//   Domniki M. Asimaki  (domniki@caltech.edu)
+//
+// References :
+//  [1]
+//
+// Description:
+///This file contains the "BinaryFile object" declarations, which memory-maps
+///the binary partition files (*.bin) written by the Pre-Process. The layout is:
+///the 8 characters "SVLBIN01", the length of the JSON header as a little-endian
+///64-bit integer, the JSON header, and the contiguous little-endian arrays of
+///the Nodes and Elements starting at the next multiple of 8 bytes. The array
+///offsets stored in the header are relative to that position.
+//------------------------------------------------------------------------------
+
+#ifndef _BINARYFILE_HPP_
+#define _BINARYFILE_HPP_
+
+#include <string>
+#include <cstring>
+#include <cstdint>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+/// @author    Danilo S. Kusanovic (dkusanov@caltech.edu)
+/// @date      October 17, 2021
+/// @version   1.0
+/// @file      BinaryFile.hpp
+/// @class     BinaryFile
+/// @see       Driver.hpp
+/// @brief     Class that memory-maps a binary partition file and provides its JSON header and arrays
+class BinaryFile{
+
+    public:
+        ///Creates a BinaryFile object and memory-maps the file.
+        ///@param fileName The full path of the binary partition file.
+        BinaryFile(std::string fileName) : Size(0), Start(0), Length(0), Data(nullptr){
+            int fd = open(fileName.c_str(), O_RDONLY);
+            if(fd < 0) return;
+
+            struct stat info;
+            if(fstat(fd, &info) == 0 && info.st_size > 16){
+                void* map = mmap(nullptr, info.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+                if(map != MAP_FAILED){
+                    Size = info.st_size;
+                    Data = static_cast<const char*>(map);
+                }
+            }
+            close(fd);
+
+            //Checks the file signature and the header length (Size > 16).
+            if(Data != nullptr){
+                uint64_t length;
+                std::memcpy(&length, Data + 8, sizeof(uint64_t));
+                if(std::memcmp(Data, "SVLBIN01", 8) != 0 || length > Size - 16){
+                    munmap(const_cast<char*>(Data), Size);
+                    Data = nullptr;
+                    Size = 0;
+                    return;
+                }
+                Length = length;
+                Start  = 8*((16 + Length + 7)/8);
+            }
+        }
+
+        ///The mapping is owned by this object, it cannot be copied.
+        BinaryFile(const BinaryFile&) = delete;
+
+        ///The mapping is owned by this object, it cannot be copied.
+        BinaryFile& operator=(const BinaryFile&) = delete;
+
+        ///Destroys this BinaryFile object and unmaps the file.
+        ~BinaryFile(){
+            if(Data != nullptr)
+                munmap(const_cast<char*>(Data), Size);
+        }
+
+        ///Returns if the file was successfully memory-mapped.
+        ///@return Whether the file is open or not.
+        bool IsOpen() const{
+            return Data != nullptr;
+        }
+
+        ///Returns the JSON header with the entities that are not stored as arrays.
+        ///@return The header in JSON format.
+        std::string GetHeader() const{
+            return std::string(Data + 16, Length);
+        }
+
+        ///Returns a pointer to an array stored in the file (no copy is performed).
+        ///@param offset The position of the array relative to the first array (as written in the header).
+        ///@param count The number of values of the array.
+        ///@return Pointer to the first value of the array, null if the array is not inside the file.
+        template<typename T>
+        const T* GetArray(double offset, std::size_t count) const{
+            //Checks that Start + offset + count*sizeof(T) <= Size.
+            std::size_t space = Size > Start ? Size - Start : 0;
+            if(!(offset >= 0.0) || offset > space)
+                return nullptr;
+
+            std::size_t position = static_cast<std::size_t>(offset);
+            if(position % alignof(T) != 0 || count > (space - position)/sizeof(T))
+                return nullptr;
+
+            return reinterpret_cast<const T*>(Data + Start + position);
+        }
+
+    private:
+        ///Size of the mapped file.
+        std::size_t Size;
+
+        ///Position of the first array.
+        std::size_t Start;
+
+        ///Length of the JSON header.
+        std::size_t Length;
+
+        ///The memory-mapped file.
+        const char* Data;
+};
+
+///Checks if the file is a binary partition file (*.bin extension).
+///@param fileName The file name to be checked.
+///@return Whether the file is a binary partition file or not.
+inline bool
+IsBinaryFile(const std::string &fileName){
+    return fileName.size() > 4 && fileName.compare(fileName.size() - 4, 4, ".bin") == 0;
+}
+
+#endif
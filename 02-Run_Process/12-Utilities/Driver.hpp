@@ -35,7 +35,9 @@
 #include <stdlib.h>
 #include <cstring>
 #include <fstream>
+#include <memory>
 #include <iostream>
+#include <iterator>
 #include <algorithm>
 
 #include "Viscous1DLinear.hpp"
@@ -129,6 +131,7 @@
 #include "PetscSolver.hpp"
 
 #include "RSJparser.hpp"
+#include "BinaryFile.hpp"
 #include "Definitions.hpp"
 #include "Profiler.hpp"
 
@@ -222,14 +225,14 @@ GetIDsFromMESH(std::shared_ptr<Mesh>& mesh, std::string Name){
 
 ///The Entities indexes to be updated
 ///@param mesh Pointer to the Mesh container.
-///@param jsonFile json file where mesh entities will be readden.
-///@param Name name of the entity to be readden from json file.
+///@param v1 the identifiers of the entities readden from the (binary) file.
+///@param Name name of the entity in the Mesh object.
 ///@return A map with the added ("add"), deleted ("del") or modified ("mod") entities with respect to previous mesh.
 template<typename T> 
 std::map<std::string, std::vector<T> >
-Entities2Update(std::shared_ptr<Mesh>& mesh, RSJresource& jsonFile, std::string Name){
+Entities2Update(std::shared_ptr<Mesh>& mesh, std::vector<T> v1, std::string Name){
     //Entity Objects To Update
-    std::vector<T> v1 = GetIDsFromJSON<T>(jsonFile, Name);
+    sortVector<T>(v1);
     std::vector<T> v2 = GetIDsFromMESH<T>(mesh, Name);
 
     //Map with indexes for which Node Objects needs to be added, deleted, or modified
@@ -241,6 +244,20 @@ Entities2Update(std::shared_ptr<Mesh>& mesh, RSJresource& jsonFile, std::string
     return Tags;
 }
 
+///The Entities indexes to be updated
+///@param mesh Pointer to the Mesh container.
+///@param jsonFile json file where mesh entities will be readden.
+///@param Name name of the entity to be readden from json file.
+///@return A map with the added ("add"), deleted ("del") or modified ("mod") entities with respect to previous mesh.
+template<typename T> 
+std::map<std::string, std::vector<T> >
+Entities2Update(std::shared_ptr<Mesh>& mesh, RSJresource& jsonFile, std::string Name){
+    //Entity Objects To Update
+    std::vector<T> v1 = GetIDsFromJSON<T>(jsonFile, Name);
+
+    return Entities2Update<T>(mesh, v1, Name);
+}
+
 ///Sets the partition subdomain tag number.
 ///@param theFile file that contains a character to be replaced.
 ///@param k the number to be replaced with.
@@ -297,6 +314,34 @@ GetSpacedName(std::string theFile, std::string toReplace){
     return subDomainMesh;
 }
 
+///Opens a JSON or (memory-mapped) binary partition file.
+///@param file2open full path of the file to be opened.
+///@param content the JSON content of the file, the header for a binary file.
+///@param binFile the memory-mapped binary file, null for a JSON file.
+///@return whether the file was successfully opened or not.
+bool
+OpenInputFile(std::string file2open, std::string &content, std::unique_ptr<BinaryFile> &binFile){
+    //Binary partition files are selected by their extension.
+    if(IsBinaryFile(file2open)){
+        binFile.reset(new BinaryFile(file2open));
+        if(!binFile->IsOpen())
+            return false;
+
+        content = binFile->GetHeader();
+        return true;
+    }
+
+    //Opens the JSON file
+    std::ifstream file2stream(file2open.c_str());
+    if(!file2stream.is_open())
+        return false;
+
+    content = std::string((std::istreambuf_iterator<char>(file2stream)), std::istreambuf_iterator<char>());
+    file2stream.close();
+
+    return true;
+}
+
 ///Updates the Node Entities in Mesh Object 
 ///@param theMesh Pointer to the Mesh container.
 ///@param jsonFile json file where mesh entities will be readden.
@@ -389,6 +434,95 @@ UpdateNodes(std::shared_ptr<Mesh> &theMesh, RSJresource& jsonFile){
     }
 }
 
+///Updates the Node Entities in Mesh Object from the binary arrays
+///@param theMesh Pointer to the Mesh container.
+///@param jsonFile json header with the offsets of the node arrays.
+///@param binFile binary file where the node arrays are stored.
+///@return whether the node arrays are inside the binary file or not.
+bool 
+UpdateNodes(std::shared_ptr<Mesh> &theMesh, RSJresource& jsonFile, BinaryFile& binFile){
+    //Node arrays stored in the binary file
+    RSJresource& Arrays = jsonFile["Binary"]["Nodes"];
+    std::size_t nNodes = Arrays["count"].as<int>(0);
+    unsigned int nCoords = Arrays["ndim"].as<int>(nDimensions);
+
+    const int* nodeTags = binFile.GetArray<int>(Arrays["tag"].as<double>(-1.0), nNodes);
+    const int* nodeDofs = binFile.GetArray<int>(Arrays["ndof"].as<double>(-1.0), nNodes);
+
+    //The degree of freedom lists have the number of degree of freedom of all nodes.
+    std::size_t nTotal = 0;
+    bool IsValid = nodeTags != nullptr && nodeDofs != nullptr && nCoords <= nDimensions;
+    for(std::size_t k = 0; IsValid && k < nNodes; k++){
+        IsValid = nodeDofs[k] >= 0;
+        nTotal += nodeDofs[k];
+    }
+
+    const int* freeDofs = IsValid ? binFile.GetArray<int>(Arrays["freedof"].as<double>(-1.0), nTotal) : nullptr;
+    const int* totalDofs = IsValid ? binFile.GetArray<int>(Arrays["totaldof"].as<double>(-1.0), nTotal) : nullptr;
+    const double* coords = IsValid ? binFile.GetArray<double>(Arrays["coords"].as<double>(-1.0), nNodes*nCoords) : nullptr;
+
+    if(freeDofs == nullptr || totalDofs == nullptr || coords == nullptr){
+        std::cout << "\x1B[31m ERROR: \x1B[0mThe Node arrays in \'Driver::UpdateNodes()\' in Processor [" << rank << "] are outside the binary file. \n";
+        return false;
+    }
+
+    //Node Identifiers To Be Updated
+    std::vector<unsigned int> IDs(nodeTags, nodeTags + nNodes);
+    std::map<std::string, std::vector<unsigned int> > Tags = Entities2Update<unsigned int>(theMesh, IDs, "Nodes");
+
+    //Nodes to be Removed from Mesh Object
+    for(unsigned int k = 0; k < Tags["del"].size(); k++){
+        unsigned int Tag = Tags["del"][k];
+        theMesh->DelNode(Tag);
+    }
+
+    std::map<unsigned int, std::shared_ptr<Node> > theNodes;
+    if( Tags["mod"].size() > 0)
+        theNodes = theMesh->GetNodes();
+
+    //Nodes to be Added To/Modified in Mesh Object
+    std::size_t start = 0;
+    for(std::size_t k = 0; k < nNodes; k++){
+        unsigned int Tag = nodeTags[k];
+        unsigned int nDofs = nodeDofs[k];
+
+        //Free/Total degree of freedom lists and coordinates.
+        std::vector<int> freeDof(freeDofs + start, freeDofs + start + nDofs);
+        std::vector<int> totalDof(totalDofs + start, totalDofs + start + nDofs);
+        start += nDofs;
+
+        Eigen::VectorXd coordinates(nDimensions);
+        for(unsigned int j = 0; j < nCoords; ++j)
+            coordinates(j) = coords[k*nCoords + j];
+
+        //Checks if the node is free/fixed.
+        bool IsFixed = false;
+        if(std::find(freeDof.begin(), freeDof.end(), -1) != freeDof.end())
+            IsFixed = true;
+
+        if(std::binary_search(Tags["add"].begin(), Tags["add"].end(), Tag)){
+            //Creates a node object.
+            std::shared_ptr<Node> theNode = std::make_shared<Node>(nDofs, coordinates, IsFixed);
+
+            //Sets preliminary degree-of-freedom numbering.
+            theNode->SetFreeDegreeOfFreedom(freeDof);
+            theNode->SetTotalDegreeOfFreedom(totalDof);  
+
+            //Stores the information in node container.
+            theMesh->AddNode(Tag, theNode);
+        }
+        else{
+            //Modify the Node's properties according to binary file.
+            theNodes[Tag]->SetAsFixed(IsFixed);
+            theNodes[Tag]->SetCoordinates(coordinates);
+            theNodes[Tag]->SetFreeDegreeOfFreedom(freeDof);
+            theNodes[Tag]->SetTotalDegreeOfFreedom(totalDof);
+        }
+    }
+
+    return true;
+}
+
 ///Updates the Masses in Mesh Object 
 ///@param theMesh Pointer to the Mesh container.
 ///@param jsonFile json file where mesh entities will be readden.
@@ -992,6 +1126,347 @@ UpdateSections(std::shared_ptr<Mesh> &theMesh, RSJresource& jsonFile){
     }
 }
 
+///Creates an Element object from its class name, connectivity and attributes
+///@param theMesh Pointer to the Mesh container.
+///@param Name the element class name.
+///@param nodes the element connectivity (node identifiers).
+///@param attributes json object with the element attributes.
+///@return A pointer to the new Element object.
+std::shared_ptr<Element>
+CreateElement(std::shared_ptr<Mesh> &theMesh, std::string Name, std::vector<unsigned int> &nodes, RSJresource& attributes){
+    //Creates an element object.
+    std::shared_ptr<Element> theElement;
+
+    if(strcasecmp(Name.c_str(),"lin2DTruss2") == 0){
+        unsigned int matID = attributes["material"].as<int>();       
+        double parameters = attributes["area"].as<double>();
+
+        //Instantiate the lin2DTruss2 element.
+        theElement = std::make_shared<lin2DTruss2>(nodes, theMesh->GetMaterial(matID), parameters);
+    }
+    else if(strcasecmp(Name.c_str(),"kin2DTruss2") == 0){  
+        unsigned int matID = attributes["material"].as<int>();  
+        double parameters = attributes["area"].as<double>();
+
+        //Instantiate the kin2DTruss2 element.
+        theElement = std::make_shared<kin2DTruss2>(nodes, theMesh->GetMaterial(matID), parameters);
+    }
+    else if(strcasecmp(Name.c_str(),"lin3DTruss2") == 0){   
+        unsigned int matID = attributes["material"].as<int>();     
+        double parameters = attributes["area"].as<double>();
+
+        //Instantiate the lin3DTruss2 element.
+        theElement = std::make_shared<lin3DTruss2>(nodes, theMesh->GetMaterial(matID), parameters);
+    }
+    else if(strcasecmp(Name.c_str(),"kin3DTruss2") == 0){
+        unsigned int matID = attributes["material"].as<int>();
+        double parameters = attributes["area"].as<double>();
+
+        //Instantiate the kin3DTruss2 element.
+        theElement = std::make_shared<kin3DTruss2>(nodes, theMesh->GetMaterial(matID), parameters);
+    }
+    else if(strcasecmp(Name.c_str(),"lin2DTruss3") == 0){      
+        double parameters = attributes["area"].as<double>();
+        unsigned int nGauss = attributes["np"].as<int>(3);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the lin2DTruss3 element.
+        theElement = std::make_shared<lin2DTruss3>(nodes, theMesh->GetMaterial(matID), parameters, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"lin3DTruss3") == 0){   
+        double parameters = attributes["area"].as<double>();
+        unsigned int nGauss = attributes["np"].as<int>(3);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the lin3DTruss3 element.
+        theElement = std::make_shared<lin3DTruss3>(nodes, theMesh->GetMaterial(matID), parameters, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"ZeroLength1D") == 0){
+        unsigned int dir = attributes["dir"].as<int>();
+        unsigned int matID = attributes["material"].as<int>();
+
+        //Instantiate the zerolength1D element.
+        theElement = std::make_shared<ZeroLength1D>(nodes, theMesh->GetMaterial(matID), dir);
+    }
+    else if(strcasecmp(Name.c_str(),"UnxBoucWen2DLink") == 0){
+        std::vector<double> variables(2, 0.0);
+        std::vector<double> parameters(4, 0.0);
+        double tol = attributes["tol"].as<double>(1E-06);
+        unsigned int nmax = attributes["nmax"].as<int>(50);
+        unsigned int dir = attributes["dir"].as<int>();
+        unsigned int dim = attributes["dim"].as<int>();
+
+        variables[0] = attributes["Fy"].as<double>();
+        variables[1] = attributes["k0"].as<double>();
+        parameters[0] = attributes["alpha"].as<double>(1.0);
+        parameters[1] = attributes["eta"].as<double>(1.0);
+        parameters[2] = attributes["beta"].as<double>(0.5);
+        parameters[3] = attributes["gamma"].as<double>(0.5);
+
+        //Instantiate the UnxBoucWen2DLink element.
+        theElement = std::make_shared<UnxBoucWen2DLink>(nodes, parameters, variables, dim, dir, tol, nmax);
+    }
+    else if(strcasecmp(Name.c_str(),"UnxBoucWen3DLink") == 0){
+        std::vector<double> variables(2, 0.0);
+        std::vector<double> parameters(4, 0.0);
+        double tol = attributes["tol"].as<double>(1E-06);
+        unsigned int nmax = attributes["nmax"].as<int>(50);
+        unsigned int dir = attributes["dir"].as<int>();
+        unsigned int dim = attributes["dim"].as<int>();
+
+        variables[0] = attributes["Fy"].as<double>();
+        variables[1] = attributes["k0"].as<double>();
+        parameters[0] = attributes["alpha"].as<double>(1.0);
+        parameters[1] = attributes["eta"].as<double>(1.0);
+        parameters[2] = attributes["beta"].as<double>(0.5);
+        parameters[3] = attributes["gamma"].as<double>(0.5);
+
+        //Instantiate the UnxBoucWen3DLink element.
+        theElement = std::make_shared<UnxBoucWen3DLink>(nodes, parameters, variables, dim, dir, tol, nmax);
+    }
+    else if(strcasecmp(Name.c_str(),"HDRBYamamoto2DLink") == 0){
+        double De = attributes["De"].as<double>(1.3);
+        double Di = attributes["Di"].as<double>(0.3);
+        double Hr = attributes["Hr"].as<double>(0.261);
+        unsigned int dim = attributes["dim"].as<int>();
+
+        //Instantiate the HDRBYamamoto2DLink element.
+        theElement = std::make_shared<HDRBYamamoto2DLink>(nodes, De, Di, Hr, dim);
+    }
+    else if(strcasecmp(Name.c_str(),"HDRBYamamoto3DLink") == 0){
+        double De = attributes["De"].as<double>(1.3);
+        double Di = attributes["Di"].as<double>(0.3);
+        double Hr = attributes["Hr"].as<double>(0.261);
+        unsigned int dim = attributes["dim"].as<int>();
+
+        //Instantiate the HDRBYamamoto3DLink element.
+        theElement = std::make_shared<HDRBYamamoto3DLink>(nodes, De, Di, Hr, dim);
+    }
+    else if(strcasecmp(Name.c_str(),"lin2DFrame2") == 0){
+        unsigned int nGauss = attributes["np"].as<int>(3);
+        unsigned int secID = attributes["section"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+        std::string Formulation = attributes["formulation"].as<std::string>("Bernoulli");
+
+        //Frame element formulation.
+        bool Condition = false;
+        if(strcasecmp(Formulation.c_str(),"Timoshenko") == 0)
+            Condition = true;
+                    
+        //Instantiate the lin2DFrame2 element.
+        theElement = std::make_shared<lin2DFrame2>(nodes, theMesh->GetSection(secID), Condition, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"kin2DFrame2") == 0){
+        unsigned int secID = attributes["section"].as<int>();
+                    
+        //Instantiate the kin2DFrame2 element.
+        theElement = std::make_shared<kin2DFrame2>(nodes, theMesh->GetSection(secID));
+    }
+    else if(strcasecmp(Name.c_str(),"lin3DFrame2") == 0){
+        unsigned int nGauss = attributes["np"].as<int>(3);
+        unsigned int secID = attributes["section"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+        std::string Formulation = attributes["formulation"].as<std::string>("Bernoulli");
+
+        //Frame element formulation.
+        bool Condition = false;
+        if(strcasecmp(Formulation.c_str(),"Timoshenko") == 0)
+            Condition = true;
+
+        //Instantiate the lin3DFrame2 element.
+        theElement = std::make_shared<lin3DFrame2>(nodes, theMesh->GetSection(secID), Condition, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"lin2DTria3") == 0){
+        double thickness = attributes["th"].as<double>();
+        unsigned int nGauss = attributes["np"].as<int>(4);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the lin2DTria3 element.
+        theElement = std::make_shared<lin2DTria3>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"lin2DTria6") == 0){
+        double thickness = attributes["th"].as<double>();
+        unsigned int nGauss = attributes["np"].as<int>(9);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the lin2DTria6 element.
+        theElement = std::make_shared<lin2DTria6>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"lin2DQuad4") == 0){
+        double thickness = attributes["th"].as<double>();
+        unsigned int nGauss = attributes["np"].as<int>(4);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the lin2DQuad4 element.
+        theElement = std::make_shared<lin2DQuad4>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"lin2DQuad8") == 0){
+        double thickness = attributes["th"].as<double>();
+        unsigned int nGauss = attributes["np"].as<int>(9);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the lin2DQuad8 element.
+        theElement = std::make_shared<lin2DQuad8>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"PML2DQuad4") == 0){
+        std::vector<double> parameters(8);
+        parameters[0] = attributes["th"].as<double>();
+        parameters[1] = attributes["n"].as<double>();
+        parameters[2] = attributes["L"].as<double>();
+        parameters[3] = attributes["R"].as<double>();
+        parameters[4] = attributes["x0"][0].as<double>();
+        parameters[5] = attributes["x0"][1].as<double>();
+        parameters[6] = attributes["npml"][0].as<double>();
+        parameters[7] = attributes["npml"][1].as<double>();
+
+        unsigned int nGauss = attributes["np"].as<int>(4);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the PML2DQuad4 element.
+        theElement = std::make_shared<PML2DQuad4>(nodes, theMesh->GetMaterial(matID), parameters, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"PML2DQuad8") == 0){
+        std::vector<double> parameters(8);
+        parameters[0] = attributes["th"].as<double>();
+        parameters[1] = attributes["n"].as<double>();
+        parameters[2] = attributes["L"].as<double>();
+        parameters[3] = attributes["R"].as<double>();
+        parameters[4] = attributes["x0"][0].as<double>();
+        parameters[5] = attributes["x0"][1].as<double>();
+        parameters[6] = attributes["npml"][0].as<double>();
+        parameters[7] = attributes["npml"][1].as<double>();
+
+        unsigned int nGauss = attributes["np"].as<int>(9);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the PML2DQuad4 element.
+        theElement = std::make_shared<PML2DQuad8>(nodes, theMesh->GetMaterial(matID), parameters, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"kin2DQuad4") == 0){
+        double thickness = attributes["th"].as<double>();
+        unsigned int nGauss = attributes["np"].as<int>(4);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the kin2DQuad4 element.
+        theElement = std::make_shared<kin2DQuad4>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"lin3DShell4") == 0){
+        unsigned int nGauss = attributes["np"].as<int>(9);
+        unsigned int secID = attributes["section"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+                
+        //Instantiate the lin3DShell4 element.
+        theElement = std::make_shared<lin3DShell4>(nodes, theMesh->GetSection(secID), Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"lin3DTetra4") == 0){
+        unsigned int nGauss = attributes["np"].as<int>(4);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the lin3DTetra4 element.
+        theElement = std::make_shared<lin3DTetra4>(nodes, theMesh->GetMaterial(matID), Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"lin3DTetra10") == 0){
+        unsigned int nGauss = attributes["np"].as<int>(11);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the lin3DTetra10 element.
+        theElement = std::make_shared<lin3DTetra10>(nodes, theMesh->GetMaterial(matID), Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"lin3DHexa8") == 0){
+        unsigned int nGauss = attributes["np"].as<int>(8);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the lin3DHexa8 element.
+        theElement = std::make_shared<lin3DHexa8>(nodes, theMesh->GetMaterial(matID), Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"kin3DHexa8") == 0){
+        unsigned int nGauss = attributes["np"].as<int>(8);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the kin3DHexa8 element.
+        theElement = std::make_shared<kin3DHexa8>(nodes, theMesh->GetMaterial(matID), Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"PML3DHexa8") == 0){
+        std::vector<double> parameters(9);
+        parameters[0] = attributes["n"].as<double>();
+        parameters[1] = attributes["L"].as<double>();
+        parameters[2] = attributes["R"].as<double>();
+        parameters[3] = attributes["x0"][0].as<double>();
+        parameters[4] = attributes["x0"][1].as<double>();
+        parameters[5] = attributes["x0"][2].as<double>();
+        parameters[6] = attributes["npml"][0].as<double>();
+        parameters[7] = attributes["npml"][1].as<double>();
+        parameters[8] = attributes["npml"][2].as<double>();
+
+        unsigned int nGauss = attributes["np"].as<int>(8);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the PML3DHexa8 element.
+        theElement = std::make_shared<PML3DHexa8>(nodes, theMesh->GetMaterial(matID), parameters, Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"lin3DHexa20") == 0){
+        unsigned int nGauss = attributes["np"].as<int>(27);
+        unsigned int matID = attributes["material"].as<int>();
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the lin3DHexa20 element.
+        theElement = std::make_shared<lin3DHexa20>(nodes, theMesh->GetMaterial(matID), Quadrature, nGauss);
+    }
+    else if(strcasecmp(Name.c_str(),"TIEQlin2DQuad4") == 0){
+        double cf1 = attributes["cf1"].as<double>();
+        double cf2 = attributes["cf2"].as<double>();
+        double zref = attributes["zref"].as<double>();
+        double eref = attributes["eref"].as<double>();
+        double thickness = attributes["th"].as<double>();
+        unsigned int matID = attributes["material"].as<int>();
+        std::string eType = attributes["type"].as<std::string>("Darandelli");
+        unsigned int nGauss = attributes["np"].as<int>(4);
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the TIEQlin2DQuad4 element.
+        theElement = std::make_shared<TIEQlin2DQuad4>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss, eType, zref, cf1, cf2, eref);
+    }
+    else if(strcasecmp(Name.c_str(),"EQlin2DQuad4") == 0){
+        double cf1 = attributes["cf1"].as<double>();
+        double cf2 = attributes["cf2"].as<double>();
+        double zref = attributes["zref"].as<double>();
+        double thickness = attributes["th"].as<double>();
+        unsigned int matID = attributes["material"].as<int>();
+        std::string eType = attributes["type"].as<std::string>("Darandelli");
+        unsigned int nGauss = attributes["np"].as<int>(4);
+        std::string Quadrature = attributes["rule"].as<std::string>("GAUSS");
+
+        //Instantiate the EQlin2DQuad4 element.
+        theElement = std::make_shared<EQlin2DQuad4>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss, eType, zref, cf1, cf2);
+    }
+    else if(strcasecmp(Name.c_str(),"null2DFrame2") == 0){
+        //Instantiate the null2DFrame2 element.
+        theElement = std::make_shared<null2DFrame2>(nodes);
+    }
+    else if(strcasecmp(Name.c_str(),"null3DFrame2") == 0){
+        //Instantiate the null3DFrame2 element.
+        theElement = std::make_shared<null3DFrame2>(nodes);
+    }
+
+    //TODO: Add more elements models here.
+
+    return theElement;
+}
+
 ///Updates the Element Entities in Mesh Object 
 ///@param theMesh Pointer to the Mesh container.
 ///@param jsonFile json file where mesh entities will be readden.
@@ -1021,338 +1496,75 @@ UpdateElements(std::shared_ptr<Mesh> &theMesh, RSJresource& jsonFile){
             nodes[k] = jsonFile["Elements"][eTag]["conn"][k].as<int>();
 
         //Creates an element object.
-        std::shared_ptr<Element> theElement;
+        std::shared_ptr<Element> theElement = CreateElement(theMesh, Name, nodes, jsonFile["Elements"][eTag]["attributes"]);
 
-        if(strcasecmp(Name.c_str(),"lin2DTruss2") == 0){
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();       
-            double parameters = jsonFile["Elements"][eTag]["attributes"]["area"].as<double>();
+        //Stores the information in element container.
+        theMesh->AddElement(Tag, theElement);
+    }
+}
 
-            //Instantiate the lin2DTruss2 element.
-            theElement = std::make_shared<lin2DTruss2>(nodes, theMesh->GetMaterial(matID), parameters);
-        }
-        else if(strcasecmp(Name.c_str(),"kin2DTruss2") == 0){  
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();  
-            double parameters = jsonFile["Elements"][eTag]["attributes"]["area"].as<double>();
+///Updates the Element Entities in Mesh Object from the binary arrays
+///@param theMesh Pointer to the Mesh container.
+///@param jsonFile json header with the offsets of the element arrays.
+///@param binFile binary file where the element arrays are stored.
+///@return whether the element arrays are inside the binary file or not.
+bool 
+UpdateElements(std::shared_ptr<Mesh> &theMesh, RSJresource& jsonFile, BinaryFile& binFile){
+    //Element arrays stored in the binary file
+    RSJresource& Arrays = jsonFile["Binary"]["Elements"];
+    std::size_t nElems = Arrays["count"].as<int>(0);
+
+    const int* elemTags = binFile.GetArray<int>(Arrays["tag"].as<double>(-1.0), nElems);
+    const int* elemName = binFile.GetArray<int>(Arrays["class"].as<double>(-1.0), nElems);
+    const int* elemConn = binFile.GetArray<int>(Arrays["nconn"].as<double>(-1.0), nElems);
+    const int* elemAttr = binFile.GetArray<int>(Arrays["attributes"].as<double>(-1.0), nElems);
+
+    //The connectivity has the number of nodes of all elements.
+    std::size_t nConn = 0;
+    bool IsValid = elemTags != nullptr && elemName != nullptr && elemConn != nullptr && elemAttr != nullptr;
+    for(std::size_t k = 0; IsValid && k < nElems; k++){
+        IsValid = elemConn[k] >= 0;
+        nConn += elemConn[k];
+    }
 
-            //Instantiate the kin2DTruss2 element.
-            theElement = std::make_shared<kin2DTruss2>(nodes, theMesh->GetMaterial(matID), parameters);
-        }
-        else if(strcasecmp(Name.c_str(),"lin3DTruss2") == 0){   
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();     
-            double parameters = jsonFile["Elements"][eTag]["attributes"]["area"].as<double>();
+    const int* connects = IsValid ? binFile.GetArray<int>(Arrays["conn"].as<double>(-1.0), nConn) : nullptr;
 
-            //Instantiate the lin3DTruss2 element.
-            theElement = std::make_shared<lin3DTruss2>(nodes, theMesh->GetMaterial(matID), parameters);
-        }
-        else if(strcasecmp(Name.c_str(),"kin3DTruss2") == 0){
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            double parameters = jsonFile["Elements"][eTag]["attributes"]["area"].as<double>();
-
-            //Instantiate the kin3DTruss2 element.
-            theElement = std::make_shared<kin3DTruss2>(nodes, theMesh->GetMaterial(matID), parameters);
-        }
-        else if(strcasecmp(Name.c_str(),"lin2DTruss3") == 0){      
-            double parameters = jsonFile["Elements"][eTag]["attributes"]["area"].as<double>();
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(3);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the lin2DTruss3 element.
-            theElement = std::make_shared<lin2DTruss3>(nodes, theMesh->GetMaterial(matID), parameters, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"lin3DTruss3") == 0){   
-            double parameters = jsonFile["Elements"][eTag]["attributes"]["area"].as<double>();
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(3);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the lin3DTruss3 element.
-            theElement = std::make_shared<lin3DTruss3>(nodes, theMesh->GetMaterial(matID), parameters, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"ZeroLength1D") == 0){
-            unsigned int dir = jsonFile["Elements"][eTag]["attributes"]["dir"].as<int>();
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
+    if(connects == nullptr){
+        std::cout << "\x1B[31m ERROR: \x1B[0mThe Element arrays in \'Driver::UpdateElements()\' in Processor [" << rank << "] are outside the binary file. \n";
+        return false;
+    }
 
-            //Instantiate the zerolength1D element.
-            theElement = std::make_shared<ZeroLength1D>(nodes, theMesh->GetMaterial(matID), dir);
-        }
-        else if(strcasecmp(Name.c_str(),"UnxBoucWen2DLink") == 0){
-            std::vector<double> variables(2, 0.0);
-            std::vector<double> parameters(4, 0.0);
-            double tol = jsonFile["Elements"][eTag]["attributes"]["tol"].as<double>(1E-06);
-            unsigned int nmax = jsonFile["Elements"][eTag]["attributes"]["nmax"].as<int>(50);
-            unsigned int dir = jsonFile["Elements"][eTag]["attributes"]["dir"].as<int>();
-            unsigned int dim = jsonFile["Elements"][eTag]["attributes"]["dim"].as<int>();
-
-            variables[0] = jsonFile["Elements"][eTag]["attributes"]["Fy"].as<double>();
-            variables[1] = jsonFile["Elements"][eTag]["attributes"]["k0"].as<double>();
-            parameters[0] = jsonFile["Elements"][eTag]["attributes"]["alpha"].as<double>(1.0);
-            parameters[1] = jsonFile["Elements"][eTag]["attributes"]["eta"].as<double>(1.0);
-            parameters[2] = jsonFile["Elements"][eTag]["attributes"]["beta"].as<double>(0.5);
-            parameters[3] = jsonFile["Elements"][eTag]["attributes"]["gamma"].as<double>(0.5);
-
-            //Instantiate the UnxBoucWen2DLink element.
-            theElement = std::make_shared<UnxBoucWen2DLink>(nodes, parameters, variables, dim, dir, tol, nmax);
-        }
-        else if(strcasecmp(Name.c_str(),"UnxBoucWen3DLink") == 0){
-            std::vector<double> variables(2, 0.0);
-            std::vector<double> parameters(4, 0.0);
-            double tol = jsonFile["Elements"][eTag]["attributes"]["tol"].as<double>(1E-06);
-            unsigned int nmax = jsonFile["Elements"][eTag]["attributes"]["nmax"].as<int>(50);
-            unsigned int dir = jsonFile["Elements"][eTag]["attributes"]["dir"].as<int>();
-            unsigned int dim = jsonFile["Elements"][eTag]["attributes"]["dim"].as<int>();
-
-            variables[0] = jsonFile["Elements"][eTag]["attributes"]["Fy"].as<double>();
-            variables[1] = jsonFile["Elements"][eTag]["attributes"]["k0"].as<double>();
-            parameters[0] = jsonFile["Elements"][eTag]["attributes"]["alpha"].as<double>(1.0);
-            parameters[1] = jsonFile["Elements"][eTag]["attributes"]["eta"].as<double>(1.0);
-            parameters[2] = jsonFile["Elements"][eTag]["attributes"]["beta"].as<double>(0.5);
-            parameters[3] = jsonFile["Elements"][eTag]["attributes"]["gamma"].as<double>(0.5);
-
-            //Instantiate the UnxBoucWen3DLink element.
-            theElement = std::make_shared<UnxBoucWen3DLink>(nodes, parameters, variables, dim, dir, tol, nmax);
-        }
-        else if(strcasecmp(Name.c_str(),"HDRBYamamoto2DLink") == 0){
-            double De = jsonFile["Elements"][eTag]["attributes"]["De"].as<double>(1.3);
-            double Di = jsonFile["Elements"][eTag]["attributes"]["Di"].as<double>(0.3);
-            double Hr = jsonFile["Elements"][eTag]["attributes"]["Hr"].as<double>(0.261);
-            unsigned int dim = jsonFile["Elements"][eTag]["attributes"]["dim"].as<int>();
-
-            //Instantiate the HDRBYamamoto2DLink element.
-            theElement = std::make_shared<HDRBYamamoto2DLink>(nodes, De, Di, Hr, dim);
-        }
-        else if(strcasecmp(Name.c_str(),"HDRBYamamoto3DLink") == 0){
-            double De = jsonFile["Elements"][eTag]["attributes"]["De"].as<double>(1.3);
-            double Di = jsonFile["Elements"][eTag]["attributes"]["Di"].as<double>(0.3);
-            double Hr = jsonFile["Elements"][eTag]["attributes"]["Hr"].as<double>(0.261);
-            unsigned int dim = jsonFile["Elements"][eTag]["attributes"]["dim"].as<int>();
-
-            //Instantiate the HDRBYamamoto3DLink element.
-            theElement = std::make_shared<HDRBYamamoto3DLink>(nodes, De, Di, Hr, dim);
-        }
-        else if(strcasecmp(Name.c_str(),"lin2DFrame2") == 0){
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(3);
-            unsigned int secID = jsonFile["Elements"][eTag]["attributes"]["section"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-            std::string Formulation = jsonFile["Elements"][eTag]["attributes"]["formulation"].as<std::string>("Bernoulli");
-
-            //Frame element formulation.
-            bool Condition = false;
-            if(strcasecmp(Formulation.c_str(),"Timoshenko") == 0)
-                Condition = true;
-                        
-            //Instantiate the lin2DFrame2 element.
-            theElement = std::make_shared<lin2DFrame2>(nodes, theMesh->GetSection(secID), Condition, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"kin2DFrame2") == 0){
-            unsigned int secID = jsonFile["Elements"][eTag]["attributes"]["section"].as<int>();
-                        
-            //Instantiate the kin2DFrame2 element.
-            theElement = std::make_shared<kin2DFrame2>(nodes, theMesh->GetSection(secID));
-        }
-        else if(strcasecmp(Name.c_str(),"lin3DFrame2") == 0){
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(3);
-            unsigned int secID = jsonFile["Elements"][eTag]["attributes"]["section"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-            std::string Formulation = jsonFile["Elements"][eTag]["attributes"]["formulation"].as<std::string>("Bernoulli");
-
-            //Frame element formulation.
-            bool Condition = false;
-            if(strcasecmp(Formulation.c_str(),"Timoshenko") == 0)
-                Condition = true;
-
-            //Instantiate the lin3DFrame2 element.
-            theElement = std::make_shared<lin3DFrame2>(nodes, theMesh->GetSection(secID), Condition, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"lin2DTria3") == 0){
-            double thickness = jsonFile["Elements"][eTag]["attributes"]["th"].as<double>();
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(4);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the lin2DTria3 element.
-            theElement = std::make_shared<lin2DTria3>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"lin2DTria6") == 0){
-            double thickness = jsonFile["Elements"][eTag]["attributes"]["th"].as<double>();
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(9);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the lin2DTria6 element.
-            theElement = std::make_shared<lin2DTria6>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"lin2DQuad4") == 0){
-            double thickness = jsonFile["Elements"][eTag]["attributes"]["th"].as<double>();
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(4);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the lin2DQuad4 element.
-            theElement = std::make_shared<lin2DQuad4>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"lin2DQuad8") == 0){
-            double thickness = jsonFile["Elements"][eTag]["attributes"]["th"].as<double>();
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(9);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the lin2DQuad8 element.
-            theElement = std::make_shared<lin2DQuad8>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"PML2DQuad4") == 0){
-            std::vector<double> parameters(8);
-            parameters[0] = jsonFile["Elements"][eTag]["attributes"]["th"].as<double>();
-            parameters[1] = jsonFile["Elements"][eTag]["attributes"]["n"].as<double>();
-            parameters[2] = jsonFile["Elements"][eTag]["attributes"]["L"].as<double>();
-            parameters[3] = jsonFile["Elements"][eTag]["attributes"]["R"].as<double>();
-            parameters[4] = jsonFile["Elements"][eTag]["attributes"]["x0"][0].as<double>();
-            parameters[5] = jsonFile["Elements"][eTag]["attributes"]["x0"][1].as<double>();
-            parameters[6] = jsonFile["Elements"][eTag]["attributes"]["npml"][0].as<double>();
-            parameters[7] = jsonFile["Elements"][eTag]["attributes"]["npml"][1].as<double>();
-
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(4);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the PML2DQuad4 element.
-            theElement = std::make_shared<PML2DQuad4>(nodes, theMesh->GetMaterial(matID), parameters, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"PML2DQuad8") == 0){
-            std::vector<double> parameters(8);
-            parameters[0] = jsonFile["Elements"][eTag]["attributes"]["th"].as<double>();
-            parameters[1] = jsonFile["Elements"][eTag]["attributes"]["n"].as<double>();
-            parameters[2] = jsonFile["Elements"][eTag]["attributes"]["L"].as<double>();
-            parameters[3] = jsonFile["Elements"][eTag]["attributes"]["R"].as<double>();
-            parameters[4] = jsonFile["Elements"][eTag]["attributes"]["x0"][0].as<double>();
-            parameters[5] = jsonFile["Elements"][eTag]["attributes"]["x0"][1].as<double>();
-            parameters[6] = jsonFile["Elements"][eTag]["attributes"]["npml"][0].as<double>();
-            parameters[7] = jsonFile["Elements"][eTag]["attributes"]["npml"][1].as<double>();
-
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(9);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the PML2DQuad4 element.
-            theElement = std::make_shared<PML2DQuad8>(nodes, theMesh->GetMaterial(matID), parameters, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"kin2DQuad4") == 0){
-            double thickness = jsonFile["Elements"][eTag]["attributes"]["th"].as<double>();
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(4);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the kin2DQuad4 element.
-            theElement = std::make_shared<kin2DQuad4>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"lin3DShell4") == 0){
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(9);
-            unsigned int secID = jsonFile["Elements"][eTag]["attributes"]["section"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-                    
-            //Instantiate the lin3DShell4 element.
-            theElement = std::make_shared<lin3DShell4>(nodes, theMesh->GetSection(secID), Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"lin3DTetra4") == 0){
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(4);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
+    //Element Identifiers To Be Updated
+    std::vector<unsigned int> IDs(elemTags, elemTags + nElems);
+    std::map<std::string, std::vector<unsigned int> > Tags = Entities2Update<unsigned int>(theMesh, IDs, "Elements");
 
-            //Instantiate the lin3DTetra4 element.
-            theElement = std::make_shared<lin3DTetra4>(nodes, theMesh->GetMaterial(matID), Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"lin3DTetra10") == 0){
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(11);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
+    //Element to be Removed from Mesh Object
+    for(unsigned int k = 0; k < Tags["del"].size(); k++){
+        unsigned int Tag = Tags["del"][k];
+        theMesh->DelElement(Tag);
+    }
 
-            //Instantiate the lin3DTetra10 element.
-            theElement = std::make_shared<lin3DTetra10>(nodes, theMesh->GetMaterial(matID), Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"lin3DHexa8") == 0){
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(8);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
+    //Element to be Added To Mesh Object
+    std::size_t start = 0;
+    for(std::size_t k = 0; k < nElems; k++){
+        unsigned int Tag = elemTags[k];
+        std::size_t n = elemConn[k];
 
-            //Instantiate the lin3DHexa8 element.
-            theElement = std::make_shared<lin3DHexa8>(nodes, theMesh->GetMaterial(matID), Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"kin3DHexa8") == 0){
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(8);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
+        if(std::binary_search(Tags["add"].begin(), Tags["add"].end(), Tag)){
+            //Element class name and node connectivity
+            std::string Name = Arrays["names"][elemName[k]].as<std::string>();
+            std::vector<unsigned int> nodes(connects + start, connects + start + n);
 
-            //Instantiate the kin3DHexa8 element.
-            theElement = std::make_shared<kin3DHexa8>(nodes, theMesh->GetMaterial(matID), Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"PML3DHexa8") == 0){
-            std::vector<double> parameters(9);
-            parameters[0] = jsonFile["Elements"][eTag]["attributes"]["n"].as<double>();
-            parameters[1] = jsonFile["Elements"][eTag]["attributes"]["L"].as<double>();
-            parameters[2] = jsonFile["Elements"][eTag]["attributes"]["R"].as<double>();
-            parameters[3] = jsonFile["Elements"][eTag]["attributes"]["x0"][0].as<double>();
-            parameters[4] = jsonFile["Elements"][eTag]["attributes"]["x0"][1].as<double>();
-            parameters[5] = jsonFile["Elements"][eTag]["attributes"]["x0"][2].as<double>();
-            parameters[6] = jsonFile["Elements"][eTag]["attributes"]["npml"][0].as<double>();
-            parameters[7] = jsonFile["Elements"][eTag]["attributes"]["npml"][1].as<double>();
-            parameters[8] = jsonFile["Elements"][eTag]["attributes"]["npml"][2].as<double>();
-
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(8);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the PML3DHexa8 element.
-            theElement = std::make_shared<PML3DHexa8>(nodes, theMesh->GetMaterial(matID), parameters, Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"lin3DHexa20") == 0){
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(27);
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
+            //Creates an element object.
+            std::shared_ptr<Element> theElement = CreateElement(theMesh, Name, nodes, Arrays["records"][elemAttr[k]]);
 
-            //Instantiate the lin3DHexa20 element.
-            theElement = std::make_shared<lin3DHexa20>(nodes, theMesh->GetMaterial(matID), Quadrature, nGauss);
-        }
-        else if(strcasecmp(Name.c_str(),"TIEQlin2DQuad4") == 0){
-            double cf1 = jsonFile["Elements"][eTag]["attributes"]["cf1"].as<double>();
-            double cf2 = jsonFile["Elements"][eTag]["attributes"]["cf2"].as<double>();
-            double zref = jsonFile["Elements"][eTag]["attributes"]["zref"].as<double>();
-            double eref = jsonFile["Elements"][eTag]["attributes"]["eref"].as<double>();
-            double thickness = jsonFile["Elements"][eTag]["attributes"]["th"].as<double>();
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string eType = jsonFile["Elements"][eTag]["attributes"]["type"].as<std::string>("Darandelli");
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(4);
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the TIEQlin2DQuad4 element.
-            theElement = std::make_shared<TIEQlin2DQuad4>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss, eType, zref, cf1, cf2, eref);
-        }
-        else if(strcasecmp(Name.c_str(),"EQlin2DQuad4") == 0){
-            double cf1 = jsonFile["Elements"][eTag]["attributes"]["cf1"].as<double>();
-            double cf2 = jsonFile["Elements"][eTag]["attributes"]["cf2"].as<double>();
-            double zref = jsonFile["Elements"][eTag]["attributes"]["zref"].as<double>();
-            double thickness = jsonFile["Elements"][eTag]["attributes"]["th"].as<double>();
-            unsigned int matID = jsonFile["Elements"][eTag]["attributes"]["material"].as<int>();
-            std::string eType = jsonFile["Elements"][eTag]["attributes"]["type"].as<std::string>("Darandelli");
-            unsigned int nGauss = jsonFile["Elements"][eTag]["attributes"]["np"].as<int>(4);
-            std::string Quadrature = jsonFile["Elements"][eTag]["attributes"]["rule"].as<std::string>("GAUSS");
-
-            //Instantiate the EQlin2DQuad4 element.
-            theElement = std::make_shared<EQlin2DQuad4>(nodes, theMesh->GetMaterial(matID), thickness, Quadrature, nGauss, eType, zref, cf1, cf2);
-        }
-        else if(strcasecmp(Name.c_str(),"null2DFrame2") == 0){
-            //Instantiate the null2DFrame2 element.
-            theElement = std::make_shared<null2DFrame2>(nodes);
+            //Stores the information in element container.
+            theMesh->AddElement(Tag, theElement);
         }
-        else if(strcasecmp(Name.c_str(),"null3DFrame2") == 0){
-            //Instantiate the null3DFrame2 element.
-            theElement = std::make_shared<null3DFrame2>(nodes);
-        }
-
-        //TODO: Add more elements models here.
-
-        //Stores the information in element container.
-        theMesh->AddElement(Tag, theElement);
+        start += n;
     }
+
+    return true;
 }
 
 ///Updates the Damping Entities in Mesh Object 
@@ -1750,11 +1962,12 @@ UpdateAnalysis(std::shared_ptr<Mesh> &theMesh, std::unique_ptr<Analysis> &theAna
     std::string file2open = GetPartitionName(InputFile, rank, true);
     file2open = GetSpacedName(file2open, " ");
 
-    //Opens the JSON file
-    std::ifstream file2stream(file2open.c_str());
+    //Opens the JSON (or binary) file
+    std::string content;
+    std::unique_ptr<BinaryFile> binFile;
 
-    if(file2stream.is_open()){
-        RSJresource jsonFile(file2stream);
+    if(OpenInputFile(file2open, content, binFile)){
+        RSJresource jsonFile(content);
 
         //The pointes to define the simulation
         std::unique_ptr<LinearSystem> theSolver;
@@ -1779,7 +1992,32 @@ UpdateAnalysis(std::shared_ptr<Mesh> &theMesh, std::unique_ptr<Analysis> &theAna
             unsigned int onz = jsonFile["Simulations"]["attributes"]["solver"]["o_nz"].as<int>();
             unsigned int ksp = jsonFile["Simulations"]["attributes"]["solver"]["option"].as<int>(3);
             double tol = jsonFile["Simulations"]["attributes"]["solver"]["tol"].as<double>(1e-08);
-            theSolver = std::make_unique<PetscSolver>(dnz, onz, tol, ksp);
+
+            //Free degree of freedom rows owned by this processor
+            int nrows = -1;
+            if( jsonFile["Simulations"]["attributes"]["solver"]["ownership"].exists() ){
+                int first = jsonFile["Simulations"]["attributes"]["solver"]["ownership"][0].as<int>();
+                int last  = jsonFile["Simulations"]["attributes"]["solver"]["ownership"][1].as<int>();
+                nrows = last - first;
+            }
+
+            //Exact number of nonzero per row stored as (value, count) pairs
+            std::vector<int> dnnz, onnz;
+            if( jsonFile["Simulations"]["attributes"]["solver"]["d_nnz"].exists() ){
+                for(int k = 0; k < jsonFile["Simulations"]["attributes"]["solver"]["d_nnz"].size(); k += 2){
+                    int value = jsonFile["Simulations"]["attributes"]["solver"]["d_nnz"][k].as<int>();
+                    int count = jsonFile["Simulations"]["attributes"]["solver"]["d_nnz"][k+1].as<int>();
+                    dnnz.insert(dnnz.end(), count, value);
+                }
+            }
+            if( jsonFile["Simulations"]["attributes"]["solver"]["o_nnz"].exists() ){
+                for(int k = 0; k < jsonFile["Simulations"]["attributes"]["solver"]["o_nnz"].size(); k += 2){
+                    int value = jsonFile["Simulations"]["attributes"]["solver"]["o_nnz"][k].as<int>();
+                    int count = jsonFile["Simulations"]["attributes"]["solver"]["o_nnz"][k+1].as<int>();
+                    onnz.insert(onnz.end(), count, value);
+                }
+            }
+            theSolver = std::make_unique<PetscSolver>(dnz, onz, tol, ksp, nrows, dnnz, onnz);
         }
 
         //Creates the algorithm
@@ -1843,7 +2081,6 @@ UpdateAnalysis(std::shared_ptr<Mesh> &theMesh, std::unique_ptr<Analysis> &theAna
         for(unsigned int k = 0; k < Recorders.size(); k++)
             theAnalysis->SetRecorder(Recorders[k]);
 
-        file2stream.close();
     }
     else{
         return true;
@@ -1861,11 +2098,12 @@ UpdateRecorders(std::vector<std::shared_ptr<Recorder> > &Recorders, std::string
     std::string file2open = GetPartitionName(InputFile, rank, true);
     file2open = GetSpacedName(file2open, " ");
 
-    //Opens the JSON file
-    std::ifstream file2stream(file2open.c_str());
+    //Opens the JSON (or binary) file
+    std::string content;
+    std::unique_ptr<BinaryFile> binFile;
 
-    if(file2stream.is_open()){
-        RSJresource jsonFile(file2stream);
+    if(OpenInputFile(file2open, content, binFile)){
+        RSJresource jsonFile(content);
 
         //Recorder Objects
         for(auto it = jsonFile["Recorders"].as_object().begin(); it != jsonFile["Recorders"].as_object().end(); ++it){
@@ -1916,7 +2154,6 @@ UpdateRecorders(std::vector<std::shared_ptr<Recorder> > &Recorders, std::string
             Recorders.push_back(theRecorder);
         }
 
-        file2stream.close();
     }
     else{
         std::cout << "\x1B[31m ERROR: \x1B[0mThe JSON file in \'Driver::UpdateRecorders()\' in Processor [" << rank << "] couldn't be opened. \n";
@@ -1932,11 +2169,12 @@ UpdateCombinations(std::map<unsigned int, std::shared_ptr<LoadCombo> > &LoadComb
     std::string file2open = GetPartitionName(InputFile, rank, true);
     file2open = GetSpacedName(file2open, " ");
 
-    //Opens the JSON file
-    std::ifstream file2stream(file2open.c_str());
+    //Opens the JSON (or binary) file
+    std::string content;
+    std::unique_ptr<BinaryFile> binFile;
 
-    if(file2stream.is_open()){
-        RSJresource jsonFile(file2stream);
+    if(OpenInputFile(file2open, content, binFile)){
+        RSJresource jsonFile(content);
 
         //Combination Objects
         for(auto it = jsonFile["Combinations"].as_object().begin(); it != jsonFile["Combinations"].as_object().end(); ++it){
@@ -1966,16 +2204,77 @@ UpdateCombinations(std::map<unsigned int, std::shared_ptr<LoadCombo> > &LoadComb
             LoadCombos[Tag] = theCombo; 
         }
 
-        file2stream.close();
     }
     else{
         std::cout << "\x1B[31m ERROR: \x1B[0mThe JSON file in \'Driver::UpdateCombinations()\' in Processor [" << rank << "] couldn't be opened. \n";
     }
 }
 
+///Populate the Mesh object with the mesh entities (all but loads) of a json object
+///@param theMesh Pointer to the Mesh container.
+///@param jsonFile json object where mesh entities will be readden.
+///@param binFile binary file where the node and element arrays are stored, null for a JSON file.
+///@return whether the mesh entities were successfully readden or not.
+bool 
+UpdateMeshEntities(std::shared_ptr<Mesh> &theMesh, RSJresource &jsonFile, BinaryFile* binFile){
+    //Global Variables
+    if( jsonFile["Global"].exists() ){
+        nDimensions = jsonFile["Global"]["ndim"].as<int>();
+        numberOfTotalDofs = jsonFile["Global"]["ntotal"].as<int>();
+        numberOfFreeDofs = jsonFile["Global"]["nfree"].as<int>();
+        UpdateOption = jsonFile["Global"]["update"].as<std::string>("RESTART");
+        std::string MassForm = jsonFile["Global"]["massform"].as<std::string>("CONSISTENT");
+
+        //Mass formulation for elements mass matrix
+        if(strcasecmp(MassForm.c_str(),"LUMPED") == 0){
+            MassFormulation = true;
+        }
+        else if(strcasecmp(MassForm.c_str(),"CONSISTENT") == 0){
+            MassFormulation = false;
+        }
+    }
+
+    //Node Objects
+    if(binFile){
+        if(!UpdateNodes(theMesh, jsonFile, *binFile))
+            return false;
+    }
+    else
+        UpdateNodes(theMesh, jsonFile);
+    
+    //Mass Objects
+    UpdateMasses(theMesh, jsonFile);
+
+    //Constraint Objects
+    UpdateConstraints(theMesh, jsonFile);
+
+    //Support Motion Objects
+    UpdateSupportMotion(theMesh, jsonFile);
+
+    //Material Objects
+    UpdateMaterials(theMesh, jsonFile);
+
+    //Section Objects
+    UpdateSections(theMesh, jsonFile);
+
+    //Element Objects
+    if(binFile){
+        if(!UpdateElements(theMesh, jsonFile, *binFile))
+            return false;
+    }
+    else
+        UpdateElements(theMesh, jsonFile);
+
+    //Damping Objects
+    UpdateDampings(theMesh, jsonFile);
+
+    return true;
+}
+
 ///Populate the Mesh object with the json provided entities
 ///@param theMesh Pointer to the Mesh container.
 ///@param InputFile json file where mesh entities will be readden.
+///@note If the file has a 'Mesh' entry, mesh entities are readden from that shared file.
 ///@return whether the mesh update was successful or not.
 bool
 UpdateMesh(std::shared_ptr<Mesh> &theMesh, std::string InputFile){
@@ -1983,59 +2282,40 @@ UpdateMesh(std::shared_ptr<Mesh> &theMesh, std::string InputFile){
     std::string file2open = GetPartitionName(InputFile, rank, true);
     file2open = GetSpacedName(file2open, " ");
 
-    //Opens the JSON file
-    std::ifstream file2stream(file2open.c_str());
+    //Opens the JSON (or binary) file
+    std::string content;
+    std::unique_ptr<BinaryFile> binFile;
 
-    if(file2stream.is_open()){
-        RSJresource jsonFile(file2stream);
+    if(OpenInputFile(file2open, content, binFile)){
+        RSJresource jsonFile(content);
 
-        //Global Variables
-        if( jsonFile["Global"].exists() ){
-            nDimensions = jsonFile["Global"]["ndim"].as<int>();
-            numberOfTotalDofs = jsonFile["Global"]["ntotal"].as<int>();
-            numberOfFreeDofs = jsonFile["Global"]["nfree"].as<int>();
-            UpdateOption = jsonFile["Global"]["update"].as<std::string>("RESTART");
-            std::string MassForm = jsonFile["Global"]["massform"].as<std::string>("CONSISTENT");
+        //Shared mesh file referenced by a load combination overlay file
+        if( jsonFile["Mesh"].exists() ){
+            std::string mesh2open = GetPartitionName(jsonFile["Mesh"].as<std::string>(), rank, true);
+            mesh2open = GetSpacedName(mesh2open, " ");
 
-            //Mass formulation for elements mass matrix
-            if(strcasecmp(MassForm.c_str(),"LUMPED") == 0){
-                MassFormulation = true;
+            std::string meshContent;
+            std::unique_ptr<BinaryFile> binMesh;
+            if(!OpenInputFile(mesh2open, meshContent, binMesh)){
+                std::cout << "\x1B[31m ERROR: \x1B[0mThe shared mesh file \'" << mesh2open << "\' referenced by \'" << file2open << "\' in \'Driver::UpdateMesh()\' in Processor [" << rank << "] couldn't be opened. \n";
+                return true;
             }
-            else if(strcasecmp(MassForm.c_str(),"CONSISTENT") == 0){
-                MassFormulation = false;
+
+            RSJresource meshFile(meshContent);
+            if(!UpdateMeshEntities(theMesh, meshFile, binMesh.get())){
+                std::cout << "\x1B[31m ERROR: \x1B[0mThe mesh entities of the shared mesh file \'" << mesh2open << "\' in \'Driver::UpdateMesh()\' in Processor [" << rank << "] couldn't be readden. \n";
+                return true;
             }
         }
-
-        //Node Objects
-        UpdateNodes(theMesh, jsonFile);
-        
-        //Mass Objects
-        UpdateMasses(theMesh, jsonFile);
-
-        //Constraint Objects
-        UpdateConstraints(theMesh, jsonFile);
-
-        //Support Motion Objects
-        UpdateSupportMotion(theMesh, jsonFile);
-
-        //Material Objects
-        UpdateMaterials(theMesh, jsonFile);
-
-        //Section Objects
-        UpdateSections(theMesh, jsonFile);
-
-        //Element Objects
-        UpdateElements(theMesh, jsonFile);
-
-        //Damping Objects
-        UpdateDampings(theMesh, jsonFile);
+        else if(!UpdateMeshEntities(theMesh, jsonFile, binFile.get())){
+            std::cout << "\x1B[31m ERROR: \x1B[0mThe mesh entities of the file \'" << file2open << "\' in \'Driver::UpdateMesh()\' in Processor [" << rank << "] couldn't be readden. \n";
+            return true;
+        }
 
         //Load Objects
         UpdateLoads(theMesh, jsonFile);
 
         //TODO: Include File inside JSON
-
-        file2stream.close();
     }
     else{
         return true;  
@@ -0,0 +1,248 @@
+#!/usr/bin/python3
+# -*- coding: Utf-8 -*-
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import numpy as np
+from Core import SeismoVLAB as SVL
+
+#Type and number of values of each array, as read by Driver::UpdateNodes()
+#and Driver::UpdateElements()
+NodeArrays = [('tag', '<i4', 'count'), ('ndof', '<i4', 'count'), ('freedof', '<i4', 'ndof'), ('totaldof', '<i4', 'ndof'), ('coords', '<f8', 'ndim')]
+ElementArrays = [('tag', '<i4', 'count'), ('class', '<i4', 'count'), ('nconn', '<i4', 'count'), ('attributes', '<i4', 'count'), ('conn', '<i4', 'nconn')]
+
+def Partitions(storage, jsonformat, path):
+    """
+    This function creates a 2D mesh with the given storage, and writes its
+    partition files in the given format using CreateRunAnalysisFiles().\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    storage : str
+        The Options['storage'] to be used: Dict or Array
+    jsonformat : str
+        The Options['jsonformat'] to be used: Compact or Binary
+    path : str
+        The directory where the Partition folder is written
+
+    Returns
+    -------
+    list
+        The full path of the partition files
+    """
+    SVL.cleanAll()
+    os.makedirs(path, exist_ok=True)
+    SVL.Options['path'] = path
+    SVL.Options['file'] = 'Binary'
+    SVL.Options['storage'] = storage
+    SVL.Options['jsonformat'] = jsonformat
+    SVL.Options['dimension'] = 2
+    SVL.Options['nparts'] = 2
+    SVL.Options['partitioner'] = 'Graph'
+    SVL.Options['allocation'] = 'YES'
+
+    attributes = {'ne': [8, 4], 'ndof': 2, 'P0': [0.0, 0.0], 'P1': [8.0, 0.0], 'P2': [0.0, 4.0], 'class': 'LIN2DQUAD4',
+        'elems': 'QUAD4', 'attributes': {'rule': 'Gauss', 'np': 4, 'material': 1, 'th': 1.0}}
+    Soil = SVL.makeDomainArea(options=attributes)
+    SVL.Entities['Nodes'] = Soil['Nodes']
+    SVL.Entities['Elements'] = Soil['Elements']
+    SVL.setRestrains(Soil, dof=[1,2], bc=['bottom'])
+
+    SVL.addMaterial(tag=1, name='Elastic2DPlaneStrain', attributes={'E': 1.0e6, 'nu': 0.25, 'rho': 2000.0})
+    SVL.addFunction(tag=1, name='Constant', attributes={'mag': 10.0, 'dir': [0.0, -1.0]})
+    SVL.addLoad(tag=1, name='PointLoad', attributes={'fun': 1, 'type': 'Constant', 'list': Soil['Boundary']['top']})
+    SVL.addCombinationCase(tag=1, name='Static', attributes={'load': [1], 'factor': [1.0]})
+    SVL.addAnalysis(tag=1, attributes={'name': 'Static', 'nt': 1})
+    SVL.addAlgorithm(tag=1, attributes={'name': 'Linear', 'nstep': 1})
+    SVL.addIntegrator(tag=1, attributes={'name': 'Static'})
+    SVL.addSolver(tag=1, attributes={'name': 'PETSC', 'option': 'KSPCG', 'tol': 1e-6})
+    SVL.addSimulation(tag=1, combo=1, attributes={'analysis': 1, 'algorithm': 1, 'integrator': 1, 'solver': 1})
+    SVL.CreateRunAnalysisFiles()
+
+    extension = '.bin' if jsonformat.upper() == 'BINARY' else '.json'
+    return [path + '/Partition/Binary.1.' + str(k) + extension for k in range(SVL.Options['nparts'])]
+
+def ReadArrays(data, start, block, arrays):
+    """
+    This function reads the arrays of a block (Nodes or Elements) of a binary
+    partition file. The array offsets and counts are checked against the file
+    size as done by BinaryFile::GetArray().\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    data : bytes
+        The content of the binary file
+    start : int
+        The position of the first array
+    block : dict
+        The header['Binary'] entry of the block with the array offsets
+    arrays : list
+        The (name, type, count) of the arrays, count is a key in block or
+        the name of an array whose values are summed
+
+    Returns
+    -------
+    dict
+        The arrays, None if an array is not inside the file
+    """
+    values = dict()
+    for name, dtype, count in arrays:
+        if count in values:
+            count = int(np.sum(values[count]))
+        elif count == 'ndim':
+            count = block['count']*block['ndim']
+        else:
+            count = block[count]
+
+        offset = block[name]
+        itemsize = np.dtype(dtype).itemsize
+        if offset < 0 or count < 0 or offset % itemsize != 0 or start + offset + count*itemsize > len(data):
+            return None
+        values[name] = np.frombuffer(data, dtype=dtype, count=count, offset=start + offset)
+    return values
+
+def ReadBinary(filename):
+    """
+    This function reads a binary partition file in the same way as the
+    Run-Analysis (see BinaryFile.hpp), and converts the Nodes and Elements
+    arrays back into dictionaries.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    filename : str
+        The full path of the binary partition file
+
+    Returns
+    -------
+    dict
+        The decoded partition, None if the file is not valid
+    """
+    with open(filename, 'rb') as infile:
+        data = infile.read()
+
+    #Checks the file signature and the header length
+    if len(data) <= 16 or data[:8] != b'SVLBIN01':
+        return None
+    length = int(np.frombuffer(data, dtype='<u8', count=1, offset=8)[0])
+    if 16 + length > len(data):
+        return None
+    header = json.loads(data[16:16 + length])
+    start = 8*((16 + length + 7)//8)
+
+    blocks = header.pop('Binary', {})
+    if 'Nodes' in blocks:
+        block = blocks['Nodes']
+        arrays = ReadArrays(data, start, block, NodeArrays)
+        if arrays is None:
+            return None
+        dofs = np.cumsum(np.r_[0, arrays['ndof']])
+        coords = arrays['coords'].reshape(-1, block['ndim'])
+        header['Nodes'] = {str(tag): {'ndof': int(arrays['ndof'][k]), 'freedof': arrays['freedof'][dofs[k]:dofs[k+1]].tolist(),
+            'totaldof': arrays['totaldof'][dofs[k]:dofs[k+1]].tolist(), 'coords': coords[k].tolist()} for k, tag in enumerate(arrays['tag'].tolist())}
+    if 'Elements' in blocks:
+        block = blocks['Elements']
+        arrays = ReadArrays(data, start, block, ElementArrays)
+        if arrays is None:
+            return None
+        conn = np.cumsum(np.r_[0, arrays['nconn']])
+        header['Elements'] = {str(tag): {'name': block['names'][arrays['class'][k]], 'conn': arrays['conn'][conn[k]:conn[k+1]].tolist(),
+            'attributes': block['records'][arrays['attributes'][k]]} for k, tag in enumerate(arrays['tag'].tolist())}
+    return header
+
+def Compare(binary, jsonfile):
+    """
+    This function compares a decoded binary partition with its JSON file.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    binary : dict
+        The decoded binary partition
+    jsonfile : str
+        The full path of the JSON partition file
+
+    Returns
+    -------
+    list
+        The Entities that differ
+    """
+    with open(jsonfile, 'r') as infile:
+        partition = json.load(infile)
+
+    failed = [key for key in sorted(set(binary) | set(partition)) if key not in ('Nodes', 'Elements') and binary.get(key) != partition.get(key)]
+
+    Nodes = partition.get('Nodes', {})
+    if set(binary.get('Nodes', {})) != set(Nodes):
+        failed.append('Nodes')
+    else:
+        for nTag, node in binary.get('Nodes', {}).items():
+            if node['ndof'] != Nodes[nTag]['ndof'] or node['freedof'] != Nodes[nTag]['freedof'] or node['totaldof'] != Nodes[nTag]['totaldof'] \
+                or not np.array_equal(node['coords'][:len(Nodes[nTag]['coords'])], Nodes[nTag]['coords']):
+                failed.append('Nodes[%s]' % nTag)
+                break
+
+    Elements = partition.get('Elements', {})
+    if set(binary.get('Elements', {})) != set(Elements):
+        failed.append('Elements')
+    else:
+        for eTag, elem in binary.get('Elements', {}).items():
+            if elem != Elements[eTag]:
+                failed.append('Elements[%s]' % eTag)
+                break
+
+    return failed
+
+def main():
+    """
+    This function checks that the binary partition files (Options['jsonformat']
+    = 'Binary') give the same Nodes, Elements and other Entities as the JSON
+    partition files, and that a truncated binary file is detected.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    None
+    """
+    failed = list()
+    path = tempfile.mkdtemp()
+    try:
+        for storage in ['Dict', 'Array']:
+            jsonfiles = Partitions(storage, 'Compact', path + '/JSON')
+            binfiles = Partitions(storage, 'Binary', path + '/Binary')
+
+            for binfile, jsonfile in zip(binfiles, jsonfiles):
+                binary = ReadBinary(binfile)
+                if binary is None:
+                    failed.append('%s (%s): the binary file is not valid' % (os.path.basename(binfile), storage))
+                    continue
+                failed.extend('%s (%s): the %s differ' % (os.path.basename(binfile), storage, key) for key in Compare(binary, jsonfile))
+
+            #The arrays of a truncated file are not inside the file
+            with open(binfiles[0], 'rb') as infile:
+                data = infile.read()
+            with open(binfiles[0], 'wb') as outfile:
+                outfile.write(data[:-8])
+            if ReadBinary(binfiles[0]) is not None:
+                failed.append('%s (%s): the truncated binary file is not detected' % (os.path.basename(binfiles[0]), storage))
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+    if failed:
+        for fail in failed:
+            print('\x1B[31m ERROR \x1B[0m: %s' % fail)
+        sys.exit(-1)
+    print(' ◇ The binary partition files give the same Entities as the JSON files with the Dict and Array storage')
+
+if __name__ == '__main__':
+    main()
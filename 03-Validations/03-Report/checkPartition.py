@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+# -*- coding: Utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import numpy as np
+from Core import SeismoVLAB as SVL
+
+def Partitions(ownership, path, cache='NO', moved=None):
+    """
+    This function creates a 2D mesh made of two domains tied with EQUAL
+    constraints (see mergeDomain), and writes its partition files for three
+    partitions using CreateRunAnalysisFiles(). A Node can be moved to check
+    the partition files that are rewritten by the cache.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    ownership : str
+        The Options['ownership'] to be used: Plain or Partition
+    path : str
+        The directory where the Partition folder is written
+    cache : str
+        The Options['cache'] to be used: Yes or No
+    moved : int
+        The Node to be moved (none if None)
+
+    Returns
+    -------
+    None
+    """
+    SVL.cleanAll()
+    os.makedirs(path, exist_ok=True)
+    SVL.Options['path'] = path
+    SVL.Options['file'] = 'Check'
+    SVL.Options['dimension'] = 2
+    SVL.Options['nparts'] = 3
+    SVL.Options['partitioner'] = 'Graph'
+    SVL.Options['ownership'] = ownership
+    SVL.Options['allocation'] = 'YES'
+    SVL.Options['cache'] = cache
+
+    domains = list()
+    for x0, x1 in [(0.0, 6.0), (6.0, 12.0)]:
+        attributes = {'ne': [6, 4], 'ndof': 2, 'P0': [x0, 0.0], 'P1': [x1, 0.0], 'P2': [x0, 4.0], 'class': 'LIN2DQUAD4',
+            'elems': 'QUAD4', 'attributes': {'rule': 'Gauss', 'np': 4, 'material': 1, 'th': 1.0}}
+        domains.append(SVL.makeDomainArea(options=attributes))
+    Soil = SVL.mergeDomain(domains[0], domains[1], coincident='EQUAL')
+    if moved is not None:
+        Soil['Nodes'][moved]['coords'] = [coord + 0.1 for coord in Soil['Nodes'][moved]['coords']]
+    SVL.Entities['Nodes'] = Soil['Nodes']
+    SVL.Entities['Elements'] = Soil['Elements']
+    SVL.Entities['Constraints'] = Soil['Constraints']
+    bottom = [nTag for nTag in Soil['Nodes'] if Soil['Nodes'][nTag]['coords'][1] == 0.0]
+    top = [nTag for nTag in Soil['Nodes'] if Soil['Nodes'][nTag]['coords'][1] == 4.0]
+    SVL.setRestrains({'Nodes': Soil['Nodes'], 'Boundary': {'bottom': bottom}}, dof=[1,2], bc=['bottom'])
+
+    SVL.addMaterial(tag=1, name='Elastic2DPlaneStrain', attributes={'E': 1.0e6, 'nu': 0.25, 'rho': 2000.0})
+    SVL.addFunction(tag=1, name='Constant', attributes={'mag': 10.0, 'dir': [0.0, -1.0]})
+    SVL.addLoad(tag=1, name='PointLoad', attributes={'fun': 1, 'type': 'Constant', 'list': top})
+    SVL.addCombinationCase(tag=1, name='Static', attributes={'load': [1], 'factor': [1.0]})
+    SVL.addAnalysis(tag=1, attributes={'name': 'Static', 'nt': 1})
+    SVL.addAlgorithm(tag=1, attributes={'name': 'Linear', 'nstep': 1})
+    SVL.addIntegrator(tag=1, attributes={'name': 'Static'})
+    SVL.addSolver(tag=1, attributes={'name': 'PETSC', 'option': 'KSPCG', 'tol': 1e-6})
+    SVL.addSimulation(tag=1, combo=1, attributes={'analysis': 1, 'algorithm': 1, 'integrator': 1, 'solver': 1})
+    SVL.CreateRunAnalysisFiles()
+
+def Allocation():
+    """
+    This function compares the (run-length encoded) d_nnz and o_nnz of each
+    partition with the number of non-zero of each owned row of the assembled
+    matrix pattern (see FormSparseMatrix) in the diagonal and off-diagonal
+    blocks.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    list
+        The partitions whose d_nnz or o_nnz differ
+    """
+    A = SVL.FormSparseMatrix('csr')
+    ownrange = SVL.Options['ownrange']
+
+    failed = list()
+    for k in range(SVL.Options['nparts']):
+        inf, sup = ownrange[k], ownrange[k+1]
+        d = SVL.Options['d_nnz'][k]
+        o = SVL.Options['o_nnz'][k]
+        d_nnz = np.repeat(d[0::2], d[1::2]).astype(int)
+        o_nnz = np.repeat(o[0::2], o[1::2]).astype(int)
+
+        diag = A[inf:sup,inf:sup].getnnz(axis=1)
+        rows = A[inf:sup,:].getnnz(axis=1)
+        if len(d_nnz) != sup - inf or len(o_nnz) != sup - inf or not np.array_equal(d_nnz, diag) or not np.array_equal(d_nnz + o_nnz, rows):
+            failed.append('Partition[%d]' % k)
+    return failed
+
+def Cache(path):
+    """
+    This function writes the partition files with Options['cache'] = 'YES',
+    moves a Node that belongs to the Elements of a single partition, and 
+    writes them again as a new run of the model. Only the partition file with
+    the moved Node must be rewritten.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    path : str
+        The directory where the Partition folder is written
+
+    Returns
+    -------
+    tuple
+        The expected and the rewritten partition files
+    """
+    Partitions('Plain', path, cache='YES')
+    files = [path + '/Partition/Check.1.' + str(k) + '.json' for k in range(SVL.Options['nparts'])]
+
+    #A free Node (not tied, nor restrained) inside the Elements of a partition
+    parts = dict()
+    for eTag, part in SVL.Options['clustermap'].items():
+        for nTag in np.asarray(SVL.Entities['Elements'][eTag]['conn']).tolist():
+            parts.setdefault(nTag, set()).add(part)
+    tied = set(nTag for con in SVL.Entities['Constraints'].values() for nTag in [con['stag']] + list(con['mtag']))
+    nTag = min(nTag for nTag in parts if len(parts[nTag]) == 1 and nTag not in tied and min(SVL.Entities['Nodes'][nTag]['freedof']) > -1)
+    k = parts[nTag].pop()
+
+    #The files written from here have a new modification time
+    for filename in files:
+        os.utime(filename, (0, 0))
+
+    #A new run of the model (the cache manifest is loaded again)
+    SVL.Session['call'] = 0
+    Partitions('Plain', path, cache='YES', moved=nTag)
+    rewritten = [filename for filename in files if os.stat(filename).st_mtime != 0]
+
+    return [files[k]], rewritten
+
+def main():
+    """
+    This function checks that the per-row PETSc allocation (d_nnz and o_nnz)
+    of each partition adds up to the assembled matrix pattern for the Plain
+    and Partition ownership, and that the cache (Options['cache'] = 'YES')
+    only rewrites the partition file of a moved Node.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    None
+    """
+    failed = list()
+    path = tempfile.mkdtemp()
+    try:
+        for ownership in ['Plain', 'Partition']:
+            Partitions(ownership, path + '/' + ownership)
+            failed.extend('%s (%s ownership): the d_nnz/o_nnz differ from the matrix pattern' % (fail, ownership) for fail in Allocation())
+
+        expected, rewritten = Cache(path + '/Cache')
+        if rewritten != expected:
+            failed.append('the cache rewrites %s instead of %s' % ([os.path.basename(f) for f in rewritten], [os.path.basename(f) for f in expected]))
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+    if failed:
+        for fail in failed:
+            print('\x1B[31m ERROR \x1B[0m: %s' % fail)
+        sys.exit(-1)
+    print(' ◇ The d_nnz/o_nnz of the partitions add up to the matrix pattern with the Plain and Partition ownership')
+    print(' ◇ The cache only rewrites the partition file of a moved Node')
+
+if __name__ == '__main__':
+    main()
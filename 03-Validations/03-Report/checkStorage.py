@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+# -*- coding: Utf-8 -*-
+
+import sys
+import numpy as np
+from Core import SeismoVLAB as SVL
+
+def Relabeled(storage):
+    """
+    This function creates a 2D mesh with the given storage, removes a column
+    of elements (and their nodes) to leave gaps in the numbering, and
+    re-numbers it using reLabel().\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    storage : str
+        The Options['storage'] to be used: Dict or Array
+
+    Returns
+    -------
+    tuple
+        The node map, Nodes, Elements and Boundary as python lists/dictionaries
+    """
+    SVL.Options['storage'] = storage
+    SVL.Options['dimension'] = 2
+
+    attributes = {'ne': [6, 4], 'ndof': 2, 'P0': [0.0, 0.0], 'P1': [6.0, 0.0], 'P2': [0.0, 4.0], 'class': 'LIN2DQUAD4',
+        'elems': 'QUAD4', 'attributes': {'rule': 'Gauss', 'np': 4, 'material': 1, 'th': 1.0}}
+    Soil = SVL.makeDomainArea(options=attributes)
+    mesh = {'Nodes': Soil['Nodes'], 'Elements': Soil['Elements']}
+
+    for eTag in [3, 9, 15, 21]:
+        del mesh['Elements'][eTag]
+    used = set(nTag for eTag in mesh['Elements'] for nTag in np.asarray(mesh['Elements'][eTag]['conn']).tolist())
+    for nTag in [nTag for nTag in list(mesh['Nodes']) if nTag not in used]:
+        del mesh['Nodes'][nTag]
+    mesh['Boundary'] = {'top': [nTag for nTag in mesh['Nodes'] if mesh['Nodes'][nTag]['coords'][1] == 4.0]}
+
+    nMap = SVL.reLabel(mesh)
+    Nodes = {nTag: (int(mesh['Nodes'][nTag]['ndof']), np.asarray(mesh['Nodes'][nTag]['coords']).tolist()) for nTag in mesh['Nodes']}
+    Elements = {eTag: (mesh['Elements'][eTag]['name'], np.asarray(mesh['Elements'][eTag]['conn']).tolist(), dict(mesh['Elements'][eTag]['attributes'])) for eTag in mesh['Elements']}
+
+    return nMap, Nodes, Elements, mesh['Boundary']
+
+def Moved(storage):
+    """
+    This function creates a 2D mesh with the given storage, builds its spatial
+    index, moves a Node and finds it at its new coordinates using Coords2Tag().
+    The Node is moved in place with the dictionaries, while the array-backed
+    coordinates are read-only and the new coordinates must be assigned.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    storage : str
+        The Options['storage'] to be used: Dict or Array
+
+    Returns
+    -------
+    list
+        The Node tags found at the new coordinates
+    """
+    SVL.Options['storage'] = storage
+    SVL.Options['dimension'] = 2
+
+    attributes = {'ne': [6, 4], 'ndof': 2, 'P0': [0.0, 0.0], 'P1': [6.0, 0.0], 'P2': [0.0, 4.0], 'class': 'LIN2DQUAD4',
+        'elems': 'QUAD4', 'attributes': {'rule': 'Gauss', 'np': 4, 'material': 1, 'th': 1.0}}
+    Soil = SVL.makeDomainArea(options=attributes)
+    mesh = {'Nodes': Soil['Nodes'], 'Elements': Soil['Elements']}
+    SVL.Coords2Tag(mesh, [[4.0, 0.0]])
+
+    try:
+        mesh['Nodes'][5]['coords'][0] = 7.0
+    except ValueError:
+        mesh['Nodes'][5]['coords'] = [7.0, 0.0]
+
+    return SVL.Coords2Tag(mesh, [[7.0, 0.0]])
+
+def main():
+    """
+    This function checks that the array-backed storage (Options['storage'] =
+    'Array') gives the same re-numbered mesh as the dictionaries, and that the
+    spatial index is updated when a Node is moved.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    None
+    """
+    Dict  = Relabeled('Dict')
+    Array = Relabeled('Array')
+
+    failed = [name for name, a, b in zip(['Node map', 'Nodes', 'Elements', 'Boundary'], Dict, Array) if a != b]
+    if failed:
+        print('\x1B[31m ERROR \x1B[0m: reLabel() in the array-backed storage differs in: %s' % ', '.join(failed))
+        sys.exit(-1)
+    print(' ◇ reLabel() gives the same mesh with the Dict and Array storage')
+
+    Dict  = Moved('Dict')
+    Array = Moved('Array')
+    if Dict != [5] or Array != [5]:
+        print('\x1B[31m ERROR \x1B[0m: Coords2Tag() does not find the moved Node[5] (Dict: %s, Array: %s)' % (Dict, Array))
+        sys.exit(-1)
+    print(' ◇ Coords2Tag() finds a moved Node with the Dict and Array storage')
+
+if __name__ == '__main__':
+    main()
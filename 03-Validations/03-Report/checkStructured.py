@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+# -*- coding: Utf-8 -*-
+
+import sys
+import json
+import hashlib
+import numpy as np
+from Core import SeismoVLAB as SVL
+
+#Element class and attributes of each meshed element type
+Cases = {
+    'HEXA8'  : ('LIN3DHEXA8',   {'rule': 'Gauss', 'np': 8,  'material': 1}),
+    'HEXA20' : ('LIN3DHEXA20',  {'rule': 'Gauss', 'np': 27, 'material': 1}),
+    'TETRA4' : ('LIN3DTETRA4',  {'rule': 'Gauss', 'np': 4,  'material': 1}),
+    'TETRA10': ('LIN3DTETRA10', {'rule': 'Gauss', 'np': 7,  'material': 1}),
+    'QUAD4'  : ('LIN2DQUAD4',   {'rule': 'Gauss', 'np': 4,  'material': 1, 'th': 1.0}),
+    'QUAD8'  : ('LIN2DQUAD8',   {'rule': 'Gauss', 'np': 9,  'material': 1, 'th': 1.0}),
+    'TRIA3'  : ('LIN2DTRIA3',   {'rule': 'Gauss', 'np': 3,  'material': 1, 'th': 1.0}),
+    'TRIA6'  : ('LIN2DTRIA6',   {'rule': 'Gauss', 'np': 7,  'material': 1, 'th': 1.0}),
+}
+
+#Digests of the (Nodes, Elements, Boundary) given by the element-by-element
+#generators of the previous release for the meshes in Mesh()
+References = {
+    'HEXA8'  : ['06c8823cd33bdc7a73a31eecb815b45e', '8b305abcaa1556f688ec7e9baa2ddbfc', 'fa2a57f089842888015f5b414b6ae4e6'],
+    'HEXA20' : ['bddfe309f9da727da1e8001dd2a8ea7a', 'cc9dd63f029a04fb650ead063dc3037a', '342d4dc1a905a2c6fb1f4a51a21683f6'],
+    'TETRA4' : ['06c8823cd33bdc7a73a31eecb815b45e', 'cde7aa8c5c40d24254d5d870c80353d9', 'fa2a57f089842888015f5b414b6ae4e6'],
+    'QUAD4'  : ['c08e0ed5b3e275710c89e7e025f81de4', 'f468a39b61c11a08464a540ce742d6bb', 'b67a51745b19239519ac3211a285bf25'],
+    'QUAD8'  : ['0e7d09456e32f345443f1f93f7ad68c1', '605fb8c01d3e060fcf39f2fd4c07ae82', 'bf9b9636c7c9d31dc8afa3dbebdb3980'],
+    'TRIA3'  : ['c08e0ed5b3e275710c89e7e025f81de4', '0d50a9ac66f8e8936fc5be2606f0e71f', 'b67a51745b19239519ac3211a285bf25'],
+    'TRIA6'  : ['f3306a5017312d547c5e0406fd86f94f', 'f4dfd5bb896eee02496519c51151ccaa', 'bf9b9636c7c9d31dc8afa3dbebdb3980']
+}
+
+#Corner Nodes of the edges of TETRA10 (mid-edge Nodes are 5 to 10)
+TetraEdges = [[0,1], [1,2], [0,2], [0,3], [1,3], [2,3]]
+
+def Mesh(elems):
+    """
+    This function creates a small structured mesh of the given element type
+    using makeDomainVolume() or makeDomainArea().\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    elems : str
+        The element type in Cases
+
+    Returns
+    -------
+    Mesh : dict
+        The generated Nodes, Elements and Boundary
+    """
+    name, attributes = Cases[elems]
+    if name[3] == '3':
+        SVL.Options['dimension'] = 3
+        return SVL.makeDomainVolume(options={'ne': [3, 2, 2], 'ndof': 3, 'class': name, 'elems': elems, 'attributes': dict(attributes),
+            'P0': [0.0, 0.0, 0.0], 'P1': [3.0, 0.0, 0.0], 'P2': [0.0, 2.0, 0.0], 'P3': [0.0, 0.0, 1.5]})
+    SVL.Options['dimension'] = 2
+    return SVL.makeDomainArea(options={'ne': [4, 3], 'ndof': 2, 'class': name, 'elems': elems, 'attributes': dict(attributes),
+        'P0': [0.0, 0.0], 'P1': [4.0, 0.0], 'P2': [0.0, 1.5]})
+
+def Digest(mesh):
+    """
+    This function computes the digests of the Nodes (ndof and coordinates),
+    Elements (class, connectivity and attributes) and Boundary of a mesh.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    mesh : dict
+        The generated Nodes, Elements and Boundary
+
+    Returns
+    -------
+    list
+        The hexadecimal digests of the Nodes, Elements and Boundary
+    """
+    nodes = [[n, int(mesh['Nodes'][n]['ndof']), [round(float(x), 9) for x in mesh['Nodes'][n]['coords']]] for n in sorted(mesh['Nodes'])]
+    elems = [[e, mesh['Elements'][e]['name'], [int(x) for x in mesh['Elements'][e]['conn']], sorted(dict(mesh['Elements'][e]['attributes']).items())] for e in sorted(mesh['Elements'])]
+    bound = sorted((key, sorted(int(x) for x in value)) for key, value in mesh['Boundary'].items())
+    return [hashlib.md5(json.dumps(data).encode()).hexdigest() for data in (nodes, elems, bound)]
+
+def CheckTetra10(mesh):
+    """
+    This function checks the TETRA10 mesh against the TETRA4 mesh, i.e., the
+    corner Nodes are the same, the Nodes 5 to 10 are at the middle of the
+    edges (1,2), (2,3), (1,3), (1,4), (2,4), (3,4), and a mid-edge Node is
+    shared by all Elements that have the edge.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    mesh : dict
+        The generated TETRA10 Nodes and Elements
+
+    Returns
+    -------
+    list
+        The description of the failed checks
+    """
+    failed = list()
+    linear = Mesh('TETRA4')
+
+    eTags = sorted(mesh['Elements'])
+    conn = np.array([np.asarray(mesh['Elements'][e]['conn']).tolist() for e in eTags], dtype=int)
+    corner = np.array([np.asarray(linear['Elements'][e]['conn']).tolist() for e in sorted(linear['Elements'])], dtype=int)
+    coords = {n: np.asarray(mesh['Nodes'][n]['coords'], dtype=float) for n in mesh['Nodes']}
+
+    if conn.shape != (len(corner), 10) or not np.array_equal(conn[:,:4], corner):
+        failed.append('corner Nodes differ from TETRA4')
+        return failed
+
+    for k, (i, j) in enumerate(TetraEdges):
+        middle = np.array([0.5*(coords[a] + coords[b]) for a, b in zip(conn[:,i], conn[:,j])])
+        if not np.allclose(np.array([coords[n] for n in conn[:,4+k]]), middle):
+            failed.append('Node %d is not at the middle of the edge (%d,%d)' % (5 + k, i + 1, j + 1))
+
+    edges = np.sort(conn[:,TetraEdges], axis=2).reshape(-1,2)
+    unique, index = np.unique(edges, axis=0, return_inverse=True)
+    if len(np.unique(conn[:,4:])) != len(unique) or len(mesh['Nodes']) != len(linear['Nodes']) + len(unique):
+        failed.append('mid-edge Nodes are not shared by the Elements of the edge')
+    elif len(np.unique(np.c_[index.ravel(), conn[:,4:].ravel()], axis=0)) != len(unique):
+        failed.append('an edge has more than one mid-edge Node')
+
+    return failed
+
+def Removals(elems):
+    """
+    This function removes a box from a structured mesh (see removeDomain) and
+    assigns the PML attributes (see setPMLattributes) before the grid is 
+    materialized, and compares the Nodes, Elements and Boundary with the ones
+    obtained when the grid is materialized first.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    elems : str
+        The (linear) element type in Cases
+
+    Returns
+    -------
+    list
+        The description of the failed checks
+    """
+    failed = list()
+    digests = list()
+    for lazy in [True, False]:
+        mesh = Mesh(elems)
+        if not lazy:
+            mesh.materialize()
+
+        ndim = SVL.Options['dimension']
+        x0 = [1.0, 1.0, 0.375] if ndim == 3 else [1.0, 0.25]
+        xl = [1.005, 1.005, 0.38] if ndim == 3 else [1.005, 0.255]
+        SVL.removeDomain(mesh, {'center': x0, 'sides': [2.0*x for x in xl]})
+        SVL.setPMLattributes(mesh, x0, xl)
+        if mesh.isLazy() != lazy:
+            failed.append('removeDomain() materializes the structured grid')
+        digests.append(Digest(mesh))
+
+    failed.extend('the %s differ when the grid is materialized first' % name for name, d0, d1 in zip(['Nodes', 'Elements', 'Boundary'], *digests) if d0 != d1)
+    return failed
+
+def main():
+    """
+    This function checks the structured mesh generators in Dict and Array
+    storage, i.e., the Nodes, Elements and Boundary are compared with the
+    ones of the previous release, the TETRA10 mid-edge Nodes are checked, and
+    the removals of a grid that is not materialized are checked.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Returns
+    -------
+    None
+    """
+    failed = list()
+    for storage in ['Dict', 'Array']:
+        SVL.Options['storage'] = storage
+        for elems in Cases:
+            mesh = Mesh(elems)
+            if elems in References:
+                for name, digest, reference in zip(['Nodes', 'Elements', 'Boundary'], Digest(mesh), References[elems]):
+                    if digest != reference:
+                        failed.append('%s (%s): the %s differ from the previous release' % (elems, storage, name))
+            else:
+                failed.extend('%s (%s): %s' % (elems, storage, fail) for fail in CheckTetra10(mesh))
+            if isinstance(mesh, SVL.StructuredDomain):
+                failed.extend('%s (%s): %s' % (elems, storage, fail) for fail in Removals(elems))
+
+    if failed:
+        for fail in failed:
+            print('\x1B[31m ERROR \x1B[0m: %s' % fail)
+        sys.exit(-1)
+    print(' ◇ The structured meshes (%s) are correct with the Dict and Array storage' % ', '.join(Cases))
+    print(' ◇ The removals and PML attributes of the structured grids are the same before and after they are materialized')
+
+if __name__ == '__main__':
+    main()
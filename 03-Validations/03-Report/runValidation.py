@@ -116,6 +116,13 @@ def main():
     files.append(["P02-ST_kin_2D_Progressive_Moment_Elastic_Frame2", 3])
     files.append(["P03-ST_DY_Progressive_WideFlange_NonLinear_Fiber_Section_Frame2", 2])
 
+    #List of Pre-Analysis checks (python files in 03-Report) to be Run.
+    checks = []
+    checks.append("checkStructured")
+    checks.append("checkStorage")
+    checks.append("checkBinary")
+    checks.append("checkPartition")
+
     #The Global LaTeX files to be Included.
     LaTeXFiles = []
 
@@ -123,6 +130,10 @@ def main():
     for k in range(n):
         LaTeXFiles.append(cwd + "/../01-Debugging/" + files[k][0] + "/LaTeX/LaTeXFile.tex")
 
+    #Run all the Pre-Analysis checks.
+    print('Running all the Pre-Analysis checks')
+    RunPreAnalysisChecks(checks)
+
     #Run all the validation cases.
     print('Running all the validation cases')
     RunValidationCases(files)
@@ -141,6 +152,33 @@ def main():
 
     print('Process Completed Successfully!')
 
+def RunPreAnalysisChecks(checks):
+    """
+    This function runs all provided Pre-Analysis checks, i.e., the python
+    files that verify the mesh, storage, partition and binary files written
+    by the 01-Pre_Process module. A check exits with an error (and stops the
+    report) if it fails.\n
+    @visit  https://github.com/SeismoVLAB/SVL\n
+    @author Danilo S. Kusanovic 2021
+
+    Parameters
+    ----------
+    checks : list
+        The list of the check files (names) to be run 
+
+    Returns
+    -------
+    None
+    """
+    #The current working path:
+    cwd = os.path.abspath(os.path.dirname(sys.argv[0]))
+
+    #Excecutes the Pre-Analysis checks.
+    for check in checks:
+        cmdline = "python3 " + cwd + "/" + check + ".py"
+        subprocess.check_output(cmdline, shell=True)
+        print(' |   ' + check + ' passed')
+
 def RunValidationCases(files):
     """
     This function runs all provided debugging cases in files.\n